@@ -0,0 +1,87 @@
+"""
+benchmarks/bench_bus.py
+
+Micro-benchmark for InMemoryBus throughput (envelopes/sec).
+
+Scenarios (same message count, same topic):
+- single: publish() per message, poll(max_items=batch) per batch
+- batch: publish_many() per batch, poll_batch(max_items=batch) per batch
+
+Usage:
+    python benchmarks/bench_bus.py --messages 200000 --batch 100 --repeat 5
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus
+
+
+TOPIC = "order_intent"
+
+
+def _payloads(n: int) -> List[Dict[str, Any]]:
+    return [{"symbol": "BTC-USD", "side": "BUY", "qty": 1.0, "i": i} for i in range(n)]
+
+
+def bench_single(n_messages: int, batch: int) -> float:
+    """Seconds to publish + poll n_messages one publish() at a time."""
+    payloads = _payloads(n_messages)
+    bus = InMemoryBus()
+    t0 = time.perf_counter()
+    for start in range(0, n_messages, batch):
+        for i in range(start, min(start + batch, n_messages)):
+            bus.publish(TOPIC, "OrderIntentV1", "T", payloads[i])
+        while bus.poll(TOPIC, max_items=batch):
+            pass
+    return time.perf_counter() - t0
+
+
+def bench_batch(n_messages: int, batch: int) -> float:
+    """Seconds to publish + poll n_messages with publish_many()/poll_batch()."""
+    payloads = _payloads(n_messages)
+    bus = InMemoryBus()
+    t0 = time.perf_counter()
+    for start in range(0, n_messages, batch):
+        bus.publish_many(TOPIC, "OrderIntentV1", [("T", p) for p in payloads[start:start + batch]])
+        while bus.poll_batch(TOPIC, max_items=batch):
+            pass
+    return time.perf_counter() - t0
+
+
+def run_benchmark(n_messages: int = 200_000, batch: int = 100, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Best-of-repeat throughput per scenario.
+
+    Returns:
+        {"messages", "batch", "single_eps", "batch_eps"} (envelopes/sec;
+        batch_eps is None if the bus has no batch API)
+    """
+    result: Dict[str, Any] = {"messages": n_messages, "batch": batch}
+    result["single_eps"] = n_messages / min(bench_single(n_messages, batch) for _ in range(repeat))
+    if hasattr(InMemoryBus, "publish_many"):
+        result["batch_eps"] = n_messages / min(bench_batch(n_messages, batch) for _ in range(repeat))
+    else:
+        result["batch_eps"] = None
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="InMemoryBus throughput micro-benchmark")
+    parser.add_argument("--messages", type=int, default=200_000, help="Messages per run")
+    parser.add_argument("--batch", type=int, default=100, help="Messages per publish/poll batch")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario (best is reported)")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.messages, args.batch, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+benchmarks/bench_idempotency.py
+
+Startup and lookup benchmark for the segmented FileIdempotencyStore.
+
+Marks n_keys keys (sealing a segment every segment_max_keys), reopens the
+store and times:
+- startup: constructing the store over the existing files
+- hit / miss: contains() latency for marked / unknown keys (p50, p99)
+
+Usage:
+    python benchmarks/bench_idempotency.py --keys 10000000 --segment-keys 1000000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.idempotency import FileIdempotencyStore
+
+
+def _percentiles_us(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+    }
+
+
+def run_benchmark(
+    n_keys: int = 1_000_000,
+    segment_max_keys: int = 100_000,
+    lookups: int = 10_000,
+    db_dir: Path = None,
+) -> Dict[str, Any]:
+    """
+    Build a store with n_keys keys, reopen it and time lookups.
+
+    Args:
+        db_dir: Directory for the temporary store (default: system tmp)
+
+    Returns:
+        {"keys", "segments", "build_s", "startup_s", "hit": {p50_us, p99_us},
+         "miss": {p50_us, p99_us}}
+    """
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory(dir=db_dir) as tmp:
+        path = Path(tmp) / "idempotency_keys.jsonl"
+
+        store = FileIdempotencyStore(path, segment_max_keys=segment_max_keys, flush_every=10_000)
+        t0 = time.perf_counter()
+        for i in range(n_keys):
+            store.mark_once(f"exec:{i:012d}")
+        build_s = time.perf_counter() - t0
+        store.close()
+
+        t0 = time.perf_counter()
+        store = FileIdempotencyStore(path, segment_max_keys=segment_max_keys)
+        startup_s = time.perf_counter() - t0
+
+        timings = {"hit": [], "miss": []}
+        for kind in ("hit", "miss"):
+            for _ in range(lookups):
+                i = rng.randrange(n_keys)
+                key = f"exec:{i:012d}" if kind == "hit" else f"other:{i:012d}"
+                t0 = time.perf_counter()
+                found = store.contains(key)
+                timings[kind].append(time.perf_counter() - t0)
+                assert found == (kind == "hit")
+
+        result = {
+            "keys": n_keys,
+            "segments": len(store._segments),
+            "build_s": build_s,
+            "startup_s": startup_s,
+            "hit": _percentiles_us(timings["hit"]),
+            "miss": _percentiles_us(timings["miss"]),
+        }
+        store.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="FileIdempotencyStore startup/lookup benchmark")
+    parser.add_argument("--keys", type=int, default=1_000_000, help="Keys to mark")
+    parser.add_argument("--segment-keys", type=int, default=100_000, help="segment_max_keys")
+    parser.add_argument("--lookups", type=int, default=10_000, help="Timed lookups per kind")
+    parser.add_argument("--db-dir", type=Path, default=None, help="Directory for the temporary store")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.keys, args.segment_keys, args.lookups, args.db_dir), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+benchmarks/bench_idempotency_memory.py
+
+mark_once latency benchmark for InMemoryIdempotencyStore expiry.
+
+Marks n_keys unique keys on a fake clock advancing 1s per mark with
+ttl_s = live_keys, so once warm the store holds ~live_keys keys and every
+mark expires one. mark_once latency is reported per window of the run
+(p50/p99/max): with queue-based expiry p99 stays flat as the store grows.
+
+For comparison, full_scan replays the previous cleanup (scan the whole
+dict on every mark once it holds >= 1000 keys) on a smaller run; its
+latency grows with live_keys.
+
+Usage:
+    python benchmarks/bench_idempotency_memory.py --keys 1000000 --live-keys 500000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.idempotency import InMemoryIdempotencyStore
+
+
+class FullScanStore:
+    """The previous InMemoryIdempotencyStore cleanup, for comparison."""
+
+    def __init__(self, ttl_s: float, now_fn):
+        self.ttl_s = ttl_s
+        self.now_fn = now_fn
+        self._seen: Dict[str, float] = {}
+
+    def mark_once(self, key: str) -> bool:
+        now = self.now_fn()
+        seen_at = self._seen.get(key)
+        if seen_at is not None and now - seen_at < self.ttl_s:
+            return False
+        self._seen[key] = now
+        if len(self._seen) >= 1000:
+            for k in [k for k, v in self._seen.items() if now - v >= self.ttl_s]:
+                del self._seen[k]
+        return True
+
+
+def _window_stats(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+        "max_us": samples[-1] * 1e6,
+    }
+
+
+def _run(store_cls, n_keys: int, live_keys: int, windows: int) -> Dict[str, Any]:
+    clock = [0.0]
+    store = store_cls(ttl_s=float(live_keys), now_fn=lambda: clock[0])
+    mark_once = store.mark_once
+    perf_counter = time.perf_counter
+
+    samples: List[float] = []
+    window_size = max(1, n_keys // windows)
+    stats = []
+    for i in range(n_keys):
+        clock[0] += 1.0
+        key = f"exec:{i:012d}"
+        t0 = perf_counter()
+        mark_once(key)
+        samples.append(perf_counter() - t0)
+        if len(samples) == window_size:
+            stats.append(_window_stats(samples))
+            samples = []
+
+    p99s = [w["p99_us"] for w in stats]
+    return {
+        "keys": n_keys,
+        "live_keys": live_keys,
+        "final_size": len(store._seen),
+        "windows": stats,
+        "p99_first_us": p99s[0],
+        "p99_last_us": p99s[-1],
+        "p99_max_us": max(p99s),
+    }
+
+
+def run_benchmark(
+    n_keys: int = 1_000_000,
+    live_keys: int = 500_000,
+    windows: int = 10,
+    baseline_keys: int = 20_000,
+) -> Dict[str, Any]:
+    """
+    Time mark_once across the run, with and without queue-based expiry.
+
+    Args:
+        n_keys: Unique keys marked (queue-based expiry)
+        live_keys: Keys alive at once (ttl_s in fake-clock marks)
+        windows: Number of windows latency is reported for
+        baseline_keys: Keys for the full_scan comparison (0: skip); its
+            live_keys is baseline_keys // 2
+
+    Returns:
+        {"queue": {...}, "full_scan": {...} or None}, each with per-window
+        p50/p99/max and first/last/max window p99 in microseconds
+    """
+    live_keys = min(live_keys, n_keys)
+    return {
+        "queue": _run(InMemoryIdempotencyStore, n_keys, live_keys, windows),
+        "full_scan": (
+            _run(FullScanStore, baseline_keys, max(1, baseline_keys // 2), windows)
+            if baseline_keys else None
+        ),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="InMemoryIdempotencyStore mark_once latency benchmark")
+    parser.add_argument("--keys", type=int, default=1_000_000, help="Unique keys to mark")
+    parser.add_argument("--live-keys", type=int, default=500_000, help="Keys alive at once (TTL)")
+    parser.add_argument("--windows", type=int, default=10, help="Latency windows to report")
+    parser.add_argument("--baseline-keys", type=int, default=20_000, help="Keys for the full-scan comparison (0: skip)")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.keys, args.live_keys, args.windows, args.baseline_keys)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+benchmarks/bench_jsonl_logger.py
+
+log_event throughput: synchronous FileHandler vs AsyncJsonlHandler.
+
+Each event is one log_event() call with a typical payload. The reported
+time covers the caller's side (what the trading loop waits for) and the
+total including close(), which drains the async queue to disk.
+
+Usage:
+    python benchmarks/bench_jsonl_logger.py --events 200000 --repeat 3
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.structured_jsonl_logger import close_jsonl_logger, get_jsonl_logger, log_event
+
+
+def bench_scenario(n_events: int, async_kwargs: Optional[Dict[str, Any]], path: Path) -> Dict[str, float]:
+    """Caller and total seconds for n_events (async_kwargs None: synchronous)."""
+    if async_kwargs is None:
+        logger = get_jsonl_logger(path, name="bench_jsonl")
+    else:
+        logger = get_jsonl_logger(path, name="bench_jsonl", async_mode=True, **async_kwargs)
+
+    t0 = time.perf_counter()
+    for i in range(n_events):
+        log_event(
+            logger, trace_id=f"trace-{i // 4}", event_type="OrderIntentV1", step_id=i // 4,
+            action="publish", topic="exec", extra={"symbol": "BTCUSDT", "side": "buy", "qty": 0.01, "price": 50000.0 + i},
+        )
+    caller = time.perf_counter() - t0
+    close_jsonl_logger(logger)
+    return {"caller_seconds": caller, "total_seconds": time.perf_counter() - t0}
+
+
+def run_benchmark(n_events: int = 200_000, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Best-of-repeat timings per scenario.
+
+    Returns:
+        {"events", "scenarios": {name: {"caller_seconds", "total_seconds",
+         "events_per_sec", "lines"}}}
+    """
+    scenarios = {
+        "sync": None,
+        "async_block": {"overflow": "block"},
+        "async_drop": {"overflow": "drop"},
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for name, kwargs in scenarios.items():
+        best: Dict[str, float] = {}
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "events.jsonl"
+                timing = bench_scenario(n_events, kwargs, path)
+                timing["lines"] = sum(1 for _ in open(path, encoding="utf-8"))
+            if not best or timing["caller_seconds"] < best["caller_seconds"]:
+                best = timing
+        best["events_per_sec"] = n_events / best["caller_seconds"]
+        results[name] = best
+
+    return {"events": n_events, "scenarios": results}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sync vs async JSONL logger throughput")
+    parser.add_argument("--events", type=int, default=200_000, help="Events per scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.events, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+benchmarks/bench_metrics.py
+
+Stage-event throughput with metrics off vs on (events/sec).
+
+Each event is one MetricsCollector.record_stage() call, streamed to a
+MetricsWriter through event_sink as run_live_3E wires it (--enable-metrics).
+
+Scenarios (same events):
+- off: NoOpMetricsCollector (metrics disabled)
+- unbuffered: MetricsWriter(buffer_bytes=0), write + flush per event
+  (the previous MetricsWriter behavior)
+- buffered: MetricsWriter defaults (64 KiB buffer, 1 s background flush)
+- buffered_gzip_rotation: buffered, rotating every rotate_lines lines with
+  gzip compression of rotated parts on the flush thread
+
+Usage:
+    python benchmarks/bench_metrics.py --events 200000 --repeat 3
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.metrics_collector import MetricsCollector, MetricsWriter, NoOpMetricsCollector
+
+
+STAGES = ("strategy", "risk", "exec", "position")
+
+
+def bench_scenario(n_events: int, writer_kwargs: Optional[Dict[str, Any]], run_dir: Path) -> float:
+    """Seconds to record n_events stage events (writer_kwargs None: metrics off)."""
+    if writer_kwargs is None:
+        collector, writer = NoOpMetricsCollector(), None
+    else:
+        writer = MetricsWriter(run_dir=run_dir, **writer_kwargs)
+        collector = MetricsCollector(event_sink=writer.append_event)
+
+    t0 = time.perf_counter()
+    for i in range(n_events):
+        t = i * 0.001
+        collector.record_stage(STAGES[i % 4], i // 4, f"trace-{i // 4}", t, t + 0.0004)
+    if writer is not None:
+        writer.close()  # Final flush is part of the cost
+    return time.perf_counter() - t0
+
+
+def run_benchmark(n_events: int = 200_000, repeat: int = 3, rotate_lines: int = 50_000) -> Dict[str, Any]:
+    """
+    Best-of-repeat events/sec per scenario.
+
+    Returns:
+        {"events", "scenarios": {name: {"seconds", "events_per_sec"}},
+         "buffered_vs_unbuffered"}
+    """
+    scenarios = {
+        "off": None,
+        "unbuffered": {"buffer_bytes": 0},
+        "buffered": {},
+        "buffered_gzip_rotation": {"rotate_max_lines": rotate_lines, "rotate_compress": True},
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    for name, kwargs in scenarios.items():
+        best = float("inf")
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                best = min(best, bench_scenario(n_events, kwargs, Path(tmp)))
+        results[name] = {"seconds": best, "events_per_sec": n_events / best}
+
+    return {
+        "events": n_events,
+        "scenarios": results,
+        "buffered_vs_unbuffered": results["unbuffered"]["seconds"] / results["buffered"]["seconds"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Metrics on/off stage-event throughput")
+    parser.add_argument("--events", type=int, default=200_000, help="Stage events per scenario")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    parser.add_argument("--rotate-lines", type=int, default=50_000, help="Rotation size for the gzip scenario")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.events, args.repeat, args.rotate_lines), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+benchmarks/bench_run_metrics.py
+
+Shutdown cost of run metrics: online RunMetricsAggregator vs re-parsing
+the JSONL trace (collect_metrics_from_jsonl, the previous run_live_3E path).
+
+Writes n_events bus-mode-like events (intent, decision, report, position
+per trace) with log_event() to an async JSONL logger whose observer is the
+aggregator, then times:
+- log: logging all events with the observer (caller side)
+- log_no_observer: the same without the observer (observe() overhead)
+- summary: aggregator.summary() at shutdown
+- reparse: collect_metrics_from_jsonl() over the written trace
+
+Usage:
+    python benchmarks/bench_run_metrics.py --events 400000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.run_metrics_3D5 import RunMetricsAggregator, collect_metrics_from_jsonl
+from engine.structured_jsonl_logger import close_jsonl_logger, get_jsonl_logger, log_event
+
+
+STAGES = (
+    ("OrderIntentV1", "publish", {"symbol": "BTCUSDT", "side": "buy", "qty": 0.01}),
+    ("RiskDecisionV1", "publish", {"allowed": True}),
+    ("ExecutionReportV1", "publish", {"status": "FILLED", "price": 50000.0}),
+    ("PositionUpdated", "persist", {"symbol": "BTCUSDT", "qty": 0.01}),
+)
+
+
+def write_trace(path: Path, n_events: int, observer: Optional[RunMetricsAggregator]) -> float:
+    """Log n_events to path; returns caller-side seconds."""
+    logger = get_jsonl_logger(
+        path, name="bench_run_metrics", async_mode=True,
+        observer=observer.observe if observer is not None else None,
+    )
+    t0 = time.perf_counter()
+    for i in range(n_events):
+        event_type, action, extra = STAGES[i % 4]
+        log_event(
+            logger, trace_id=f"trace-{i // 4}", event_type=event_type,
+            step_id=i // 4, action=action, extra=extra,
+        )
+    log_event(
+        logger, trace_id="SYSTEM", event_type="BusModeDone", step_id=n_events // 4,
+        action="complete", extra={"drain_iterations": 1},
+    )
+    elapsed = time.perf_counter() - t0
+    close_jsonl_logger(logger)
+    return elapsed
+
+
+def run_benchmark(n_events: int = 400_000) -> Dict[str, Any]:
+    """
+    Time online aggregation vs re-parse for one trace.
+
+    Returns:
+        {"events", "trace_mb", "log_seconds", "log_no_observer_seconds",
+         "observe_overhead_us", "summary_seconds", "reparse_seconds", "match"}
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "events.ndjson"
+        plain = write_trace(Path(tmp) / "plain.ndjson", n_events, None)
+
+        aggregator = RunMetricsAggregator()
+        logged = write_trace(path, n_events, aggregator)
+
+        t0 = time.perf_counter()
+        online = aggregator.summary()
+        summary_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        reparsed = collect_metrics_from_jsonl(path)
+        reparse_s = time.perf_counter() - t0
+
+        trace_mb = path.stat().st_size / 1e6
+
+    return {
+        "events": n_events,
+        "trace_mb": trace_mb,
+        "log_seconds": logged,
+        "log_no_observer_seconds": plain,
+        "observe_overhead_us": (logged - plain) / n_events * 1e6,
+        "summary_seconds": summary_s,
+        "reparse_seconds": reparse_s,
+        "match": online == reparsed,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Online vs re-parsed run metrics")
+    parser.add_argument("--events", type=int, default=400_000, help="Trace events to log")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.events), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+"""
+benchmarks/suite.py
+
+Benchmark suite for the throughput/latency KPIs in the README
+(Latency < 1 s per order, Throughput >= 100k tx/day), with a JSON baseline
+and a regression check.
+
+Benchmarks (all higher-is-better rates):
+- loop_stepper.<mode>: LoopStepper bars/sec (run, run_bus_mode two-phase,
+  run_bus_mode pipelined, run_adapter_mode)
+- bus.<scenario>: InMemoryBus envelopes/sec (benchmarks/bench_bus.py)
+- risk.assess: RiskManagerV06.assess calls/sec
+- position_store.<scenario>: PositionStoreSQLite fills/sec
+  (benchmarks/bench_position_store.py)
+- idempotency.<backend>: mark_once marks/sec per store backend
+- load_ohlcv: data_adapters.ohlcv_loader.load_ohlcv MB/sec (CSV)
+
+The KPI check derives per-bar latency and tx/day (fills, not bars) from
+the bus-mode LoopStepper rate (the run_live_3E default path).
+
+Usage:
+    python benchmarks/suite.py run --output results.json [--quick] [--only bus risk]
+    python benchmarks/suite.py run --output benchmarks/baseline.json   # refresh baseline
+    python benchmarks/suite.py compare results.json --max-regression-pct 30
+
+compare exits 1 when any benchmark is more than --max-regression-pct
+below the baseline (default baseline: benchmarks/baseline.json) or when
+one of the two runs used --quick and the other did not. The
+baseline is machine-specific: refresh it on the machine that runs compare.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks import bench_bus, bench_position_store
+
+
+SUITE_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_MAX_REGRESSION_PCT = 30.0
+RISK_RULES = Path(__file__).parent.parent / "risk_rules.yaml"
+
+# README KPIs
+KPI_LATENCY_S = 1.0
+KPI_TX_PER_DAY = 100_000
+
+SIZES = {
+    "full": {
+        "bars": 2_000, "repeat": 3, "messages": 100_000, "assess": 5_000,
+        "fills": 2_000, "marks": 20_000, "sqlite_marks": 2_000, "csv_rows": 200_000,
+    },
+    "quick": {
+        "bars": 200, "repeat": 1, "messages": 5_000, "assess": 300,
+        "fills": 200, "marks": 1_000, "sqlite_marks": 200, "csv_rows": 5_000,
+    },
+}
+
+
+def make_ohlcv_df(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """Deterministic geometric random-walk OHLCV (prices stay positive at any length)."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": rng.integers(1000, 10000, n_bars).astype(float),
+    })
+
+
+def _best(fn: Callable[[], float], repeat: int) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+# --- LoopStepper -----------------------------------------------------------
+
+def _stepper(tmp: Path):
+    from engine.loop_stepper import LoopStepper
+    from engine.time_provider import SimulatedTimeProvider
+
+    return LoopStepper(state_db=tmp / "state.db", seed=42, time_provider=SimulatedTimeProvider(seed=42))
+
+
+def _time_stepper_mode(mode: str, n_bars: int, warmup: int = 10) -> Tuple[float, int]:
+    """Seconds for one LoopStepper run of n_bars bars in mode (setup excluded), and its fills."""
+    from bus import InMemoryBus
+    from engine.market_data.fixture_adapter import FixtureMarketDataAdapter
+
+    df = make_ohlcv_df(n_bars + warmup)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        stepper = _stepper(tmp)
+        if mode == "run":
+            t0 = time.perf_counter()
+            stepper.run(df, max_steps=n_bars, warmup=warmup)
+        elif mode == "bus_mode":
+            t0 = time.perf_counter()
+            stepper.run_bus_mode(df, InMemoryBus(), max_steps=n_bars, warmup=warmup)
+        elif mode == "bus_mode_pipelined":
+            t0 = time.perf_counter()
+            stepper.run_bus_mode(df, InMemoryBus(), max_steps=n_bars, warmup=warmup, pipeline_batch=64)
+        elif mode == "adapter_mode":
+            csv_path = tmp / "fixture.csv"
+            df.to_csv(csv_path, index=False)
+            adapter = FixtureMarketDataAdapter(csv_path)
+            t0 = time.perf_counter()
+            stepper.run_adapter_mode(adapter, max_steps=n_bars, warmup=warmup)
+        else:
+            raise ValueError(f"Unknown LoopStepper mode: {mode}")
+        elapsed = time.perf_counter() - t0
+        fills = stepper._get_metrics()["fills"]
+        stepper.close()
+    return elapsed, fills
+
+
+def bench_loop_stepper(sizes: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    """Bars/sec per mode; fills_per_bar (deterministic per seed) turns bars into transactions."""
+    n = sizes["bars"]
+    out = {}
+    for mode in ("run", "bus_mode", "bus_mode_pipelined", "adapter_mode"):
+        runs = [_time_stepper_mode(mode, n) for _ in range(sizes["repeat"])]
+        out[f"loop_stepper.{mode}"] = {
+            "value": n / min(seconds for seconds, _ in runs),
+            "unit": "bars/s",
+            "fills_per_bar": runs[0][1] / n,
+        }
+    return out
+
+
+# --- Bus, risk, position store ---------------------------------------------
+
+def bench_bus_throughput(sizes: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    result = bench_bus.run_benchmark(n_messages=sizes["messages"], batch=100, repeat=sizes["repeat"])
+    out = {"bus.single": {"value": result["single_eps"], "unit": "envelopes/s"}}
+    if result["batch_eps"] is not None:
+        out["bus.batch"] = {"value": result["batch_eps"], "unit": "envelopes/s"}
+    return out
+
+
+def bench_risk_assess(sizes: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    from contracts.events_v1 import OrderIntentV1
+    from risk_manager_v0_6 import RiskManagerV06
+
+    rm = RiskManagerV06(RISK_RULES)
+    symbols = ("BTC/USDT", "ETH/USDT", "SOL/USDT")
+    intents = [
+        OrderIntentV1(symbol=symbols[i % 3], side="SELL" if i % 4 == 3 else "BUY", qty=0.5 + i % 3)
+        for i in range(sizes["assess"])
+    ]
+
+    def run() -> float:
+        t0 = time.perf_counter()
+        for intent in intents:
+            rm.assess(intent, nav=10_000.0)
+        return time.perf_counter() - t0
+
+    return {"risk.assess": {"value": len(intents) / _best(run, sizes["repeat"]), "unit": "calls/s"}}
+
+
+def bench_position_store_fills(sizes: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    result = bench_position_store.run_benchmark(n_fills=sizes["fills"], batch=100, repeat=sizes["repeat"])
+    return {
+        "position_store.single": {"value": result["single_fps"], "unit": "fills/s"},
+        "position_store.batch": {"value": result["batch_fps"], "unit": "fills/s"},
+    }
+
+
+# --- Idempotency -----------------------------------------------------------
+
+def _time_marks(backend: str, n_keys: int) -> float:
+    from engine.idempotency import FileIdempotencyStore, InMemoryIdempotencyStore, SQLiteIdempotencyStore
+
+    keys = [f"exec:{i:012d}" for i in range(n_keys)]
+    with tempfile.TemporaryDirectory() as tmp:
+        if backend == "memory":
+            store = InMemoryIdempotencyStore()
+        elif backend == "file":
+            store = FileIdempotencyStore(Path(tmp) / "keys.jsonl")
+        else:
+            store = SQLiteIdempotencyStore(Path(tmp) / "keys.db")
+        t0 = time.perf_counter()
+        for key in keys:
+            store.mark_once(key)
+        elapsed = time.perf_counter() - t0
+        if hasattr(store, "close"):
+            store.close()
+    return elapsed
+
+
+def bench_idempotency_marks(sizes: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    out = {}
+    for backend in ("memory", "file", "sqlite"):
+        n = sizes["sqlite_marks"] if backend == "sqlite" else sizes["marks"]
+        out[f"idempotency.{backend}"] = {
+            "value": n / _best(lambda: _time_marks(backend, n), sizes["repeat"]),
+            "unit": "marks/s",
+        }
+    return out
+
+
+# --- OHLCV loading ---------------------------------------------------------
+
+def bench_load_ohlcv(sizes: Dict[str, int]) -> Dict[str, Dict[str, Any]]:
+    from data_adapters.ohlcv_loader import load_ohlcv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ohlcv.csv"
+        make_ohlcv_df(sizes["csv_rows"]).to_csv(path, index=False)
+        mb = path.stat().st_size / 1e6
+
+        def run() -> float:
+            t0 = time.perf_counter()
+            load_ohlcv(path)
+            return time.perf_counter() - t0
+
+        seconds = _best(run, sizes["repeat"])
+    return {"load_ohlcv": {"value": mb / seconds, "unit": "MB/s"}}
+
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, int]], Dict[str, Dict[str, Any]]]] = {
+    "loop_stepper": bench_loop_stepper,
+    "bus": bench_bus_throughput,
+    "risk": bench_risk_assess,
+    "position_store": bench_position_store_fills,
+    "idempotency": bench_idempotency_marks,
+    "load_ohlcv": bench_load_ohlcv,
+}
+
+
+def kpi_report(results: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    README KPIs from the bus-mode LoopStepper rate (None if it wasn't run).
+
+    One bar carries at most one order through intent -> risk -> exec ->
+    position, so 1 / bars_per_sec bounds the per-order pipeline latency.
+    Most bars emit no order, so sustained tx/day counts fills, not bars:
+    bars_per_sec * fills_per_bar * 86400.
+    """
+    entry = results.get("loop_stepper.bus_mode")
+    if entry is None:
+        return None
+    rate = entry["value"]
+    latency = 1.0 / rate
+    tx_per_day = rate * entry["fills_per_bar"] * 86_400
+    return {
+        "latency_per_bar_s": latency,
+        "latency_budget_s": KPI_LATENCY_S,
+        "tx_per_day": tx_per_day,
+        "tx_per_day_target": KPI_TX_PER_DAY,
+        "ok": latency < KPI_LATENCY_S and tx_per_day >= KPI_TX_PER_DAY,
+    }
+
+
+def run_suite(only: Optional[List[str]] = None, quick: bool = False) -> Dict[str, Any]:
+    """
+    Run the selected benchmark groups.
+
+    Args:
+        only: Group names from BENCHMARKS (None = all)
+        quick: Small sizes, one repetition (smoke runs, CI)
+
+    Returns:
+        {"version", "quick", "python", "platform", "results": {name:
+         {"value", "unit"}}, "kpi"}
+
+    Raises:
+        ValueError: If only names an unknown group
+    """
+    groups = list(BENCHMARKS) if not only else list(only)
+    unknown = [g for g in groups if g not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark groups {unknown}; choose from {list(BENCHMARKS)}")
+
+    sizes = SIZES["quick" if quick else "full"]
+    results: Dict[str, Dict[str, Any]] = {}
+    for group in groups:
+        results.update(BENCHMARKS[group](sizes))
+    return {
+        "version": SUITE_VERSION,
+        "quick": quick,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "kpi": kpi_report(results),
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    max_regression_pct: float = DEFAULT_MAX_REGRESSION_PCT,
+) -> Dict[str, Any]:
+    """
+    Compare current suite output against a baseline.
+
+    A benchmark regresses when its rate is more than max_regression_pct
+    below the baseline. Benchmarks missing from either side are listed but
+    do not fail the comparison (compare a partial --only run safely). A
+    current run that misses the README KPIs fails regardless of baseline,
+    and so does comparing a --quick run with a full one (or vice versa):
+    their sizes differ, so the rates are not comparable.
+
+    Returns:
+        {"ok", "max_regression_pct", "rows": [{"name", "unit", "baseline",
+         "current", "change_pct", "regressed"}], "missing": [...],
+         "new": [...], "kpi", "quick_mismatch"}
+    """
+    base = baseline["results"]
+    cur = current["results"]
+    rows = []
+    for name in sorted(set(base) & set(cur)):
+        b, c = base[name]["value"], cur[name]["value"]
+        change = (c - b) / b * 100.0 if b else 0.0
+        rows.append({
+            "name": name,
+            "unit": cur[name]["unit"],
+            "baseline": b,
+            "current": c,
+            "change_pct": change,
+            "regressed": change < -max_regression_pct,
+        })
+    kpi = current.get("kpi")
+    quick_mismatch = bool(current.get("quick")) != bool(baseline.get("quick"))
+    return {
+        "ok": not any(r["regressed"] for r in rows) and (kpi is None or kpi["ok"]) and not quick_mismatch,
+        "max_regression_pct": max_regression_pct,
+        "rows": rows,
+        "missing": sorted(set(base) - set(cur)),
+        "new": sorted(set(cur) - set(base)),
+        "kpi": kpi,
+        "quick_mismatch": quick_mismatch,
+    }
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _print_comparison(report: Dict[str, Any]) -> None:
+    for r in report["rows"]:
+        flag = "REGRESSION" if r["regressed"] else "ok"
+        print(
+            f"{r['name']:<32} {r['baseline']:>14,.1f} -> {r['current']:>14,.1f} {r['unit']:<12}"
+            f" {r['change_pct']:+7.1f}%  {flag}"
+        )
+    for name in report["missing"]:
+        print(f"{name:<32} missing from current results")
+    for name in report["new"]:
+        print(f"{name:<32} not in baseline")
+    kpi = report["kpi"]
+    if kpi is not None:
+        print(
+            f"KPI latency/bar {kpi['latency_per_bar_s']:.4f}s (< {kpi['latency_budget_s']}s), "
+            f"{kpi['tx_per_day']:,.0f} tx/day (>= {kpi['tx_per_day_target']:,}): "
+            + ("ok" if kpi["ok"] else "MISSED")
+        )
+    if report["quick_mismatch"]:
+        print("--quick and full runs are not comparable: re-run with the baseline's sizes")
+    verdict = "OK" if report["ok"] else "FAILED"
+    print(f"{verdict} (max regression {report['max_regression_pct']}%)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput/latency benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run benchmarks and write results JSON")
+    run_p.add_argument("--output", type=Path, default=None, help="Results JSON path (default: stdout only)")
+    run_p.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None, help="Benchmark groups to run")
+    run_p.add_argument("--quick", action="store_true", help="Small sizes, one repetition")
+
+    cmp_p = sub.add_parser("compare", help="Compare results JSON against the baseline")
+    cmp_p.add_argument("results", type=Path, help="Results JSON from 'run'")
+    cmp_p.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON")
+    cmp_p.add_argument(
+        "--max-regression-pct", type=float, default=DEFAULT_MAX_REGRESSION_PCT,
+        help=f"Fail if a rate drops more than this %% below baseline (default: {DEFAULT_MAX_REGRESSION_PCT})",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        result = run_suite(args.only, args.quick)
+        text = json.dumps(result, indent=2, sort_keys=True)
+        if args.output:
+            args.output.write_text(text + "\n", encoding="utf-8")
+        print(text)
+        return 0
+
+    report = compare_results(_load(args.baseline), _load(args.results), args.max_regression_pct)
+    _print_comparison(report)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,9 +7,21 @@ Exports:
 - BusEnvelope: Immutable message envelope
 - BusBase: Protocol for bus implementations
 - InMemoryBus: Deterministic in-memory implementation
+- ThreadSafeBus: Locked in-memory bus with blocking waits and trace partitions
+- SegmentedLogBus: Persistent segmented log with consumer-group offsets and replay
 """
 
 from .bus_base import BusBase, BusEnvelope
 from .inmemory_bus import InMemoryBus
+from .threadsafe_bus import ThreadSafeBus, PartitionView
+from .segmented_log_bus import SegmentedLogBus, LogConsumer
 
-__all__ = ["BusBase", "BusEnvelope", "InMemoryBus"]
+__all__ = [
+    "BusBase",
+    "BusEnvelope",
+    "InMemoryBus",
+    "ThreadSafeBus",
+    "PartitionView",
+    "SegmentedLogBus",
+    "LogConsumer",
+]
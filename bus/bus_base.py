@@ -4,7 +4,7 @@ bus/bus_base.py
 Base abstractions for event bus.
 
 Defines:
-- BusEnvelope: Immutable envelope wrapping event payloads
+- BusEnvelope: Immutable (tuple-backed) envelope wrapping event payloads
 - BusBase: Protocol for bus implementations
 
 Design decisions:
@@ -15,15 +15,16 @@ Design decisions:
 Part of ticket AG-3D-2-1.
 """
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Protocol, runtime_checkable
+from typing import Any, Dict, List, NamedTuple, Protocol, runtime_checkable
 
 
-@dataclass(frozen=True)
-class BusEnvelope:
+class BusEnvelope(NamedTuple):
     """
     Immutable envelope for bus messages.
     
+    Tuple-backed (NamedTuple): construction is a single tuple allocation and
+    fields are read by index, which keeps per-message bus overhead low.
+    
     Attributes:
         seq: Global monotonic sequence number (total ordering)
         topic: Destination topic (e.g., 'order_intent', 'risk_decision')
@@ -57,6 +58,9 @@ class BusBase(Protocol):
     - publish: Send event to topic
     - poll: Retrieve events from topic (FIFO)
     - size: Count pending events in topic
+    
+    InMemoryBus / ThreadSafeBus also provide publish_many / poll_batch
+    for batched producers and consumers.
     """
     
     def publish(
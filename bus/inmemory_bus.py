@@ -8,12 +8,13 @@ Features:
 - Global monotonic seq counter for total ordering
 - No external dependencies
 - Deterministic (no timestamps, no randomness)
+- Batch API: publish_many / poll_batch (one queue lookup per batch)
 
 Part of ticket AG-3D-2-1.
 """
 
 from collections import deque
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Tuple
 
 from .bus_base import BusBase, BusEnvelope
 
@@ -45,9 +46,10 @@ class InMemoryBus(BusBase):
     
     def _get_queue(self, topic: str) -> deque[BusEnvelope]:
         """Get or create queue for topic."""
-        if topic not in self._queues:
-            self._queues[topic] = deque()
-        return self._queues[topic]
+        queue = self._queues.get(topic)
+        if queue is None:
+            queue = self._queues[topic] = deque()
+        return queue
     
     def publish(
         self,
@@ -68,16 +70,40 @@ class InMemoryBus(BusBase):
         Returns:
             BusEnvelope with assigned seq number
         """
-        envelope = BusEnvelope(
-            seq=self._next_seq(),
-            topic=topic,
-            event_type=event_type,
-            trace_id=trace_id,
-            payload=payload,
-        )
+        self._seq += 1
+        envelope = BusEnvelope(self._seq, topic, event_type, trace_id, payload)
         self._get_queue(topic).append(envelope)
         return envelope
     
+    def publish_many(
+        self,
+        topic: str,
+        event_type: str,
+        messages: Iterable[Tuple[str, Dict[str, Any]]],
+    ) -> List[BusEnvelope]:
+        """
+        Publish a batch of events of one type to a topic.
+        
+        Equivalent to publish() per message (consecutive seq numbers, same
+        FIFO order), with one queue lookup and one extend for the batch.
+        
+        Args:
+            topic: Destination topic
+            event_type: Type of all events in the batch
+            messages: Iterable of (trace_id, payload)
+            
+        Returns:
+            List of BusEnvelope in publish order
+        """
+        seq = self._seq
+        envelopes = [
+            BusEnvelope(seq + i, topic, event_type, trace_id, payload)
+            for i, (trace_id, payload) in enumerate(messages, start=1)
+        ]
+        self._seq = seq + len(envelopes)
+        self._get_queue(topic).extend(envelopes)
+        return envelopes
+    
     def poll(self, topic: str, max_items: int = 1) -> List[BusEnvelope]:
         """
         Poll events from a topic (FIFO).
@@ -89,13 +115,31 @@ class InMemoryBus(BusBase):
         Returns:
             List of BusEnvelope (empty if no messages)
         """
-        queue = self._get_queue(topic)
-        result: List[BusEnvelope] = []
+        return self.poll_batch(topic, max_items)
+    
+    def poll_batch(self, topic: str, max_items: int) -> List[BusEnvelope]:
+        """
+        Poll up to max_items events from a topic as one contiguous FIFO batch.
         
-        for _ in range(min(max_items, len(queue))):
-            result.append(queue.popleft())
+        Draining the whole queue copies it in one step instead of popping
+        envelope by envelope.
         
-        return result
+        Args:
+            topic: Topic to poll from
+            max_items: Maximum number of envelopes to return
+            
+        Returns:
+            List of BusEnvelope in seq order (empty if no messages)
+        """
+        queue = self._queues.get(topic)
+        if not queue or max_items <= 0:
+            return []
+        if max_items >= len(queue):
+            result = list(queue)
+            queue.clear()
+            return result
+        popleft = queue.popleft
+        return [popleft() for _ in range(max_items)]
     
     def size(self, topic: str) -> int:
         """
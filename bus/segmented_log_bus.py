@@ -0,0 +1,545 @@
+"""
+bus/segmented_log_bus.py
+
+Persistent, file-backed event bus (append-only segmented log).
+
+InMemoryBus loses pending messages on a crash. SegmentedLogBus keeps every
+topic as an append-only log on disk so consumers resume from their committed
+offsets and recorded runs can be replayed at disk speed.
+
+Layout (root directory):
+    <topic>/<base_offset:020d>.log   Segment files, named by first offset
+    _offsets/<group>.json            Committed offsets per consumer group
+
+Record format: <u32 length><u32 crc32><JSON [seq, event_type, trace_id, payload]>
+
+Features:
+- BusBase API (publish / poll / size) plus publish_many / poll_batch
+- Offsets are per topic and 0-based; seq stays global and survives restarts
+- Memory-mapped readers; per-segment record index built on first read
+- Consumer groups: the bus consumes as its own group, consumer(group) gives
+  independent views; auto_commit commits the previous poll's position on the
+  next poll (at-least-once: an uncommitted batch is redelivered after a crash)
+- Segment rolling (segment_bytes) and retention (retention_segments)
+- Torn tail records (crash mid-write) are truncated on open
+
+Single-threaded, like InMemoryBus.
+
+Part of the bus durability work (persistent log bus).
+"""
+
+import bisect
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .bus_base import BusEnvelope
+
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<II")  # length, crc32
+_SEGMENT_SUFFIX = ".log"
+_OFFSETS_DIR = "_offsets"
+_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.\-]*$")
+
+DEFAULT_GROUP = "default"
+
+
+def _check_name(kind: str, name: str) -> None:
+    if not _NAME_RE.match(name):
+        raise ValueError(f"Invalid {kind} name {name!r} (allowed: letters, digits, _ . -)")
+
+
+class _Segment:
+    """One segment file: base offset, record positions (lazy) and read map."""
+
+    __slots__ = ("path", "base", "positions", "size", "_mm", "_mm_size")
+
+    def __init__(self, path: Path, base: int):
+        self.path = path
+        self.base = base
+        self.positions: Optional[List[int]] = None  # Byte position per record
+        self.size = 0  # Valid bytes
+        self._mm: Optional[mmap.mmap] = None
+        self._mm_size = 0
+
+    def view(self) -> Union[mmap.mmap, bytes]:
+        """Read-only map covering the valid bytes (remapped when the file grew)."""
+        if self.size == 0:
+            return b""
+        if self._mm is None or self._mm_size < self.size:
+            self.close()
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mm_size = len(self._mm)
+        return self._mm
+
+    def index(self) -> List[int]:
+        """Record positions (scans the segment on first use)."""
+        if self.positions is None:
+            self.size = self.path.stat().st_size
+            self.positions, valid = _scan(self.view(), self.size)
+            self.size = valid
+        return self.positions
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._mm_size = 0
+
+
+def _scan(buf, limit: int) -> Tuple[List[int], int]:
+    """Positions of valid records in buf[:limit] and the end of the last one."""
+    positions: List[int] = []
+    pos = 0
+    while pos + _HEADER.size <= limit:
+        length, crc = _HEADER.unpack_from(buf, pos)
+        end = pos + _HEADER.size + length
+        if end > limit or zlib.crc32(buf[pos + _HEADER.size:end]) != crc:
+            break
+        positions.append(pos)
+        pos = end
+    return positions, pos
+
+
+class _TopicLog:
+    """Segments of one topic plus the append handle of the active segment."""
+
+    def __init__(self, directory: Path):
+        self.dir = directory
+        self.segments: List[_Segment] = []
+        self.bases: List[int] = []
+        self._writer = None
+
+    @property
+    def start(self) -> int:
+        return self.segments[0].base if self.segments else 0
+
+    @property
+    def end(self) -> int:
+        if not self.segments:
+            return 0
+        last = self.segments[-1]
+        return last.base + len(last.index())
+
+    @property
+    def active(self) -> _Segment:
+        return self.segments[-1]
+
+    def add_segment(self, base: int) -> _Segment:
+        seg = _Segment(self.dir / f"{base:020d}{_SEGMENT_SUFFIX}", base)
+        seg.path.touch()
+        seg.positions = []
+        self.segments.append(seg)
+        self.bases.append(base)
+        return seg
+
+    def writer(self):
+        if self._writer is None:
+            self._writer = open(self.active.path, "ab")
+        return self._writer
+
+    def close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def segment_for(self, offset: int) -> _Segment:
+        return self.segments[bisect.bisect_right(self.bases, offset) - 1]
+
+    def drop_oldest(self) -> None:
+        seg = self.segments.pop(0)
+        self.bases.pop(0)
+        seg.close()
+        seg.path.unlink()
+
+    def close(self) -> None:
+        self.close_writer()
+        for seg in self.segments:
+            seg.close()
+
+
+class SegmentedLogBus:
+    """
+    File-backed BusBase implementation (append-only segmented log).
+
+    Example:
+        bus = SegmentedLogBus("runs/r1/bus")
+        bus.publish("order_intent", "OrderIntentV1", "T-001", {"qty": 10})
+        events = bus.poll("order_intent", max_items=10)
+        bus.close()  # Commits consumed offsets
+
+        # After a restart, polling continues after the last committed offset
+        bus = SegmentedLogBus("runs/r1/bus")
+        for env in bus.replay("order_intent"):  # Full history, no offsets touched
+            ...
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        *,
+        group: str = DEFAULT_GROUP,
+        segment_bytes: int = 64 * 1024 * 1024,
+        retention_segments: Optional[int] = None,
+        auto_commit: bool = True,
+        fsync: bool = False,
+    ):
+        """
+        Args:
+            root: Log directory (created if missing)
+            group: Consumer group used by poll()/size()/commit() on the bus itself
+            segment_bytes: Roll to a new segment once the active one reaches this size
+            retention_segments: Keep at most this many segments per topic (None = keep all);
+                consumers behind the new log start continue from it
+            auto_commit: Commit the previous poll's position on each poll and on close()
+            fsync: fsync segment appends and offset commits (durable vs fast)
+        """
+        _check_name("group", group)
+        if segment_bytes < 1:
+            raise ValueError(f"segment_bytes must be >= 1, got {segment_bytes}")
+        if retention_segments is not None and retention_segments < 1:
+            raise ValueError(f"retention_segments must be >= 1, got {retention_segments}")
+        self.root = Path(root)
+        self.group = group
+        self.segment_bytes = segment_bytes
+        self.retention_segments = retention_segments
+        self.auto_commit = auto_commit
+        self.fsync = fsync
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / _OFFSETS_DIR).mkdir(exist_ok=True)
+        self._logs: Dict[str, _TopicLog] = {}
+        self._positions: Dict[str, Dict[str, int]] = {}
+        self._committed: Dict[str, Dict[str, int]] = {}
+        self._seq = 0
+        self._closed = False
+        self._recover()
+
+    # -- Recovery ---------------------------------------------------------
+
+    def _recover(self) -> None:
+        """Load segments, truncate torn tails and restore the global seq."""
+        for topic_dir in sorted(p for p in self.root.iterdir() if p.is_dir() and p.name != _OFFSETS_DIR):
+            log = _TopicLog(topic_dir)
+            for path in sorted(topic_dir.glob(f"*{_SEGMENT_SUFFIX}")):
+                seg = _Segment(path, int(path.stem))
+                log.segments.append(seg)
+                log.bases.append(seg.base)
+            if not log.segments:
+                continue
+
+            last = log.active
+            file_size = last.path.stat().st_size
+            last.index()
+            if last.size < file_size:
+                logger.warning(
+                    "SegmentedLogBus: truncating torn tail of %s (%d -> %d bytes)",
+                    last.path, file_size, last.size,
+                )
+                last.close()
+                with open(last.path, "r+b") as f:
+                    f.truncate(last.size)
+
+            self._logs[topic_dir.name] = log
+            last_env = self._last_envelope(topic_dir.name)
+            if last_env is not None:
+                self._seq = max(self._seq, last_env.seq)
+
+    def _last_envelope(self, topic: str) -> Optional[BusEnvelope]:
+        log = self._logs[topic]
+        for seg in reversed(log.segments):
+            positions = seg.index()
+            if positions:
+                return self._decode(topic, seg, len(positions) - 1)
+        return None
+
+    # -- Publish ----------------------------------------------------------
+
+    def _log_for_write(self, topic: str) -> _TopicLog:
+        log = self._logs.get(topic)
+        if log is None:
+            _check_name("topic", topic)
+            directory = self.root / topic
+            directory.mkdir(exist_ok=True)
+            log = self._logs[topic] = _TopicLog(directory)
+        if not log.segments:
+            log.add_segment(0)
+        return log
+
+    def _append(self, log: _TopicLog, records: List[bytes]) -> None:
+        seg = log.active
+        positions = seg.index()
+        chunks = []
+        pos = seg.size
+        for data in records:
+            positions.append(pos)
+            chunks.append(_HEADER.pack(len(data), zlib.crc32(data)))
+            chunks.append(data)
+            pos += _HEADER.size + len(data)
+        writer = log.writer()
+        writer.write(b"".join(chunks))
+        writer.flush()
+        if self.fsync:
+            os.fsync(writer.fileno())
+        seg.size = pos
+
+        if seg.size >= self.segment_bytes:
+            log.close_writer()
+            log.add_segment(seg.base + len(positions))
+            if self.retention_segments is not None:
+                while len(log.segments) > self.retention_segments:
+                    log.drop_oldest()
+
+    def publish(
+        self,
+        topic: str,
+        event_type: str,
+        trace_id: str,
+        payload: Dict[str, Any],
+    ) -> BusEnvelope:
+        """Append one event to topic; returns its envelope."""
+        return self.publish_many(topic, event_type, [(trace_id, payload)])[0]
+
+    def publish_many(
+        self,
+        topic: str,
+        event_type: str,
+        messages: Iterable[Tuple[str, Dict[str, Any]]],
+    ) -> List[BusEnvelope]:
+        """Append a batch of events (consecutive seq, one write + flush)."""
+        log = self._log_for_write(topic)
+        envelopes: List[BusEnvelope] = []
+        records: List[bytes] = []
+        for trace_id, payload in messages:
+            self._seq += 1
+            envelopes.append(BusEnvelope(self._seq, topic, event_type, trace_id, payload))
+            records.append(json.dumps(
+                [self._seq, event_type, trace_id, payload], separators=(",", ":")
+            ).encode("utf-8"))
+        if records:
+            self._append(log, records)
+        return envelopes
+
+    # -- Read -------------------------------------------------------------
+
+    def _decode(self, topic: str, seg: _Segment, idx: int) -> BusEnvelope:
+        buf = seg.view()
+        pos = seg.positions[idx]
+        length, _ = _HEADER.unpack_from(buf, pos)
+        start = pos + _HEADER.size
+        seq, event_type, trace_id, payload = json.loads(buf[start:start + length])
+        return BusEnvelope(seq, topic, event_type, trace_id, payload)
+
+    def _read(self, topic: str, offset: int, max_items: int) -> List[BusEnvelope]:
+        """Up to max_items envelopes starting at offset (offset >= log start)."""
+        log = self._logs.get(topic)
+        result: List[BusEnvelope] = []
+        if log is None:
+            return result
+        end = log.end
+        while len(result) < max_items and offset < end:
+            seg = log.segment_for(offset)
+            positions = seg.index()
+            idx = offset - seg.base
+            stop = min(len(positions), idx + max_items - len(result))
+            for i in range(idx, stop):
+                result.append(self._decode(topic, seg, i))
+            offset = seg.base + stop
+        return result
+
+    def replay(
+        self,
+        topic: str,
+        from_offset: Optional[int] = None,
+        to_offset: Optional[int] = None,
+        batch_size: int = 1024,
+    ) -> Iterator[BusEnvelope]:
+        """
+        Iterate a topic's retained history without touching consumer offsets.
+
+        Args:
+            topic: Topic to replay
+            from_offset: First offset (None = log start)
+            to_offset: Stop before this offset (None = current end)
+            batch_size: Records decoded per read
+        """
+        log = self._logs.get(topic)
+        if log is None:
+            return
+        offset = log.start if from_offset is None else max(from_offset, log.start)
+        end = log.end if to_offset is None else min(to_offset, log.end)
+        while offset < end:
+            batch = self._read(topic, offset, min(batch_size, end - offset))
+            if not batch:
+                return
+            yield from batch
+            offset += len(batch)
+
+    def topics(self) -> List[str]:
+        """Topics with a log on disk."""
+        return sorted(self._logs)
+
+    def start_offset(self, topic: str) -> int:
+        """First retained offset of topic."""
+        log = self._logs.get(topic)
+        return log.start if log else 0
+
+    def end_offset(self, topic: str) -> int:
+        """Offset the next published event of topic will get."""
+        log = self._logs.get(topic)
+        return log.end if log else 0
+
+    # -- Consumer groups ----------------------------------------------------
+
+    def _offsets_path(self, group: str) -> Path:
+        return self.root / _OFFSETS_DIR / f"{group}.json"
+
+    def _group_committed(self, group: str) -> Dict[str, int]:
+        committed = self._committed.get(group)
+        if committed is None:
+            _check_name("group", group)
+            path = self._offsets_path(group)
+            committed = {}
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    committed = {k: int(v) for k, v in json.load(f).items()}
+            self._committed[group] = committed
+            self._positions[group] = dict(committed)
+        return committed
+
+    def position(self, topic: str, group: Optional[str] = None) -> int:
+        """Next offset group will read from topic (clamped to the log start)."""
+        group = group or self.group
+        self._group_committed(group)
+        return max(self._positions[group].get(topic, 0), self.start_offset(topic))
+
+    def committed(self, topic: str, group: Optional[str] = None) -> int:
+        """Last committed offset of group for topic (0 if never committed)."""
+        return self._group_committed(group or self.group).get(topic, 0)
+
+    def seek(self, topic: str, offset: int, group: Optional[str] = None) -> None:
+        """Move group's read position for topic (not committed until commit())."""
+        group = group or self.group
+        self._group_committed(group)
+        self._positions[group][topic] = max(0, offset)
+
+    def commit(self, topic: Optional[str] = None, group: Optional[str] = None) -> None:
+        """
+        Persist group's current read positions (one topic or all) atomically.
+        """
+        group = group or self.group
+        committed = self._group_committed(group)
+        positions = self._positions[group]
+        topics = [topic] if topic is not None else list(positions)
+        changed = False
+        for name in topics:
+            if name in positions and committed.get(name) != positions[name]:
+                committed[name] = positions[name]
+                changed = True
+        if not changed:
+            return
+
+        path = self._offsets_path(group)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(committed.items())), f, separators=(",", ":"))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def poll(self, topic: str, max_items: int = 1, group: Optional[str] = None) -> List[BusEnvelope]:
+        """
+        Read the next events of topic for group (FIFO) and advance its position.
+
+        With auto_commit, the position reached by the previous poll is
+        committed first, so a batch counts as processed once its consumer
+        comes back for more.
+        """
+        group = group or self.group
+        if self.auto_commit:
+            self.commit(topic, group)
+        if max_items <= 0:
+            return []
+        offset = self.position(topic, group)
+        result = self._read(topic, offset, max_items)
+        self._positions[group][topic] = offset + len(result)
+        return result
+
+    def poll_batch(self, topic: str, max_items: int, group: Optional[str] = None) -> List[BusEnvelope]:
+        """Poll up to max_items events as one contiguous batch (see poll())."""
+        return self.poll(topic, max_items=max_items, group=group)
+
+    def size(self, topic: str, group: Optional[str] = None) -> int:
+        """Number of events of topic not yet read by group."""
+        return self.end_offset(topic) - self.position(topic, group)
+
+    def consumer(self, group: str) -> "LogConsumer":
+        """Bus view that reads as another consumer group."""
+        self._group_committed(group)
+        return LogConsumer(self, group)
+
+    # -- Lifecycle ----------------------------------------------------------
+
+    def close(self) -> None:
+        """Commit consumed offsets (auto_commit) and release files."""
+        if self._closed:
+            return
+        if self.auto_commit:
+            for group in list(self._committed):
+                self.commit(group=group)
+        for log in self._logs.values():
+            log.close()
+        self._closed = True
+
+    def __enter__(self) -> "SegmentedLogBus":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class LogConsumer:
+    """
+    SegmentedLogBus facade for one consumer group.
+
+    publish passes through; poll/size/commit/seek use the view's group, so
+    existing workers can consume the same log independently.
+    """
+
+    def __init__(self, bus: SegmentedLogBus, group: str) -> None:
+        self._bus = bus
+        self.group = group
+
+    def publish(self, topic: str, event_type: str, trace_id: str, payload: Dict[str, Any]) -> BusEnvelope:
+        return self._bus.publish(topic, event_type, trace_id, payload)
+
+    def publish_many(self, topic: str, event_type: str, messages) -> List[BusEnvelope]:
+        return self._bus.publish_many(topic, event_type, messages)
+
+    def poll(self, topic: str, max_items: int = 1) -> List[BusEnvelope]:
+        return self._bus.poll(topic, max_items=max_items, group=self.group)
+
+    def poll_batch(self, topic: str, max_items: int) -> List[BusEnvelope]:
+        return self._bus.poll(topic, max_items=max_items, group=self.group)
+
+    def size(self, topic: str) -> int:
+        return self._bus.size(topic, group=self.group)
+
+    def position(self, topic: str) -> int:
+        return self._bus.position(topic, group=self.group)
+
+    def seek(self, topic: str, offset: int) -> None:
+        self._bus.seek(topic, offset, group=self.group)
+
+    def commit(self, topic: Optional[str] = None) -> None:
+        self._bus.commit(topic, group=self.group)
@@ -0,0 +1,207 @@
+"""
+bus/threadsafe_bus.py
+
+Thread-safe in-memory event bus for the threaded worker runtime.
+
+Features:
+- Same envelopes / global seq as InMemoryBus, guarded by one lock
+- Blocking waits for consumers (wait_for_items) and producers (wait_until_below)
+- Optional trace-hash partitions per topic: every envelope of a trace lands in
+  the same partition, so N parallel consumers keep per-trace seq order
+
+Part of the threaded worker runtime (engine/worker_runtime.py).
+"""
+
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .bus_base import BusEnvelope
+from .inmemory_bus import InMemoryBus
+
+
+def _partition_topic(topic: str, partition: int) -> str:
+    return f"{topic}#{partition}"
+
+
+class ThreadSafeBus(InMemoryBus):
+    """
+    InMemoryBus with a lock and condition variable.
+
+    Design:
+    - publish/poll/size/clear are atomic; seq is assigned under the lock, so
+      seq order == enqueue order across producer threads
+    - A topic listed in partitions is split into N FIFO sub-queues selected by
+      crc32(trace_id) % N; poll(topic) reads all partitions in partition order,
+      poll(topic, partition=k) only partition k (see partition_view)
+
+    Example:
+        bus = ThreadSafeBus(partitions={"risk_decision": 4})
+        view = bus.partition_view(2)  # Hand to the 3rd exec worker
+    """
+
+    def __init__(self, partitions: Optional[Dict[str, int]] = None) -> None:
+        super().__init__()
+        self._partitions: Dict[str, int] = dict(partitions or {})
+        for topic, n in self._partitions.items():
+            if n < 1:
+                raise ValueError(f"Partition count for {topic!r} must be >= 1, got {n}")
+        self._cond = threading.Condition(threading.Lock())
+
+    def partition_count(self, topic: str) -> int:
+        """Number of partitions of topic (1 if not partitioned)."""
+        return self._partitions.get(topic, 1)
+
+    def partition_of(self, topic: str, trace_id: str) -> int:
+        """Partition an envelope of trace_id is routed to."""
+        n = self._partitions.get(topic)
+        if not n:
+            return 0
+        return zlib.crc32(trace_id.encode("utf-8")) % n
+
+    def _queue_names(self, topic: str, partition: Optional[int] = None) -> List[str]:
+        n = self._partitions.get(topic)
+        if not n:
+            return [topic]
+        if partition is not None:
+            return [_partition_topic(topic, partition)]
+        return [_partition_topic(topic, k) for k in range(n)]
+
+    def publish(
+        self,
+        topic: str,
+        event_type: str,
+        trace_id: str,
+        payload: Dict[str, Any],
+    ) -> BusEnvelope:
+        """Publish an event (atomic); wakes waiting consumers."""
+        with self._cond:
+            envelope = BusEnvelope(self._next_seq(), topic, event_type, trace_id, payload)
+            queue_name = topic
+            if topic in self._partitions:
+                queue_name = _partition_topic(topic, self.partition_of(topic, trace_id))
+            self._get_queue(queue_name).append(envelope)
+            self._cond.notify_all()
+        return envelope
+
+    def publish_many(
+        self,
+        topic: str,
+        event_type: str,
+        messages: Iterable[Tuple[str, Dict[str, Any]]],
+    ) -> List[BusEnvelope]:
+        """Publish a batch atomically (consecutive seq); wakes waiting consumers."""
+        messages = list(messages)
+        with self._cond:
+            if topic in self._partitions:
+                envelopes = []
+                for trace_id, payload in messages:
+                    envelope = BusEnvelope(self._next_seq(), topic, event_type, trace_id, payload)
+                    name = _partition_topic(topic, self.partition_of(topic, trace_id))
+                    self._get_queue(name).append(envelope)
+                    envelopes.append(envelope)
+            else:
+                envelopes = super().publish_many(topic, event_type, messages)
+            if envelopes:
+                self._cond.notify_all()
+        return envelopes
+
+    def poll_batch(self, topic: str, max_items: int, partition: Optional[int] = None) -> List[BusEnvelope]:
+        """Poll up to max_items events (atomic); see poll()."""
+        return self.poll(topic, max_items=max_items, partition=partition)
+
+    def poll(self, topic: str, max_items: int = 1, partition: Optional[int] = None) -> List[BusEnvelope]:
+        """
+        Poll events from a topic (FIFO per queue).
+
+        Args:
+            topic: Topic to poll from
+            max_items: Maximum number of envelopes to return
+            partition: Only this partition (partitioned topics)
+
+        Returns:
+            List of BusEnvelope (empty if no messages)
+        """
+        result: List[BusEnvelope] = []
+        with self._cond:
+            for name in self._queue_names(topic, partition):
+                if len(result) >= max_items:
+                    break
+                result.extend(super().poll_batch(name, max_items - len(result)))
+            if result:
+                self._cond.notify_all()
+        return result
+
+    def size(self, topic: str, partition: Optional[int] = None) -> int:
+        """Number of pending events in topic (or one partition)."""
+        with self._cond:
+            return self._size_locked(topic, partition)
+
+    def _size_locked(self, topic: str, partition: Optional[int] = None) -> int:
+        return sum(len(self._get_queue(name)) for name in self._queue_names(topic, partition))
+
+    def clear(self, topic: str | None = None) -> None:
+        """Clear events from topic(s) (all partitions)."""
+        with self._cond:
+            if topic is None:
+                self._queues.clear()
+                self._seq = 0
+            else:
+                for name in self._queue_names(topic):
+                    if name in self._queues:
+                        self._queues[name].clear()
+            self._cond.notify_all()
+
+    def wait_for_items(self, topic: str, timeout: float, partition: Optional[int] = None) -> bool:
+        """Block until topic (or partition) is non-empty; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._size_locked(topic, partition) > 0, timeout)
+
+    def wait_until_below(self, topic: str, limit: int, timeout: Optional[float] = None) -> bool:
+        """Block until fewer than limit events are pending (producer backpressure)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._size_locked(topic) < limit, timeout)
+
+    def notify_all(self) -> None:
+        """Wake all waiters (used on shutdown)."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def partition_view(self, partition: int) -> "PartitionView":
+        """Bus view whose polls on partitioned topics read only this partition."""
+        return PartitionView(self, partition)
+
+
+class PartitionView:
+    """
+    Bus facade for one consumer of a partitioned topic.
+
+    publish/size pass through; poll(topic) on a partitioned topic reads only
+    the view's partition, so existing workers (which poll by topic) can run
+    as N parallel consumers without code changes.
+    """
+
+    def __init__(self, bus: ThreadSafeBus, partition: int) -> None:
+        self._bus = bus
+        self.partition = partition
+
+    def publish(self, topic: str, event_type: str, trace_id: str, payload: Dict[str, Any]) -> BusEnvelope:
+        return self._bus.publish(topic, event_type, trace_id, payload)
+
+    def publish_many(self, topic: str, event_type: str, messages) -> List[BusEnvelope]:
+        return self._bus.publish_many(topic, event_type, messages)
+
+    def poll(self, topic: str, max_items: int = 1) -> List[BusEnvelope]:
+        return self._bus.poll(topic, max_items=max_items, partition=self._own(topic))
+
+    def poll_batch(self, topic: str, max_items: int) -> List[BusEnvelope]:
+        return self.poll(topic, max_items=max_items)
+
+    def size(self, topic: str) -> int:
+        return self._bus.size(topic, partition=self._own(topic))
+
+    def wait_for_items(self, topic: str, timeout: float) -> bool:
+        return self._bus.wait_for_items(topic, timeout, partition=self._own(topic))
+
+    def _own(self, topic: str) -> Optional[int]:
+        return self.partition if self._bus.partition_count(topic) > 1 else None
@@ -2,5 +2,6 @@
 """Engine package for simulation orchestration."""
 
 from engine.loop_stepper import LoopStepper
+from engine.universe_stepper import UniverseLoopStepper
 
-__all__ = ["LoopStepper"]
+__all__ = ["LoopStepper", "UniverseLoopStepper"]
@@ -13,7 +13,7 @@ All workers are deterministic and single-threaded.
 Part of ticket AG-3D-3-1.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 import logging
 
 from bus import InMemoryBus, BusEnvelope
@@ -194,18 +194,65 @@ class ExecWorker:
         """
         Process up to max_items from risk_decision topic.
         
+        Op keys of the polled batch are deduplicated with one mark_many()
+        call when the idempotency store has it (SQLiteIdempotencyStore: one
+        transaction), otherwise with mark_once() per key just before its
+        submit. If an item raises, the batch-marked keys of the items after
+        it are released (unmark_many) so they are not lost as duplicates on
+        replay; the failing item's key stays marked, as with mark_once().
+        
         Returns:
             Number of items processed
         """
         envelopes = bus.poll(TOPIC_RISK_DECISION, max_items=max_items)
         
+        prepared = []
+        error = None
         for env in envelopes:
-            self._process_one(bus, env)
-        
+            try:
+                item = self._prepare_one(env)
+            except Exception as e:
+                # Fail-fast after executing what came before (as unbatched)
+                error = e
+                break
+            if item is not None:
+                prepared.append(item)
+        
+        store = self._idempotency_store
+        new_keys = self._mark_batch([item["op_key"] for item in prepared])
+        for item in prepared:
+            op_key = item["op_key"]
+            if new_keys is not None:
+                if op_key not in new_keys:
+                    logger.debug("ExecWorker: duplicate op_key=%s, skipping", op_key)
+                    continue
+                new_keys.discard(op_key)  # Repeats within the batch are duplicates
+            elif store and not store.mark_once(op_key):
+                logger.debug("ExecWorker: duplicate op_key=%s, skipping", op_key)
+                continue
+            try:
+                self._execute_one(bus, item)
+            except BaseException:
+                if new_keys:
+                    # Keys still in new_keys belong to items never submitted
+                    store.unmark_many(new_keys)
+                raise
+        
+        if error is not None:
+            raise error
         return len(envelopes)
     
-    def _process_one(self, bus: InMemoryBus, env: BusEnvelope) -> None:
-        """Process single RiskDecisionV1 envelope."""
+    def _mark_batch(self, op_keys: List[str]) -> Optional[Set[str]]:
+        """Newly marked op keys, or None if the store cannot mark (and release) a batch."""
+        store = self._idempotency_store
+        if not store or not op_keys:
+            return None
+        if not (hasattr(store, "mark_many") and hasattr(store, "unmark_many")):
+            return None
+        return set(store.mark_many(op_keys))
+    
+    def _prepare_one(self, env: BusEnvelope) -> Optional[Dict[str, Any]]:
+        """Validate a RiskDecisionV1 envelope; None if not allowed."""
         payload = env.payload
         trace_id = env.trace_id
         
@@ -214,7 +261,7 @@ class ExecWorker:
         
         if not decision.allowed:
             logger.debug("ExecWorker: decision not allowed, skipping %s", decision.ref_order_event_id)
-            return
+            return None
         
         # Get original intent details from cache (REQUIRED)
         intent_payload = self._intent_cache.get(decision.ref_order_event_id)
@@ -290,11 +337,27 @@ class ExecWorker:
         # Generate stable op_key for idempotency and retry
         op_key = f"exec:{decision.ref_order_event_id}"
         
-        # Idempotency check: skip if already processed
-        if self._idempotency_store:
-            if not self._idempotency_store.mark_once(op_key):
-                logger.debug("ExecWorker: duplicate op_key=%s, skipping", op_key)
-                return  # Skip duplicate - no report generated
+        return {
+            "env": env,
+            "decision": decision,
+            "intent": intent,
+            "exec_ctx": exec_ctx,
+            "report_event_id": report_event_id,
+            "extra_meta": extra_meta,
+            "op_key": op_key,
+            "step_id": self._processed_count,
+        }
+    
+    def _execute_one(self, bus: InMemoryBus, item: Dict[str, Any]) -> None:
+        """Submit a prepared decision (op key already marked) and publish the report."""
+        env = item["env"]
+        trace_id = env.trace_id
+        decision = item["decision"]
+        intent = item["intent"]
+        exec_ctx = item["exec_ctx"]
+        report_event_id = item["report_event_id"]
+        extra_meta = item["extra_meta"]
+        op_key = item["op_key"]
         
         # Define submit function for retry wrapper
         def do_submit():
@@ -356,7 +419,7 @@ class ExecWorker:
                 self._jsonl_logger,
                 trace_id=trace_id,
                 event_type="ExecutionReportV1",
-                step_id=self._processed_count,
+                step_id=item["step_id"],
                 action="publish",
                 topic=TOPIC_EXECUTION_REPORT,
                 extra={
@@ -382,7 +445,7 @@ class PositionStoreWorker:
         Initialize PositionStoreWorker.
         
         Args:
-            store: PositionStoreSQLite instance
+            store: PositionStoreSQLite or PositionCache (same fill API)
             jsonl_logger: Optional structured JSONL logger
         """
         self._store = store
@@ -393,40 +456,48 @@ class PositionStoreWorker:
         """
         Process up to max_items from execution_report topic.
         
+        Fills from the polled batch are applied with one apply_fills() call
+        (one SQLite transaction, or one in-memory update for PositionCache).
+        
         Returns:
             Number of items processed
         """
         envelopes = bus.poll(TOPIC_EXECUTION_REPORT, max_items=max_items)
         
+        fills = []
         for env in envelopes:
-            self._process_one(env)
+            report = ExecutionReportV1.from_dict(env.payload)
+            
+            if report.status not in ("FILLED", "PARTIALLY_FILLED"):
+                logger.debug("PositionStoreWorker: status=%s, skipping", report.status)
+                continue
+            
+            # Extract symbol and side from extra (set by ExecWorker)
+            extra = report.extra or {}
+            symbol = extra.get("symbol", "UNKNOWN")
+            side = extra.get("side", "BUY")
+            fills.append((env.trace_id, report, symbol, side))
+        
+        if fills:
+            # Apply fills to store (returns position after each fill)
+            new_positions = self._store.apply_fills(
+                (symbol, side, report.filled_qty, report.avg_price)
+                for _, report, symbol, side in fills
+            )
+            for (trace_id, report, symbol, side), new_pos in zip(fills, new_positions):
+                self._log_fill(trace_id, report, symbol, side, new_pos)
         
         return len(envelopes)
     
-    def _process_one(self, env: BusEnvelope) -> None:
-        """Process single ExecutionReportV1 envelope."""
-        payload = env.payload
-        trace_id = env.trace_id
-        
-        report = ExecutionReportV1.from_dict(payload)
-        
-        if report.status not in ("FILLED", "PARTIALLY_FILLED"):
-            logger.debug("PositionStoreWorker: status=%s, skipping", report.status)
-            return
-        
-        # Extract symbol and side from extra (set by ExecWorker)
-        extra = report.extra or {}
-        symbol = extra.get("symbol", "UNKNOWN")
-        side = extra.get("side", "BUY")
-        
-        # Apply fill to store (returns updated position dict)
-        new_pos = self._store.apply_fill(
-            symbol=symbol,
-            side=side,
-            qty=report.filled_qty,
-            price=report.avg_price,
-        )
-        
+    def _log_fill(
+        self,
+        trace_id: str,
+        report: ExecutionReportV1,
+        symbol: str,
+        side: str,
+        new_pos: Dict[str, Any],
+    ) -> None:
+        """Log an applied fill and advance the worker step."""
         # Log event if logger configured
         if self._jsonl_logger:
             from engine.structured_jsonl_logger import log_event
@@ -450,7 +521,7 @@ class PositionStoreWorker:
 
             # 2. PROPOSED: position_changed (Observability Gap Gap)
             # Payload: symbol, qty (holding), avg_px, step_id
-            # We use the new_pos dict returned by apply_fill
+            # We use the new_pos dict returned by apply_fills
             log_event(
                 self._jsonl_logger,
                 trace_id=trace_id,
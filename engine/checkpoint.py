@@ -2,15 +2,24 @@
 engine/checkpoint.py
 
 Atomic checkpoint persistence for crash recovery.
+
+CheckpointWriter coalesces saves under a CheckpointPolicy (every N bars,
+every T seconds, always at close) and can write from a background thread.
 """
 
 from __future__ import annotations
 import json
+import logging
 import os
+import threading
+import time
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -90,3 +99,187 @@ class Checkpoint:
             processed_count=self.processed_count + 1,
             updated_at=datetime.now(timezone.utc).isoformat(),
         )
+
+
+@dataclass(frozen=True)
+class CheckpointPolicy:
+    """
+    When CheckpointWriter persists the latest checkpoint.
+
+    A save is due once every_n_bars bars or every_seconds seconds have
+    passed since the last save (whichever comes first; None disables that
+    trigger). The latest checkpoint is always saved at close(), i.e. on
+    normal completion and on a graceful stop. The default (every bar,
+    synchronous) is the historical save_atomic-per-bar behaviour.
+
+    Attributes:
+        every_n_bars: Save after this many bars (None = no bar trigger)
+        every_seconds: Save after this many seconds (None = no time trigger)
+        async_write: Write on a background thread (latest-wins single slot)
+    """
+    every_n_bars: Optional[int] = 1
+    every_seconds: Optional[float] = None
+    async_write: bool = False
+
+    def __post_init__(self) -> None:
+        if self.every_n_bars is not None and self.every_n_bars < 1:
+            raise ValueError(f"every_n_bars must be >= 1, got {self.every_n_bars}")
+        if self.every_seconds is not None and self.every_seconds <= 0:
+            raise ValueError(f"every_seconds must be > 0, got {self.every_seconds}")
+
+    def is_due(self, bars: int, seconds: float) -> bool:
+        """True if bars/seconds since the last save trigger a save."""
+        if self.every_n_bars is not None and bars >= self.every_n_bars:
+            return True
+        return self.every_seconds is not None and seconds >= self.every_seconds
+
+
+class CheckpointWriter:
+    """
+    Coalescing checkpoint writer.
+
+    Callers hand it every checkpoint with update() once the bars it covers
+    are fully processed (fills persisted); the writer only ever saves a
+    checkpoint it was given, so the file may lag behind the run but never
+    runs ahead of persisted fills. Skipped checkpoints are simply replaced
+    by later ones.
+
+    With policy.async_write the save happens on a daemon thread through a
+    single-slot queue: a newer checkpoint overwrites a pending one that has
+    not been written yet (latest wins), so the loop never waits on fsync.
+    A write error is re-raised on the next update()/flush()/close().
+
+    before_save (optional) runs on the caller's thread right before each
+    save is issued - e.g. flushing a write-behind position cache so the
+    saved checkpoint never runs ahead of persisted positions.
+
+    Example:
+        writer = CheckpointWriter(path, CheckpointPolicy(every_n_bars=100, async_write=True))
+        for idx in ...:
+            checkpoint = checkpoint.update(idx)
+            writer.update(checkpoint)
+        writer.close()  # Saves the latest checkpoint
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        policy: Optional[CheckpointPolicy] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        before_save: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.policy = policy or CheckpointPolicy()
+        self._clock = clock
+        self._before_save = before_save
+        self._latest: Optional[Checkpoint] = None
+        self._dirty = False
+        self._bars_since_save = 0
+        self._last_save_t = clock()
+        self.saves = 0  # Checkpoints handed to save (sync) or to the slot (async)
+        self.writes = 0  # Files actually written
+        self.coalesced = 0  # Async checkpoints replaced before being written
+
+        self._cond = threading.Condition()
+        self._slot: Optional[Checkpoint] = None
+        self._writing = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        if self.policy.async_write:
+            self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+            self._thread.start()
+
+    @property
+    def latest(self) -> Optional[Checkpoint]:
+        """Most recent checkpoint passed to update()."""
+        return self._latest
+
+    def update(self, checkpoint: Checkpoint, bars: int = 1) -> bool:
+        """
+        Record checkpoint (covering bars more bars) and save it if due.
+
+        Returns:
+            True if a save was issued
+        """
+        self._raise_if_failed()
+        self._latest = checkpoint
+        self._dirty = True
+        self._bars_since_save += bars
+        if self.policy.is_due(self._bars_since_save, self._clock() - self._last_save_t):
+            self._save_latest()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """Save the latest checkpoint now and wait until it is on disk."""
+        self._raise_if_failed()
+        if self._dirty:
+            self._save_latest()
+        if self._thread is not None:
+            with self._cond:
+                self._cond.wait_for(lambda: self._slot is None and not self._writing)
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Flush and stop the background thread (idempotent)."""
+        try:
+            if not self._closed:
+                self.flush()
+        finally:
+            self._closed = True
+            if self._thread is not None:
+                with self._cond:
+                    self._cond.notify_all()
+                self._thread.join()
+                self._thread = None
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _save_latest(self) -> None:
+        if self._before_save is not None:
+            self._before_save()
+        self._dirty = False
+        self._bars_since_save = 0
+        self._last_save_t = self._clock()
+        self.saves += 1
+        if self._thread is None:
+            self._latest.save_atomic(self.path)
+            self.writes += 1
+            return
+        with self._cond:
+            if self._slot is not None:
+                self.coalesced += 1
+            self._slot = self._latest
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._slot is not None or self._closed)
+                if self._slot is None:
+                    return
+                checkpoint, self._slot = self._slot, None
+                self._writing = True
+            error: Optional[Exception] = None
+            try:
+                checkpoint.save_atomic(self.path)
+            except Exception as exc:
+                logger.error("Checkpoint write to %s failed: %s", self.path, exc)
+                error = exc
+            with self._cond:
+                if error is None:
+                    self.writes += 1
+                else:
+                    self._error = error
+                self._writing = False
+                self._cond.notify_all()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Checkpoint write to {self.path} failed") from self._error
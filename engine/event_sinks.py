@@ -0,0 +1,196 @@
+"""
+engine/event_sinks.py
+
+Pluggable sinks for LoopStepper event streams.
+
+LoopStepper.run() / run_adapter_mode() used to accumulate every event dict
+and return the whole list, so memory grew with run length. With sink=...
+events are pushed to the sink as they are produced and the stepper keeps
+only counters (EventCounter). LoopStepper.iter_events() /
+iter_adapter_events() expose the same stream as a generator.
+
+Sinks:
+- NullSink: discards events (only the per-type counts are kept)
+- ListSink: in-memory list (tests, small runs)
+- CallbackSink: forwards each event to a callable
+- JsonlEventSink: one deterministic JSON line per event (structured JSONL logger)
+- ParquetEventSink: batched Parquet row groups (requires pyarrow)
+
+Part of the bounded-memory streaming work for soak runs.
+"""
+
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Union, runtime_checkable
+
+
+@runtime_checkable
+class EventSink(Protocol):
+    """Consumer of event dicts ({"type": ..., "payload": {...}})."""
+
+    def write(self, event: Dict[str, Any]) -> None:
+        """Consume one event."""
+        ...
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        ...
+
+
+class EventCounter:
+    """Per-type event counts (the only per-event state kept with a sink)."""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+
+    def add(self, event: Dict[str, Any]) -> None:
+        self._counts[event.get("type", "unknown")] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts.values())
+
+    def as_dict(self) -> Dict[str, int]:
+        """Counts by event type (sorted keys, deterministic)."""
+        return dict(sorted(self._counts.items()))
+
+
+class NullSink:
+    """Discards events (run_*(sink=NullSink()) keeps only the counters)."""
+
+    def write(self, event: Dict[str, Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class ListSink:
+    """Collects events in memory."""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+
+    def write(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+
+    def close(self) -> None:
+        pass
+
+
+class CallbackSink:
+    """Forwards each event to fn(event)."""
+
+    def __init__(self, fn: Callable[[Dict[str, Any]], None]):
+        self._fn = fn
+
+    def write(self, event: Dict[str, Any]) -> None:
+        self._fn(event)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlEventSink:
+    """
+    Writes each event as one JSON line (sorted keys, no whitespace).
+
+    Uses the structured JSONL logger, so output is deterministic and the
+    file is appended to like the other JSONL traces.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        from engine.structured_jsonl_logger import get_jsonl_logger
+
+        self.path = Path(path)
+        self._logger = get_jsonl_logger(self.path, name=f"event_sink:{self.path}")
+        self._closed = False
+
+    def write(self, event: Dict[str, Any]) -> None:
+        self._logger.info(json.dumps(event, sort_keys=True, separators=(",", ":")))
+
+    def close(self) -> None:
+        from engine.structured_jsonl_logger import close_jsonl_logger
+
+        if not self._closed:
+            close_jsonl_logger(self._logger)
+            self._closed = True
+
+
+class ParquetEventSink:
+    """
+    Writes events to a Parquet file in row groups of batch_size events.
+
+    Columns: seq, type, event_id, trace_id, ts, payload (JSON string). The
+    payload is kept as JSON because event types have different fields.
+
+    Requires pyarrow (optional dependency).
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 10_000):
+        """
+        Args:
+            path: Output .parquet path (overwritten)
+            batch_size: Events buffered per row group
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow package not installed. Install with: pip install pyarrow\n"
+                "Use JsonlEventSink for a dependency-free file sink."
+            )
+
+        self._pa = pa
+        self._pq = pq
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._schema = pa.schema([
+            ("seq", pa.int64()),
+            ("type", pa.string()),
+            ("event_id", pa.string()),
+            ("trace_id", pa.string()),
+            ("ts", pa.string()),
+            ("payload", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(str(self.path), self._schema)
+        self._buffer: Dict[str, list] = {name: [] for name in self._schema.names}
+        self._seq = 0
+
+    def write(self, event: Dict[str, Any]) -> None:
+        payload = event.get("payload") or {}
+        buf = self._buffer
+        buf["seq"].append(self._seq)
+        buf["type"].append(event.get("type"))
+        buf["event_id"].append(payload.get("event_id"))
+        buf["trace_id"].append(payload.get("trace_id"))
+        buf["ts"].append(payload.get("ts"))
+        buf["payload"].append(json.dumps(payload, sort_keys=True, separators=(",", ":")))
+        self._seq += 1
+        if len(buf["seq"]) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer["seq"]:
+            return
+        table = self._pa.Table.from_pydict(self._buffer, schema=self._schema)
+        self._writer.write_table(table)
+        self._buffer = {name: [] for name in self._schema.names}
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+
+def open_event_sink(path: Union[str, Path], **kwargs) -> EventSink:
+    """Create a file sink from the path suffix (.parquet -> Parquet, else JSONL)."""
+    if Path(path).suffix == ".parquet":
+        return ParquetEventSink(path, **kwargs)
+    return JsonlEventSink(path)
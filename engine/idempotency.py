@@ -6,10 +6,19 @@ Idempotency store for preventing duplicate execution of operations.
 
 from __future__ import annotations
 import json
+import logging
+import os
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Dict, Protocol, Set
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Protocol, Set, Tuple
+
+from engine.idempotency_segment import KeySegment, key_hash, write_segment
+
+
+logger = logging.getLogger(__name__)
 
 
 class IdempotencyStore(Protocol):
@@ -34,8 +43,13 @@ class InMemoryIdempotencyStore:
     """
     In-memory idempotency store with TTL expiration.
     
-    Thread-safe for single-threaded use (no actual locking needed).
-    For multi-threaded use, add locking.
+    Thread-safe via internal lock (run_bus_mode's exec workers share one
+    store).
+    
+    Expiry is amortized O(1) per mark: with a single ttl_s, keys expire in
+    the order they were marked, so (seen_at, key) entries go on a FIFO
+    queue and each mark pops the expired entries off its front. Entries of
+    keys re-marked since are stale and skipped.
     
     Attributes:
         ttl_s: Time-to-live in seconds for entries
@@ -44,6 +58,8 @@ class InMemoryIdempotencyStore:
     ttl_s: float = 3600.0
     now_fn: Callable[[], float] = field(default_factory=lambda: time.time)
     _seen: Dict[str, float] = field(default_factory=dict)
+    _expiry: Deque[Tuple[float, str]] = field(default_factory=deque, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
     
     def mark_once(self, key: str) -> bool:
         """
@@ -51,109 +67,248 @@ class InMemoryIdempotencyStore:
         
         Automatically cleans up expired entries on access.
         """
-        now = self.now_fn()
-        
-        # Check if key exists and not expired
-        if key in self._seen:
-            seen_at = self._seen[key]
-            if now - seen_at < self.ttl_s:
-                # Still valid → duplicate
-                return False
-            # Expired → treat as new
-        
-        # Mark as seen
-        self._seen[key] = now
-        
-        # Lazy cleanup: remove expired entries (only every N calls or when size is large)
-        self._maybe_cleanup(now)
-        
-        return True
+        with self._lock:
+            now = self.now_fn()
+            
+            # Check if key exists and not expired
+            if key in self._seen:
+                seen_at = self._seen[key]
+                if now - seen_at < self.ttl_s:
+                    # Still valid → duplicate
+                    return False
+                # Expired → treat as new
+            
+            # Mark as seen
+            self._seen[key] = now
+            self._expiry.append((now, key))
+            
+            # Drop entries that expired by now (oldest first)
+            self._expire(now)
+            
+            return True
     
-    def _maybe_cleanup(self, now: float) -> None:
-        """Remove expired entries to prevent memory leak."""
-        # Only cleanup when store gets large
-        if len(self._seen) < 1000:
-            return
-        
-        expired_keys = [
-            k for k, v in self._seen.items()
-            if now - v >= self.ttl_s
-        ]
-        for k in expired_keys:
-            del self._seen[k]
+    def _expire(self, now: float) -> None:
+        """Remove expired entries from the front of the expiry queue (caller holds the lock)."""
+        expiry, seen = self._expiry, self._seen
+        while expiry and now - expiry[0][0] >= self.ttl_s:
+            seen_at, key = expiry.popleft()
+            if seen.get(key) == seen_at:  # Not re-marked since
+                del seen[key]
     
     def clear(self) -> None:
         """Clear all entries."""
-        self._seen.clear()
+        with self._lock:
+            self._seen.clear()
+            self._expiry.clear()
     
     def size(self) -> int:
         """Return number of entries."""
-        return len(self._seen)
+        with self._lock:
+            return len(self._seen)
 
 
 @dataclass
 class FileIdempotencyStore:
     """
-    File-backed idempotency store using append-only JSONL.
+    File-backed idempotency store: append-only JSONL + sealed key segments.
     
     Keys persist across restarts for crash recovery.
-    Each key is written as a JSON line: {"key": "..."}
     
-    On init, loads all existing keys from file.
-    On mark_once, appends new keys and flushes to disk.
+    Layout (next to file_path):
+    - file_path: active segment, one JSON line per mark: {"key": ..., "ts": ...}
+      (lines without "ts" are treated as marked at load time)
+    - <file_path>.seg-NNNNNN: sealed segments (engine/idempotency_segment.py),
+      memory-mapped with an on-disk bloom filter and sorted hash index
+    
+    On init, only the active segment is loaded into memory (bounded by
+    segment_max_keys); sealed segments are mapped, not read, so startup and
+    memory no longer grow with the total number of keys. When the active
+    segment reaches segment_max_keys it is sealed and truncated.
+    
+    With ttl_s set, keys expire ttl_s after being marked and compact() (run on
+    open and after each seal) deletes fully expired segments and rewrites
+    segments that are mostly expired.
+    
+    Durability: writes are buffered; the buffer is flushed to the OS every
+    flush_every marks (default 1: a process crash loses nothing) and fsynced
+    every fsync_every marks (default None: only on seal and close).
+    
+    Attributes:
+        file_path: Active segment path
+        ttl_s: Key time-to-live in seconds (None: keys never expire)
+        segment_max_keys: Active-segment size that triggers a seal
+        flush_every: Flush the write buffer every N marks
+        fsync_every: fsync the active segment every N marks (None: never)
+        now_fn: Function returning current time (for testing)
     """
     file_path: Path
-    _seen: Set[str] = field(default_factory=set, init=False)
-    _file_handle: any = field(default=None, init=False)
+    ttl_s: Optional[float] = None
+    segment_max_keys: int = 1_000_000
+    flush_every: int = 1
+    fsync_every: Optional[int] = None
+    now_fn: Callable[[], float] = field(default_factory=lambda: time.time)
+    _active: Dict[str, float] = field(default_factory=dict, init=False, repr=False)
+    _segments: List[KeySegment] = field(default_factory=list, init=False, repr=False)
+    _file_handle: Any = field(default=None, init=False, repr=False)
+    _marks: int = field(default=0, init=False, repr=False)
+    _lock: Any = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
+        if self.ttl_s is not None and self.ttl_s <= 0:
+            raise ValueError(f"ttl_s must be > 0, got {self.ttl_s}")
+        if self.segment_max_keys < 1:
+            raise ValueError(f"segment_max_keys must be >= 1, got {self.segment_max_keys}")
+        if self.flush_every < 1:
+            raise ValueError(f"flush_every must be >= 1, got {self.flush_every}")
+        if self.fsync_every is not None and self.fsync_every < 1:
+            raise ValueError(f"fsync_every must be >= 1, got {self.fsync_every}")
+        
         self.file_path = Path(self.file_path)
+        self._lock = threading.Lock()
+        self._load_segments()
         self._load_existing()
+        self.compact()
         # Open file for appending
         self._file_handle = open(self.file_path, "a", encoding="utf-8")
     
+    def _segment_path(self, number: int) -> Path:
+        return self.file_path.with_name(f"{self.file_path.name}.seg-{number:06d}")
+    
+    def _load_segments(self) -> None:
+        """Map sealed segments (oldest first)."""
+        prefix = f"{self.file_path.name}.seg-"
+        for path in sorted(self.file_path.parent.glob(prefix + "*")):
+            if path.name[len(prefix):].isdigit():
+                self._segments.append(KeySegment(path))
+    
     def _load_existing(self) -> None:
-        """Load existing keys from file."""
+        """Load the active segment's keys (latest mark wins)."""
         if not self.file_path.exists():
             return
         
+        load_t = self.now_fn()
         with open(self.file_path, "r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
                 if line:
                     try:
                         data = json.loads(line)
-                        self._seen.add(data["key"])
+                        self._active[data["key"]] = data.get("ts", load_t)
                     except (json.JSONDecodeError, KeyError):
                         # Skip malformed lines
                         pass
     
+    def _lookup(self, key: str) -> Optional[float]:
+        """Latest mark timestamp of key, or None if never marked."""
+        ts = self._active.get(key)
+        if ts is not None or not self._segments:
+            return ts
+        h1, h2, mask = key_hash(key)
+        for segment in reversed(self._segments):  # Newest first
+            ts = segment.lookup(key, h1, h2, mask)
+            if ts is not None:
+                return ts
+        return None
+    
+    def _is_live(self, ts: Optional[float], now: float) -> bool:
+        return ts is not None and (self.ttl_s is None or now - ts < self.ttl_s)
+    
+    def contains(self, key: str) -> bool:
+        """Check if a key is marked and not expired."""
+        with self._lock:
+            return self._is_live(self._lookup(key), self.now_fn())
+    
     def mark_once(self, key: str) -> bool:
         """
-        Mark a key as seen. Returns True if first time, False if duplicate.
+        Mark a key as seen. Returns True if first time (or expired), False if duplicate.
         
-        Appends new keys to file and flushes immediately for durability.
+        Appends new keys to the active segment (flushed every flush_every marks).
         """
-        if key in self._seen:
-            return False
-        
-        self._seen.add(key)
+        with self._lock:
+            now = self.now_fn()
+            if self._is_live(self._lookup(key), now):
+                return False
+            
+            self._active[key] = now
+            self._file_handle.write(f'{{"key": {json.dumps(key)}, "ts": {now!r}}}\n')
+            self._marks += 1
+            if self._marks % self.flush_every == 0:
+                self._file_handle.flush()
+            if self.fsync_every is not None and self._marks % self.fsync_every == 0:
+                self._file_handle.flush()
+                os.fsync(self._file_handle.fileno())
+            
+            if len(self._active) >= self.segment_max_keys:
+                self._seal()
+            return True
+    
+    def _seal(self) -> None:
+        """Write the active segment as a sealed segment and truncate it."""
+        number = int(self._segments[-1].path.name.rsplit("-", 1)[1]) + 1 if self._segments else 1
+        path = self._segment_path(number)
+        write_segment(path, self._active)
+        self._segments.append(KeySegment(path))
+        # A crash before the truncate leaves keys in both places (still deduped)
+        self._file_handle.close()
+        self._file_handle = open(self.file_path, "w", encoding="utf-8")
+        self._active.clear()
+        self.compact()
+    
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Drop expired keys from sealed segments (no-op without ttl_s).
         
-        # Append to file with immediate flush
-        self._file_handle.write(json.dumps({"key": key}) + "\n")
-        self._file_handle.flush()
+        Fully expired segments are deleted; segments with less than half of
+        their keys live are rewritten with only the live keys.
         
-        return True
+        Returns:
+            Number of expired keys removed
+        """
+        if self.ttl_s is None:
+            return 0
+        now = self.now_fn() if now is None else now
+        cutoff = now - self.ttl_s
+        removed = 0
+        kept: List[KeySegment] = []
+        for segment in self._segments:
+            if segment.max_ts <= cutoff:
+                removed += len(segment)
+                segment.close()
+                segment.path.unlink()
+                continue
+            if segment.min_ts <= cutoff:
+                live = {k: ts for k, ts in segment.entries() if ts > cutoff}
+                if len(live) * 2 < len(segment):
+                    removed += len(segment) - len(live)
+                    path = segment.path
+                    segment.close()
+                    write_segment(path, live)
+                    segment = KeySegment(path)
+            kept.append(segment)
+        self._segments = kept
+        return removed
+    
+    def flush(self) -> None:
+        """Flush and fsync the active segment."""
+        with self._lock:
+            if self._file_handle:
+                self._file_handle.flush()
+                os.fsync(self._file_handle.fileno())
     
     def close(self) -> None:
-        """Close file handle."""
+        """Close file handle and unmap segments."""
         if self._file_handle:
+            self._file_handle.flush()
+            os.fsync(self._file_handle.fileno())
             self._file_handle.close()
             self._file_handle = None
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
     
     def size(self) -> int:
-        """Return number of keys."""
-        return len(self._seen)
+        """Return number of stored keys (expired keys count until compacted)."""
+        return len(self._active) + sum(len(segment) for segment in self._segments)
     
     def __del__(self):
         self.close()
@@ -170,23 +325,41 @@ class SQLiteIdempotencyStore:
     Features:
     - WAL mode for better concurrent read/write performance
     - INSERT OR IGNORE for atomic "first-writer-wins" semantics
+    - mark_many: a whole batch of keys in one transaction (unmark_many
+      releases keys whose operation never ran)
+    - TTL pruning: prune_older_than() (indexed on created_at), run every
+      prune_interval_s on a background thread when ttl_s is set
     - Thread-safe for multi-threaded access
     - Persists across restarts for crash recovery
     
+    A pruned key is unknown again: the next mark_once for it returns True.
+    
     Attributes:
         db_path: Path to SQLite database file
         timeout_s: Database lock timeout in seconds
         synchronous: PRAGMA synchronous mode (NORMAL or FULL)
+        ttl_s: Prune keys older than this in the background (None: never)
+        prune_interval_s: Seconds between background prune passes
+        now_fn: Function returning current time (for testing)
     """
     db_path: Path
     timeout_s: float = 30.0
     synchronous: str = "NORMAL"
+    ttl_s: Optional[float] = None
+    prune_interval_s: float = 60.0
+    now_fn: Callable[[], float] = field(default_factory=lambda: time.time)
     _conn: any = field(default=None, init=False, repr=False)
     _lock: any = field(default=None, init=False, repr=False)
+    _prune_stop: Any = field(default=None, init=False, repr=False)
+    _prune_thread: Any = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
         import sqlite3
-        import threading
+        
+        if self.ttl_s is not None and self.ttl_s <= 0:
+            raise ValueError(f"ttl_s must be > 0, got {self.ttl_s}")
+        if self.prune_interval_s <= 0:
+            raise ValueError(f"prune_interval_s must be > 0, got {self.prune_interval_s}")
         
         self.db_path = Path(self.db_path)
         self._lock = threading.Lock()
@@ -213,6 +386,13 @@ class SQLiteIdempotencyStore:
                 created_at REAL NOT NULL
             )
         """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at "
+            "ON idempotency_keys (created_at)"
+        )
+        
+        if self.ttl_s is not None:
+            self.start_pruning()
     
     def mark_once(self, key: str) -> bool:
         """
@@ -228,16 +408,129 @@ class SQLiteIdempotencyStore:
             True if this is the first time seeing this key
             False if this key was already seen
         """
-        import time
-        
         with self._lock:
             cursor = self._conn.execute(
                 "INSERT OR IGNORE INTO idempotency_keys (key, created_at) VALUES (?, ?)",
-                (key, time.time())
+                (key, self.now_fn())
             )
             # rowcount = 1 if inserted, 0 if already existed
             return cursor.rowcount == 1
     
+    def mark_many(self, keys: Iterable[str]) -> Set[str]:
+        """
+        Mark a batch of keys in a single transaction.
+        
+        Same semantics as calling mark_once for each key in order (a key
+        repeated within the batch is new at most once), with one commit.
+        
+        Args:
+            keys: Operation keys
+            
+        Returns:
+            Set of keys that were newly marked by this call
+        """
+        created_at = self.now_fn()
+        marked: Set[str] = set()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO idempotency_keys (key, created_at) VALUES (?, ?)",
+                        (key, created_at)
+                    )
+                    if cursor.rowcount == 1:
+                        marked.add(key)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return marked
+    
+    def unmark_many(self, keys: Iterable[str]) -> int:
+        """
+        Release keys marked by mark_many whose operation never ran.
+    
+        A released key is unknown again: the next mark_once for it returns True.
+    
+        Args:
+            keys: Operation keys
+    
+        Returns:
+            Number of keys deleted
+        """
+        keys = list(keys)
+        if not keys:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = 0
+                for key in keys:
+                    cursor = self._conn.execute(
+                        "DELETE FROM idempotency_keys WHERE key = ?", (key,)
+                    )
+                    removed += cursor.rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return removed
+    
+    def prune_older_than(self, ts: float) -> int:
+        """
+        Delete keys marked before ts (uses the created_at index).
+        
+        Args:
+            ts: Cutoff timestamp (same clock as now_fn)
+            
+        Returns:
+            Number of keys deleted
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM idempotency_keys WHERE created_at < ?", (ts,)
+            )
+            return cursor.rowcount
+    
+    def start_pruning(self) -> None:
+        """
+        Start the background prune thread (requires ttl_s).
+        
+        Every prune_interval_s it deletes keys older than ttl_s. Started
+        automatically when ttl_s is set; stopped by stop_pruning() or close().
+        
+        Raises:
+            ValueError: If ttl_s is not set
+        """
+        if self.ttl_s is None:
+            raise ValueError("start_pruning requires ttl_s")
+        if self._prune_thread is not None:
+            return
+        self._prune_stop = threading.Event()
+        self._prune_thread = threading.Thread(
+            target=self._prune_loop, name="idempotency-prune", daemon=True
+        )
+        self._prune_thread.start()
+    
+    def stop_pruning(self) -> None:
+        """Stop the background prune thread (no-op if not running)."""
+        if self._prune_thread is None:
+            return
+        self._prune_stop.set()
+        self._prune_thread.join()
+        self._prune_thread = None
+    
+    def _prune_loop(self) -> None:
+        while not self._prune_stop.wait(self.prune_interval_s):
+            try:
+                removed = self.prune_older_than(self.now_fn() - self.ttl_s)
+            except Exception:
+                logger.exception("SQLiteIdempotencyStore: prune failed")
+                continue
+            if removed:
+                logger.debug("SQLiteIdempotencyStore: pruned %d expired keys", removed)
+    
     def contains(self, key: str) -> bool:
         """Check if a key exists (for testing/debugging)."""
         with self._lock:
@@ -254,7 +547,8 @@ class SQLiteIdempotencyStore:
             return cursor.fetchone()[0]
     
     def close(self) -> None:
-        """Close database connection."""
+        """Stop pruning and close database connection."""
+        self.stop_pruning()
         if self._conn:
             self._conn.close()
             self._conn = None
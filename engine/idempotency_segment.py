@@ -0,0 +1,168 @@
+"""
+engine/idempotency_segment.py
+
+Immutable on-disk key segments for FileIdempotencyStore.
+
+A sealed segment is a single file, memory-mapped on open (nothing is read
+into memory up front):
+
+    header   magic, n keys, bloom words w, min/max mark ts
+    hashes   n x uint64, sorted (first half of the key's blake2b-128)
+    ts       n x float64, mark time per key (same order)
+    offsets  (n + 1) x uint64 into the key blob
+    bloom    w x uint64, blocked bloom filter
+    blob     UTF-8 keys concatenated in hash order
+
+The bloom filter is blocked: each key sets NUM_HASHES bits of a single
+64-bit word (word chosen by the second hash half, bits by the first), so a
+probe is one 8-byte read and the bit mask is computed once per key for all
+segments. At 10 bits/key that is ~1-2% false positives.
+
+lookup() answers most misses from the bloom filter and resolves the rest
+with a binary search over the sorted hashes plus an exact key comparison,
+so a wrong "duplicate" is impossible.
+"""
+
+from __future__ import annotations
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+MAGIC = b"IDEMSEG1"
+HEADER = struct.Struct("<8sQQdd")  # magic, n, bloom words, min_ts, max_ts
+BITS_PER_KEY = 10
+NUM_HASHES = 7
+_BIT = [1 << (b & 63) for b in range(256)]  # Digest byte -> bloom bit
+
+
+def key_hash(key: str) -> Tuple[int, int, int]:
+    """
+    Hashes of key for segment lookups.
+    
+    Returns:
+        (h1, h2, mask): blake2b-128 halves (h1 orders the index, h2 picks the
+        bloom word) and the key's bloom bit mask
+    """
+    d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    # NUM_HASHES (7) bit positions from the first 7 digest bytes, unrolled
+    bit = _BIT
+    mask = bit[d[0]] | bit[d[1]] | bit[d[2]] | bit[d[3]] | bit[d[4]] | bit[d[5]] | bit[d[6]]
+    return int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little"), mask
+
+
+def write_segment(path: Path, entries: Dict[str, float]) -> None:
+    """
+    Write entries (key -> mark ts) as a sealed segment, atomically.
+
+    Args:
+        path: Segment file path (tmp file + fsync + rename)
+        entries: Keys and their mark timestamps
+    """
+    path = Path(path)
+    keys = list(entries)
+    n = len(keys)
+    hashes = [key_hash(k) for k in keys]
+    h1 = np.fromiter((h[0] for h in hashes), dtype=np.uint64, count=n)
+    h2 = np.fromiter((h[1] for h in hashes), dtype=np.uint64, count=n)
+    masks = np.fromiter((h[2] for h in hashes), dtype=np.uint64, count=n)
+    ts = np.fromiter((entries[k] for k in keys), dtype=np.float64, count=n)
+
+    order = np.argsort(h1, kind="stable")
+    encoded = [keys[i].encode("utf-8") for i in order]
+    offsets = np.zeros(n + 1, dtype=np.uint64)
+    np.cumsum(np.fromiter((len(b) for b in encoded), dtype=np.uint64, count=n), out=offsets[1:])
+
+    n_words = max(1, (n * BITS_PER_KEY + 63) // 64)
+    bloom = np.zeros(n_words, dtype="<u8")
+    np.bitwise_or.at(bloom, h2 % np.uint64(n_words), masks)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, n, n_words, float(ts.min()) if n else 0.0, float(ts.max()) if n else 0.0,
+        ))
+        f.write(h1[order].astype("<u8").tobytes())
+        f.write(ts[order].astype("<f8").tobytes())
+        f.write(offsets.astype("<u8").tobytes())
+        f.write(bloom.tobytes())
+        f.write(b"".join(encoded))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class KeySegment:
+    """Read-only, memory-mapped view of a sealed segment."""
+
+    def __init__(self, path: Path):
+        """
+        Raises:
+            ValueError: If the file is not a segment
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, n_words, min_ts, max_ts = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not an idempotency segment: {self.path}")
+        self.n, self._n_words = n, n_words
+        self.min_ts, self.max_ts = min_ts, max_ts
+
+        offset = HEADER.size
+        self._hashes = np.frombuffer(self._mm, dtype="<u8", count=n, offset=offset)
+        offset += 8 * n
+        self._ts = np.frombuffer(self._mm, dtype="<f8", count=n, offset=offset)
+        offset += 8 * n
+        self._offsets = np.frombuffer(self._mm, dtype="<u8", count=n + 1, offset=offset)
+        offset += 8 * (n + 1)
+        self._bloom_start = offset
+        self._blob_start = offset + 8 * n_words
+
+    def __len__(self) -> int:
+        return self.n
+
+    def lookup(self, key: str, h1: int, h2: int, mask: int) -> Optional[float]:
+        """
+        Mark timestamp of key, or None if the segment doesn't hold it.
+
+        Args:
+            key: Key to look up
+            h1, h2, mask: key_hash(key) (computed once per lookup across segments)
+        """
+        start = self._bloom_start + 8 * (h2 % self._n_words)
+        if int.from_bytes(self._mm[start:start + 8], "little") & mask != mask:
+            return None
+
+        raw = key.encode("utf-8")
+        idx = int(np.searchsorted(self._hashes, np.uint64(h1), side="left"))
+        while idx < self.n and int(self._hashes[idx]) == h1:
+            start = self._blob_start + int(self._offsets[idx])
+            end = self._blob_start + int(self._offsets[idx + 1])
+            if self._mm[start:end] == raw:
+                return float(self._ts[idx])
+            idx += 1
+        return None
+
+    def entries(self) -> Iterator[Tuple[str, float]]:
+        """All (key, mark ts) pairs in hash order."""
+        for idx in range(self.n):
+            start = self._blob_start + int(self._offsets[idx])
+            end = self._blob_start + int(self._offsets[idx + 1])
+            yield self._mm[start:end].decode("utf-8"), float(self._ts[idx])
+
+    def close(self) -> None:
+        """Unmap and close (array views must go before the mmap can close)."""
+        self._hashes = self._ts = self._offsets = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,201 @@
+"""
+engine/latency_histogram.py
+
+Bounded-memory latency histogram (HDR-style log-linear buckets).
+
+Values (seconds) are counted in resolution units (default 1 us). Below
+2**sub_bucket_bits units every unit has its own bucket; above, each
+power-of-two range is split into 2**sub_bucket_bits linear sub-buckets,
+so a bucket is at most 1 / 2**sub_bucket_bits (0.8% at the default 7 bits)
+wide relative to its values. Each bucket keeps count, sum, min and max of
+its values and a percentile reports the mean of the bucket holding that
+rank, clamped to the bucket's min/max: exact when the bucket holds a single
+distinct value, within the bucket width otherwise.
+
+Memory is O(buckets) regardless of the number of samples (about 3.5k
+buckets for 1 us .. 3 h), percentiles are O(buckets), and histograms with
+the same configuration merge by adding buckets (per-worker histograms ->
+run histogram). to_dict()/from_dict() carry the state across processes.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram with mergeable state.
+
+    Usage:
+        hist = LatencyHistogram()
+        hist.record(0.0021)
+        hist.percentile(95)        # seconds, or None when empty
+        hist.merge(other_worker_hist)
+    """
+
+    def __init__(self, resolution: float = 1e-6, sub_bucket_bits: int = 7):
+        """
+        Args:
+            resolution: Smallest distinguished value in seconds
+            sub_bucket_bits: log2 of sub-buckets per power-of-two range
+
+        Raises:
+            ValueError: If resolution or sub_bucket_bits is not positive
+        """
+        if resolution <= 0:
+            raise ValueError(f"resolution must be > 0, got {resolution}")
+        if sub_bucket_bits < 1:
+            raise ValueError(f"sub_bucket_bits must be >= 1, got {sub_bucket_bits}")
+        self.resolution = resolution
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_buckets = 1 << sub_bucket_bits
+        self._buckets: Dict[int, List[float]] = {}  # index -> [count, sum, min, max]
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def bucket_count(self) -> int:
+        """Number of non-empty buckets (the memory footprint)."""
+        return len(self._buckets)
+
+    def _index(self, value: float) -> int:
+        units = int(value / self.resolution) if value > 0 else 0
+        if units < self._sub_buckets:
+            return units
+        shift = units.bit_length() - self.sub_bucket_bits - 1
+        return shift * self._sub_buckets + (units >> shift)
+
+    def record(self, value: float) -> None:
+        """Add one latency sample (seconds)."""
+        idx = self._index(value)
+        bucket = self._buckets.get(idx)
+        if bucket is None:
+            self._buckets[idx] = [1, value, value, value]
+        else:
+            bucket[0] += 1
+            bucket[1] += value
+            if value < bucket[2]:
+                bucket[2] = value
+            elif value > bucket[3]:
+                bucket[3] = value
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def record_many(self, values: Iterable[float]) -> None:
+        """Add several samples."""
+        for value in values:
+            self.record(value)
+
+    def percentiles(self, ps: Iterable[float]) -> List[Optional[float]]:
+        """
+        Several percentiles in one pass over the buckets.
+
+        Uses the same rank as the exact nearest-rank calculation it replaces:
+        the sample at index int(p / 100 * (count - 1)) of the sorted samples.
+
+        Args:
+            ps: Percentiles in [0, 100]
+
+        Returns:
+            Values in seconds (None for all when empty), in the order of ps
+        """
+        ps = list(ps)
+        if not self.count:
+            return [None] * len(ps)
+        ranks = sorted(
+            (max(0, min(self.count - 1, int(p / 100.0 * (self.count - 1)))), i)
+            for i, p in enumerate(ps)
+        )
+        results: List[Optional[float]] = [None] * len(ps)
+        pending = 0
+        seen = 0
+        for idx in sorted(self._buckets):
+            count, total, lo, hi = self._buckets[idx]
+            seen += count
+            while pending < len(ranks) and ranks[pending][0] < seen:
+                results[ranks[pending][1]] = min(max(total / count, lo), hi)
+                pending += 1
+            if pending == len(ranks):
+                break
+        return results
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Single percentile in seconds (None when empty)."""
+        return self.percentiles([p])[0]
+
+    def mean(self) -> Optional[float]:
+        """Exact mean in seconds (None when empty)."""
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Add other's samples to this histogram (in place).
+
+        Returns:
+            self
+
+        Raises:
+            ValueError: If the bucket configurations differ
+        """
+        if (other.resolution, other.sub_bucket_bits) != (self.resolution, self.sub_bucket_bits):
+            raise ValueError(
+                "Cannot merge histograms with different configurations: "
+                f"({self.resolution}, {self.sub_bucket_bits}) vs ({other.resolution}, {other.sub_bucket_bits})"
+            )
+        for idx, (count, total, lo, hi) in other._buckets.items():
+            bucket = self._buckets.get(idx)
+            if bucket is None:
+                self._buckets[idx] = [count, total, lo, hi]
+            else:
+                bucket[0] += count
+                bucket[1] += total
+                bucket[2] = min(bucket[2], lo)
+                bucket[3] = max(bucket[3], hi)
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._buckets.clear()
+        self.count = 0
+        self.total = 0.0
+        self.min = self.max = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state (buckets as [index, count, sum, min, max])."""
+        return {
+            "resolution": self.resolution,
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": [[idx] + self._buckets[idx] for idx in sorted(self._buckets)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram from to_dict() output."""
+        hist = cls(resolution=data["resolution"], sub_bucket_bits=data["sub_bucket_bits"])
+        for idx, count, total, lo, hi in data["buckets"]:
+            hist._buckets[int(idx)] = [int(count), float(total), float(lo), float(hi)]
+        hist.count = int(data["count"])
+        hist.total = float(data["total"])
+        hist.min = data["min"]
+        hist.max = data["max"]
+        return hist
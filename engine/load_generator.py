@@ -0,0 +1,378 @@
+"""
+engine/load_generator.py
+
+Synthetic order-flow load generator for the bus-mode pipeline.
+
+Publishes OrderIntentV1 at a target rate (and symbol mix) straight into
+order_intent, independent of strategy signals, while RiskWorker,
+ExecWorker(s) and PositionStoreWorker consume on their own threads
+(WorkerRuntime over a ThreadSafeBus, as run_bus_mode(exec_workers=N)).
+
+Load is open-loop: intent i of a stage is due at stage_start + i / rate and
+its latency is measured from that due time, not from when the producer got
+to publish it, so a pipeline that falls behind shows up as latency
+instead of a silently lower rate (no coordinated omission).
+
+A trace completes at its terminal JSONL record, seen through the trace
+logger's observer:
+- PositionUpdated/persist: filled and applied to the position store
+- RiskDecisionV1/publish with allowed=False: rejected by risk
+- ExecutionReportV1/publish with a non-fill status: rejected by exec
+
+Stages run back to back (a rate ramp); the report gives p50/p95/p99/max
+latency and sustained throughput per stage, and where latency first
+exceeded latency_budget_seconds (risk_rules.yaml).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from bus.threadsafe_bus import ThreadSafeBus
+from contracts.events_v1 import OrderIntentV1
+from engine.bus_workers import (
+    ExecWorker, PositionStoreWorker, RiskWorker,
+    TOPIC_EXECUTION_REPORT, TOPIC_ORDER_INTENT, TOPIC_RISK_DECISION,
+)
+from engine.latency_histogram import LatencyHistogram
+from engine.structured_jsonl_logger import close_jsonl_logger, get_jsonl_logger
+from engine.worker_runtime import WorkerRuntime
+from risk_manager_v_0_4 import RiskManager as RiskManagerV04
+from risk_rules_loader import load_risk_rules
+from state.position_store_sqlite import PositionStoreSQLite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYMBOL_MIX = {"BTC/USDT": 0.5, "ETH/USDT": 0.3, "SOL/USDT": 0.2}
+DEFAULT_PRICES = {"BTC/USDT": 50_000.0, "ETH/USDT": 3_000.0, "SOL/USDT": 150.0}
+DEFAULT_LATENCY_BUDGET_S = 1.0
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass(frozen=True)
+class LoadStage:
+    """Publish intents at rate (per second) for duration_s seconds."""
+    rate: float
+    duration_s: float
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError(f"rate must be > 0, got {self.rate}")
+        if self.duration_s <= 0:
+            raise ValueError(f"duration_s must be > 0, got {self.duration_s}")
+
+    @property
+    def n_intents(self) -> int:
+        return max(1, int(round(self.rate * self.duration_s)))
+
+
+def parse_symbol_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse "BTC/USDT:0.5,ETH/USDT:0.3" into normalized weights.
+
+    A symbol without ":weight" gets weight 1.
+
+    Raises:
+        ValueError: On empty specs or non-positive weights
+    """
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        symbol, _, weight = part.partition(":")
+        w = float(weight) if weight else 1.0
+        if w <= 0:
+            raise ValueError(f"Symbol weight must be > 0, got {part!r}")
+        mix[symbol.strip()] = mix.get(symbol.strip(), 0.0) + w
+    if not mix:
+        raise ValueError(f"Empty symbol mix: {spec!r}")
+    total = sum(mix.values())
+    return {symbol: w / total for symbol, w in mix.items()}
+
+
+class TraceLatencyTracker:
+    """
+    End-to-end latency per trace_id, one LatencyHistogram per stage.
+
+    start() registers a trace with its due time; observe() is the JSONL
+    observer and closes the trace at its terminal record. Thread-safe:
+    workers log from their own threads.
+    """
+
+    def __init__(self, n_stages: int, budget_s: float, now_fn: Callable[[], float] = time.perf_counter):
+        self.budget_s = budget_s
+        self._now = now_fn
+        self._lock = threading.Lock()
+        self._pending: Dict[str, tuple] = {}  # trace_id -> (stage, due_t, event_id)
+        self.histograms = [LatencyHistogram() for _ in range(n_stages)]
+        self.outcomes = [{"filled": 0, "risk_rejected": 0, "exec_rejected": 0} for _ in range(n_stages)]
+        self.last_done_at: List[Optional[float]] = [None] * n_stages
+        self.first_breach: Optional[Dict[str, Any]] = None
+        self.on_done: Optional[Callable[[str], None]] = None  # Gets the intent event_id
+
+    def start(self, trace_id: str, stage: int, due_t: float, event_id: str) -> None:
+        with self._lock:
+            self._pending[trace_id] = (stage, due_t, event_id)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def observe(self, record: Dict[str, Any]) -> None:
+        """JSONL observer: close the trace on its terminal record."""
+        event_type = record.get("event_type")
+        action = record.get("action")
+        extra = record.get("extra") or {}
+        if event_type == "PositionUpdated" and action == "persist":
+            outcome = "filled"
+        elif event_type == "RiskDecisionV1" and action == "publish" and not extra.get("allowed"):
+            outcome = "risk_rejected"
+        elif (
+            event_type == "ExecutionReportV1" and action == "publish"
+            and extra.get("status") not in ("FILLED", "PARTIALLY_FILLED")
+        ):
+            outcome = "exec_rejected"
+        else:
+            return
+
+        now = self._now()
+        with self._lock:
+            entry = self._pending.pop(record.get("trace_id"), None)
+            if entry is None:
+                return
+            stage, due_t, event_id = entry
+            latency = now - due_t
+            self.histograms[stage].record(latency)
+            self.outcomes[stage][outcome] += 1
+            self.last_done_at[stage] = now
+            # Earliest due trace over budget (completions arrive out of order)
+            if latency > self.budget_s and (self.first_breach is None or due_t < self.first_breach["due_t"]):
+                self.first_breach = {
+                    "trace_id": record.get("trace_id"), "stage": stage, "due_t": due_t, "latency_s": latency,
+                }
+        if self.on_done is not None:
+            self.on_done(event_id)
+
+
+def _make_intent(i: int, rng: random.Random, symbols: List[str], weights: List[float],
+                 prices: Dict[str, float]) -> OrderIntentV1:
+    symbol = rng.choices(symbols, weights)[0]
+    price = prices.get(symbol, 100.0) * (1.0 + rng.uniform(-0.001, 0.001))
+    return OrderIntentV1(
+        symbol=symbol,
+        side="BUY" if rng.random() < 0.5 else "SELL",
+        qty=round(rng.uniform(0.01, 1.0), 4),
+        trace_id=f"load-{i:09d}",
+        meta={"current_price": price},
+    )
+
+
+def run_load(
+    stages: List[LoadStage],
+    *,
+    symbol_mix: Optional[Dict[str, float]] = None,
+    risk_rules: Union[Dict[str, Any], str, Path, None] = None,
+    latency_budget_s: Optional[float] = None,
+    exec_workers: int = 1,
+    seed: int = 42,
+    state_db: Optional[Union[str, Path]] = None,
+    trace_path: Optional[Union[str, Path]] = None,
+    exchange_adapter=None,
+    drain_timeout_s: float = 60.0,
+) -> Dict[str, Any]:
+    """
+    Drive the intent -> risk -> exec -> position pipeline through stages.
+
+    Args:
+        stages: Rate stages, run back to back
+        symbol_mix: Symbol -> weight (default: DEFAULT_SYMBOL_MIX)
+        risk_rules: Rules dict or YAML path for RiskManager v0.4 (as LoopStepper)
+        latency_budget_s: SLO (default: risk_rules latency_budget_seconds, else 1.0)
+        exec_workers: ExecWorker threads (risk_decision partitions)
+        seed: Seed for symbol/side/qty draws
+        state_db: Position store path (default: temporary)
+        trace_path: JSONL trace path (default: discarded)
+        exchange_adapter: ExchangeAdapter for ExecWorker (default: paper)
+        drain_timeout_s: Max wait for in-flight traces after the last stage
+
+    Returns:
+        Report dict (see build_report)
+
+    Raises:
+        ValueError: If stages is empty or exec_workers < 1
+    """
+    if not stages:
+        raise ValueError("At least one LoadStage is required")
+    if exec_workers < 1:
+        raise ValueError(f"exec_workers must be >= 1, got {exec_workers}")
+
+    if isinstance(risk_rules, (str, Path)):
+        risk_rules = load_risk_rules(risk_rules)
+    risk_rules = risk_rules or {}
+    if latency_budget_s is None:
+        latency_budget_s = float(risk_rules.get("latency_budget_seconds", DEFAULT_LATENCY_BUDGET_S))
+
+    mix = symbol_mix or DEFAULT_SYMBOL_MIX
+    symbols, weights = list(mix), list(mix.values())
+    rng = random.Random(seed)
+
+    tmp_dir = None
+    if state_db is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        state_db = Path(tmp_dir.name) / "state.db"
+
+    tracker = TraceLatencyTracker(len(stages), latency_budget_s)
+    intent_cache: Dict[str, Dict[str, Any]] = {}
+    tracker.on_done = lambda event_id: intent_cache.pop(event_id, None)
+
+    jsonl_logger = get_jsonl_logger(
+        trace_path or os.devnull, name=f"load_generator:{id(tracker)}",
+        async_mode=True, observer=tracker.observe,
+    )
+    store = PositionStoreSQLite(state_db)
+    store.ensure_schema()
+    bus = ThreadSafeBus(partitions={TOPIC_RISK_DECISION: exec_workers} if exec_workers > 1 else None)
+
+    def gen_event_id() -> str:
+        return uuid.uuid4().hex
+
+    runtime = WorkerRuntime(bus)
+    runtime.add_worker(
+        "risk", RiskWorker(RiskManagerV04(risk_rules), gen_event_id=gen_event_id, jsonl_logger=jsonl_logger),
+        TOPIC_ORDER_INTENT,
+    )
+    for k in range(exec_workers):
+        runtime.add_worker(
+            f"exec-{k}",
+            ExecWorker(
+                gen_event_id=gen_event_id, intent_cache=intent_cache,
+                jsonl_logger=jsonl_logger, exchange_adapter=exchange_adapter,
+            ),
+            TOPIC_RISK_DECISION,
+            partition=k if exec_workers > 1 else None,
+        )
+    runtime.add_worker("position", PositionStoreWorker(store, jsonl_logger=jsonl_logger), TOPIC_EXECUTION_REPORT)
+
+    stage_windows = []
+    published = 0
+    max_publish_lag = 0.0
+    runtime.start()
+    try:
+        for s, stage in enumerate(stages):
+            stage_start = time.perf_counter()
+            interval = 1.0 / stage.rate
+            for i in range(stage.n_intents):
+                due = stage_start + i * interval
+                now = time.perf_counter()
+                if due > now:
+                    time.sleep(due - now)
+                else:
+                    max_publish_lag = max(max_publish_lag, now - due)
+                intent = _make_intent(published, rng, symbols, weights, DEFAULT_PRICES)
+                payload = intent.to_dict()
+                intent_cache[intent.event_id] = payload
+                tracker.start(intent.trace_id, s, due, intent.event_id)
+                bus.publish(TOPIC_ORDER_INTENT, "OrderIntentV1", intent.trace_id, payload)
+                published += 1
+            stage_windows.append((stage_start, time.perf_counter()))
+        drained = runtime.drain(timeout=drain_timeout_s)
+    finally:
+        runtime.stop(drain=False)
+        close_jsonl_logger(jsonl_logger)
+        store.close()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    return build_report(
+        stages, stage_windows, tracker,
+        published=published, drained=drained, max_publish_lag_s=max_publish_lag,
+        workers=runtime.stats(), exec_workers=exec_workers,
+    )
+
+
+def build_report(
+    stages: List[LoadStage],
+    stage_windows: List[tuple],
+    tracker: TraceLatencyTracker,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """
+    Latency SLO report.
+
+    Returns:
+        {"latency_budget_s", "stages": [{"target_rate", "duration_s",
+         "published", "completed", outcomes, "p50_s", "p95_s", "p99_s",
+         "max_s", "sustained_tps", "within_budget"}], "total",
+         "max_rate_within_budget", "slo_breach", "tx_per_day_at_max_rate",
+         "incomplete", plus extra}
+
+        slo_breach is None if every stage's p99 stayed within budget, else
+        the first such stage's target rate and the first trace whose
+        latency exceeded the budget (with its offset from the run start).
+    """
+    budget = tracker.budget_s
+    run_start = stage_windows[0][0] if stage_windows else 0.0
+    total = LatencyHistogram()
+    stage_reports = []
+    for s, stage in enumerate(stages):
+        hist = tracker.histograms[s]
+        total.merge(hist)
+        p50, p95, p99 = hist.percentiles(PERCENTILES)
+        start, end = stage_windows[s] if s < len(stage_windows) else (0.0, 0.0)
+        done_at = tracker.last_done_at[s]
+        span = (max(end, done_at) - start) if done_at is not None else 0.0
+        stage_reports.append({
+            "target_rate": stage.rate,
+            "duration_s": stage.duration_s,
+            "published": stage.n_intents,
+            "completed": len(hist),
+            **tracker.outcomes[s],
+            "p50_s": p50,
+            "p95_s": p95,
+            "p99_s": p99,
+            "max_s": hist.max,
+            "sustained_tps": len(hist) / span if span > 0 else 0.0,
+            "within_budget": p99 is not None and p99 <= budget and len(hist) == stage.n_intents,
+        })
+
+    ok_rates = []
+    breach_stage = None
+    for rep in stage_reports:
+        if rep["within_budget"] and breach_stage is None:
+            ok_rates.append(rep["target_rate"])
+        elif breach_stage is None:
+            breach_stage = rep
+    slo_breach = None
+    if breach_stage is not None:
+        slo_breach = {"target_rate": breach_stage["target_rate"], "stage_p99_s": breach_stage["p99_s"]}
+        first = tracker.first_breach
+        if first is not None:
+            slo_breach.update({
+                "first_trace": first["trace_id"],
+                "first_trace_latency_s": first["latency_s"],
+                "first_trace_stage_rate": stages[first["stage"]].rate,
+                "first_trace_at_s": first["due_t"] - run_start,
+            })
+
+    p50, p95, p99 = total.percentiles(PERCENTILES)
+    max_ok = max(ok_rates) if ok_rates else None
+    return {
+        "latency_budget_s": budget,
+        "stages": stage_reports,
+        "total": {"completed": len(total), "p50_s": p50, "p95_s": p95, "p99_s": p99, "max_s": total.max},
+        "max_rate_within_budget": max_ok,
+        "tx_per_day_at_max_rate": max_ok * 86_400 if max_ok is not None else None,
+        "slo_breach": slo_breach,
+        "incomplete": tracker.in_flight,
+        **extra,
+    }
@@ -8,14 +8,26 @@ Provides:
 - step(bar) -> list[dict]: Process single bar, return event dicts
 - run(bars, max_steps, sleep_ms) -> dict: Run full simulation
 - run_bus_mode(): Bus-based event flow with optional metrics instrumentation
+- iter_events() / iter_adapter_events(): generator form of run() / run_adapter_mode();
+  with sink=... run() and run_adapter_mode() stream events to an EventSink and
+  keep only per-type counts instead of the full event list
+
+Streaming step mode: when the injected strategy is a StatefulStrategy, bars are
+pushed one at a time into a per-run StrategyState (step_bar) instead of handing
+the strategy a growing history slice, so per-bar cost is O(1) in history length.
+
+Precompute mode: when the strategy is a PrecomputedStrategy, run() and
+run_bus_mode() compute the intent schedule for the whole in-memory frame once
+(vectorized) and step_bar only looks intents up by bar index.
 """
 
 import json
 import time
 import logging
+import itertools
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Generator, Iterator, List, Mapping, Optional, Tuple, Union
 
 from engine.time_provider import TimeProvider, SimulatedTimeProvider
 from engine.exchange_adapter import ExchangeAdapter
@@ -27,13 +39,23 @@ from contracts.event_messages import OrderIntent
 from risk_manager_v0_6 import RiskManagerV06
 from risk_manager_v_0_4 import RiskManager as RiskManagerV04
 from adapters.risk_input_adapter import adapt_order_intent_to_risk_input
-from strategy_engine.strategy_registry import get_strategy_fn, DEFAULT_STRATEGY
+from strategy_engine.strategy_registry import get_strategy_fn, get_strategy_lookback, DEFAULT_STRATEGY
+from strategy_engine.stateful import StatefulStrategy, StrategyState
+from strategy_engine.precomputed import PrecomputedStrategy, IntentSchedule
 from execution.execution_adapter_v0_2 import simulate_execution
 from state.position_store_sqlite import PositionStoreSQLite
+from state.position_cache import PositionCache
+from engine.market_data.ohlcv_ring_buffer import OHLCVRingBuffer
+from engine.event_sinks import EventSink, EventCounter
+from engine.checkpoint import Checkpoint, CheckpointPolicy, CheckpointWriter
+from engine.snapshot import EngineSnapshot
 
 
 logger = logging.getLogger(__name__)
 
+# NAV the inline/adapter risk checks size against (and weights are relative to)
+RISK_NAV = 10000.0
+
 # Deterministic stage latency deltas for simulated clock mode (nanoseconds)
 # These are advanced between metrics timing points to ensure non-zero latencies.
 #
@@ -57,6 +79,204 @@ STAGE_LATENCY_NS = {
 }
 
 
+def drain_bus_workers(
+    bus,
+    risk_worker,
+    exec_worker,
+    report_worker,
+    *,
+    time_provider: TimeProvider,
+    max_drain_iterations: int = 100,
+    max_items: int = 100,
+    metrics_collector=None,
+    step_id: int = 0,
+) -> int:
+    """
+    Drain order_intent -> risk_decision -> execution_report through the workers.
+    
+    Each iteration steps every stage once (up to max_items each), advancing
+    simulated time per processed item and recording one metrics sample per
+    non-empty stage.
+    
+    Args:
+        bus: Bus holding the topics
+        risk_worker: RiskWorker
+        exec_worker: ExecWorker
+        report_worker: PositionStoreWorker or DrainWorker for execution_report (or None)
+        time_provider: Time provider advanced by STAGE_LATENCY_NS
+        max_drain_iterations: Max iterations (prevents deadlock)
+        max_items: Max items per stage per iteration
+        metrics_collector: Optional MetricsCollector
+        step_id: Step id recorded in metrics samples
+        
+    Returns:
+        Number of drain iterations used
+        
+    Raises:
+        RuntimeError: If no progress is made or max_drain_iterations is exceeded
+    """
+    from engine.bus_workers import TOPIC_ORDER_INTENT, TOPIC_RISK_DECISION, TOPIC_EXECUTION_REPORT
+    
+    def _metrics_clock():
+        return time_provider.now_ns() / 1e9
+    
+    can_advance = hasattr(time_provider, 'advance_ns')
+    
+    drain_iter = 0
+    while drain_iter < max_drain_iterations:
+        drain_iter += 1
+        
+        # -- Risk Worker Stage --
+        risk_t0 = _metrics_clock() if metrics_collector else 0.0
+        risk_processed = risk_worker.step(bus, max_items=max_items)
+        # Advance simulated time for risk stage
+        if can_advance and risk_processed > 0:
+            time_provider.advance_ns(STAGE_LATENCY_NS["risk"] * risk_processed)
+        risk_t1 = _metrics_clock() if metrics_collector else 0.0
+        
+        # Record risk stage metrics (aggregate for the batch, synthetic trace_id)
+        if metrics_collector and risk_processed > 0:
+            metrics_collector.record_stage(
+                stage="risk",
+                step_id=step_id,
+                trace_id=f"batch_risk_{drain_iter}",
+                t_start=risk_t0,
+                t_end=risk_t1,
+                outcome="ok",
+            )
+        
+        # -- Exec Worker Stage --
+        exec_t0 = _metrics_clock() if metrics_collector else 0.0
+        exec_processed = exec_worker.step(bus, max_items=max_items)
+        # Advance simulated time for exec stage
+        if can_advance and exec_processed > 0:
+            time_provider.advance_ns(STAGE_LATENCY_NS["exec"] * exec_processed)
+        exec_t1 = _metrics_clock() if metrics_collector else 0.0
+        
+        if metrics_collector and exec_processed > 0:
+            metrics_collector.record_stage(
+                stage="exec",
+                step_id=step_id,
+                trace_id=f"batch_exec_{drain_iter}",
+                t_start=exec_t0,
+                t_end=exec_t1,
+                outcome="ok",
+            )
+        
+        # -- Position Store Stage --
+        pos_t0 = _metrics_clock() if metrics_collector else 0.0
+        pos_processed = report_worker.step(bus, max_items=max_items) if report_worker else 0
+        # Advance simulated time for position stage
+        if can_advance and pos_processed > 0:
+            time_provider.advance_ns(STAGE_LATENCY_NS["position"] * pos_processed)
+        pos_t1 = _metrics_clock() if metrics_collector else 0.0
+        
+        if metrics_collector and pos_processed > 0:
+            metrics_collector.record_stage(
+                stage="position",
+                step_id=step_id,
+                trace_id=f"batch_position_{drain_iter}",
+                t_start=pos_t0,
+                t_end=pos_t1,
+                outcome="ok",
+            )
+        
+        total_processed = risk_processed + exec_processed + pos_processed
+        
+        # Check if all queues are empty
+        intent_pending = bus.size(TOPIC_ORDER_INTENT)
+        decision_pending = bus.size(TOPIC_RISK_DECISION)
+        report_pending = bus.size(TOPIC_EXECUTION_REPORT)
+        
+        if intent_pending == 0 and decision_pending == 0 and report_pending == 0:
+            logger.info("Bus mode: all queues drained after %d iterations", drain_iter)
+            break
+        
+        if total_processed == 0 and (intent_pending + decision_pending + report_pending) > 0:
+            # Stuck: events in queue but no progress
+            raise RuntimeError(
+                f"Bus mode deadlock: pending events but no progress. "
+                f"intent={intent_pending}, decision={decision_pending}, report={report_pending}"
+            )
+    else:
+        raise RuntimeError(
+            f"Bus mode: max_drain_iterations ({max_drain_iterations}) exceeded. "
+            f"Queues not empty: intent={bus.size(TOPIC_ORDER_INTENT)}, "
+            f"decision={bus.size(TOPIC_RISK_DECISION)}, report={bus.size(TOPIC_EXECUTION_REPORT)}"
+        )
+    
+    return drain_iter
+
+
+def _iter_bars(ohlcv_df: pd.DataFrame, start: int = 0, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield rows of ohlcv_df as bar dicts (column -> value), one at a time."""
+    columns = list(ohlcv_df.columns)
+    for values in ohlcv_df.iloc[start:end].itertuples(index=False, name=None):
+        yield dict(zip(columns, values))
+
+
+def _consume_events(
+    stream: Generator[Dict[str, Any], None, Any],
+    sink: Optional[EventSink] = None,
+) -> Tuple[Optional[List[Dict[str, Any]]], EventCounter, Any]:
+    """
+    Drain an event generator into a list (sink=None) or into sink.
+    
+    Returns:
+        (events or None when sink is given, per-type counts, generator return value)
+    """
+    counts = EventCounter()
+    events: Optional[List[Dict[str, Any]]] = [] if sink is None else None
+    while True:
+        try:
+            event = next(stream)
+        except StopIteration as stop:
+            return events, counts, stop.value
+        counts.add(event)
+        if sink is None:
+            events.append(event)
+        else:
+            sink.write(event)
+
+
+def _skip_events(adapter, count: int, last_ts: Optional[int] = None) -> int:
+    """
+    Advance adapter past its first count events without processing them.
+    
+    Seekable adapters (SeekableMarketDataAdapter) are repositioned in one call:
+    seek(last_ts + 1) when the last skipped timestamp is known, else
+    seek_index(count). Other adapters are polled and the events discarded.
+    
+    Returns:
+        Number of events skipped
+    """
+    if last_ts is not None and hasattr(adapter, "seek"):
+        adapter.seek(last_ts + 1)
+        return count
+    if hasattr(adapter, "seek_index"):
+        adapter.seek_index(count)
+        return count
+    skipped = 0
+    while skipped < count:
+        events = adapter.poll(max_items=count - skipped)
+        if not events:
+            break
+        skipped += len(events)
+    return skipped
+
+
+def _event_to_bar(event) -> Dict[str, Any]:
+    """Convert a MarketDataEvent into an OHLCV bar dict."""
+    return {
+        "timestamp": pd.Timestamp(event.ts, unit="ms", tz="UTC"),
+        "open": event.open,
+        "high": event.high,
+        "low": event.low,
+        "close": event.close,
+        "volume": event.volume,
+    }
+
+
 class LoopStepper:
     """
     Deterministic live-like loop stepper.
@@ -77,9 +297,22 @@ class LoopStepper:
         time_provider: Optional[TimeProvider] = None,
         seed: int = 42,
         strategy_fn = None,  # AG-3J-1-1: Strategy function injection
+        ohlcv_window: Optional[int] = None,  # Adapter-mode window (default: strategy lookback)
+        position_flush_every: Optional[int] = 1000,
+        position_aware_risk: bool = False,
     ):
         """
         Initialize the loop stepper.
+        
+        ohlcv_window bounds the OHLCV history kept for slice-based strategies in
+        run_adapter_mode. Defaults to the strategy's declared lookback; if the
+        strategy declares none, full history is kept (legacy behavior).
+        
+        Positions live in a write-behind PositionCache in front of state_db:
+        dirty positions are flushed every position_flush_every fills, before
+        every checkpoint save and on close(). With position_aware_risk the
+        inline and adapter paths pass current portfolio weights (from the
+        cache, marked at the bar close) to the risk manager instead of {}.
         """
         self.seed = seed
         import random
@@ -105,11 +338,13 @@ class LoopStepper:
             self._risk_v04 = RiskManagerV04(rules)
             self._risk_v06 = None
         
-        # Initialize state store if provided
-        self._state_store: Optional[PositionStoreSQLite] = None
+        # Initialize state store if provided (write-behind cache in front of SQLite)
+        self._state_store: Optional[PositionCache] = None
         if state_db:
-            self._state_store = PositionStoreSQLite(state_db)
-            self._state_store.ensure_schema()
+            self._state_store = PositionCache(
+                PositionStoreSQLite(state_db), flush_every_fills=position_flush_every,
+            )
+        self.position_aware_risk = position_aware_risk
         
         # Metrics
         self._step_count = 0
@@ -120,12 +355,94 @@ class LoopStepper:
         
         # AG-3J-1-1: Strategy function (default to v0_7)
         self._strategy_fn = strategy_fn if strategy_fn else get_strategy_fn(DEFAULT_STRATEGY)
+        
+        # Streaming step mode: per-run state for stateful strategies
+        self._strategy_state = None
+        
+        # Precompute mode: per-run intent schedule for the in-memory frame
+        self._schedule: Optional[IntentSchedule] = None
+        
+        # Adapter-mode OHLCV window (ring buffer, created per run)
+        self.ohlcv_window = ohlcv_window
+        self._ohlcv_buffer: Optional[OHLCVRingBuffer] = None
+
+    @property
+    def streaming(self) -> bool:
+        """True if the strategy is stateful (bars pushed one at a time)."""
+        return isinstance(self._strategy_fn, StatefulStrategy)
+
+    @property
+    def precomputed(self) -> bool:
+        """True if the strategy precomputes its intent schedule (in-memory frames)."""
+        return isinstance(self._strategy_fn, PrecomputedStrategy)
 
     def _gen_uuid(self) -> str:
         """Generate deterministic UUID based on seed."""
         import uuid
         return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
 
+    def _bar_context(self, last_row) -> tuple:
+        """Resolve (asof_ts, ts_str) for the current bar (Series or bar dict)."""
+        if 'timestamp' in last_row:
+            asof_ts = last_row['timestamp']
+        else:
+            # Deterministic fallback using time_provider
+            now_ns = self.time_provider.now_ns()
+            asof_ts = pd.Timestamp(now_ns, unit='ns', tz='UTC')
+        ts_str = asof_ts.isoformat() if hasattr(asof_ts, "isoformat") else str(asof_ts)
+        return asof_ts, ts_str
+
+    def _reset_strategy_state(self) -> None:
+        """Start a fresh per-run strategy state (streaming mode only)."""
+        if self.streaming:
+            self._strategy_state = self._strategy_fn.init_state(self.strategy_params)
+
+    def _start_frame_run(self, ohlcv_df: pd.DataFrame) -> bool:
+        """
+        Per-run strategy setup for in-memory frames (run / run_bus_mode).
+        
+        Returns:
+            True if bars are processed one at a time via step_bar (streaming or
+            precompute mode), False for the legacy slice-per-bar path.
+        """
+        self._schedule = None
+        if self.streaming:
+            self._reset_strategy_state()
+            return True
+        if self.precomputed:
+            self._schedule = self._strategy_fn.precompute(
+                ohlcv_df, self.strategy_params, self.ticker
+            )
+            return True
+        return False
+
+    def _bar_intents(self, bar: Mapping[str, Any], bar_idx: int, asof_ts) -> List[OrderIntent]:
+        """Intents for one bar: schedule lookup (precompute) or state push (streaming)."""
+        if self._schedule is not None:
+            return self._schedule.intents_at(bar_idx, self.ticker, asof_ts)
+        return self._push_bar(bar, asof_ts)
+
+    def _push_bar(self, bar: Mapping[str, Any], asof_ts) -> List[OrderIntent]:
+        """Push one bar into the per-run strategy state and return its intents."""
+        if self._strategy_state is None:
+            self._reset_strategy_state()
+        return self._strategy_fn.on_bar(
+            self._strategy_state, bar, self.strategy_params, self.ticker, asof_ts
+        )
+
+    def _ohlcv_window_capacity(self) -> Optional[int]:
+        """Ring buffer capacity for adapter mode (None = unbounded)."""
+        if self.ohlcv_window is not None:
+            return self.ohlcv_window
+        return get_strategy_lookback(self._strategy_fn, self.strategy_params)
+
+    def _warm_bar(self, bar: Mapping[str, Any]) -> None:
+        """Feed a warmup/already-processed bar into strategy state (no events)."""
+        if not self.streaming:
+            return  # Precompute schedules need no warming
+        asof_ts, _ = self._bar_context(bar)
+        self._push_bar(bar, asof_ts)
+
     def step(self, ohlcv_slice: pd.DataFrame, bar_idx: int) -> List[Dict[str, Any]]:
         """
         Process a single bar and return list of event dicts.
@@ -136,32 +453,66 @@ class LoopStepper:
         if ohlcv_slice.empty:
             return events
         
-        # Get current bar timestamp
         # Advance logical time
         self.time_provider.advance_steps(1)
 
         last_row = ohlcv_slice.iloc[-1]
-        
-        if 'timestamp' in last_row:
-            asof_ts = last_row['timestamp']
-        else:
-            # Deterministic fallback using time_provider
-            now_ns = self.time_provider.now_ns()
-            asof_ts = pd.Timestamp(now_ns, unit='ns', tz='UTC')
+        asof_ts, ts_str = self._bar_context(last_row)
         current_price = float(last_row['close'])
-        
-        # Use ISO format for events, ensuring UTC aware if possible
-        if hasattr(asof_ts, "tz") and asof_ts.tz is None:
-             # Assume UTC if naive, or just use isoformat
-             pass
-        
-        ts_str = asof_ts.isoformat() if hasattr(asof_ts, "isoformat") else str(asof_ts)
 
         # 1. Strategy: Generate order intents
         intents = self._strategy_fn(
             ohlcv_slice, self.strategy_params, self.ticker, asof_ts
         )
         
+        return self._process_intents(intents, bar_idx, ts_str, current_price)
+
+    def step_bar(
+        self,
+        bar: Mapping[str, Any],
+        bar_idx: int,
+        exchange_adapter: Optional[ExchangeAdapter] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process a single bar in streaming/precompute mode and return list of event dicts.
+        
+        The bar is pushed into the per-run strategy state (StatefulStrategy) or
+        looked up in the precomputed schedule by bar_idx; no history slice is
+        built.
+        
+        Args:
+            bar: Mapping with OHLCV columns for the current bar
+            bar_idx: Current bar index
+            exchange_adapter: If given, execute via ExchangeAdapter (adapter mode)
+        """
+        self._step_count += 1
+        
+        # Advance logical time
+        self.time_provider.advance_steps(1)
+        
+        asof_ts, ts_str = self._bar_context(bar)
+        current_price = float(bar['close'])
+        
+        # 1. Strategy: push bar into state / look up schedule
+        intents = self._bar_intents(bar, bar_idx, asof_ts)
+        
+        if exchange_adapter is not None:
+            return self._submit_intents_via_adapter(
+                intents, bar_idx, exchange_adapter, ts_str, current_price
+            )
+        return self._process_intents(intents, bar_idx, ts_str, current_price)
+
+    def _process_intents(
+        self,
+        intents: List[OrderIntent],
+        bar_idx: int,
+        ts_str: str,
+        current_price: float,
+    ) -> List[Dict[str, Any]]:
+        """Run intents through Risk -> simulate_execution -> State."""
+        events = []
+        fills = []  # Applied to the state store in one transaction per bar
+        
         for intent in intents:
             # Overwrite with deterministic IDs and TS to ensure reproducibility
             # (Strategy might have used random UUIDs)
@@ -204,7 +555,9 @@ class LoopStepper:
                     trace_id=intent.trace_id,
                     meta=intent.meta,
                 )
-                decision = self._risk_v06.assess(intent_v1)
+                decision = self._risk_v06.assess(
+                    intent_v1, current_weights=self._risk_weights(intent.symbol, current_price),
+                )
                 
                 # Override with deterministic ID and TS
                 decision.event_id = decision_event_id
@@ -220,7 +573,9 @@ class LoopStepper:
                     "assets": [intent.symbol],
                     "deltas": {intent.symbol: 0.10},
                 }
-                allowed, annotated = self._risk_v04.filter_signal(signal, {}, nav_eur=10000.0)
+                allowed, annotated = self._risk_v04.filter_signal(
+                    signal, self._risk_weights(intent.symbol, current_price), nav_eur=RISK_NAV,
+                )
                 rejection_reasons = annotated.get("risk_reasons", [])
                 
                 decision = RiskDecisionV1(
@@ -284,27 +639,28 @@ class LoopStepper:
                     
                     # Apply to state store if available
                     if self._state_store and rep_v1.status in ("FILLED", "PARTIALLY_FILLED"):
-                        self._state_store.apply_fill(
-                            symbol=intent.symbol,
-                            side=intent.side,
-                            qty=rep_v1.filled_qty,
-                            price=rep_v1.avg_price,
-                        )
+                        fills.append((intent.symbol, intent.side, rep_v1.filled_qty, rep_v1.avg_price))
             else:
                 self._rejected_count += 1
         
+        if fills:
+            self._state_store.apply_fills(fills)
+        
         return events
 
-    def run(
+    def iter_events(
         self,
         ohlcv_df: pd.DataFrame,
         *,
         max_steps: Optional[int] = None,
         sleep_ms: int = 0,
         warmup: int = 10,
-    ) -> Dict[str, Any]:
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Run full simulation over OHLCV data.
+        Yield events of a full simulation as they are produced.
+        
+        Same semantics as run(), but nothing is accumulated: memory stays
+        bounded regardless of run length.
         
         Args:
             ohlcv_df: Full OHLCV DataFrame
@@ -312,33 +668,64 @@ class LoopStepper:
             sleep_ms: Sleep between steps (for live-like feel)
             warmup: Warmup period (bars to skip)
             
-        Returns:
-            Dict with metrics and events
+        Yields:
+            Event dicts ({"type": ..., "payload": {...}})
         """
-        all_events = []
-        
         if len(ohlcv_df) <= warmup:
             logger.warning("Not enough data for simulation (need > %d rows)", warmup)
-            return {"events": [], "metrics": self._get_metrics()}
+            return
         
         end_idx = len(ohlcv_df)
         if max_steps:
             end_idx = min(warmup + max_steps, len(ohlcv_df))
         
+        # Streaming/precompute mode: one bar at a time (warmup bars only feed state)
+        bars = None
+        if self._start_frame_run(ohlcv_df):
+            bars = _iter_bars(ohlcv_df, 0, end_idx)
+            for bar in itertools.islice(bars, warmup):
+                self._warm_bar(bar)
+        
         for i in range(warmup, end_idx):
-            # Slice up to current bar (inclusive)
-            current_slice = ohlcv_df.iloc[:i+1]
-            
-            step_events = self.step(current_slice, bar_idx=i)
-            all_events.extend(step_events)
+            if bars is not None:
+                step_events = self.step_bar(next(bars), bar_idx=i)
+            else:
+                # Slice up to current bar (inclusive)
+                current_slice = ohlcv_df.iloc[:i+1]
+                step_events = self.step(current_slice, bar_idx=i)
+            yield from step_events
             
             if sleep_ms > 0:
                 time.sleep(sleep_ms / 1000.0)
+
+    def run(
+        self,
+        ohlcv_df: pd.DataFrame,
+        *,
+        max_steps: Optional[int] = None,
+        sleep_ms: int = 0,
+        warmup: int = 10,
+        sink: Optional[EventSink] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run full simulation over OHLCV data.
         
-        return {
-            "events": all_events,
-            "metrics": self._get_metrics(),
-        }
+        Args:
+            ohlcv_df: Full OHLCV DataFrame
+            max_steps: Maximum bars to process (None = all after warmup)
+            sleep_ms: Sleep between steps (for live-like feel)
+            warmup: Warmup period (bars to skip)
+            sink: Optional EventSink; events are written to it as produced
+                and only per-type counts are kept (the caller closes the sink)
+            
+        Returns:
+            Dict with metrics and events (or event_counts when sink is given)
+        """
+        stream = self.iter_events(ohlcv_df, max_steps=max_steps, sleep_ms=sleep_ms, warmup=warmup)
+        events, counts, _ = _consume_events(stream, sink)
+        if sink is None:
+            return {"events": events, "metrics": self._get_metrics()}
+        return {"metrics": self._get_metrics(), "event_counts": counts.as_dict()}
 
     def _get_metrics(self) -> Dict[str, Any]:
         """Get current metrics."""
@@ -349,12 +736,105 @@ class LoopStepper:
             "rejected": self._rejected_count,
         }
 
+    def snapshot(
+        self,
+        checkpoint: Checkpoint,
+        consumed: int,
+        last_event_ts: Optional[int] = None,
+    ) -> EngineSnapshot:
+        """
+        Capture engine state after a fully processed adapter-mode step.
+        
+        Args:
+            checkpoint: Checkpoint covering the processed steps
+            consumed: Adapter events consumed so far (warmup included)
+            last_event_ts: Timestamp of the last consumed event (for seek on resume)
+        """
+        if self.streaming:
+            data = self._strategy_state.to_dict() if self._strategy_state else None
+            strategy = {"kind": "state", "data": data}
+        elif self._ohlcv_buffer is not None:
+            strategy = {"kind": "window", "data": self._ohlcv_buffer.snapshot()}
+        else:
+            strategy = {"kind": None, "data": None}
+        
+        rng_version, rng_internal, rng_gauss = self._rng.getstate()
+        clock = self.time_provider.snapshot() if hasattr(self.time_provider, "snapshot") else None
+        risk_manager = self._risk_v06 or self._risk_v04
+        risk_state = risk_manager.snapshot_state() if hasattr(risk_manager, "snapshot_state") else None
+        
+        return EngineSnapshot(
+            checkpoint=checkpoint,
+            consumed=consumed,
+            strategy=strategy,
+            rng=[rng_version, list(rng_internal), rng_gauss],
+            clock=clock,
+            counters={
+                "steps": self._step_count,
+                "events": self._event_count,
+                "fills": self._fill_count,
+                "rejected": self._rejected_count,
+            },
+            risk={"version": self.risk_version, "state": risk_state},
+            last_event_ts=last_event_ts,
+        )
+
+    def restore(self, snap: EngineSnapshot) -> None:
+        """
+        Restore engine state captured by snapshot().
+        
+        The stepper must be configured like the one that took the snapshot
+        (strategy, params, risk version, seed, time provider settings).
+        
+        Raises:
+            ValueError: If the snapshot does not match this stepper's config
+        """
+        if snap.risk.get("version", self.risk_version) != self.risk_version:
+            raise ValueError(
+                f"Snapshot risk version {snap.risk['version']!r} != stepper {self.risk_version!r}"
+            )
+        kind, data = snap.strategy["kind"], snap.strategy["data"]
+        if (kind == "state") != self.streaming:
+            raise ValueError(f"Snapshot strategy kind {kind!r} does not match the stepper's strategy")
+        if kind == "state":
+            self._strategy_state = StrategyState.from_dict(data) if data else None
+        elif kind == "window":
+            self._ohlcv_buffer = OHLCVRingBuffer.from_snapshot(data)
+        
+        rng_version, rng_internal, rng_gauss = snap.rng
+        self._rng.setstate((rng_version, tuple(rng_internal), rng_gauss))
+        if snap.clock is not None:
+            if not hasattr(self.time_provider, "restore"):
+                raise ValueError(
+                    f"Snapshot has clock state but {type(self.time_provider).__name__} cannot restore it"
+                )
+            self.time_provider.restore(snap.clock)
+        risk_state = snap.risk.get("state")
+        if risk_state is not None:
+            (self._risk_v06 or self._risk_v04).restore_state(risk_state)
+        
+        self._step_count = snap.counters["steps"]
+        self._event_count = snap.counters["events"]
+        self._fill_count = snap.counters["fills"]
+        self._rejected_count = snap.counters["rejected"]
+
     def get_positions(self) -> List[Dict[str, Any]]:
         """Get current positions from state store."""
         if self._state_store:
             return self._state_store.list_positions()
         return []
 
+    def _risk_weights(self, symbol: str, price: float) -> Dict[str, float]:
+        """Portfolio weights passed to risk ({} unless position_aware_risk)."""
+        if not self.position_aware_risk or not self._state_store:
+            return {}
+        return self._state_store.weights(RISK_NAV, {symbol: price})
+
+    def _flush_positions(self) -> None:
+        """Persist cached positions (runs before every checkpoint save)."""
+        if self._state_store:
+            self._state_store.flush()
+
     def close(self) -> None:
         """Close resources."""
         if self._state_store:
@@ -373,9 +853,14 @@ class LoopStepper:
         idempotency_store = None,  # Optional IdempotencyStore for crash recovery
         checkpoint = None,  # Optional Checkpoint for progress tracking
         checkpoint_path: Optional[Path] = None,  # Path to save checkpoint
+        checkpoint_policy: Optional[CheckpointPolicy] = None,
         start_idx: int = 0,  # Start index for resume (0 = from beginning after warmup)
         metrics_collector = None,  # Optional MetricsCollector for granular observability (3H.1)
         stop_controller = None,  # AG-3O-2-1: Graceful shutdown
+        pipeline_batch: Optional[int] = None,
+        max_pending_intents: Optional[int] = None,
+        exec_workers: Optional[int] = None,
+        event_observer: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """
         Run simulation using bus-based event flow.
@@ -386,271 +871,347 @@ class LoopStepper:
         3. ExecWorker processes → execution_report topic
         4. PositionStoreWorker processes → SQLite updates
         
+        By default all bars are published first and the workers drain once at
+        the end (two-phase). With pipeline_batch=N the workers drain after
+        every N bars, and with max_pending_intents the producer stops and
+        drains whenever the order_intent queue reaches that high-water mark.
+        Either way queue depth, intent_cache size and time-to-first-fill are
+        bounded by the batch, not by the run length. Drained intents are
+        evicted from intent_cache. In both modes the checkpoint only advances
+        past bars whose intents have been drained (two-phase: at the end).
+        
+        With exec_workers=N the risk, exec (N threads) and position workers
+        run on their own threads (engine/worker_runtime.py) while this thread
+        produces; bus must be a ThreadSafeBus, partitioned on risk_decision
+        when N > 1. max_pending_intents then blocks the producer until the
+        workers catch up. Fills are no longer in a deterministic order and
+        only the strategy stage is recorded in metrics_collector; per-worker
+        throughput/latency is returned under "workers". The checkpoint then
+        advances once every stage has drained, after the producer is done.
+        
         Args:
             ohlcv_df: Full OHLCV DataFrame
             bus: InMemoryBus instance
             max_steps: Maximum bars to process (None = all after warmup)
             warmup: Warmup period (bars to skip)
             max_drain_iterations: Max iterations to drain queues (prevents deadlock)
+            pipeline_batch: Drain after every N bars (None = two-phase)
+            max_pending_intents: order_intent high-water mark (None = unbounded)
+            exec_workers: Run workers on threads with N exec workers (None = single thread)
+            event_observer: Called with each JSONL trace record as it is logged
+                (e.g. RunMetricsAggregator.observe; from worker threads too
+                with exec_workers)
+            checkpoint_policy: When/how checkpoint_path is saved (None = every
+                bar, synchronously); the latest checkpoint is saved on exit
             
         Returns:
-            Dict with metrics and published envelopes count
+            Dict with metrics and published envelopes count (pipelined runs
+            add drains and peak_pending_intents, threaded runs add workers,
+            runs with a checkpoint_policy add checkpoint_writes)
             
         Raises:
             RuntimeError: If queues not drained within max_drain_iterations
         """
         if stop_controller and stop_controller.is_stop_requested:
             return {"metrics": self._get_metrics(), "published": 0, "status": "stopped_early"}
+        if pipeline_batch is not None and pipeline_batch < 1:
+            raise ValueError(f"pipeline_batch must be >= 1, got {pipeline_batch}")
+        if max_pending_intents is not None and max_pending_intents < 1:
+            raise ValueError(f"max_pending_intents must be >= 1, got {max_pending_intents}")
 
         from engine.bus_workers import (
             RiskWorker, ExecWorker, PositionStoreWorker, DrainWorker,
             TOPIC_ORDER_INTENT, TOPIC_RISK_DECISION, TOPIC_EXECUTION_REPORT
         )
         
+        threaded = exec_workers is not None
+        if threaded:
+            from bus.threadsafe_bus import ThreadSafeBus
+            from engine.worker_runtime import WorkerRuntime
+            
+            if exec_workers < 1:
+                raise ValueError(f"exec_workers must be >= 1, got {exec_workers}")
+            if pipeline_batch is not None:
+                raise ValueError("pipeline_batch does not apply to threaded workers (exec_workers)")
+            if not isinstance(bus, ThreadSafeBus):
+                raise TypeError(f"exec_workers requires a ThreadSafeBus, got {type(bus).__name__}")
+            if exec_workers > 1 and bus.partition_count(TOPIC_RISK_DECISION) != exec_workers:
+                raise ValueError(
+                    f"exec_workers={exec_workers} requires "
+                    f"ThreadSafeBus(partitions={{'{TOPIC_RISK_DECISION}': {exec_workers}}})"
+                )
+        pipelined = not threaded and (pipeline_batch is not None or max_pending_intents is not None)
+        
         # Initialize JSONL logger if path provided
         jsonl_logger = None
         if log_jsonl_path:
             from engine.structured_jsonl_logger import get_jsonl_logger, log_event, close_jsonl_logger
-            jsonl_logger = get_jsonl_logger(log_jsonl_path)
-        
-        # Initialize workers
-        intent_cache: Dict[str, Dict] = {}  # Cache intents for ExecWorker
-        
-        risk_worker = RiskWorker(
-            self._risk_v04,
-            gen_event_id=self._gen_uuid,
-            jsonl_logger=jsonl_logger,
-        )
-        exec_worker = ExecWorker(
-            self.execution_config,
-            gen_event_id=self._gen_uuid,
-            intent_cache=intent_cache,
-            jsonl_logger=jsonl_logger,
-            exchange_adapter=exchange_adapter,
-            idempotency_store=idempotency_store,
-        )
-        pos_worker = PositionStoreWorker(self._state_store, jsonl_logger=jsonl_logger) if self._state_store else None
-        # Drain execution_report if no pos_worker (prevents deadlock)
-        exec_report_drainer = DrainWorker(TOPIC_EXECUTION_REPORT) if not pos_worker else None
+            jsonl_logger = get_jsonl_logger(log_jsonl_path, async_mode=True, observer=event_observer)
         
-        published_count = 0
-        
-        # Helper for deterministic metrics clock
-        def _metrics_clock():
-            """Return deterministic time for metrics (seconds from time_provider)."""
-            return self.time_provider.now_ns() / 1e9
-        
-        if len(ohlcv_df) <= warmup:
-            logger.warning("Not enough data for simulation (need > %d rows)", warmup)
-            return {"metrics": self._get_metrics(), "published": 0}
-        
-        end_idx = len(ohlcv_df)
-        if max_steps:
-            end_idx = min(warmup + max_steps, len(ohlcv_df))
-        
-        # Phase 1: Publish all OrderIntentV1 to bus
-        # Resume support: skip already processed indices
-        actual_start = warmup + start_idx
-        for i in range(actual_start, end_idx):
-            # AG-3O-2-1: Check for graceful shutdown request
-            if stop_controller and stop_controller.is_stop_requested:
-                logger.info("Bus mode: stop requested (%s), draining and exiting...", stop_controller.stop_reason)
-                break
-
-            current_slice = ohlcv_df.iloc[:i+1]
-            self._step_count += 1
+        runtime = None
+        ckpt_writer = None
+        try:
+            # Initialize workers
+            intent_cache: Dict[str, Dict] = {}  # Cache intents for ExecWorker
             
-            if current_slice.empty:
-                continue
+            gen_event_id = self._gen_uuid
+            if threaded:
+                import threading
+                uuid_lock = threading.Lock()
+                
+                def gen_event_id() -> str:
+                    with uuid_lock:
+                        return self._gen_uuid()
             
-            last_row = current_slice.iloc[-1]
-            last_row = current_slice.iloc[-1]
-            if 'timestamp' in last_row:
-                asof_ts = last_row['timestamp']
-            else:
-                # Deterministic fallback
-                now_ns = self.time_provider.now_ns()
-                asof_ts = pd.Timestamp(now_ns, unit='ns', tz='UTC')
-            ts_str = asof_ts.isoformat() if hasattr(asof_ts, "isoformat") else str(asof_ts)
+            risk_worker = RiskWorker(
+                self._risk_v04,
+                gen_event_id=gen_event_id,
+                jsonl_logger=jsonl_logger,
+            )
+            exec_pool = [
+                ExecWorker(
+                    self.execution_config,
+                    gen_event_id=gen_event_id,
+                    intent_cache=intent_cache,
+                    jsonl_logger=jsonl_logger,
+                    exchange_adapter=exchange_adapter,
+                    idempotency_store=idempotency_store,
+                )
+                for _ in range(exec_workers or 1)
+            ]
+            exec_worker = exec_pool[0]
+            pos_worker = PositionStoreWorker(self._state_store, jsonl_logger=jsonl_logger) if self._state_store else None
+            # Drain execution_report if no pos_worker (prevents deadlock)
+            exec_report_drainer = DrainWorker(TOPIC_EXECUTION_REPORT) if not pos_worker else None
             
-            # Metrics: start strategy stage
-            strategy_t0 = _metrics_clock() if metrics_collector else 0.0
+            published_count = 0
             
-            intents = self._strategy_fn(
-                current_slice, self.strategy_params, self.ticker, asof_ts
-            )
+            # Helper for deterministic metrics clock
+            def _metrics_clock():
+                """Return deterministic time for metrics (seconds from time_provider)."""
+                return self.time_provider.now_ns() / 1e9
             
-            # Advance simulated time for strategy stage (deterministic latency)
-            if hasattr(self.time_provider, 'advance_ns'):
-                self.time_provider.advance_ns(STAGE_LATENCY_NS["strategy"])
+            if len(ohlcv_df) <= warmup:
+                logger.warning("Not enough data for simulation (need > %d rows)", warmup)
+                return {"metrics": self._get_metrics(), "published": 0}
             
-            # Metrics: end strategy stage (per intent)
-            strategy_t1 = _metrics_clock() if metrics_collector else 0.0
+            end_idx = len(ohlcv_df)
+            if max_steps:
+                end_idx = min(warmup + max_steps, len(ohlcv_df))
             
-            # Record strategy stage metric (once per bar, regardless of intents generated)
-            if metrics_collector:
-                metrics_collector.record_stage(
-                    stage="strategy",
-                    step_id=self._step_count,
-                    trace_id=f"bar_{i}",
-                    t_start=strategy_t0,
-                    t_end=strategy_t1,
-                    outcome="ok" if intents else "no_signal",
-                )
+            # Phase 1: Publish OrderIntentV1 to bus (all bars, or per batch when pipelined)
+            # Resume support: skip already processed indices
+            actual_start = warmup + start_idx
             
-            for intent in intents:
-                # Deterministic IDs
-                intent.event_id = self._gen_uuid()
-                intent.trace_id = self._gen_uuid()
-                intent.ts = ts_str
-                
-                # Cache for ExecWorker (add bar_close for price fallback)
-                intent_dict = intent.to_dict()
-                if "meta" not in intent_dict or intent_dict["meta"] is None:
-                    intent_dict["meta"] = {}
-                intent_dict["meta"]["bar_close"] = last_row.get("close", 0.0) if hasattr(last_row, "get") else last_row["close"]
-                intent_cache[intent.event_id] = intent_dict
-                
-                # Publish to bus
-                bus.publish(
-                    topic=TOPIC_ORDER_INTENT,
-                    event_type="OrderIntentV1",
-                    trace_id=intent.trace_id,
-                    payload=intent_dict,
-                )
-                published_count += 1
-                self._event_count += 1
-                
-                # Log publish event
-                if jsonl_logger:
-                    from engine.structured_jsonl_logger import log_event
-                    log_event(
-                        jsonl_logger,
-                        trace_id=intent.trace_id,
-                        event_type="OrderIntentV1",
-                        step_id=self._step_count,
-                        action="publish",
-                        topic=TOPIC_ORDER_INTENT,
-                        extra={"event_id": intent.event_id, "symbol": intent.symbol},
+            if threaded:
+                # Workers consume concurrently while this thread produces
+                runtime = WorkerRuntime(bus, stop_controller=stop_controller)
+                runtime.add_worker("risk", risk_worker, TOPIC_ORDER_INTENT)
+                for k, worker in enumerate(exec_pool):
+                    runtime.add_worker(
+                        f"exec-{k}", worker, TOPIC_RISK_DECISION,
+                        partition=k if exec_workers > 1 else None,
                     )
+                runtime.add_worker("position", pos_worker or exec_report_drainer, TOPIC_EXECUTION_REPORT)
+                runtime.start()
             
-            # Update checkpoint after processing this bar index
             if checkpoint and checkpoint_path:
-                checkpoint = checkpoint.update(i - warmup)  # idx relative to warmup
-                checkpoint.save_atomic(checkpoint_path)
-        
-        # Phase 2: Drain queues with workers
-        drain_iter = 0
-        while drain_iter < max_drain_iterations:
-            drain_iter += 1
-            
-            # -- Risk Worker Stage --
-            risk_t0 = _metrics_clock() if metrics_collector else 0.0
-            risk_processed = risk_worker.step(bus, max_items=100)
-            # Advance simulated time for risk stage
-            if hasattr(self.time_provider, 'advance_ns') and risk_processed > 0:
-                self.time_provider.advance_ns(STAGE_LATENCY_NS["risk"] * risk_processed)
-            risk_t1 = _metrics_clock() if metrics_collector else 0.0
-            
-            # Record risk stage metrics (one per processed item)
-            if metrics_collector and risk_processed > 0:
-                # We record aggregate for the batch with a synthetic trace_id
-                metrics_collector.record_stage(
-                    stage="risk",
-                    step_id=self._step_count,
-                    trace_id=f"batch_risk_{drain_iter}",
-                    t_start=risk_t0,
-                    t_end=risk_t1,
-                    outcome="ok",
+                ckpt_writer = CheckpointWriter(
+                    checkpoint_path, checkpoint_policy, before_save=self._flush_positions,
                 )
             
-            # -- Exec Worker Stage --
-            exec_t0 = _metrics_clock() if metrics_collector else 0.0
-            exec_processed = exec_worker.step(bus, max_items=100)
-            # Advance simulated time for exec stage
-            if hasattr(self.time_provider, 'advance_ns') and exec_processed > 0:
-                self.time_provider.advance_ns(STAGE_LATENCY_NS["exec"] * exec_processed)
-            exec_t1 = _metrics_clock() if metrics_collector else 0.0
+            drain_iter = 0
+            drains = 0
+            peak_pending = 0
+            undrained = []  # Bar indices published since the last drain
             
-            if metrics_collector and exec_processed > 0:
-                metrics_collector.record_stage(
-                    stage="exec",
+            def _drain() -> None:
+                """Drain all stages to empty; drained intents leave intent_cache."""
+                nonlocal drain_iter, drains
+                drain_iter += drain_bus_workers(
+                    bus,
+                    risk_worker,
+                    exec_worker,
+                    pos_worker or exec_report_drainer,
+                    time_provider=self.time_provider,
+                    max_drain_iterations=max_drain_iterations,
+                    metrics_collector=metrics_collector,
                     step_id=self._step_count,
-                    trace_id=f"batch_exec_{drain_iter}",
-                    t_start=exec_t0,
-                    t_end=exec_t1,
-                    outcome="ok",
                 )
+                drains += 1
+                intent_cache.clear()
+                _checkpoint_drained()
             
-            # -- Position Store Stage --
-            pos_t0 = _metrics_clock() if metrics_collector else 0.0
-            if pos_worker:
-                pos_processed = pos_worker.step(bus, max_items=100)
-            elif exec_report_drainer:
-                pos_processed = exec_report_drainer.step(bus, max_items=100)
-            else:
-                pos_processed = 0
-            # Advance simulated time for position stage
-            if hasattr(self.time_provider, 'advance_ns') and pos_processed > 0:
-                self.time_provider.advance_ns(STAGE_LATENCY_NS["position"] * pos_processed)
-            pos_t1 = _metrics_clock() if metrics_collector else 0.0
+            def _checkpoint_drained() -> None:
+                """Advance the checkpoint over bars whose intents were drained."""
+                nonlocal checkpoint
+                if undrained and ckpt_writer:
+                    for idx in undrained:
+                        checkpoint = checkpoint.update(idx - warmup)
+                    ckpt_writer.update(checkpoint, bars=len(undrained))
+                undrained.clear()
             
-            if metrics_collector and pos_processed > 0:
-                metrics_collector.record_stage(
-                    stage="position",
-                    step_id=self._step_count,
-                    trace_id=f"batch_position_{drain_iter}",
-                    t_start=pos_t0,
-                    t_end=pos_t1,
-                    outcome="ok",
-                )
+            # Streaming/precompute mode: replay skipped bars into state, then one at a time
+            bars = None
+            if self._start_frame_run(ohlcv_df):
+                bars = _iter_bars(ohlcv_df, 0, end_idx)
+                for bar in itertools.islice(bars, actual_start):
+                    self._warm_bar(bar)
+            
+            for i in range(actual_start, end_idx):
+                # AG-3O-2-1: Check for graceful shutdown request
+                if stop_controller and stop_controller.is_stop_requested:
+                    logger.info("Bus mode: stop requested (%s), draining and exiting...", stop_controller.stop_reason)
+                    break
+                
+                if threaded and max_pending_intents is not None:
+                    # Backpressure: block until the risk worker catches up
+                    while not bus.wait_until_below(TOPIC_ORDER_INTENT, max_pending_intents, timeout=0.1):
+                        runtime.raise_if_failed()
+
+                self._step_count += 1
+                
+                if bars is not None:
+                    last_row = next(bars)
+                else:
+                    current_slice = ohlcv_df.iloc[:i+1]
+                    if current_slice.empty:
+                        continue
+                    last_row = current_slice.iloc[-1]
+                asof_ts, ts_str = self._bar_context(last_row)
+                
+                # Metrics: start strategy stage
+                strategy_t0 = _metrics_clock() if metrics_collector else 0.0
+                
+                if bars is not None:
+                    intents = self._bar_intents(last_row, i, asof_ts)
+                else:
+                    intents = self._strategy_fn(
+                        current_slice, self.strategy_params, self.ticker, asof_ts
+                    )
+                
+                # Advance simulated time for strategy stage (deterministic latency)
+                if hasattr(self.time_provider, 'advance_ns'):
+                    self.time_provider.advance_ns(STAGE_LATENCY_NS["strategy"])
+                
+                # Metrics: end strategy stage (per intent)
+                strategy_t1 = _metrics_clock() if metrics_collector else 0.0
+                
+                # Record strategy stage metric (once per bar, regardless of intents generated)
+                if metrics_collector:
+                    metrics_collector.record_stage(
+                        stage="strategy",
+                        step_id=self._step_count,
+                        trace_id=f"bar_{i}",
+                        t_start=strategy_t0,
+                        t_end=strategy_t1,
+                        outcome="ok" if intents else "no_signal",
+                    )
+                
+                for intent in intents:
+                    # Deterministic IDs
+                    intent.event_id = self._gen_uuid()
+                    intent.trace_id = self._gen_uuid()
+                    intent.ts = ts_str
+                    
+                    # Cache for ExecWorker (add bar_close for price fallback)
+                    intent_dict = intent.to_dict()
+                    if "meta" not in intent_dict or intent_dict["meta"] is None:
+                        intent_dict["meta"] = {}
+                    intent_dict["meta"]["bar_close"] = last_row.get("close", 0.0) if hasattr(last_row, "get") else last_row["close"]
+                    intent_cache[intent.event_id] = intent_dict
+                    
+                    # Publish to bus
+                    bus.publish(
+                        topic=TOPIC_ORDER_INTENT,
+                        event_type="OrderIntentV1",
+                        trace_id=intent.trace_id,
+                        payload=intent_dict,
+                    )
+                    published_count += 1
+                    self._event_count += 1
+                    
+                    # Log publish event
+                    if jsonl_logger:
+                        from engine.structured_jsonl_logger import log_event
+                        log_event(
+                            jsonl_logger,
+                            trace_id=intent.trace_id,
+                            event_type="OrderIntentV1",
+                            step_id=self._step_count,
+                            action="publish",
+                            topic=TOPIC_ORDER_INTENT,
+                            extra={"event_id": intent.event_id, "symbol": intent.symbol},
+                        )
+                
+                undrained.append(i)  # Checkpointed once the workers have drained it
+                if pipelined:
+                    pending = bus.size(TOPIC_ORDER_INTENT)
+                    peak_pending = max(peak_pending, pending)
+                    # Backpressure: stop producing until the pipeline is drained
+                    if (pipeline_batch is not None and len(undrained) >= pipeline_batch) or (
+                        max_pending_intents is not None and pending >= max_pending_intents
+                    ):
+                        _drain()
             
-            total_processed = risk_processed + exec_processed + pos_processed
+            # Phase 2: Drain queues with workers (remaining partial batch when pipelined)
+            if threaded:
+                # Producer is done: wait for every stage to empty, then join the threads
+                if runtime.drain():
+                    _checkpoint_drained()
+                runtime.stop()
+            elif not pipelined or undrained or drains == 0:
+                _drain()
             
-            # Check if all queues are empty
-            intent_pending = bus.size(TOPIC_ORDER_INTENT)
-            decision_pending = bus.size(TOPIC_RISK_DECISION)
-            report_pending = bus.size(TOPIC_EXECUTION_REPORT)
+            # Latest checkpoint reaches disk on completion and on graceful stop
+            if ckpt_writer:
+                ckpt_writer.close()
             
-            if intent_pending == 0 and decision_pending == 0 and report_pending == 0:
-                logger.info("Bus mode: all queues drained after %d iterations", drain_iter)
-                break
+            # Update metrics from workers
+            self._fill_count = sum(worker._fill_count for worker in exec_pool)
+            self._rejected_count = risk_worker._processed_count - self._fill_count
             
-            if total_processed == 0 and (intent_pending + decision_pending + report_pending) > 0:
-                # Stuck: events in queue but no progress
-                raise RuntimeError(
-                    f"Bus mode deadlock: pending events but no progress. "
-                    f"intent={intent_pending}, decision={decision_pending}, report={report_pending}"
+            if jsonl_logger:
+                from engine.structured_jsonl_logger import log_event
+                log_event(
+                    jsonl_logger,
+                    trace_id="SYSTEM",
+                    event_type="BusModeDone",
+                    step_id=self._step_count,
+                    action="complete",
+                    extra={"published": published_count, "drain_iterations": drain_iter},
                 )
-        else:
-            raise RuntimeError(
-                f"Bus mode: max_drain_iterations ({max_drain_iterations}) exceeded. "
-                f"Queues not empty: intent={bus.size(TOPIC_ORDER_INTENT)}, "
-                f"decision={bus.size(TOPIC_RISK_DECISION)}, report={bus.size(TOPIC_EXECUTION_REPORT)}"
-            )
-        
-        # Update metrics from workers
-        self._fill_count = exec_worker._fill_count
-        self._rejected_count = risk_worker._processed_count - exec_worker._fill_count
-        
-        # Close JSONL logger
-        if jsonl_logger:
-            from engine.structured_jsonl_logger import log_event, close_jsonl_logger
-            log_event(
-                jsonl_logger,
-                trace_id="SYSTEM",
-                event_type="BusModeDone",
-                step_id=self._step_count,
-                action="complete",
-                extra={"published": published_count, "drain_iterations": drain_iter},
-            )
-            close_jsonl_logger(jsonl_logger)
-        
-        return {
-            "metrics": self._get_metrics(),
-            "published": published_count,
-            "drain_iterations": drain_iter,
-        }
+            
+            result = {
+                "metrics": self._get_metrics(),
+                "published": published_count,
+                "drain_iterations": drain_iter,
+            }
+            if pipelined:
+                result["drains"] = drains
+                result["peak_pending_intents"] = peak_pending
+            if threaded:
+                result["workers"] = runtime.stats()
+            if ckpt_writer and checkpoint_policy is not None:
+                result["checkpoint_writes"] = ckpt_writer.writes
+            return result
+        except BaseException:
+            # Failed run: stop the worker threads without draining and close the writer
+            if runtime is not None:
+                try:
+                    runtime.stop(drain=False)
+                except RuntimeError as e:
+                    logger.warning("Bus mode: worker runtime failed during shutdown: %s", e)
+            if ckpt_writer is not None:
+                try:
+                    ckpt_writer.close()
+                except RuntimeError as e:
+                    logger.warning("Bus mode: checkpoint writer failed during shutdown: %s", e)
+            raise
+        finally:
+            # Close JSONL logger (joins the async writer thread)
+            if jsonl_logger:
+                close_jsonl_logger(jsonl_logger)
 
     def _step_with_adapter(
         self,
@@ -674,8 +1235,6 @@ class LoopStepper:
         Returns:
             List of event dicts (OrderIntent, RiskDecisionV1, ExecutionReportV1)
         """
-        from engine.exchange_adapter import ExecutionContext
-        
         events = []
         self._step_count += 1
         
@@ -686,20 +1245,32 @@ class LoopStepper:
         self.time_provider.advance_steps(1)
         
         last_row = ohlcv_slice.iloc[-1]
-        
-        if 'timestamp' in last_row:
-            asof_ts = last_row['timestamp']
-        else:
-            now_ns = self.time_provider.now_ns()
-            asof_ts = pd.Timestamp(now_ns, unit='ns', tz='UTC')
+        asof_ts, ts_str = self._bar_context(last_row)
         current_price = float(last_row['close'])
-        ts_str = asof_ts.isoformat() if hasattr(asof_ts, "isoformat") else str(asof_ts)
         
         # 1. Strategy: Generate order intents
         intents = self._strategy_fn(
             ohlcv_slice, self.strategy_params, self.ticker, asof_ts
         )
         
+        return self._submit_intents_via_adapter(
+            intents, bar_idx, exchange_adapter, ts_str, current_price
+        )
+
+    def _submit_intents_via_adapter(
+        self,
+        intents: List[OrderIntent],
+        bar_idx: int,
+        exchange_adapter: ExchangeAdapter,
+        ts_str: str,
+        current_price: float,
+    ) -> List[Dict[str, Any]]:
+        """Run intents through Risk -> ExchangeAdapter -> PositionStore."""
+        from engine.exchange_adapter import ExecutionContext
+        
+        events = []
+        fills = []  # Applied to the PositionStore in one transaction per bar
+        
         for intent in intents:
             # Deterministic IDs
             intent.event_id = self._gen_uuid()
@@ -740,7 +1311,9 @@ class LoopStepper:
                     trace_id=intent.trace_id,
                     meta=intent.meta,
                 )
-                decision = self._risk_v06.assess(intent_v1)
+                decision = self._risk_v06.assess(
+                    intent_v1, current_weights=self._risk_weights(intent.symbol, current_price),
+                )
                 decision.event_id = decision_event_id
                 decision.ts = ts_str
                 if decision.trace_id != intent.trace_id:
@@ -750,7 +1323,9 @@ class LoopStepper:
                     "assets": [intent.symbol],
                     "deltas": {intent.symbol: 0.10},
                 }
-                allowed, annotated = self._risk_v04.filter_signal(signal, {}, nav_eur=10000.0)
+                allowed, annotated = self._risk_v04.filter_signal(
+                    signal, self._risk_weights(intent.symbol, current_price), nav_eur=RISK_NAV,
+                )
                 rejection_reasons = annotated.get("risk_reasons", [])
                 
                 decision = RiskDecisionV1(
@@ -832,15 +1407,13 @@ class LoopStepper:
                 
                 # 4. Apply to PositionStore if available
                 if self._state_store and report.status in ("FILLED", "PARTIALLY_FILLED"):
-                    self._state_store.apply_fill(
-                        symbol=intent.symbol,
-                        side=intent.side,
-                        qty=report.filled_qty,
-                        price=report.avg_price,
-                    )
+                    fills.append((intent.symbol, intent.side, report.filled_qty, report.avg_price))
             else:
                 self._rejected_count += 1
         
+        if fills:
+            self._state_store.apply_fills(fills)
+        
         return events
 
     def run_adapter_mode(
@@ -854,12 +1427,79 @@ class LoopStepper:
         exchange_adapter: Optional[ExchangeAdapter] = None,
         checkpoint = None,  # AG-3M-2-1: Optional Checkpoint for progress tracking
         checkpoint_path: Optional[Path] = None,  # AG-3M-2-1: Path to save checkpoint
+        checkpoint_policy: Optional[CheckpointPolicy] = None,
         start_idx: int = 0,  # AG-3M-2-1: Resume from this step index
         stop_controller = None,  # AG-3O-2-1: Graceful shutdown
+        snapshot: Optional[EngineSnapshot] = None,
+        snapshot_path: Optional[Path] = None,
+        sink: Optional[EventSink] = None,
+        event_observer: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """
         Run simulation consuming events directly from MarketDataAdapter.
         
+        See iter_adapter_events() for the flow and the no-lookahead guard.
+        
+        Args:
+            adapter: MarketDataAdapter instance (must implement poll, peek_next_ts)
+            sink: Optional EventSink; events are written to it as produced
+                and only per-type counts are kept (the caller closes the sink)
+            max_steps..event_observer: As in iter_adapter_events()
+            
+        Returns:
+            Dict with metrics and events (or event_counts when sink is given)
+        """
+        stream = self.iter_adapter_events(
+            adapter,
+            max_steps=max_steps,
+            warmup=warmup,
+            log_jsonl_path=log_jsonl_path,
+            metrics_collector=metrics_collector,
+            exchange_adapter=exchange_adapter,
+            checkpoint=checkpoint,
+            checkpoint_path=checkpoint_path,
+            checkpoint_policy=checkpoint_policy,
+            start_idx=start_idx,
+            stop_controller=stop_controller,
+            snapshot=snapshot,
+            snapshot_path=snapshot_path,
+            event_observer=event_observer,
+        )
+        events, counts, summary = _consume_events(stream, sink)
+        if "status" in summary:
+            return summary
+        if sink is None:
+            return {"events": events, **summary}
+        return {**summary, "event_counts": counts.as_dict()}
+
+    def iter_adapter_events(
+        self,
+        adapter,  # MarketDataAdapter Protocol
+        *,
+        max_steps: Optional[int] = None,
+        warmup: int = 10,
+        log_jsonl_path: Optional[Union[str, Path]] = None,
+        metrics_collector = None,
+        exchange_adapter: Optional[ExchangeAdapter] = None,
+        checkpoint = None,  # AG-3M-2-1: Optional Checkpoint for progress tracking
+        checkpoint_path: Optional[Path] = None,  # AG-3M-2-1: Path to save checkpoint
+        checkpoint_policy: Optional[CheckpointPolicy] = None,
+        start_idx: int = 0,  # AG-3M-2-1: Resume from this step index
+        stop_controller = None,  # AG-3O-2-1: Graceful shutdown
+        snapshot: Optional[EngineSnapshot] = None,
+        snapshot_path: Optional[Path] = None,
+        event_observer: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        """
+        Yield events of an adapter-driven simulation as they are produced.
+        
+        Generator form of run_adapter_mode(): each step's events are yielded
+        after its JSONL trace and checkpoint are written; the summary dict
+        (metrics, consumed, steps_processed, or status) is the generator's
+        return value. Closing it early (break, close()) or an error still
+        saves the latest checkpoint and closes the JSONL trace; AdapterModeDone
+        is logged only when the run completes.
+        
         AG-3L-1-1: Direct adapter integration without public DataFrame bridge.
         AG-3M-1-1: End-to-end execution via ExchangeAdapter (paper/stub).
         AG-3M-2-1: Checkpoint/resume support for crash recovery.
@@ -870,7 +1510,7 @@ class LoopStepper:
         3. Guard: assert no event has ts > current_step_ts (no-lookahead)
         4. Build incremental OHLCV slice internally (private helper)
         5. Process: Strategy -> Risk -> Exec (via exchange_adapter) -> PositionStore
-        6. Save checkpoint after each step (if checkpoint provided)
+        6. Update checkpoint after each step (saved per checkpoint_policy)
         
         Args:
             adapter: MarketDataAdapter instance (must implement poll, peek_next_ts)
@@ -881,10 +1521,24 @@ class LoopStepper:
             exchange_adapter: Optional ExchangeAdapter for execution (paper/stub)
             checkpoint: Optional Checkpoint for progress tracking (AG-3M-2-1)
             checkpoint_path: Path to save checkpoint (AG-3M-2-1)
+            checkpoint_policy: When/how checkpoint_path is saved (None = every
+                step, synchronously); the latest checkpoint is saved on exit
             start_idx: Resume from this step index (AG-3M-2-1)
+            stop_controller: Optional StopController for graceful shutdown
+            snapshot: Resume from this EngineSnapshot instead of replaying
+                history: engine state is restored, the snapshot's consumed
+                events are skipped unprocessed and its checkpoint/start index
+                replace checkpoint/start_idx
+            snapshot_path: Also save an EngineSnapshot here whenever the
+                checkpoint is saved (requires checkpoint and checkpoint_path)
+            event_observer: Called with each JSONL trace record as it is
+                logged (e.g. RunMetricsAggregator.observe)
+            
+        Yields:
+            Event dicts ({"type": ..., "payload": {...}})
             
         Returns:
-            Dict with metrics and events
+            Summary dict with metrics (StopIteration.value)
             
         Raises:
             AssertionError: If adapter returns event with ts > current_step_ts (lookahead)
@@ -892,204 +1546,251 @@ class LoopStepper:
         if stop_controller and stop_controller.is_stop_requested:
             return {"metrics": self._get_metrics(), "published": 0, "status": "stopped_early"}
 
-        all_events = []
-        
         # Initialize JSONL logger if path provided
         jsonl_logger = None
         if log_jsonl_path:
             from engine.structured_jsonl_logger import get_jsonl_logger, log_event, close_jsonl_logger
-            jsonl_logger = get_jsonl_logger(log_jsonl_path)
-        
-        # Internal OHLCV accumulator (private - NOT exposed as API)
-        # This is the "shim interno" that builds DataFrame incrementally for step()
-        _ohlcv_rows = []
-        
-        # Helper for deterministic metrics clock
-        def _metrics_clock():
-            return self.time_provider.now_ns() / 1e9
-        
-        # Track consumed events
-        consumed_count = 0
-        step_count = 0
-        
-        # AG-3M-2-1: Resume support
-        # If resuming (start_idx > 0), we need to:
-        # 1. Skip warmup (already done in previous run)
-        # 2. Skip already-processed steps
-        # 3. Rebuild _ohlcv_rows to have correct slice for strategy
-        is_resuming = start_idx > 0
-        
-        # Warmup phase: consume without processing (skip if resuming)
-        warmup_consumed = 0
-        if not is_resuming:
-            while warmup_consumed < warmup:
-                next_ts = adapter.peek_next_ts()
-                if next_ts is None:
-                    logger.warning(
-                        "Adapter exhausted during warmup (consumed %d of %d required)",
-                        warmup_consumed, warmup
-                    )
-                    break
-                
-                events = adapter.poll(max_items=1)
-                if not events:
-                    break
-                
-                event = events[0]
-                _ohlcv_rows.append({
-                    "timestamp": pd.Timestamp(event.ts, unit="ms", tz="UTC"),
-                    "open": event.open,
-                    "high": event.high,
-                    "low": event.low,
-                    "close": event.close,
-                    "volume": event.volume,
-                })
-                warmup_consumed += 1
-                consumed_count += 1
-            
-            if warmup_consumed < warmup:
-                return {"events": [], "metrics": self._get_metrics(), "consumed": consumed_count}
-        else:
-            # Resuming: skip warmup + already processed steps
-            # We need to consume (warmup + start_idx) events to rebuild state
-            skip_count = warmup + start_idx
-            for _ in range(skip_count):
-                next_ts = adapter.peek_next_ts()
-                if next_ts is None:
-                    break
-                events = adapter.poll(max_items=1)
-                if not events:
-                    break
-                event = events[0]
-                _ohlcv_rows.append({
-                    "timestamp": pd.Timestamp(event.ts, unit="ms", tz="UTC"),
-                    "open": event.open,
-                    "high": event.high,
-                    "low": event.low,
-                    "close": event.close,
-                    "volume": event.volume,
-                })
-                consumed_count += 1
-            
-            logger.info("Resumed adapter-mode: skipped %d events (warmup=%d, processed=%d)",
-                       consumed_count, warmup, start_idx)
+            jsonl_logger = get_jsonl_logger(log_jsonl_path, async_mode=True, observer=event_observer)
         
-        # Main processing loop
-        end_steps = max_steps if max_steps else float('inf')
-        
-        while step_count < end_steps:
-            # AG-3O-2-1: Check for graceful shutdown request
-            if stop_controller and stop_controller.is_stop_requested:
-                logger.info("Adapter mode: stop requested (%s), exiting...", stop_controller.stop_reason)
-                break
-
-            next_ts = adapter.peek_next_ts()
-            if next_ts is None:
-                # Adapter exhausted
-                break
-            
-            # Current step timestamp is the next event's ts
-            current_step_ts = next_ts
-            
-            # Poll with up_to_ts boundary (no-lookahead enforcement)
-            events = adapter.poll(max_items=1, up_to_ts=current_step_ts)
-            
-            if not events:
-                # No more events within boundary
-                break
-            
-            event = events[0]
+        ckpt_writer = None
+        snap_writer = None
+        snapped = None  # Checkpoint of the last snapshot taken
+        stepping = False
+        completed = False
+        try:
+            # Internal OHLCV window (private - NOT exposed as API)
+            # Bounded ring buffer sized from the strategy's declared lookback; the
+            # DataFrame handed to step() is a view over it (no per-step rebuild).
+            # Streaming mode needs no window: bars are pushed into strategy state.
+            # Precompute strategies have no full frame here and act as slice fns.
+            self._schedule = None
+            if self.streaming:
+                self._reset_strategy_state()
+                self._ohlcv_buffer = None
+            else:
+                self._ohlcv_buffer = OHLCVRingBuffer(self._ohlcv_window_capacity())
             
-            # NO-LOOKAHEAD GUARD (critical invariant)
-            assert event.ts <= current_step_ts, (
-                f"Lookahead violation: event.ts={event.ts} > current_step_ts={current_step_ts}"
-            )
+            last_event_ts: Optional[int] = None
             
-            # Accumulate to internal OHLCV slice
-            _ohlcv_rows.append({
-                "timestamp": pd.Timestamp(event.ts, unit="ms", tz="UTC"),
-                "open": event.open,
-                "high": event.high,
-                "low": event.low,
-                "close": event.close,
-                "volume": event.volume,
-            })
-            consumed_count += 1
+            def _accumulate(event) -> None:
+                """Feed a consumed-but-not-stepped event (warmup/resume)."""
+                nonlocal last_event_ts
+                last_event_ts = event.ts
+                if self.streaming:
+                    self._warm_bar(_event_to_bar(event))
+                else:
+                    self._ohlcv_buffer.append_event(event)
             
-            # Build DataFrame slice for step()
-            ohlcv_slice = pd.DataFrame(_ohlcv_rows)
+            # Helper for deterministic metrics clock
+            def _metrics_clock():
+                return self.time_provider.now_ns() / 1e9
             
-            # Metrics: start strategy stage
-            strategy_t0 = _metrics_clock() if metrics_collector else 0.0
+            # Track consumed events
+            consumed_count = 0
+            step_count = 0
             
-            bar_idx = len(_ohlcv_rows) - 1
+            # AG-3M-2-1: Resume support
+            # If resuming (start_idx > 0), we need to:
+            # 1. Skip warmup (already done in previous run)
+            # 2. Skip already-processed steps
+            # 3. Refill the OHLCV window to have correct slice for strategy
+            # With a snapshot, 3. is replaced by restoring the captured engine state.
+            is_resuming = start_idx > 0
             
-            # AG-3M-1-1: When exchange_adapter is provided, do end-to-end wiring
-            # Strategy -> Risk -> Exec (via ExchangeAdapter) -> PositionStore
-            if exchange_adapter is not None:
-                step_events_list = self._step_with_adapter(
-                    ohlcv_slice, bar_idx, exchange_adapter, current_step_ts
-                )
+            # Warmup phase: consume without processing (skip if resuming)
+            warmup_consumed = 0
+            if snapshot is not None:
+                self.restore(snapshot)
+                checkpoint = snapshot.checkpoint
+                start_idx = checkpoint.last_processed_idx + 1
+                consumed_count = _skip_events(adapter, snapshot.consumed, snapshot.last_event_ts)
+                last_event_ts = snapshot.last_event_ts
+                
+                logger.info("Resumed adapter-mode from snapshot: skipped %d events (processed=%d)",
+                           consumed_count, start_idx)
+            elif not is_resuming:
+                while warmup_consumed < warmup:
+                    next_ts = adapter.peek_next_ts()
+                    if next_ts is None:
+                        logger.warning(
+                            "Adapter exhausted during warmup (consumed %d of %d required)",
+                            warmup_consumed, warmup
+                        )
+                        break
+                    
+                    events = adapter.poll(max_items=1)
+                    if not events:
+                        break
+                    
+                    _accumulate(events[0])
+                    warmup_consumed += 1
+                    consumed_count += 1
+                
+                if warmup_consumed < warmup:
+                    return {"metrics": self._get_metrics(), "consumed": consumed_count}
             else:
-                # Original behavior: use step() which uses simulate_execution()
-                step_events_list = self.step(ohlcv_slice, bar_idx=bar_idx)
-            
-            all_events.extend(step_events_list)
-            step_count += 1
+                # Resuming: skip warmup + already processed steps
+                # We need to consume (warmup + start_idx) events to rebuild state
+                skip_count = warmup + start_idx
+                capacity = self._ohlcv_buffer.capacity if self._ohlcv_buffer is not None else None
+                if capacity is not None and skip_count > capacity and hasattr(adapter, "seek_index"):
+                    # Bounded window: only the last `capacity` events can reach the strategy
+                    consumed_count = _skip_events(adapter, skip_count - capacity)
+                for _ in range(skip_count - consumed_count):
+                    next_ts = adapter.peek_next_ts()
+                    if next_ts is None:
+                        break
+                    events = adapter.poll(max_items=1)
+                    if not events:
+                        break
+                    _accumulate(events[0])
+                    consumed_count += 1
+                
+                logger.info("Resumed adapter-mode: skipped %d events (warmup=%d, processed=%d)",
+                           consumed_count, warmup, start_idx)
             
-            # Advance simulated time for strategy stage
-            if hasattr(self.time_provider, 'advance_ns'):
-                self.time_provider.advance_ns(STAGE_LATENCY_NS["strategy"])
+            if checkpoint and checkpoint_path:
+                ckpt_writer = CheckpointWriter(
+                    checkpoint_path, checkpoint_policy, before_save=self._flush_positions,
+                )
+                if snapshot_path:
+                    # Snapshots are only taken when a checkpoint save is issued
+                    async_write = checkpoint_policy.async_write if checkpoint_policy else False
+                    snap_writer = CheckpointWriter(snapshot_path, CheckpointPolicy(async_write=async_write))
             
-            strategy_t1 = _metrics_clock() if metrics_collector else 0.0
+            # Main processing loop
+            end_steps = max_steps if max_steps else float('inf')
             
-            # Record strategy stage metric
-            if metrics_collector:
-                metrics_collector.record_stage(
-                    stage="strategy",
-                    step_id=self._step_count,
-                    trace_id=f"adapter_bar_{bar_idx}",
-                    t_start=strategy_t0,
-                    t_end=strategy_t1,
-                    outcome="ok" if step_events_list else "no_signal",
+            while step_count < end_steps:
+                # AG-3O-2-1: Check for graceful shutdown request
+                if stop_controller and stop_controller.is_stop_requested:
+                    logger.info("Adapter mode: stop requested (%s), exiting...", stop_controller.stop_reason)
+                    break
+
+                next_ts = adapter.peek_next_ts()
+                if next_ts is None:
+                    # Adapter exhausted
+                    break
+                
+                # Current step timestamp is the next event's ts
+                current_step_ts = next_ts
+                
+                # Poll with up_to_ts boundary (no-lookahead enforcement)
+                events = adapter.poll(max_items=1, up_to_ts=current_step_ts)
+                
+                if not events:
+                    # No more events within boundary
+                    break
+                
+                event = events[0]
+                
+                # NO-LOOKAHEAD GUARD (critical invariant)
+                assert event.ts <= current_step_ts, (
+                    f"Lookahead violation: event.ts={event.ts} > current_step_ts={current_step_ts}"
                 )
-            
-            # Log to JSONL
-            if jsonl_logger and step_events_list:
-                from engine.structured_jsonl_logger import log_event
-                for evt in step_events_list:
-                    log_event(
-                        jsonl_logger,
-                        trace_id=evt.get("payload", {}).get("trace_id", "unknown"),
-                        event_type=evt.get("type", "unknown"),
+                
+                stepping = True  # Engine state runs ahead of the checkpoint until updated
+                consumed_count += 1
+                bar_idx = consumed_count - 1
+                last_event_ts = event.ts
+                
+                # Metrics: start strategy stage
+                strategy_t0 = _metrics_clock() if metrics_collector else 0.0
+                
+                if self.streaming:
+                    # Streaming: push the bar into strategy state, no slice rebuild
+                    step_events_list = self.step_bar(_event_to_bar(event), bar_idx, exchange_adapter)
+                else:
+                    # Append to the OHLCV window and view it as a DataFrame for step()
+                    self._ohlcv_buffer.append_event(event)
+                    ohlcv_slice = self._ohlcv_buffer.to_frame()
+                    
+                    # AG-3M-1-1: When exchange_adapter is provided, do end-to-end wiring
+                    # Strategy -> Risk -> Exec (via ExchangeAdapter) -> PositionStore
+                    if exchange_adapter is not None:
+                        step_events_list = self._step_with_adapter(
+                            ohlcv_slice, bar_idx, exchange_adapter, current_step_ts
+                        )
+                    else:
+                        # Original behavior: use step() which uses simulate_execution()
+                        step_events_list = self.step(ohlcv_slice, bar_idx=bar_idx)
+                
+                step_count += 1
+                
+                # Advance simulated time for strategy stage
+                if hasattr(self.time_provider, 'advance_ns'):
+                    self.time_provider.advance_ns(STAGE_LATENCY_NS["strategy"])
+                
+                strategy_t1 = _metrics_clock() if metrics_collector else 0.0
+                
+                # Record strategy stage metric
+                if metrics_collector:
+                    metrics_collector.record_stage(
+                        stage="strategy",
                         step_id=self._step_count,
-                        action="emit",
-                        extra={"bar_idx": bar_idx},
+                        trace_id=f"adapter_bar_{bar_idx}",
+                        t_start=strategy_t0,
+                        t_end=strategy_t1,
+                        outcome="ok" if step_events_list else "no_signal",
                     )
+                
+                # Log to JSONL
+                if jsonl_logger and step_events_list:
+                    from engine.structured_jsonl_logger import log_event
+                    for evt in step_events_list:
+                        log_event(
+                            jsonl_logger,
+                            trace_id=evt.get("payload", {}).get("trace_id", "unknown"),
+                            event_type=evt.get("type", "unknown"),
+                            step_id=self._step_count,
+                            action="emit",
+                            extra={"bar_idx": bar_idx},
+                        )
+                
+                # AG-3M-2-1: Update checkpoint after each step (saved per checkpoint_policy)
+                if ckpt_writer:
+                    # step_count is 1-indexed here (incremented above), use as processed index
+                    checkpoint = checkpoint.update(start_idx + step_count - 1)
+                    if ckpt_writer.update(checkpoint) and snap_writer:
+                        snap_writer.update(self.snapshot(checkpoint, consumed_count, last_event_ts))
+                        snapped = checkpoint
+                stepping = False
+                
+                yield from step_events_list
             
-            # AG-3M-2-1: Update and save checkpoint after each step
-            if checkpoint and checkpoint_path:
-                # step_count is 1-indexed here (incremented above), use as processed index
-                checkpoint = checkpoint.update(start_idx + step_count - 1)
-                checkpoint.save_atomic(checkpoint_path)
-        
-        # Close JSONL logger
-        if jsonl_logger:
-            from engine.structured_jsonl_logger import log_event, close_jsonl_logger
-            log_event(
-                jsonl_logger,
-                trace_id="SYSTEM",
-                event_type="AdapterModeDone",
-                step_id=self._step_count,
-                action="complete",
-                extra={"consumed": consumed_count, "steps": step_count},
-            )
-            close_jsonl_logger(jsonl_logger)
+            completed = True
+        finally:
+            # Latest checkpoint reaches disk on completion, graceful stop, early
+            # close of the generator (break) and errors
+            try:
+                if ckpt_writer:
+                    if snap_writer and snapped is not checkpoint and not stepping:
+                        snap_writer.update(self.snapshot(checkpoint, consumed_count, last_event_ts))
+                    try:
+                        ckpt_writer.close()
+                    finally:
+                        if snap_writer:
+                            snap_writer.close()
+            finally:
+                # Close JSONL logger
+                if jsonl_logger:
+                    if completed:
+                        log_event(
+                            jsonl_logger,
+                            trace_id="SYSTEM",
+                            event_type="AdapterModeDone",
+                            step_id=self._step_count,
+                            action="complete",
+                            extra={"consumed": consumed_count, "steps": step_count},
+                        )
+                    close_jsonl_logger(jsonl_logger)
         
-        return {
-            "events": all_events,
+        summary = {
             "metrics": self._get_metrics(),
             "consumed": consumed_count,
             "steps_processed": step_count,
         }
+        if ckpt_writer and checkpoint_policy is not None:
+            summary["checkpoint_writes"] = ckpt_writer.writes
+        return summary
 
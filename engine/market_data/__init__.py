@@ -4,7 +4,11 @@ engine/market_data/__init__.py
 Market data feed components for pluggable data sources.
 """
 
-from engine.market_data.market_data_adapter import MarketDataEvent, MarketDataAdapter
+from engine.market_data.market_data_adapter import (
+    MarketDataEvent,
+    MarketDataAdapter,
+    SeekableMarketDataAdapter,
+)
 from engine.market_data.fixture_adapter import FixtureMarketDataAdapter, FixtureSchemaError
 from engine.market_data.ccxt_adapter import (
     CCXTMarketDataAdapter,
@@ -13,10 +17,12 @@ from engine.market_data.ccxt_adapter import (
     MockOHLCVClient,
     NetworkDisabledError,
 )
+from engine.market_data.ohlcv_ring_buffer import OHLCVRingBuffer, OHLCV_COLUMNS
 
 __all__ = [
     "MarketDataEvent",
     "MarketDataAdapter",
+    "SeekableMarketDataAdapter",
     "FixtureMarketDataAdapter",
     "FixtureSchemaError",
     "CCXTMarketDataAdapter",
@@ -24,5 +30,7 @@ __all__ = [
     "OHLCVClient",
     "MockOHLCVClient",
     "NetworkDisabledError",
+    "OHLCVRingBuffer",
+    "OHLCV_COLUMNS",
 ]
 
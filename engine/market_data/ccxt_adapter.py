@@ -4,6 +4,7 @@ engine/market_data/ccxt_adapter.py
 CCXT-based market data adapter with network gating.
 
 AG-3K-2-1: Gated CCXT sandbox feed - no network calls without explicit opt-in.
+Seekable: seek(ts) restarts paging with a since-based refetch.
 
 Note: ccxt is NOT a required dependency. This adapter uses a Protocol for the
 client interface, allowing injection of mock clients for testing without network.
@@ -194,6 +195,8 @@ class CCXTMarketDataAdapter:
         - Client injection for testing without network
         - Respects up_to_ts for no-lookahead guarantee
         - Buffer management for sequential poll()
+        - seek(ts): drops the buffer and refetches from since=ts on the next
+          poll (one page, independent of how far the feed was consumed)
     
     Gating:
         Network calls are blocked unless:
@@ -348,6 +351,46 @@ class CCXTMarketDataAdapter:
             return self._buffer[0].ts
         return None
     
+    def seek(self, ts: int) -> None:
+        """
+        Position before the first candle with ts >= ts.
+        
+        No fetch happens here: the buffer is dropped and the next poll()
+        fetches one page starting at ts (candles before ts are skipped by the
+        usual already-seen filter, so inclusive and exclusive 'since'
+        semantics both work).
+        """
+        self._buffer = []
+        self._exhausted = False
+        self._last_fetch_ts = ts - 1
+    
+    def seek_index(self, index: int) -> None:
+        """
+        Position before the index-th candle from config.since (0-based).
+        
+        Exchanges have no random access by position, so this pages from the
+        start of the feed and drops index candles (O(index / limit) fetches);
+        prefer seek(ts) when the timestamp is known.
+        
+        Raises:
+            ValueError: If index is negative
+            NetworkDisabledError: If network is not allowed
+        """
+        if index < 0:
+            raise ValueError(f"index must be >= 0, got {index}")
+        self._buffer = []
+        self._exhausted = False
+        self._last_fetch_ts = None
+        while index > 0:
+            if not self._buffer:
+                if self._exhausted:
+                    break
+                self._fetch_and_buffer()
+                continue
+            n = min(index, len(self._buffer))
+            del self._buffer[:n]
+            index -= n
+    
     def is_exhausted(self) -> bool:
         """Check if adapter has no more data to provide."""
         return self._exhausted and not self._buffer
@@ -5,11 +5,13 @@ Offline deterministic market data adapter for CI/testing.
 
 AG-3K-1-1: FixtureMarketDataAdapter loads CSV fixtures using existing ohlcv_loader.
 AG-3K-1-2: Hardening - schema validation, no-lookahead via up_to_ts, gaps awareness.
+Seekable: seek(ts) / seek_index(i) by binary search over the timestamp array.
 """
 
 from pathlib import Path
 from typing import List, Optional
 import logging
+import numpy as np
 import pandas as pd
 
 from data_adapters.ohlcv_loader import load_ohlcv, REQUIRED_COLUMNS
@@ -94,6 +96,7 @@ class FixtureMarketDataAdapter:
         
         # Convert timestamps to epoch ms
         self._events = self._build_events()
+        self._ts = np.fromiter((e.ts for e in self._events), dtype=np.int64, count=len(self._events))
         self._idx = 0
     
     def _validate_schema(self) -> None:
@@ -230,6 +233,26 @@ class FixtureMarketDataAdapter:
         """Reset adapter to beginning for re-iteration."""
         self._idx = 0
     
+    def seek(self, ts: int) -> None:
+        """
+        Position before the first event with ts >= ts (binary search).
+        
+        Args:
+            ts: Timestamp (epoch ms UTC); past the last event means EOF.
+        """
+        self._idx = int(np.searchsorted(self._ts, ts, side="left"))
+    
+    def seek_index(self, index: int) -> None:
+        """
+        Position before the index-th event (0-based); past the end means EOF.
+        
+        Raises:
+            ValueError: If index is negative
+        """
+        if index < 0:
+            raise ValueError(f"index must be >= 0, got {index}")
+        self._idx = min(index, len(self._events))
+    
     def remaining(self) -> int:
         """Return number of events remaining."""
         return len(self._events) - self._idx
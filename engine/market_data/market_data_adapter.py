@@ -5,6 +5,9 @@ Protocol and dataclass for pluggable market data feeds.
 
 AG-3K-1-1: Introduces MarketDataAdapter Protocol and MarketDataEvent.
 AG-3K-1-2: Hardening - clarified poll() contract, EOF behavior, no-lookahead.
+
+SeekableMarketDataAdapter: optional seek(ts) / seek_index(i) extension so
+resumed runs can fast-forward instead of polling and discarding history.
 """
 
 from dataclasses import dataclass
@@ -92,3 +95,34 @@ class MarketDataAdapter(Protocol):
             - Events are ordered: result[i].ts <= result[i+1].ts
         """
         ...
+
+
+class SeekableMarketDataAdapter(MarketDataAdapter, Protocol):
+    """
+    MarketDataAdapter that can be repositioned without consuming events.
+    
+    Seeking is the constant-time alternative to polling and discarding
+    already-processed events on resume (run_adapter_mode uses it when
+    available, falling back to poll()).
+    
+    Contract:
+        1. After seek(ts), the next poll() returns the first event with
+           event.ts >= ts (or [] if there is none).
+        2. After seek_index(i), the next poll() returns the i-th event of the
+           feed (0-based, from the feed's start); i past the end means EOF.
+        3. Seeking never returns events and may move backwards or forwards.
+        4. poll() contract (ordering, up_to_ts, EOF) is unchanged.
+    """
+    
+    def seek(self, ts: int) -> None:
+        """Position before the first event with ts >= ts (epoch ms UTC)."""
+        ...
+    
+    def seek_index(self, index: int) -> None:
+        """
+        Position before the index-th event (0-based).
+        
+        Raises:
+            ValueError: If index is negative
+        """
+        ...
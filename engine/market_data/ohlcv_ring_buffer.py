@@ -0,0 +1,191 @@
+"""
+engine/market_data/ohlcv_ring_buffer.py
+
+Fixed-capacity, NumPy-backed OHLCV window for incremental consumers.
+
+Replaces the list-of-dicts + pd.DataFrame(rows) rebuild in
+LoopStepper.run_adapter_mode: appends are O(1) and the window is bounded by
+the strategy's declared lookback, so per-step cost no longer grows with
+history.
+
+Layout (mirrored ring):
+    Every row is written twice, at slot i and slot i + capacity, so the most
+    recent `size` rows are ALWAYS a contiguous slice of the backing arrays.
+    Readers therefore get zero-copy views without any wrap-around handling.
+
+Views are only valid until the next append (the backing memory is reused).
+Consumers that need to keep data must copy it.
+
+Snapshots:
+    snapshot() returns a JSON-serializable dict (rows in chronological order)
+    and from_snapshot() rebuilds an identical buffer, so checkpoints can
+    capture the window instead of replaying history.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class OHLCVRingBuffer:
+    """
+    Ring buffer of OHLCV bars (timestamps as epoch ms UTC).
+
+    Usage:
+        buf = OHLCVRingBuffer(capacity=50)
+        buf.append(ts_ms, o, h, l, c, v)
+        closes = buf.column("close")      # zero-copy view, oldest -> newest
+        df = buf.to_frame()               # DataFrame over the same memory
+
+    Attributes:
+        capacity: Maximum number of bars retained (None = unbounded, grows x2)
+    """
+
+    _INITIAL_GROWABLE_CAPACITY = 64
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Initialize empty buffer.
+
+        Args:
+            capacity: Max bars retained. None keeps full history (legacy
+                semantics for strategies without a declared lookback).
+
+        Raises:
+            ValueError: If capacity is not a positive integer
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self._slots = capacity if capacity is not None else self._INITIAL_GROWABLE_CAPACITY
+        self._ts = np.empty(2 * self._slots, dtype=np.int64)
+        self._values = np.empty((len(OHLCV_COLUMNS), 2 * self._slots), dtype=np.float64)
+        self._head = 0  # Next write slot in [0, _slots)
+        self._size = 0
+        self._total_appended = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def total_appended(self) -> int:
+        """Number of bars appended over the buffer's lifetime."""
+        return self._total_appended
+
+    def _grow(self) -> None:
+        """Double the backing storage, keeping rows in order (unbounded mode)."""
+        ts = self.timestamps().copy()
+        values = self._window(self._values).copy()
+
+        self._slots *= 2
+        self._ts = np.empty(2 * self._slots, dtype=np.int64)
+        self._values = np.empty((len(OHLCV_COLUMNS), 2 * self._slots), dtype=np.float64)
+        n = len(ts)
+        self._ts[:n] = ts
+        self._ts[self._slots:self._slots + n] = ts
+        self._values[:, :n] = values
+        self._values[:, self._slots:self._slots + n] = values
+        self._head = n
+
+    def append(
+        self,
+        ts: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        """Append one bar; evicts the oldest bar when full (bounded mode)."""
+        if self.capacity is None and self._size == self._slots:
+            self._grow()
+
+        i = self._head
+        j = i + self._slots
+        self._ts[i] = self._ts[j] = ts
+        col = self._values
+        col[0, i] = col[0, j] = open
+        col[1, i] = col[1, j] = high
+        col[2, i] = col[2, j] = low
+        col[3, i] = col[3, j] = close
+        col[4, i] = col[4, j] = volume
+
+        self._head = (i + 1) % self._slots
+        if self._size < self._slots:
+            self._size += 1
+        self._total_appended += 1
+
+    def append_event(self, event) -> None:
+        """Append a MarketDataEvent."""
+        self.append(event.ts, event.open, event.high, event.low, event.close, event.volume)
+
+    def _bounds(self) -> tuple:
+        start = self._head - self._size + self._slots
+        return start, start + self._size
+
+    def _window(self, arr: np.ndarray) -> np.ndarray:
+        start, end = self._bounds()
+        return arr[..., start:end]
+
+    def timestamps(self) -> np.ndarray:
+        """Zero-copy view of timestamps (epoch ms), oldest -> newest."""
+        return self._window(self._ts)
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy view of one OHLCV column, oldest -> newest."""
+        return self._window(self._values[OHLCV_COLUMNS.index(name)])
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame over the current window.
+
+        Price/volume columns share memory with the buffer (single float block);
+        only the timestamp column is materialized. Same column layout as the
+        legacy pd.DataFrame(_ohlcv_rows) slice.
+        """
+        df = pd.DataFrame(
+            self._window(self._values).T,
+            columns=list(OHLCV_COLUMNS),
+            copy=False,
+        )
+        df.insert(0, "timestamp", pd.to_datetime(self.timestamps(), unit="ms", utc=True))
+        return df
+
+    def last(self) -> Dict[str, Any]:
+        """Most recent bar as a dict (timestamp as epoch ms)."""
+        if self._size == 0:
+            raise IndexError("last() on empty OHLCVRingBuffer")
+        idx = self._head - 1 + self._slots
+        bar = {"ts": int(self._ts[idx])}
+        for k, name in enumerate(OHLCV_COLUMNS):
+            bar[name] = float(self._values[k, idx])
+        return bar
+
+    # -------------------------------------------------------------------------
+    # Snapshot / restore
+    # -------------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return JSON-serializable state (rows in chronological order)."""
+        snap: Dict[str, Any] = {
+            "capacity": self.capacity,
+            "total_appended": self._total_appended,
+            "ts": self.timestamps().tolist(),
+        }
+        for name in OHLCV_COLUMNS:
+            snap[name] = self.column(name).tolist()
+        return snap
+
+    @classmethod
+    def from_snapshot(cls, snap: Dict[str, Any]) -> "OHLCVRingBuffer":
+        """Rebuild a buffer from snapshot()."""
+        buf = cls(snap["capacity"])
+        for row in zip(snap["ts"], *(snap[name] for name in OHLCV_COLUMNS)):
+            buf.append(*row)
+        buf._total_appended = snap["total_appended"]
+        return buf
@@ -7,37 +7,58 @@ Features:
 - Latency tracking per message (start/end)
 - Granular stage timing (strategy, risk, exec, position) with step_id/trace_id
 - Counters: processed, allowed, rejected, filled, errors, retries, dupes_filtered
-- Percentile calculation (p50, p95) with empty-set safety
+- Percentile calculation (p50, p95) with empty-set safety, from bounded
+  LatencyHistograms (engine/latency_histogram.py); collectors merge
+- Stage events streamed to an optional sink instead of kept in memory
 - Deterministic clock injection for tests
-- File-first persistence (NDJSON + summary JSON)
+- File-first persistence (NDJSON + summary JSON), buffered with a background
+  flush thread and optional gzip of rotated parts
 
 Part of ticket AG-3G-3-1, extended in AG-3H-1-1.
 """
 
 from __future__ import annotations
 
+import gzip
 import json
+import os
+import shutil
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Any
 
+from engine.latency_histogram import LatencyHistogram
+
+
+# json.dumps(..., sort_keys=True) builds a new encoder per call; reuse one
+_EVENT_ENCODER = json.JSONEncoder(sort_keys=True)
+
 
 @dataclass
 class MetricsCollector:
     """
     Collects real-time metrics during event processing loop.
     
-    Thread-safety: Not thread-safe. Use one collector per worker.
+    Thread-safety: Not thread-safe. Use one collector per worker and
+    merge() them for a run-level summary.
+    
+    Memory is bounded: latencies go into LatencyHistograms (overall and per
+    stage), and with event_sink set stage events are handed to the sink
+    (e.g. MetricsWriter.append_event) instead of being kept for
+    get_stage_events().
     
     Attributes:
         clock_fn: Function returning monotonic time (injectable for tests)
+        event_sink: Optional callable receiving each stage event dict
     """
     clock_fn: Callable[[], float] = field(default_factory=lambda: time.monotonic)
+    event_sink: Optional[Callable[[Dict[str, Any]], None]] = None
     
     # Internal state
     _starts: Dict[str, float] = field(default_factory=dict, init=False)
-    _latencies: List[float] = field(default_factory=list, init=False)
+    _latencies: LatencyHistogram = field(default_factory=LatencyHistogram, init=False)
     
     # Counters
     _processed: int = field(default=0, init=False)
@@ -54,7 +75,8 @@ class MetricsCollector:
     
     # Stage-level granular metrics (AG-3H-1-1)
     _stage_events: List[Dict[str, Any]] = field(default_factory=list, init=False)
-    _stage_latencies: Dict[str, List[float]] = field(default_factory=dict, init=False)
+    _stage_events_count: int = field(default=0, init=False)
+    _stage_latencies: Dict[str, LatencyHistogram] = field(default_factory=dict, init=False)
     _stage_outcomes: Dict[str, Dict[str, int]] = field(default_factory=dict, init=False)
     
     def start(self, msg_id: str, t: Optional[float] = None) -> None:
@@ -92,7 +114,7 @@ class MetricsCollector:
         # Calculate latency if we have start
         if msg_id in self._starts:
             latency = end_t - self._starts[msg_id]
-            self._latencies.append(latency)
+            self._latencies.record(latency)
             del self._starts[msg_id]
         
         self._processed += 1
@@ -141,7 +163,7 @@ class MetricsCollector:
         """
         dt = t_end - t_start
         
-        # Store event for NDJSON output
+        # Stream event to the sink, or keep it for NDJSON output
         event = {
             "stage": stage,
             "step_id": step_id,
@@ -153,12 +175,16 @@ class MetricsCollector:
         }
         if reason:
             event["reason"] = reason
-        self._stage_events.append(event)
+        if self.event_sink is not None:
+            self.event_sink(event)
+        else:
+            self._stage_events.append(event)
+        self._stage_events_count += 1
         
         # Aggregate latencies per stage
         if stage not in self._stage_latencies:
-            self._stage_latencies[stage] = []
-        self._stage_latencies[stage].append(dt)
+            self._stage_latencies[stage] = LatencyHistogram()
+        self._stage_latencies[stage].record(dt)
         
         # Aggregate outcomes per stage
         if stage not in self._stage_outcomes:
@@ -167,33 +193,54 @@ class MetricsCollector:
         self._stage_outcomes[stage][outcome_lower] = self._stage_outcomes[stage].get(outcome_lower, 0) + 1
     
     def get_stage_events(self) -> List[Dict[str, Any]]:
-        """Return list of stage events for NDJSON output."""
+        """Return list of stage events for NDJSON output (empty with event_sink)."""
         return self._stage_events
     
-    def _percentile(self, p: float) -> Optional[float]:
+    def latency_histogram(self, stage: Optional[str] = None) -> Optional[LatencyHistogram]:
         """
-        Calculate percentile safely.
+        Latency histogram of end-to-end messages, or of a stage.
         
-        Returns None if no data available.
+        Returns:
+            The live histogram (None for an unknown stage)
         """
-        if not self._latencies:
-            return None
-        
-        sorted_lat = sorted(self._latencies)
-        n = len(sorted_lat)
-        idx = int(p / 100.0 * (n - 1))
-        idx = max(0, min(n - 1, idx))
-        return sorted_lat[idx]
-    
-    def _percentile_for_list(self, data: List[float], p: float) -> Optional[float]:
-        """Calculate percentile for a given list."""
-        if not data:
-            return None
-        sorted_data = sorted(data)
-        n = len(sorted_data)
-        idx = int(p / 100.0 * (n - 1))
-        idx = max(0, min(n - 1, idx))
-        return sorted_data[idx]
+        if stage is None:
+            return self._latencies
+        return self._stage_latencies.get(stage)
+    
+    def merge(self, other: "MetricsCollector") -> "MetricsCollector":
+        """
+        Add another collector's counts, outcomes and latencies (in place).
+        
+        Stage events kept by other are appended; in-flight starts are not
+        merged.
+        
+        Returns:
+            self
+        """
+        self._processed += other._processed
+        self._allowed += other._allowed
+        self._rejected += other._rejected
+        self._filled += other._filled
+        self._errors += other._errors
+        self._retries += other._retries
+        self._dupes_filtered += other._dupes_filtered
+        for mine, theirs in (
+            (self._errors_by_reason, other._errors_by_reason),
+            (self._rejects_by_reason, other._rejects_by_reason),
+        ):
+            for reason, count in theirs.items():
+                mine[reason] = mine.get(reason, 0) + count
+        
+        self._latencies.merge(other._latencies)
+        for stage, hist in other._stage_latencies.items():
+            self._stage_latencies.setdefault(stage, LatencyHistogram()).merge(hist)
+        for stage, outcomes in other._stage_outcomes.items():
+            mine = self._stage_outcomes.setdefault(stage, {})
+            for outcome, count in outcomes.items():
+                mine[outcome] = mine.get(outcome, 0) + count
+        self._stage_events.extend(other._stage_events)
+        self._stage_events_count += other._stage_events_count
+        return self
     
     def snapshot_summary(self) -> Dict[str, Any]:
         """
@@ -205,8 +252,7 @@ class MetricsCollector:
         # Build stage summaries
         stages_by_name = {}
         for stage, latencies in sorted(self._stage_latencies.items()):
-            p50 = self._percentile_for_list(latencies, 50)
-            p95 = self._percentile_for_list(latencies, 95)
+            p50, p95 = latencies.percentiles([50, 95])
             stages_by_name[stage] = {
                 "count": len(latencies),
                 "p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
@@ -217,6 +263,8 @@ class MetricsCollector:
         for stage, outcomes in sorted(self._stage_outcomes.items()):
             outcomes_by_stage[stage] = dict(sorted(outcomes.items()))
         
+        latency_p50, latency_p95 = self._latencies.percentiles([50, 95])
+        
         return {
             "processed": self._processed,
             "allowed": self._allowed,
@@ -225,14 +273,14 @@ class MetricsCollector:
             "errors": self._errors,
             "retries": self._retries,
             "dupes_filtered": self._dupes_filtered,
-            "latency_p50_ms": round(self._percentile(50) * 1000, 3) if self._percentile(50) is not None else None,
-            "latency_p95_ms": round(self._percentile(95) * 1000, 3) if self._percentile(95) is not None else None,
+            "latency_p50_ms": round(latency_p50 * 1000, 3) if latency_p50 is not None else None,
+            "latency_p95_ms": round(latency_p95 * 1000, 3) if latency_p95 is not None else None,
             "latency_count": len(self._latencies),
             "errors_by_reason": dict(sorted(self._errors_by_reason.items())),
             "rejects_by_reason": dict(sorted(self._rejects_by_reason.items())),
             "stages_by_name": stages_by_name,
             "outcomes_by_stage": outcomes_by_stage,
-            "stage_events_count": len(self._stage_events),
+            "stage_events_count": self._stage_events_count,
         }
     
     def reset(self) -> None:
@@ -249,6 +297,7 @@ class MetricsCollector:
         self._errors_by_reason.clear()
         self._rejects_by_reason.clear()
         self._stage_events.clear()
+        self._stage_events_count = 0
         self._stage_latencies.clear()
         self._stage_outcomes.clear()
 
@@ -261,11 +310,26 @@ class MetricsWriter:
     - metrics.ndjson: Append-only event stream (rotated to .1, .2, etc. if enabled)
     - metrics_summary.json: Final summary
     
+    Buffering:
+    - Events are serialized into an in-memory buffer and written out once
+      it holds buffer_bytes (size-based flush, on the appending thread)
+    - A background thread flushes every flush_interval_s (time-based), so
+      a slow run still reaches disk within that interval
+    - buffer_bytes=0 writes and flushes every event (previous behavior)
+    - close() flushes everything; events since the last flush are lost on
+      a hard crash
+    
     Rotation:
     - Disabled by default (back-compat)
     - Enable via rotate_max_mb or rotate_max_lines
-    - Atomic: close+flush -> rename -> reopen
+    - Atomic: flush -> close -> rename -> reopen
     - Check threshold every 100 writes for efficiency
+    - Rotated parts are tracked in memory (the directory is scanned once, on
+      open, for parts left by earlier writers)
+    - rotate_compress: rotated parts are gzipped to metrics.ndjson.N.gz on
+      the background thread (or on close)
+    
+    Thread-safe: append_event may run concurrently with the flush thread.
     """
     
     # Check rotation every N writes to avoid overhead
@@ -278,6 +342,9 @@ class MetricsWriter:
         rotate_max_mb: Optional[int] = None,
         rotate_max_lines: Optional[int] = None,
         rotate_keep: Optional[int] = None,
+        rotate_compress: bool = False,
+        buffer_bytes: int = 64 * 1024,
+        flush_interval_s: Optional[float] = 1.0,
     ):
         """
         Initialize writer.
@@ -287,15 +354,37 @@ class MetricsWriter:
             rotate_max_mb: Max size in MB before rotation (None = disabled)
             rotate_max_lines: Max lines before rotation (None = disabled)
             rotate_keep: Keep only N most recent rotated files (None = keep all)
+            rotate_compress: gzip rotated files (metrics.ndjson.N.gz)
+            buffer_bytes: Flush the write buffer at this size (0 = every event)
+            flush_interval_s: Background flush interval (None = no flush thread)
+        
+        Raises:
+            ValueError: If buffer_bytes < 0 or flush_interval_s <= 0
         """
         self._run_dir = Path(run_dir) if run_dir else None
         self._ndjson_handle = None
         self._ndjson_path: Optional[Path] = None
+        self._lock = threading.RLock()
+        self._flush_stop = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._to_compress: List[Path] = []
+        
+        if buffer_bytes < 0:
+            raise ValueError(f"buffer_bytes must be >= 0, got {buffer_bytes}")
+        if flush_interval_s is not None and flush_interval_s <= 0:
+            raise ValueError(f"flush_interval_s must be > 0, got {flush_interval_s}")
         
         # Rotation config
         self._rotate_max_bytes = rotate_max_mb * 1024 * 1024 if rotate_max_mb else None
         self._rotate_max_lines = rotate_max_lines
         self._rotate_keep = rotate_keep  # AG-3I-3-1: retention config
+        self._rotate_compress = rotate_compress
+        
+        # Buffering
+        self._buffer_bytes = buffer_bytes
+        self._flush_interval_s = flush_interval_s
+        self._buffer: List[str] = []
+        self._buffered = 0
         
         # Counters
         self._bytes_written = 0
@@ -303,6 +392,10 @@ class MetricsWriter:
         self._writes_since_check = 0
         self._rotation_count = 0  # Number of rotations performed
         
+        # Rotation state: (suffix, path) of rotated parts, oldest first
+        self._rotated: List[tuple] = []
+        self._next_suffix = 1
+        
         # Dynamic check interval: check every write if max_lines is small
         if rotate_max_lines and rotate_max_lines < self._ROTATION_CHECK_INTERVAL:
             self._check_interval = 1  # Check every write
@@ -313,6 +406,7 @@ class MetricsWriter:
             self._run_dir.mkdir(parents=True, exist_ok=True)
             self._ndjson_path = self._run_dir / "metrics.ndjson"
             self._ndjson_handle = open(self._ndjson_path, "a", encoding="utf-8")
+            self._scan_rotated()
     
     @property
     def enabled(self) -> bool:
@@ -324,6 +418,19 @@ class MetricsWriter:
         """Return number of rotations performed."""
         return self._rotation_count
     
+    def _scan_rotated(self) -> None:
+        """Pick up rotated parts of earlier writers (the only directory scan)."""
+        parts = {}
+        for p in self._run_dir.glob("metrics.ndjson.*"):
+            suffix = p.name[len("metrics.ndjson."):]
+            if suffix.endswith(".gz"):
+                suffix = suffix[:-3]
+            if suffix.isdigit():
+                parts[int(suffix)] = p
+        self._rotated = sorted(parts.items())
+        if self._rotated:
+            self._next_suffix = self._rotated[-1][0] + 1
+    
     def _should_rotate(self) -> bool:
         """Check if rotation threshold is exceeded."""
         if self._rotate_max_bytes and self._bytes_written >= self._rotate_max_bytes:
@@ -332,37 +439,23 @@ class MetricsWriter:
             return True
         return False
     
-    def _find_next_rotation_suffix(self) -> int:
-        """Find the next rotation suffix (1, 2, 3, ...)."""
-        if not self._run_dir:
-            return 1
-        
-        # Find existing rotated files
-        existing = list(self._run_dir.glob("metrics.ndjson.*"))
-        if not existing:
-            return 1
-        
-        # Extract suffixes and find max
-        suffixes = []
-        for p in existing:
-            suffix = p.suffix.lstrip(".")
-            if suffix.isdigit():
-                suffixes.append(int(suffix))
-        
-        return max(suffixes, default=0) + 1
-    
     def _rotate(self) -> None:
-        """Perform atomic rotation: close -> rename -> reopen -> cleanup."""
+        """Perform atomic rotation: flush -> close -> rename -> reopen -> cleanup."""
         if not self._ndjson_handle or not self._ndjson_path:
             return
         
-        # Close and flush current file
+        # Flush buffered events into the current file and close it
+        self._write_buffer()
         self._ndjson_handle.close()
         
         # Rename to next suffix
-        suffix = self._find_next_rotation_suffix()
+        suffix = self._next_suffix
+        self._next_suffix += 1
         rotated_path = self._run_dir / f"metrics.ndjson.{suffix}"
         self._ndjson_path.rename(rotated_path)
+        self._rotated.append((suffix, rotated_path))
+        if self._rotate_compress:
+            self._to_compress.append(rotated_path)
         
         # Reset counters
         self._bytes_written = 0
@@ -374,6 +467,9 @@ class MetricsWriter:
         
         # Reopen fresh file
         self._ndjson_handle = open(self._ndjson_path, "a", encoding="utf-8")
+        
+        if self._to_compress and self._flush_thread is None:
+            self._compress_pending()  # No background thread to hand it to
     
     def _cleanup_rotated(self) -> None:
         """
@@ -386,31 +482,65 @@ class MetricsWriter:
         if self._rotate_keep is None or not self._run_dir:
             return  # No cleanup if keep is not set
         
-        # Find all rotated files (metrics.ndjson.1, metrics.ndjson.2, etc.)
-        pattern = "metrics.ndjson.*"
-        rotated_files = []
-        for p in self._run_dir.glob(pattern):
-            # Extract numeric suffix only
-            suffix = p.suffix.lstrip(".")
-            if suffix.isdigit():
-                rotated_files.append((int(suffix), p))
-        
-        if not rotated_files:
+        # Oldest first; keep only the most recent N
+        excess = len(self._rotated) - self._rotate_keep
+        if excess <= 0:
             return
-        
-        # Sort by suffix descending (highest = most recent)
-        rotated_files.sort(key=lambda x: x[0], reverse=True)
-        
-        # Keep only the most recent N
-        to_delete = rotated_files[self._rotate_keep:]
+        to_delete, self._rotated = self._rotated[:excess], self._rotated[excess:]
         
         for suffix, path in to_delete:
+            if path in self._to_compress:
+                self._to_compress.remove(path)
             try:
                 path.unlink()
             except OSError:
                 # Best-effort: log would be nice but we don't have logger here
                 pass  # Ignore errors on individual file deletion
     
+    def _compress_pending(self) -> None:
+        """gzip rotated parts queued by _rotate (appends are not blocked meanwhile)."""
+        while True:
+            with self._lock:
+                if not self._to_compress:
+                    return
+                path = self._to_compress.pop(0)
+            gz_path = path.with_name(path.name + ".gz")
+            tmp_path = path.with_name(path.name + ".gz.tmp")
+            try:
+                with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, gz_path)
+            except OSError:
+                continue  # Best-effort: the plain part stays readable (or was pruned)
+            with self._lock:
+                if any(p == path for _, p in self._rotated):
+                    self._rotated = [(s, gz_path if p == path else p) for s, p in self._rotated]
+                    path.unlink()
+                else:
+                    gz_path.unlink()  # Pruned by rotate_keep while compressing
+    
+    def _write_buffer(self) -> None:
+        """Write buffered lines to the file and flush (call with the lock held)."""
+        if self._buffer:
+            self._ndjson_handle.write("".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._ndjson_handle.flush()
+    
+    def _flush_loop(self) -> None:
+        """Background thread: time-based flush and compression of rotated parts."""
+        while not self._flush_stop.wait(self._flush_interval_s):
+            with self._lock:
+                if self._ndjson_handle and self._buffer:
+                    self._write_buffer()
+            self._compress_pending()
+    
+    def _start_flush_thread(self) -> None:
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="metrics-writer-flush", daemon=True,
+        )
+        self._flush_thread.start()
+    
     def append_event(self, payload: Dict[str, Any]) -> None:
         """
         Append a metric event to NDJSON file.
@@ -419,20 +549,35 @@ class MetricsWriter:
             payload: Event data (will be JSON-serialized)
         """
         if self._ndjson_handle:
-            line = json.dumps(payload, sort_keys=True) + "\n"
-            self._ndjson_handle.write(line)
-            self._ndjson_handle.flush()
+            line = _EVENT_ENCODER.encode(payload) + "\n"
+            size = len(line.encode("utf-8"))
             
-            # Update counters
-            self._bytes_written += len(line.encode("utf-8"))
-            self._lines_written += 1
-            self._writes_since_check += 1
-            
-            # Check rotation periodically
-            if self._writes_since_check >= self._check_interval:
-                self._writes_since_check = 0
-                if self._should_rotate():
-                    self._rotate()
+            with self._lock:
+                if self._ndjson_handle is None:
+                    return  # Closed concurrently
+                if self._flush_thread is None and self._flush_interval_s is not None:
+                    self._start_flush_thread()
+                self._buffer.append(line)
+                self._buffered += size
+                if self._buffered >= self._buffer_bytes:
+                    self._write_buffer()
+                
+                # Update counters
+                self._bytes_written += size
+                self._lines_written += 1
+                self._writes_since_check += 1
+                
+                # Check rotation periodically
+                if self._writes_since_check >= self._check_interval:
+                    self._writes_since_check = 0
+                    if self._should_rotate():
+                        self._rotate()
+    
+    def flush(self) -> None:
+        """Write buffered events to the file."""
+        with self._lock:
+            if self._ndjson_handle:
+                self._write_buffer()
     
     def write_summary(self, summary: Dict[str, Any]) -> None:
         """
@@ -447,10 +592,17 @@ class MetricsWriter:
                 json.dump(summary, f, sort_keys=True, indent=2)
     
     def close(self) -> None:
-        """Close file handles."""
-        if self._ndjson_handle:
-            self._ndjson_handle.close()
-            self._ndjson_handle = None
+        """Stop the flush thread, flush, compress pending parts, close file handles."""
+        if self._flush_thread is not None:
+            self._flush_stop.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+        with self._lock:
+            if self._ndjson_handle:
+                self._write_buffer()
+                self._ndjson_handle.close()
+                self._ndjson_handle = None
+        self._compress_pending()
     
     def __del__(self):
         self.close()
@@ -489,6 +641,12 @@ class NoOpMetricsCollector:
     def get_stage_events(self) -> List[Dict[str, Any]]:
         return []
     
+    def latency_histogram(self, stage: Optional[str] = None) -> Optional[LatencyHistogram]:
+        return None
+    
+    def merge(self, other) -> "NoOpMetricsCollector":
+        return self
+    
     def snapshot_summary(self) -> Dict[str, Any]:
         return {}
     
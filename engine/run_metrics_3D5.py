@@ -8,59 +8,59 @@ Metrics:
 - Risk outcomes (allowed/rejected)
 - System stats (drain_iterations, unique traces)
 
+RunMetricsAggregator computes them online: it observes each event record
+as log_event() writes it (get_jsonl_logger(observer=...)), so the summary
+is ready at shutdown without reading the log back.
+collect_metrics_from_jsonl() feeds the same aggregator from the file and
+is kept to verify a run's online metrics against its trace.
+
 Part of ticket AG-3D-5-1.
 """
 
 import json
+import threading
 from pathlib import Path
 from typing import Dict, Any, Union
 
 
-def collect_metrics_from_jsonl(log_path: Union[str, Path]) -> Dict[str, Any]:
+class RunMetricsAggregator:
     """
-    Parse JSONL log file and calculate metrics.
+    Incremental run metrics over structured JSONL event records.
     
-    Args:
-        log_path: Path to JSONL file
-        
-    Returns:
-        Dictionary with metrics. No timestamps.
+    observe() is O(1) per event and thread-safe (bus workers log from
+    their own threads with exec_workers); summary() is O(1).
+    
+    Usage:
+        run_metrics = RunMetricsAggregator()
+        stepper.run_bus_mode(..., log_jsonl_path=path, event_observer=run_metrics.observe)
+        metrics = run_metrics.summary()
     """
-    metrics = {
-        "num_order_intents": 0,
-        "num_risk_decisions_total": 0,
-        "num_risk_allowed": 0,
-        "num_risk_rejected": 0,
-        "num_execution_reports": 0,
-        "num_fills": 0,
-        "num_positions_updated": 0,
-        "drain_iterations": 0,
-        "max_step_id": 0,
-        "unique_trace_ids": 0,
-    }
     
-    trace_ids = set()
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {
+            "num_order_intents": 0,
+            "num_risk_decisions_total": 0,
+            "num_risk_allowed": 0,
+            "num_risk_rejected": 0,
+            "num_execution_reports": 0,
+            "num_fills": 0,
+            "num_positions_updated": 0,
+            "drain_iterations": 0,
+            "max_step_id": 0,
+        }
+        self._trace_ids = set()
     
-    path = Path(log_path)
-    if not path.exists():
-        return metrics
-    
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            
-            try:
-                record = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            
-            event_type = record.get("event_type")
-            action = record.get("action")
-            trace_id = record.get("trace_id")
-            step_id = record.get("step_id", 0)
-            extra = record.get("extra", {})
+    def observe(self, record: Dict[str, Any]) -> None:
+        """Account for one event record (as logged by log_event)."""
+        event_type = record.get("event_type")
+        action = record.get("action")
+        trace_id = record.get("trace_id")
+        step_id = record.get("step_id", 0)
+        extra = record.get("extra", {})
+        
+        with self._lock:
+            metrics = self._metrics
             
             # Track max step
             if isinstance(step_id, int) and step_id > metrics["max_step_id"]:
@@ -68,7 +68,7 @@ def collect_metrics_from_jsonl(log_path: Union[str, Path]) -> Dict[str, Any]:
             
             # Track trace IDs (exclude SYSTEM)
             if trace_id and trace_id != "SYSTEM":
-                trace_ids.add(trace_id)
+                self._trace_ids.add(trace_id)
             
             # Count events
             if event_type == "OrderIntentV1" and action == "publish":
@@ -93,8 +93,48 @@ def collect_metrics_from_jsonl(log_path: Union[str, Path]) -> Dict[str, Any]:
             elif event_type == "BusModeDone" and action == "complete":
                 metrics["drain_iterations"] = extra.get("drain_iterations", 0)
     
-    metrics["unique_trace_ids"] = len(trace_ids)
+    def summary(self) -> Dict[str, Any]:
+        """
+        Metrics so far. No timestamps.
+        
+        The return is a dict; the caller should use json.dump(sort_keys=True).
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["unique_trace_ids"] = len(self._trace_ids)
+        return metrics
+
+
+def collect_metrics_from_jsonl(log_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Parse JSONL log file and calculate metrics.
+    
+    Reads the whole file: use it to verify RunMetricsAggregator output,
+    not on the shutdown path of large runs.
+    
+    Args:
+        log_path: Path to JSONL file
+        
+    Returns:
+        Dictionary with metrics. No timestamps.
+    """
+    aggregator = RunMetricsAggregator()
+    
+    path = Path(log_path)
+    if not path.exists():
+        return aggregator.summary()
+    
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            
+            aggregator.observe(record)
     
-    # Sort keys for deterministic output dump? 
-    # The return is a dict, caller should use json.dump(sort_keys=True)
-    return metrics
+    return aggregator.summary()
@@ -0,0 +1,136 @@
+"""
+engine/snapshot.py
+
+Versioned engine-state snapshots for O(snapshot) resume.
+
+A Checkpoint only records how far a run got, so resuming run_adapter_mode
+replays warmup + start_idx events to rebuild the strategy window and starts
+the RNG and simulated clock from scratch (IDs and timings then differ from an
+uninterrupted run). An EngineSnapshot captures everything a LoopStepper
+carries across bars:
+
+- checkpoint: the Checkpoint the snapshot was taken at
+- consumed: adapter events consumed so far (resume skips exactly these)
+- last_event_ts: ts of the last consumed event (resume seeks past it)
+- strategy: StrategyState.to_dict() (stateful strategies) or
+  OHLCVRingBuffer.snapshot() (window-based strategies)
+- rng: random.Random state behind the deterministic event IDs
+- clock: SimulatedTimeProvider state (None for wall-clock providers)
+- counters: step/event/fill/rejected counters (metrics continue seamlessly)
+- risk: risk engine identity and state (the v0.4/v0.6 managers used by the
+  loop hold no state across intents; stateful managers expose
+  snapshot_state() / restore_state())
+
+Restoring a snapshot into a fresh LoopStepper (same config) and continuing
+produces byte-identical events to the uninterrupted run.
+
+Format: a single JSON document written atomically (tmp + fsync + rename),
+tagged with SNAPSHOT_VERSION; load() rejects unknown versions.
+"""
+
+from __future__ import annotations
+import json
+import os
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from engine.checkpoint import Checkpoint
+
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class EngineSnapshot:
+    """
+    Engine state after a fully processed bar.
+
+    Attributes:
+        checkpoint: Progress (run_id, last_processed_idx, processed_count)
+        consumed: Adapter events consumed (warmup included)
+        strategy: {"kind": "state" | "window" | None, "data": ...}
+        rng: random.Random.getstate() as JSON lists
+        clock: SimulatedTimeProvider.snapshot() (None if not restorable)
+        counters: LoopStepper counters (steps, events, fills, rejected)
+        risk: {"version": risk_version, "state": ...}
+        last_event_ts: Timestamp of the last consumed event (epoch ms)
+        version: Snapshot format version
+    """
+    checkpoint: Checkpoint
+    consumed: int
+    strategy: Dict[str, Any]
+    rng: Any
+    clock: Optional[Dict[str, Any]]
+    counters: Dict[str, int]
+    risk: Dict[str, Any] = field(default_factory=dict)
+    last_event_ts: Optional[int] = None
+    version: int = SNAPSHOT_VERSION
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return JSON-serializable snapshot.
+        
+        Shallow: nested data (window, RNG state) is shared, not copied -
+        asdict() deep-copies it, which dominated per-bar snapshot saves.
+        """
+        return {
+            "checkpoint": asdict(self.checkpoint),
+            "consumed": self.consumed,
+            "strategy": self.strategy,
+            "rng": self.rng,
+            "clock": self.clock,
+            "counters": self.counters,
+            "risk": self.risk,
+            "last_event_ts": self.last_event_ts,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EngineSnapshot":
+        """
+        Rebuild a snapshot from to_dict().
+
+        Raises:
+            ValueError: If the snapshot version is not supported
+        """
+        version = data.get("version")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {version!r} (expected {SNAPSHOT_VERSION})"
+            )
+        return cls(
+            checkpoint=Checkpoint(**data["checkpoint"]),
+            consumed=data["consumed"],
+            strategy=data["strategy"],
+            rng=data["rng"],
+            clock=data["clock"],
+            counters=data["counters"],
+            risk=data.get("risk", {}),
+            last_event_ts=data.get("last_event_ts"),
+            version=version,
+        )
+
+    def save_atomic(self, path: Path) -> None:
+        """Save snapshot atomically (tmp file + fsync + rename)."""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # dumps() + one write: json.dump() streams via the pure-Python encoder
+            f.write(json.dumps(self.to_dict(), separators=(",", ":")))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "EngineSnapshot":
+        """
+        Load snapshot from file.
+
+        Raises:
+            FileNotFoundError: If snapshot doesn't exist
+            json.JSONDecodeError: If snapshot is corrupted
+            ValueError: If the snapshot version is not supported
+        """
+        with open(Path(path), "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -7,14 +7,26 @@ Features:
 - No timestamps (deterministic for CI)
 - Each log includes: trace_id, event_type, step_id
 - File-based JSONL output
+- Optional async mode (AsyncJsonlHandler): the caller only serializes and
+  enqueues; a writer thread drains the bounded queue and writes batches of
+  lines with one write() each. Lines are written in enqueue order, so
+  output is identical to the synchronous FileHandler (block policy).
 
 Part of ticket AG-3D-4-1.
 """
 
 import json
 import logging
+import queue
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+OVERFLOW_POLICIES = ("block", "drop")
+
+# json.dumps(..., sort_keys=True) builds a new encoder per call; reuse one
+_LINE_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
 
 
 class JSONLFormatter(logging.Formatter):
@@ -24,9 +36,142 @@ class JSONLFormatter(logging.Formatter):
         return record.getMessage()
 
 
+class AsyncJsonlHandler(logging.Handler):
+    """
+    QueueHandler + QueueListener in one handler, batching file writes.
+    
+    emit() formats the record on the caller's thread and puts the line on
+    a bounded queue; a single writer thread takes every line available (up
+    to batch_max_lines), writes them with one write() and flushes. One
+    queue and one writer keep lines in emit order.
+    
+    Overflow (queue full):
+    - "block": the caller waits for the writer (no loss, deterministic)
+    - "drop": the line is discarded and counted in dropped
+    
+    close() (close_jsonl_logger, or logging.shutdown at exit) writes
+    everything queued before it and stops the writer thread.
+    
+    log_event() hands its line straight to enqueue() when this is the
+    logger's only handler, skipping LogRecord creation (the dominant cost
+    of a synchronous log_event call).
+    """
+    
+    _STOP = object()
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        queue_size: int = 10_000,
+        overflow: str = "block",
+        batch_max_lines: int = 1000,
+    ):
+        """
+        Args:
+            path: JSONL output file (appended to)
+            queue_size: Max lines waiting for the writer
+            overflow: "block" or "drop" when the queue is full
+            batch_max_lines: Max lines per write()
+        
+        Raises:
+            ValueError: If overflow is unknown or a size is < 1
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be >= 1, got {queue_size}")
+        if batch_max_lines < 1:
+            raise ValueError(f"batch_max_lines must be >= 1, got {batch_max_lines}")
+        super().__init__()
+        self.path = Path(path)
+        self.overflow = overflow
+        self.batch_max_lines = batch_max_lines
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._thread = threading.Thread(
+            target=self._run, name=f"jsonl-writer:{self.path.name}", daemon=True,
+        )
+        self._thread.start()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._thread is None:
+            return  # Closed
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self.enqueue(line)
+    
+    def enqueue(self, line: str) -> None:
+        """Queue one formatted line (applies the overflow policy)."""
+        if self._thread is None:
+            return  # Closed
+        if self.overflow == "block":
+            self._queue.put(line)
+        else:
+            try:
+                self._queue.put_nowait(line)
+            except queue.Full:
+                self.dropped += 1
+    
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            lines: List[str] = []
+            item = q.get()
+            stop = item is self._STOP
+            if not stop:
+                lines.append(item)
+                while len(lines) < self.batch_max_lines:
+                    try:
+                        item = q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is self._STOP:
+                        stop = True
+                        break
+                    lines.append(item)
+            if lines:
+                try:
+                    self._file.write("\n".join(lines) + "\n")
+                    self._file.flush()
+                except Exception:
+                    logging.getLogger(__name__).exception("AsyncJsonlHandler: write failed")
+            for _ in range(len(lines) + (1 if stop else 0)):
+                q.task_done()
+            if stop:
+                return
+    
+    def flush(self) -> None:
+        """Block until every line queued so far is written."""
+        if self._thread is not None:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Write queued lines, stop the writer thread and close the file."""
+        self.acquire()
+        try:
+            thread, self._thread = self._thread, None
+        finally:
+            self.release()
+        if thread is not None:
+            self._queue.put(self._STOP)  # Always blocks: the stop must not be dropped
+            thread.join()
+            self._file.close()
+        super().close()
+
+
 def get_jsonl_logger(
     path: Union[str, Path],
     name: str = "structured_jsonl",
+    *,
+    async_mode: bool = False,
+    queue_size: int = 10_000,
+    overflow: str = "block",
+    observer: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> logging.Logger:
     """
     Create a logger that writes JSONL to file.
@@ -34,19 +179,28 @@ def get_jsonl_logger(
     Args:
         path: Path to JSONL output file
         name: Logger name (default: structured_jsonl)
+        async_mode: Write from a background thread (AsyncJsonlHandler)
+        queue_size: Async queue bound (lines)
+        overflow: Async policy when the queue is full: "block" or "drop"
+        observer: Called with each log_event() record before it is
+            serialized, on the caller's thread (e.g. RunMetricsAggregator.observe)
         
     Returns:
-        Configured logger with FileHandler
+        Configured logger with FileHandler (or AsyncJsonlHandler)
     """
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     logger.propagate = False  # Don't bubble up to root
     
-    # Remove existing handlers
-    logger.handlers.clear()
+    # Remove existing handlers (closing them: an async handler owns a thread)
+    close_jsonl_logger(logger)
+    logger.jsonl_observer = observer
     
     # Add file handler
-    handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+    if async_mode:
+        handler = AsyncJsonlHandler(path, queue_size=queue_size, overflow=overflow)
+    else:
+        handler = logging.FileHandler(path, mode="a", encoding="utf-8")
     handler.setFormatter(JSONLFormatter())
     logger.addHandler(handler)
     
@@ -88,13 +242,29 @@ def log_event(
     if extra:
         record["extra"] = extra
     
+    observer = getattr(logger, "jsonl_observer", None)
+    if observer is not None:
+        observer(record)
+    
     # Deterministic JSON (sorted keys, no whitespace)
-    line = json.dumps(record, sort_keys=True, separators=(",", ":"))
-    logger.info(line)
+    line = _LINE_ENCODER.encode(record)
+    handlers = logger.handlers
+    if (
+        len(handlers) == 1
+        and type(handlers[0]) is AsyncJsonlHandler
+        and not logger.filters
+        and not handlers[0].filters
+        and handlers[0].level <= logging.INFO
+        and logger.isEnabledFor(logging.INFO)
+    ):
+        handlers[0].enqueue(line)
+    else:
+        logger.info(line)
 
 
 def close_jsonl_logger(logger: logging.Logger) -> None:
-    """Close all handlers of a logger."""
+    """Close all handlers of a logger (async handlers write their queue first)."""
+    logger.jsonl_observer = None
     for handler in logger.handlers[:]:
         handler.close()
         logger.removeHandler(handler)
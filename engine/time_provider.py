@@ -6,7 +6,7 @@ Defines the TimeProvider protocol and implementations for deterministic time sim
 AG-3I-1-1: Extended with now_utc(), monotonic_ns(), FrozenTimeProvider, and singleton.
 """
 
-from typing import Protocol, Optional
+from typing import Dict, Protocol, Optional
 from datetime import datetime, timezone
 import time
 from dataclasses import dataclass, field
@@ -197,6 +197,15 @@ class SimulatedTimeProvider:
             raise ValueError("Cannot advance by negative nanoseconds")
         self._now_ns += delta_ns
 
+    def snapshot(self) -> Dict[str, int]:
+        """Return JSON-serializable clock state (see engine/snapshot.py)."""
+        return {"step": self._step, "now_ns": self._now_ns}
+
+    def restore(self, snap: Dict[str, int]) -> None:
+        """Continue from a snapshot() of an identically configured provider."""
+        self._step = snap["step"]
+        self._now_ns = snap["now_ns"]
+
 
 class RealTimeProvider:
     """
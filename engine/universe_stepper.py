@@ -0,0 +1,423 @@
+"""
+engine/universe_stepper.py
+
+Multi-symbol loop stepper: steps a whole universe of symbols per bar.
+
+LoopStepper is bound to one ticker and one OHLCV frame, so N symbols meant N
+stepper instances, N SQLite connections and N passes over the data. The
+UniverseLoopStepper takes a long-format panel (one row per timestamp and
+symbol) and, for every timestamp:
+
+1. Evaluates the strategy for every symbol with a bar at that timestamp
+2. Publishes all resulting OrderIntentV1 to the bus as one batch
+3. Drains the batch through RiskWorker -> ExecWorker -> PositionStoreWorker
+   (each stage takes the whole batch in a single step)
+
+All symbols share one PositionStoreSQLite (behind a write-behind PositionCache,
+flushed before each checkpoint save). The intent cache is released after
+each bar's drain, so memory stays bounded by the universe size, not the run
+length.
+
+Strategy modes are the same as LoopStepper (per symbol):
+- StatefulStrategy: one StrategyState per symbol, bars pushed one at a time
+- PrecomputedStrategy: one IntentSchedule per symbol frame
+- slice functions: growing per-symbol slice (reference path, O(n) per bar)
+
+Usage:
+    panel = panel_from_frames({"BTC-USD": btc_df, "ETH-USD": eth_df})
+    stepper = UniverseLoopStepper(state_db="state.db", strategy_fn=get_strategy_fn("v0_7", "stateful"))
+    result = stepper.run_bus_mode(panel, InMemoryBus(), warmup=10)
+"""
+
+import logging
+import random
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from contracts.event_messages import OrderIntent
+from engine.exchange_adapter import ExchangeAdapter
+from engine.loop_stepper import STAGE_LATENCY_NS, drain_bus_workers
+from engine.time_provider import TimeProvider, SimulatedTimeProvider
+from risk_manager_v_0_4 import RiskManager as RiskManagerV04
+from state.position_store_sqlite import PositionStoreSQLite
+from state.position_cache import PositionCache
+from strategy_engine.precomputed import IntentSchedule, PrecomputedStrategy
+from strategy_engine.stateful import StatefulStrategy
+from strategy_engine.strategy_registry import get_strategy_fn, DEFAULT_STRATEGY
+
+logger = logging.getLogger(__name__)
+
+PANEL_KEY_COLUMNS = ("timestamp", "symbol")
+
+
+def panel_from_frames(frames: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Build a long-format panel from per-symbol OHLCV frames.
+
+    Args:
+        frames: Mapping symbol -> OHLCV DataFrame (with 'timestamp' column)
+
+    Returns:
+        DataFrame with a 'symbol' column, sorted by (timestamp, symbol)
+    """
+    parts = [df.assign(symbol=symbol) for symbol, df in frames.items()]
+    if not parts:
+        return pd.DataFrame(columns=list(PANEL_KEY_COLUMNS))
+    panel = pd.concat(parts, ignore_index=True)
+    return panel.sort_values(list(PANEL_KEY_COLUMNS), kind="mergesort").reset_index(drop=True)
+
+
+@dataclass
+class _SymbolBook:
+    """Per-symbol strategy context for one run."""
+    frame: pd.DataFrame
+    state: Any = None
+    schedule: Optional[IntentSchedule] = None
+
+
+class UniverseLoopStepper:
+    """
+    Deterministic loop stepper over a universe of symbols.
+
+    One bar = one timestamp of the panel; a step evaluates every symbol that
+    has a row at that timestamp.
+    """
+
+    def __init__(
+        self,
+        *,
+        symbols: Optional[List[str]] = None,
+        risk_rules: Optional[Union[Dict, str, Path]] = None,
+        strategy_params: Optional[Dict[str, Any]] = None,
+        execution_config: Optional[Dict[str, Any]] = None,
+        state_db: Optional[Union[str, Path]] = None,
+        time_provider: Optional[TimeProvider] = None,
+        seed: int = 42,
+        strategy_fn=None,
+    ):
+        """
+        Initialize the universe stepper.
+
+        Args:
+            symbols: Restrict the run to these symbols (None = all in panel)
+            risk_rules: Risk rules for RiskManager v0.4 (dict or YAML path)
+            strategy_params: Strategy parameters (shared by all symbols)
+            execution_config: Execution config for ExecWorker
+            state_db: SQLite path for the shared position store
+            time_provider: Time provider (default: SimulatedTimeProvider(seed))
+            seed: Seed for deterministic event IDs
+            strategy_fn: Strategy (slice fn, StatefulStrategy or PrecomputedStrategy)
+        """
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self.time_provider = time_provider or SimulatedTimeProvider(seed=seed)
+
+        self.symbols = list(symbols) if symbols is not None else None
+        self.strategy_params = strategy_params or {"fast_period": 3, "slow_period": 5}
+        self.execution_config = execution_config or {"slippage_bps": 5.0, "partial_fill": False}
+        self._risk_v04 = RiskManagerV04(risk_rules if risk_rules else {})
+        self._strategy_fn = strategy_fn if strategy_fn else get_strategy_fn(DEFAULT_STRATEGY)
+
+        # Single position store shared by all symbols (write-behind cache)
+        self._state_store: Optional[PositionCache] = None
+        if state_db:
+            self._state_store = PositionCache(PositionStoreSQLite(state_db))
+
+        # Metrics
+        self._step_count = 0
+        self._event_count = 0
+        self._fill_count = 0
+        self._rejected_count = 0
+        self._symbol_bar_count = 0
+
+    def _gen_uuid(self) -> str:
+        """Generate deterministic UUID based on seed."""
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    # -------------------------------------------------------------------------
+    # Panel / strategy setup
+    # -------------------------------------------------------------------------
+
+    def _prepare_panel(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """Validate, filter and sort the panel by (timestamp, symbol)."""
+        missing = [c for c in (*PANEL_KEY_COLUMNS, "close") if c not in panel.columns]
+        if missing:
+            raise ValueError(f"Panel missing required columns: {missing}")
+        if self.symbols is not None:
+            panel = panel[panel["symbol"].isin(self.symbols)]
+        return panel.sort_values(list(PANEL_KEY_COLUMNS), kind="mergesort").reset_index(drop=True)
+
+    def _build_books(self, panel: pd.DataFrame) -> Dict[str, _SymbolBook]:
+        """Per-symbol frames plus streaming state / precomputed schedule."""
+        books: Dict[str, _SymbolBook] = {}
+        for symbol, group in panel.groupby("symbol", sort=True):
+            frame = group.drop(columns="symbol").reset_index(drop=True)
+            book = _SymbolBook(frame=frame)
+            if isinstance(self._strategy_fn, StatefulStrategy):
+                book.state = self._strategy_fn.init_state(self.strategy_params)
+            elif isinstance(self._strategy_fn, PrecomputedStrategy):
+                book.schedule = self._strategy_fn.precompute(frame, self.strategy_params, symbol)
+            books[symbol] = book
+        return books
+
+    def _symbol_intents(
+        self,
+        book: _SymbolBook,
+        symbol: str,
+        bar: Dict[str, Any],
+        pos: int,
+        asof_ts: pd.Timestamp,
+    ) -> List[OrderIntent]:
+        """Evaluate the strategy for one symbol at its bar position pos."""
+        if book.state is not None:
+            return self._strategy_fn.on_bar(book.state, bar, self.strategy_params, symbol, asof_ts)
+        if book.schedule is not None:
+            return book.schedule.intents_at(pos, symbol, asof_ts)
+        return self._strategy_fn(book.frame.iloc[:pos + 1], self.strategy_params, symbol, asof_ts)
+
+    # -------------------------------------------------------------------------
+    # Run
+    # -------------------------------------------------------------------------
+
+    def run_bus_mode(
+        self,
+        panel: pd.DataFrame,
+        bus,  # InMemoryBus
+        *,
+        max_steps: Optional[int] = None,
+        warmup: int = 10,
+        max_drain_iterations: int = 100,
+        log_jsonl_path: Optional[Union[str, Path]] = None,
+        exchange_adapter: Optional[ExchangeAdapter] = None,
+        idempotency_store=None,
+        checkpoint=None,
+        checkpoint_path: Optional[Path] = None,
+        start_idx: int = 0,
+        metrics_collector=None,
+        stop_controller=None,
+    ) -> Dict[str, Any]:
+        """
+        Run the universe through the bus, one timestamp at a time.
+
+        Args:
+            panel: Long-format OHLCV panel with 'timestamp' and 'symbol' columns
+            bus: InMemoryBus instance
+            max_steps: Maximum bars (timestamps) to process after warmup
+            warmup: Warmup bars (timestamps) that only feed strategy state
+            max_drain_iterations: Max drain iterations per bar
+            log_jsonl_path: Optional path for JSONL logging
+            exchange_adapter: Optional ExchangeAdapter for ExecWorker
+            idempotency_store: Optional IdempotencyStore for ExecWorker
+            checkpoint: Optional Checkpoint (last_processed_idx relative to warmup)
+            checkpoint_path: Path to save checkpoint
+            start_idx: Resume from this bar index (relative to warmup)
+            metrics_collector: Optional MetricsCollector
+            stop_controller: Optional graceful shutdown controller
+
+        Returns:
+            Dict with metrics, published count, bars, symbols and drain iterations
+
+        Raises:
+            ValueError: If the panel lacks timestamp/symbol/close columns
+            RuntimeError: If a bar's batch cannot be drained
+        """
+        if stop_controller and stop_controller.is_stop_requested:
+            return {"metrics": self._get_metrics(), "published": 0, "status": "stopped_early"}
+
+        from engine.bus_workers import (
+            RiskWorker, ExecWorker, PositionStoreWorker, DrainWorker,
+            TOPIC_ORDER_INTENT, TOPIC_EXECUTION_REPORT,
+        )
+        from engine.structured_jsonl_logger import get_jsonl_logger, log_event, close_jsonl_logger
+
+        panel = self._prepare_panel(panel)
+        books = self._build_books(panel)
+
+        jsonl_logger = get_jsonl_logger(log_jsonl_path, async_mode=True) if log_jsonl_path else None
+
+        intent_cache: Dict[str, Dict] = {}
+        risk_worker = RiskWorker(self._risk_v04, gen_event_id=self._gen_uuid, jsonl_logger=jsonl_logger)
+        exec_worker = ExecWorker(
+            self.execution_config,
+            gen_event_id=self._gen_uuid,
+            intent_cache=intent_cache,
+            jsonl_logger=jsonl_logger,
+            exchange_adapter=exchange_adapter,
+            idempotency_store=idempotency_store,
+        )
+        if self._state_store:
+            report_worker = PositionStoreWorker(self._state_store, jsonl_logger=jsonl_logger)
+        else:
+            report_worker = DrainWorker(TOPIC_EXECUTION_REPORT)
+
+        def _metrics_clock():
+            return self.time_provider.now_ns() / 1e9
+
+        # Bar boundaries: rows [bounds[k], bounds[k+1]) share one timestamp
+        ts_values = panel["timestamp"].to_numpy()
+        bounds = np.concatenate((
+            [0], np.flatnonzero(ts_values[1:] != ts_values[:-1]) + 1, [len(panel)]
+        )).astype(int)
+        n_bars = len(bounds) - 1
+
+        if n_bars <= warmup:
+            logger.warning("Not enough bars for universe simulation (need > %d)", warmup)
+            return {"metrics": self._get_metrics(), "published": 0, "bars": 0, "symbols": len(books)}
+
+        end_bar = n_bars if not max_steps else min(warmup + max_steps, n_bars)
+        actual_start = warmup + start_idx
+
+        symbols = panel["symbol"].to_numpy()
+        symbol_pos = panel.groupby("symbol", sort=False).cumcount().to_numpy()
+        columns = [c for c in panel.columns if c != "symbol"]
+        streaming = isinstance(self._strategy_fn, StatefulStrategy)
+
+        published_count = 0
+        drain_total = 0
+        bars_processed = 0
+
+        rows = panel[columns].itertuples(index=False, name=None)
+        for b in range(end_bar):
+            lo, hi = bounds[b], bounds[b + 1]
+            bar_rows = [dict(zip(columns, next(rows))) for _ in range(hi - lo)]
+
+            if b < actual_start:
+                # Warmup / already processed: only feed streaming state
+                if streaming:
+                    for k, bar in enumerate(bar_rows):
+                        book = books[symbols[lo + k]]
+                        self._strategy_fn.on_bar(
+                            book.state, bar, self.strategy_params, symbols[lo + k], bar["timestamp"]
+                        )
+                continue
+
+            if stop_controller and stop_controller.is_stop_requested:
+                logger.info("Universe mode: stop requested (%s), exiting...", stop_controller.stop_reason)
+                break
+
+            self._step_count += 1
+
+            # 1. Strategy for every symbol at this timestamp
+            strategy_t0 = _metrics_clock() if metrics_collector else 0.0
+            batch = []
+            for k, bar in enumerate(bar_rows):
+                symbol = symbols[lo + k]
+                asof_ts = bar["timestamp"]
+                intents = self._symbol_intents(books[symbol], symbol, bar, int(symbol_pos[lo + k]), asof_ts)
+                batch.extend((intent, bar) for intent in intents)
+                self._symbol_bar_count += 1
+                if hasattr(self.time_provider, 'advance_ns'):
+                    self.time_provider.advance_ns(STAGE_LATENCY_NS["strategy"])
+            strategy_t1 = _metrics_clock() if metrics_collector else 0.0
+
+            if metrics_collector:
+                metrics_collector.record_stage(
+                    stage="strategy",
+                    step_id=self._step_count,
+                    trace_id=f"bar_{b}",
+                    t_start=strategy_t0,
+                    t_end=strategy_t1,
+                    outcome="ok" if batch else "no_signal",
+                )
+
+            # 2. Publish the bar's batch (one publish_many call)
+            messages = []
+            for intent, bar in batch:
+                intent.event_id = self._gen_uuid()
+                intent.trace_id = self._gen_uuid()
+                ts_str = bar["timestamp"].isoformat()
+                intent.ts = ts_str
+
+                intent_dict = intent.to_dict()
+                if intent_dict.get("meta") is None:
+                    intent_dict["meta"] = {}
+                intent_dict["meta"]["bar_close"] = bar["close"]
+                intent_cache[intent.event_id] = intent_dict
+                messages.append((intent.trace_id, intent_dict))
+                published_count += 1
+                self._event_count += 1
+
+                if jsonl_logger:
+                    log_event(
+                        jsonl_logger,
+                        trace_id=intent.trace_id,
+                        event_type="OrderIntentV1",
+                        step_id=self._step_count,
+                        action="publish",
+                        topic=TOPIC_ORDER_INTENT,
+                        extra={"event_id": intent.event_id, "symbol": intent.symbol},
+                    )
+
+            if messages:
+                bus.publish_many(TOPIC_ORDER_INTENT, "OrderIntentV1", messages)
+
+            # 3. Drain the batch: each stage takes the whole bar in one step
+            if batch:
+                drain_total += drain_bus_workers(
+                    bus,
+                    risk_worker,
+                    exec_worker,
+                    report_worker,
+                    time_provider=self.time_provider,
+                    max_drain_iterations=max_drain_iterations,
+                    max_items=len(batch),
+                    metrics_collector=metrics_collector,
+                    step_id=self._step_count,
+                )
+                # Drained: cached intents are no longer referenced
+                intent_cache.clear()
+
+            bars_processed += 1
+            if checkpoint and checkpoint_path:
+                checkpoint = checkpoint.update(b - warmup)
+                if self._state_store:
+                    self._state_store.flush()  # Checkpoint never ahead of positions
+                checkpoint.save_atomic(checkpoint_path)
+
+        self._fill_count = exec_worker._fill_count
+        self._rejected_count = risk_worker._processed_count - exec_worker._fill_count
+
+        if jsonl_logger:
+            log_event(
+                jsonl_logger,
+                trace_id="SYSTEM",
+                event_type="UniverseModeDone",
+                step_id=self._step_count,
+                action="complete",
+                extra={"published": published_count, "bars": bars_processed, "symbols": len(books)},
+            )
+            close_jsonl_logger(jsonl_logger)
+
+        return {
+            "metrics": self._get_metrics(),
+            "published": published_count,
+            "bars": bars_processed,
+            "symbols": len(books),
+            "drain_iterations": drain_total,
+        }
+
+    def _get_metrics(self) -> Dict[str, Any]:
+        """Get current metrics."""
+        return {
+            "steps": self._step_count,
+            "symbol_bars": self._symbol_bar_count,
+            "events": self._event_count,
+            "fills": self._fill_count,
+            "rejected": self._rejected_count,
+        }
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Get current positions (all symbols) from the shared state store."""
+        if self._state_store:
+            return self._state_store.list_positions()
+        return []
+
+    def close(self) -> None:
+        """Close resources."""
+        if self._state_store:
+            self._state_store.close()
@@ -0,0 +1,292 @@
+"""
+engine/worker_runtime.py
+
+Threaded runtime for bus workers (RiskWorker / ExecWorker / PositionStoreWorker).
+
+run_bus_mode steps all workers round-robin on one thread, so an ExecWorker
+blocked in a SimulatedRealtimeAdapter sleep_fn stalls the whole pipeline.
+WorkerRuntime runs every registered worker on its own thread over a
+ThreadSafeBus:
+
+- Workers are unchanged: each thread calls worker.step(bus_view, max_items)
+  and blocks on the bus condition while its input topic is empty
+- N workers on one topic consume disjoint trace partitions (ThreadSafeBus
+  partitions), so envelopes of one trace are handled in seq order
+- Graceful stop: once the StopController (or stop(drain=True)) requests it,
+  each stage finishes its queue after all upstream stages have exited
+- Per-worker stats: processed items, batches, busy time, throughput, latency
+
+Part of the bus throughput work (threaded workers).
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from bus.threadsafe_bus import ThreadSafeBus
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerStats:
+    """Counters for one worker thread (updated only by that thread)."""
+    name: str
+    topic: str
+    partition: Optional[int] = None
+    processed: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+    max_batch_seconds: float = 0.0
+    error: Optional[str] = None
+
+    def record_batch(self, items: int, seconds: float) -> None:
+        self.processed += items
+        self.batches += 1
+        self.busy_seconds += seconds
+        self.max_batch_seconds = max(self.max_batch_seconds, seconds)
+
+    def to_dict(self, elapsed_seconds: float) -> Dict[str, Any]:
+        """Stats plus throughput (items/s of wall time) and mean item latency."""
+        return {
+            "name": self.name,
+            "topic": self.topic,
+            "partition": self.partition,
+            "processed": self.processed,
+            "batches": self.batches,
+            "busy_seconds": self.busy_seconds,
+            "utilization": self.busy_seconds / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+            "items_per_second": self.processed / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+            "mean_latency_ms": 1000.0 * self.busy_seconds / self.processed if self.processed else 0.0,
+            "max_batch_ms": 1000.0 * self.max_batch_seconds,
+            "error": self.error,
+        }
+
+
+@dataclass
+class _WorkerSlot:
+    worker: Any
+    stats: WorkerStats
+    stage: int
+    bus_view: Any
+    thread: Optional[threading.Thread] = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class WorkerRuntime:
+    """
+    Runs bus workers on dedicated threads.
+
+    Usage:
+        bus = ThreadSafeBus(partitions={TOPIC_RISK_DECISION: 4})
+        runtime = WorkerRuntime(bus, stop_controller=stop_controller)
+        runtime.add_worker("risk", risk_worker, TOPIC_ORDER_INTENT)
+        for k, w in enumerate(exec_workers):
+            runtime.add_worker(f"exec-{k}", w, TOPIC_RISK_DECISION, partition=k)
+        runtime.add_worker("position", pos_worker, TOPIC_EXECUTION_REPORT)
+        runtime.start()
+        ...publish...
+        runtime.drain()
+        runtime.stop()
+        stats = runtime.stats()
+
+    Workers registered on a new topic form the next pipeline stage; stages
+    must be added in upstream -> downstream order.
+    """
+
+    def __init__(
+        self,
+        bus: ThreadSafeBus,
+        *,
+        stop_controller=None,
+        max_items: int = 100,
+        idle_wait_s: float = 0.05,
+    ):
+        """
+        Args:
+            bus: ThreadSafeBus shared by all workers
+            stop_controller: Optional StopController; a stop request starts a graceful stop
+            max_items: Max items per worker.step() call
+            idle_wait_s: Max time a worker blocks on an empty topic before rechecking stop
+        """
+        if not isinstance(bus, ThreadSafeBus):
+            raise TypeError(f"WorkerRuntime requires a ThreadSafeBus, got {type(bus).__name__}")
+        self._bus = bus
+        self._stop_controller = stop_controller
+        self._max_items = max_items
+        self._idle_wait_s = idle_wait_s
+        self._slots: List[_WorkerSlot] = []
+        self._stage_topics: List[str] = []
+        self._stop_now = threading.Event()
+        self._stop_graceful = threading.Event()
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._activity = 0
+        self._error: Optional[BaseException] = None
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    @property
+    def topics(self) -> List[str]:
+        """Input topics in stage order."""
+        return list(self._stage_topics)
+
+    def add_worker(self, name: str, worker, topic: str, *, partition: Optional[int] = None) -> None:
+        """
+        Register a worker consuming topic (optionally one partition of it).
+
+        Args:
+            name: Unique worker name (thread name and stats key)
+            worker: Object with step(bus, max_items) -> int
+            topic: Input topic (used for idle waits, drain and stage order)
+            partition: Partition of topic this worker owns (partitioned topics)
+        """
+        if self._started_at is not None:
+            raise RuntimeError("Cannot add workers after start()")
+        if any(slot.stats.name == name for slot in self._slots):
+            raise ValueError(f"Duplicate worker name: {name}")
+        if topic not in self._stage_topics:
+            self._stage_topics.append(topic)
+        view = self._bus.partition_view(partition) if partition is not None else self._bus
+        self._slots.append(_WorkerSlot(
+            worker=worker,
+            stats=WorkerStats(name=name, topic=topic, partition=partition),
+            stage=self._stage_topics.index(topic),
+            bus_view=view,
+        ))
+
+    def start(self) -> None:
+        """Start one thread per worker."""
+        if self._started_at is not None:
+            raise RuntimeError("WorkerRuntime already started")
+        self._started_at = time.perf_counter()
+        for slot in self._slots:
+            slot.thread = threading.Thread(
+                target=self._run_worker, args=(slot,), name=f"worker-{slot.stats.name}", daemon=True
+            )
+            slot.thread.start()
+
+    def _stopping(self) -> bool:
+        if self._stop_controller is not None and self._stop_controller.is_stop_requested:
+            return True
+        return self._stop_graceful.is_set()
+
+    def _upstream_done(self, stage: int) -> bool:
+        return all(slot.done.is_set() for slot in self._slots if slot.stage < stage)
+
+    def _run_worker(self, slot: _WorkerSlot) -> None:
+        stats = slot.stats
+        view = slot.bus_view
+        try:
+            while not self._stop_now.is_set():
+                with self._lock:
+                    self._inflight += 1
+                    self._activity += 1
+                t0 = time.perf_counter()
+                try:
+                    processed = slot.worker.step(view, max_items=self._max_items)
+                except BaseException as exc:  # Surface worker failures to the caller
+                    stats.error = f"{type(exc).__name__}: {exc}"
+                    logger.exception("Worker %s failed", stats.name)
+                    with self._lock:
+                        # Recorded before inflight drops so drain() cannot miss it
+                        if self._error is None:
+                            self._error = exc
+                        self._inflight -= 1
+                        self._activity += 1
+                    self._stop_now.set()
+                    break
+                with self._lock:
+                    self._inflight -= 1
+                    self._activity += 1
+                if processed:
+                    stats.record_batch(processed, time.perf_counter() - t0)
+                    continue
+
+                # Idle: exit on graceful stop once upstream is finished, else wait
+                if self._stopping() and self._upstream_done(slot.stage) and view.size(stats.topic) == 0:
+                    break
+                view.wait_for_items(stats.topic, self._idle_wait_s)
+        finally:
+            slot.done.set()
+            self._bus.notify_all()
+
+    def raise_if_failed(self) -> None:
+        """Raise RuntimeError if any worker thread failed."""
+        if self._error is not None:
+            raise RuntimeError(f"Worker runtime failed: {self._error!r}") from self._error
+
+    def _is_drained(self) -> bool:
+        with self._lock:
+            before = (self._activity, self._inflight)
+        if before[1]:
+            return False
+        if any(self._bus.size(topic) for topic in self._stage_topics):
+            return False
+        with self._lock:
+            # No step started or finished while the queues were checked
+            return (self._activity, self._inflight) == before
+
+    def drain(self, timeout: Optional[float] = None, poll_s: float = 0.001) -> bool:
+        """
+        Block until every input topic is empty and no worker is mid-step.
+
+        Assumes producers have stopped publishing.
+
+        Returns:
+            True if drained, False on timeout
+
+        Raises:
+            RuntimeError: If a worker failed
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            self.raise_if_failed()
+            if self._is_drained():
+                self.raise_if_failed()
+                return True
+            if all(slot.done.is_set() for slot in self._slots):
+                # Everyone exited (stop) with items left behind
+                return self._is_drained()
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(poll_s)
+
+    def stop(self, *, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop all workers and join their threads.
+
+        Args:
+            drain: Graceful (finish queued items stage by stage) vs immediate
+                (exit after the current batch)
+            timeout: Max seconds to wait per thread
+
+        Raises:
+            RuntimeError: If a worker failed
+        """
+        if drain:
+            self._stop_graceful.set()
+        else:
+            self._stop_now.set()
+        self._bus.notify_all()
+        for slot in self._slots:
+            if slot.thread is not None:
+                slot.thread.join(timeout)
+        if self._stopped_at is None:
+            self._stopped_at = time.perf_counter()
+        self.raise_if_failed()
+
+    @property
+    def running(self) -> bool:
+        return any(slot.thread is not None and slot.thread.is_alive() for slot in self._slots)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-worker stats keyed by worker name."""
+        if self._started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._stopped_at or time.perf_counter()) - self._started_at
+        return {slot.stats.name: slot.stats.to_dict(elapsed) for slot in self._slots}
@@ -2,5 +2,6 @@
 """State persistence package."""
 
 from state.position_store_sqlite import PositionStoreSQLite
+from state.position_cache import PositionCache
 
-__all__ = ["PositionStoreSQLite"]
+__all__ = ["PositionStoreSQLite", "PositionCache"]
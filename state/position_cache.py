@@ -0,0 +1,239 @@
+"""
+state/position_cache.py
+
+Write-behind in-memory position cache in front of PositionStoreSQLite.
+
+During a run the cache is the authoritative position map: reads are dict
+lookups (no SQLite round trip), fills update memory and mark the symbol
+dirty, and dirty symbols are written to SQLite in one transaction when a
+flush is due:
+- size-based: flush_every_fills fills since the last flush
+- periodic: flush_every_seconds since the last flush (checked on write)
+- explicit: flush() and close()
+
+A flush also appends the fills applied since the last flush to the store's
+fill ledger, in the same transaction as the position rows.
+
+LoopStepper flushes before every checkpoint save, so a checkpoint never
+runs ahead of persisted positions. Fills applied after the last flush are
+lost on a crash; resuming from the last checkpoint re-applies them.
+
+The cache exposes the PositionStoreSQLite fill/read API (apply_fill,
+apply_fills, get_position, list_positions, ensure_schema, close), so
+PositionStoreWorker and LoopStepper use it as a drop-in store.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from state.position_store_sqlite import Fill, PositionStoreSQLite
+
+
+class PositionCache:
+    """
+    Write-behind position map backed by PositionStoreSQLite.
+
+    Thread-safe: the position worker of engine/worker_runtime.py may apply
+    fills while the loop thread reads weights.
+
+    Usage:
+        cache = PositionCache(PositionStoreSQLite("state.db"), flush_every_fills=500)
+        cache.apply_fill("BTC/USDT", "BUY", 1.0, 50000.0)
+        cache.get_position("BTC/USDT")  # No SQLite read
+        cache.flush()                   # One transaction for all dirty symbols
+        cache.close()                   # Flush + close store
+    """
+
+    def __init__(
+        self,
+        store: PositionStoreSQLite,
+        *,
+        flush_every_fills: Optional[int] = 1000,
+        flush_every_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache and load current positions from the store.
+
+        Args:
+            store: Backing PositionStoreSQLite (schema is ensured)
+            flush_every_fills: Flush after this many fills (None: never by size)
+            flush_every_seconds: Flush when this long since the last flush
+                (None: never by time)
+            clock: Monotonic clock (injectable for tests)
+
+        Raises:
+            ValueError: If a flush threshold is not positive
+        """
+        if flush_every_fills is not None and flush_every_fills < 1:
+            raise ValueError(f"flush_every_fills must be >= 1, got {flush_every_fills}")
+        if flush_every_seconds is not None and flush_every_seconds <= 0:
+            raise ValueError(f"flush_every_seconds must be > 0, got {flush_every_seconds}")
+
+        self._store = store
+        self.flush_every_fills = flush_every_fills
+        self.flush_every_seconds = flush_every_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._positions: Dict[str, Tuple[float, float]] = {}  # symbol -> (qty, avg_price)
+        self._dirty: Set[str] = set()
+        self._pending: List[Fill] = []  # Validated fills not yet in the ledger
+        self._fills_since_flush = 0
+        self._last_flush_t = clock()
+        self.flushes = 0  # Flushes that wrote at least one symbol
+
+        store.ensure_schema()
+        for pos in store.list_positions():
+            avg = pos["avg_price"] if pos["avg_price"] is not None else 0.0
+            self._positions[pos["symbol"]] = (float(pos["qty"]), float(avg))
+
+    @property
+    def store(self) -> PositionStoreSQLite:
+        """Backing SQLite store."""
+        return self._store
+
+    @property
+    def dirty_count(self) -> int:
+        """Symbols changed since the last flush."""
+        return len(self._dirty)
+
+    def ensure_schema(self) -> None:
+        """Schema is ensured on construction (kept for store API parity)."""
+        self._store.ensure_schema()
+
+    # -------------------------------------------------------------------------
+    # Fills
+    # -------------------------------------------------------------------------
+
+    def apply_fill(self, symbol: str, side: str, qty: float, price: float) -> Dict[str, Any]:
+        """
+        Apply a fill in memory (same semantics as PositionStoreSQLite.apply_fill).
+
+        Returns:
+            {"symbol", "qty", "avg_price", "closed"} after the fill
+
+        Raises:
+            ValueError: If inputs are invalid
+        """
+        return self.apply_fills([(symbol, side, qty, price)])[0]
+
+    def apply_fills(self, fills: Iterable[Fill]) -> List[Dict[str, Any]]:
+        """
+        Apply a batch of fills in memory, in order.
+
+        Returns:
+            One dict per fill, as PositionStoreSQLite.apply_fills()
+
+        Raises:
+            ValueError: If any fill is invalid (nothing is applied)
+        """
+        validated = []
+        for symbol, side, qty, price in fills:
+            symbol, side = self._store._validate_fill(symbol, side, qty, price)
+            validated.append((symbol, side, qty, price))
+
+        results: List[Dict[str, Any]] = []
+        with self._lock:
+            for symbol, side, qty, price in validated:
+                current_qty, current_avg = self._positions.get(symbol, (0.0, 0.0))
+                new_qty, new_avg = self._store._compute_new_position(
+                    current_qty, current_avg, side, qty, price
+                )
+                self._dirty.add(symbol)
+                if abs(new_qty) < 1e-10:
+                    self._positions.pop(symbol, None)
+                    results.append({"symbol": symbol, "qty": 0.0, "avg_price": None, "closed": True})
+                else:
+                    self._positions[symbol] = (new_qty, new_avg)
+                    results.append({"symbol": symbol, "qty": new_qty, "avg_price": new_avg, "closed": False})
+
+            self._pending.extend(validated)
+            self._fills_since_flush += len(validated)
+            if self._flush_due():
+                self._flush_locked()
+
+        return results
+
+    # -------------------------------------------------------------------------
+    # Reads (no SQLite access)
+    # -------------------------------------------------------------------------
+
+    def get_position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get position by symbol.
+
+        Returns:
+            {"symbol", "qty", "avg_price"} or None if flat
+        """
+        pos = self._positions.get(symbol)
+        if pos is None:
+            return None
+        return {"symbol": symbol, "qty": pos[0], "avg_price": pos[1]}
+
+    def list_positions(self) -> List[Dict[str, Any]]:
+        """List all positions ordered by symbol."""
+        with self._lock:
+            items = sorted(self._positions.items())
+        return [{"symbol": s, "qty": qty, "avg_price": avg} for s, (qty, avg) in items]
+
+    def weights(self, nav: float, prices: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        Current portfolio weights for risk checks.
+
+        Args:
+            nav: Net asset value the weights are relative to (must be > 0)
+            prices: Mark prices by symbol; symbols without one are valued at
+                their avg_price
+
+        Returns:
+            symbol -> abs(qty) * price / nav (gross exposure per symbol)
+        """
+        if nav <= 0:
+            raise ValueError(f"nav must be positive, got {nav}")
+        prices = prices or {}
+        with self._lock:
+            return {
+                symbol: abs(qty) * prices.get(symbol, avg) / nav
+                for symbol, (qty, avg) in self._positions.items()
+            }
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Write all dirty symbols to SQLite in one transaction."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush and close the backing store."""
+        self.flush()
+        self._store.close()
+
+    def __enter__(self) -> "PositionCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _flush_due(self) -> bool:
+        if self.flush_every_fills is not None and self._fills_since_flush >= self.flush_every_fills:
+            return True
+        return (
+            self.flush_every_seconds is not None
+            and self._clock() - self._last_flush_t >= self.flush_every_seconds
+        )
+
+    def _flush_locked(self) -> None:
+        if self._dirty or self._pending:
+            self._store.write_positions(
+                {s: self._positions.get(s) for s in self._dirty}, fills=self._pending,
+            )
+            self._dirty.clear()
+            self._pending = []
+            self.flushes += 1
+        self._fills_since_flush = 0
+        self._last_flush_t = self._clock()
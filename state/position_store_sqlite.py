@@ -5,13 +5,34 @@ SQLite-based position store for state persistence.
 
 Uses only sqlite3 (stdlib), no external dependencies.
 Schema is created idempotently on first access.
+
+Throughput: connections run in WAL mode with synchronous=NORMAL by default
+(commits append to the WAL without an fsync each; a process crash never
+loses a committed fill, an OS crash/power loss may lose the last few).
+apply_fills() applies a whole batch of fills in one transaction, so a
+PositionStoreWorker draining N reports pays one commit instead of N.
+
+Fill ledger: every applied fill is also appended to the `fills` table
+under a monotonic sequence number (in the same transaction as the position
+update). Every snapshot_every fills, the full position table is copied into
+`position_snapshot_rows` keyed by the ledger offset it covers.
+rebuild_positions(as_of_seq) loads the nearest snapshot at or before
+as_of_seq and replays only the ledger tail, so historical positions (PnL,
+audits) and restarts don't need a backtest re-run. Positions written
+directly with upsert_position()/delete_position() bypass the ledger; those
+present while the ledger is still empty become the seq-0 snapshot
+(ensure_schema), so upgraded databases rebuild from their live positions.
 """
 
 import sqlite3
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+
+# (symbol, side, qty, price) as accepted by apply_fill()
+Fill = Tuple[str, str, float, float]
 
 
 class PositionStoreSQLite:
@@ -38,34 +59,102 @@ class PositionStoreSQLite:
         key TEXT PRIMARY KEY,
         value TEXT
     );
+    
+    CREATE TABLE IF NOT EXISTS fills (
+        seq INTEGER PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        side TEXT NOT NULL,
+        qty REAL NOT NULL,
+        price REAL NOT NULL,
+        ts TEXT NOT NULL
+    );
+    
+    CREATE TABLE IF NOT EXISTS position_snapshots (
+        seq INTEGER PRIMARY KEY,
+        created_at TEXT NOT NULL
+    );
+    
+    CREATE TABLE IF NOT EXISTS position_snapshot_rows (
+        seq INTEGER NOT NULL,
+        symbol TEXT NOT NULL,
+        qty REAL NOT NULL,
+        avg_price REAL,
+        PRIMARY KEY (seq, symbol)
+    );
     """
 
-    def __init__(self, db_path: Union[str, Path]):
+    UPSERT_SQL = """
+    INSERT INTO positions (symbol, qty, avg_price, updated_at, meta_json)
+    VALUES (?, ?, ?, ?, NULL)
+    ON CONFLICT(symbol) DO UPDATE SET
+        qty = excluded.qty,
+        avg_price = excluded.avg_price,
+        updated_at = excluded.updated_at
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        *,
+        journal_mode: Optional[str] = "WAL",
+        synchronous: Optional[str] = "NORMAL",
+        snapshot_every: Optional[int] = 10_000,
+    ):
         """
         Initialize the position store.
         
         Args:
             db_path: Path to SQLite database file (created if not exists)
+            journal_mode: PRAGMA journal_mode for the connection (None keeps
+                SQLite's default rollback journal)
+            synchronous: PRAGMA synchronous for the connection (None keeps
+                SQLite's default FULL)
+            snapshot_every: Snapshot all positions each time the fill ledger
+                crosses a multiple of this many fills (None: only explicit
+                snapshot_positions() calls)
+        
+        Raises:
+            ValueError: If snapshot_every is not positive
         """
+        if snapshot_every is not None and snapshot_every < 1:
+            raise ValueError(f"snapshot_every must be >= 1, got {snapshot_every}")
         self.db_path = Path(db_path)
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.snapshot_every = snapshot_every
         self._conn: Optional[sqlite3.Connection] = None
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get or create database connection."""
+        """
+        Get or create database connection.
+        
+        The connection may be handed to another thread (the position worker
+        of engine/worker_runtime.py); callers must not use it concurrently.
+        """
         if self._conn is None:
-            self._conn = sqlite3.connect(str(self.db_path))
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
             self._conn.row_factory = sqlite3.Row
+            if self.journal_mode:
+                self._conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            if self.synchronous:
+                self._conn.execute(f"PRAGMA synchronous={self.synchronous}")
         return self._conn
 
     def ensure_schema(self) -> None:
         """
         Create schema if not exists (idempotent).
         
-        Safe to call multiple times.
+        Safe to call multiple times. A database whose fill ledger is empty
+        but whose positions table is not (e.g. written before the ledger
+        existed, or by upsert_position()) gets a seq-0 snapshot of those
+        positions, so rebuild_positions() starts from them.
         """
         conn = self._get_connection()
         conn.executescript(self.SCHEMA_SQL)
-        conn.commit()
+        with conn:
+            ledger_empty = conn.execute("SELECT 1 FROM fills LIMIT 1").fetchone() is None
+            if ledger_empty and conn.execute("SELECT 1 FROM positions LIMIT 1").fetchone():
+                self._snapshot(conn, 0)
 
     def close(self) -> None:
         """Close database connection."""
@@ -193,7 +282,256 @@ class PositionStoreSQLite:
         Raises:
             ValueError: If inputs are invalid
         """
-        # Validate inputs
+        symbol, side = self._validate_fill(symbol, side, qty, price)
+        
+        # Transactional: use single connection with explicit transaction
+        conn = self._get_connection()
+        
+        with conn:  # Implicit transaction
+            # Read current position within transaction
+            current_qty, current_avg = self._read_position(conn, symbol)
+            
+            # Calculate new qty and avg_price
+            new_qty, new_avg = self._compute_new_position(
+                current_qty, current_avg, side, qty, price
+            )
+            
+            # Position closure deletes the row
+            closed = abs(new_qty) < 1e-10
+            self._write_positions(conn, {symbol: None if closed else (new_qty, new_avg)})
+            self._record_fills(conn, [(symbol, side, qty, price)])
+        
+        if closed:
+            return {"symbol": symbol, "qty": 0.0, "avg_price": None, "closed": True}
+        
+        # Read back the updated position
+        return self.get_position(symbol)
+
+    def apply_fills(self, fills: Iterable[Fill]) -> List[Dict[str, Any]]:
+        """
+        Apply a batch of fills in a single transaction (group commit).
+        
+        Equivalent to calling apply_fill() for each fill in order, but each
+        touched symbol is read once, its final state is written once
+        (executemany over the cached upsert/delete statements) and the batch
+        commits once. Either every fill is applied or none is.
+        
+        Args:
+            fills: (symbol, side, qty, price) tuples, applied in order
+            
+        Returns:
+            One dict per fill with the position right after that fill:
+            {"symbol", "qty", "avg_price", "closed"} (qty 0.0 and
+            avg_price None when the fill closed the position)
+            
+        Raises:
+            ValueError: If any fill is invalid (nothing is applied)
+        """
+        validated = []
+        for symbol, side, qty, price in fills:
+            symbol, side = self._validate_fill(symbol, side, qty, price)
+            validated.append((symbol, side, qty, price))
+        if not validated:
+            return []
+        
+        conn = self._get_connection()
+        results: List[Dict[str, Any]] = []
+        
+        with conn:  # One transaction for the whole batch
+            positions: Dict[str, Tuple[float, float]] = {}
+            for symbol, side, qty, price in validated:
+                if symbol not in positions:
+                    positions[symbol] = self._read_position(conn, symbol)
+                current_qty, current_avg = positions[symbol]
+                
+                new_qty, new_avg = self._compute_new_position(
+                    current_qty, current_avg, side, qty, price
+                )
+                
+                if abs(new_qty) < 1e-10:
+                    positions[symbol] = (0.0, 0.0)
+                    results.append({"symbol": symbol, "qty": 0.0, "avg_price": None, "closed": True})
+                else:
+                    positions[symbol] = (new_qty, new_avg)
+                    results.append({"symbol": symbol, "qty": new_qty, "avg_price": new_avg, "closed": False})
+            
+            self._write_positions(conn, {
+                symbol: (qty, avg) if abs(qty) >= 1e-10 else None
+                for symbol, (qty, avg) in positions.items()
+            })
+            self._record_fills(conn, validated)
+        
+        return results
+
+    def write_positions(
+        self,
+        positions: Dict[str, Optional[Tuple[float, float]]],
+        fills: Iterable[Fill] = (),
+    ) -> None:
+        """
+        Write final position states in one transaction.
+        
+        Used by write-behind callers (state/position_cache.py) that compute
+        positions themselves.
+        
+        Args:
+            positions: symbol -> (qty, avg_price), or None to delete the row
+            fills: Validated fills that produced these positions, appended to
+                the fill ledger in the same transaction
+        """
+        fills = list(fills)
+        if not positions and not fills:
+            return
+        conn = self._get_connection()
+        with conn:
+            self._write_positions(conn, positions)
+            self._record_fills(conn, fills)
+
+    def _write_positions(
+        self,
+        conn: sqlite3.Connection,
+        positions: Dict[str, Optional[Tuple[float, float]]],
+    ) -> None:
+        """Upsert/delete positions with executemany (caller owns the transaction)."""
+        now = datetime.now(timezone.utc).isoformat()
+        upserts = [
+            (symbol, pos[0], pos[1], now)
+            for symbol, pos in positions.items()
+            if pos is not None
+        ]
+        deletes = [(symbol,) for symbol, pos in positions.items() if pos is None]
+        if upserts:
+            conn.executemany(self.UPSERT_SQL, upserts)
+        if deletes:
+            conn.executemany("DELETE FROM positions WHERE symbol = ?", deletes)
+
+    # -------------------------------------------------------------------------
+    # Fill Ledger
+    # -------------------------------------------------------------------------
+
+    def ledger_seq(self) -> int:
+        """Sequence number of the last ledger fill (0 if empty)."""
+        conn = self._get_connection()
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM fills").fetchone()[0]
+
+    def list_fills(self, after_seq: int = 0, until_seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Ledger fills with after_seq < seq <= until_seq, in sequence order.
+        
+        Returns:
+            List of {"seq", "symbol", "side", "qty", "price", "ts"}
+        """
+        conn = self._get_connection()
+        cursor = conn.execute(
+            "SELECT seq, symbol, side, qty, price, ts FROM fills"
+            " WHERE seq > ? AND seq <= ? ORDER BY seq",
+            (after_seq, until_seq if until_seq is not None else self.ledger_seq()),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def snapshot_positions(self) -> int:
+        """
+        Snapshot all positions at the current ledger offset.
+        
+        Returns:
+            Ledger sequence the snapshot covers
+        """
+        conn = self._get_connection()
+        with conn:
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM fills").fetchone()[0]
+            self._snapshot(conn, seq)
+        return seq
+
+    def rebuild_positions(self, as_of_seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Positions as of a ledger offset, from the nearest snapshot + ledger tail.
+        
+        Args:
+            as_of_seq: Ledger sequence to rebuild at (default: ledger head)
+            
+        Returns:
+            List of {"symbol", "qty", "avg_price"} ordered by symbol
+            
+        Raises:
+            ValueError: If as_of_seq is negative
+        """
+        if as_of_seq is not None and as_of_seq < 0:
+            raise ValueError(f"as_of_seq must be >= 0, got {as_of_seq}")
+        conn = self._get_connection()
+        if as_of_seq is None:
+            as_of_seq = self.ledger_seq()
+        
+        base_seq = conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM position_snapshots WHERE seq <= ?",
+            (as_of_seq,)
+        ).fetchone()[0]
+        positions: Dict[str, Tuple[float, float]] = {}
+        for row in conn.execute(
+            "SELECT symbol, qty, avg_price FROM position_snapshot_rows WHERE seq = ?",
+            (base_seq,)
+        ):
+            avg = float(row["avg_price"]) if row["avg_price"] is not None else 0.0
+            positions[row["symbol"]] = (float(row["qty"]), avg)
+        
+        for row in conn.execute(
+            "SELECT symbol, side, qty, price FROM fills WHERE seq > ? AND seq <= ? ORDER BY seq",
+            (base_seq, as_of_seq)
+        ):
+            current_qty, current_avg = positions.get(row["symbol"], (0.0, 0.0))
+            new_qty, new_avg = self._compute_new_position(
+                current_qty, current_avg, row["side"], row["qty"], row["price"]
+            )
+            if abs(new_qty) < 1e-10:
+                positions.pop(row["symbol"], None)
+            else:
+                positions[row["symbol"]] = (new_qty, new_avg)
+        
+        return [
+            {"symbol": symbol, "qty": qty, "avg_price": avg}
+            for symbol, (qty, avg) in sorted(positions.items())
+        ]
+
+    def _record_fills(self, conn: sqlite3.Connection, fills: List[Fill]) -> None:
+        """Append validated fills to the ledger; snapshot when a boundary is crossed."""
+        if not fills:
+            return
+        last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM fills").fetchone()[0]
+        now = datetime.now(timezone.utc).isoformat()
+        conn.executemany(
+            "INSERT INTO fills (seq, symbol, side, qty, price, ts) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (last_seq + i, symbol, side, qty, price, now)
+                for i, (symbol, side, qty, price) in enumerate(fills, start=1)
+            ]
+        )
+        new_seq = last_seq + len(fills)
+        if self.snapshot_every and new_seq // self.snapshot_every > last_seq // self.snapshot_every:
+            # Positions are already updated in this transaction: they cover new_seq
+            self._snapshot(conn, new_seq)
+
+    def _snapshot(self, conn: sqlite3.Connection, seq: int) -> None:
+        """Copy the positions table into snapshot rows keyed by seq (caller owns the transaction)."""
+        conn.execute(
+            "INSERT OR REPLACE INTO position_snapshots (seq, created_at) VALUES (?, ?)",
+            (seq, datetime.now(timezone.utc).isoformat())
+        )
+        conn.execute("DELETE FROM position_snapshot_rows WHERE seq = ?", (seq,))
+        conn.execute(
+            "INSERT INTO position_snapshot_rows (seq, symbol, qty, avg_price)"
+            " SELECT ?, symbol, qty, avg_price FROM positions",
+            (seq,)
+        )
+
+    def _validate_fill(self, symbol: str, side: str, qty: float, price: float) -> Tuple[str, str]:
+        """
+        Validate fill inputs.
+        
+        Returns:
+            Tuple of (normalized symbol, normalized side)
+            
+        Raises:
+            ValueError: If inputs are invalid
+        """
         if not symbol or not isinstance(symbol, str) or not symbol.strip():
             raise ValueError(f"symbol must be a non-empty string, got {symbol!r}")
         symbol = symbol.strip()
@@ -210,50 +548,17 @@ class PositionStoreSQLite:
         if price is None or price <= 0:
             raise ValueError(f"price must be positive, got {price}")
         
-        # Transactional: use single connection with explicit transaction
-        conn = self._get_connection()
-        
-        with conn:  # Implicit transaction
-            # Read current position within transaction
-            cursor = conn.execute(
-                "SELECT symbol, qty, avg_price FROM positions WHERE symbol = ?",
-                (symbol,)
-            )
-            row = cursor.fetchone()
-            
-            if row is None:
-                current_qty = 0.0
-                current_avg = 0.0
-            else:
-                current_qty = float(row["qty"])
-                current_avg = float(row["avg_price"]) if row["avg_price"] is not None else 0.0
-            
-            # Calculate new qty and avg_price
-            new_qty, new_avg = self._compute_new_position(
-                current_qty, current_avg, side, qty, price
-            )
-            
-            # Handle position closure
-            if abs(new_qty) < 1e-10:
-                conn.execute("DELETE FROM positions WHERE symbol = ?", (symbol,))
-                return {"symbol": symbol, "qty": 0.0, "avg_price": None, "closed": True}
-            
-            # Upsert within transaction
-            now = datetime.now(timezone.utc).isoformat()
-            conn.execute(
-                """
-                INSERT INTO positions (symbol, qty, avg_price, updated_at, meta_json)
-                VALUES (?, ?, ?, ?, NULL)
-                ON CONFLICT(symbol) DO UPDATE SET
-                    qty = excluded.qty,
-                    avg_price = excluded.avg_price,
-                    updated_at = excluded.updated_at
-                """,
-                (symbol, new_qty, new_avg, now)
-            )
-        
-        # Read back the updated position
-        return self.get_position(symbol)
+        return symbol, side
+
+    def _read_position(self, conn: sqlite3.Connection, symbol: str) -> Tuple[float, float]:
+        """Read (qty, avg_price) for symbol, (0.0, 0.0) if flat."""
+        row = conn.execute(
+            "SELECT qty, avg_price FROM positions WHERE symbol = ?",
+            (symbol,)
+        ).fetchone()
+        if row is None:
+            return 0.0, 0.0
+        return float(row["qty"]), float(row["avg_price"]) if row["avg_price"] is not None else 0.0
 
     def _compute_new_position(
         self,
@@ -0,0 +1,427 @@
+"""
+strategy_engine/indicators.py
+
+Incremental (streaming) technical indicators with O(1) updates.
+
+Every indicator consumes one observation per update() call, keeps only the
+state it needs, and can be serialized with to_state() / restored with
+indicator_from_state() so a strategy's state can be checkpointed and resumed
+without replaying history.
+
+Available indicators:
+    SMA          Simple moving average (bit-identical to rolling(w).mean())
+    EMA          Exponential moving average (bit-identical to ewm(span, adjust=False))
+    RollingStd   Rolling sample std (rolling(w).std(ddof))
+    ATR          Average True Range, Wilder smoothing
+    RSI          Relative Strength Index, Wilder smoothing
+    Crossover    Golden/death cross detection between two series
+
+crossover_signals() is the vectorized (whole-array) counterpart of Crossover,
+used by precompute mode.
+
+Values are NaN until the indicator is warmed up (same as pandas).
+
+Usage:
+    sma = SMA(10)
+    for close in closes:
+        value = sma.update(close)
+    state = sma.to_state()                 # JSON-serializable dict
+    sma2 = indicator_from_state(state)     # identical continuation
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Optional, Type
+
+import numpy as np
+
+
+NAN = float("nan")
+
+
+def _is_nan(x: Optional[float]) -> bool:
+    return x is None or x != x
+
+
+class Indicator:
+    """
+    Base class for streaming indicators.
+
+    Subclasses set `kind`, implement update(), and list the attributes that
+    make up their state in `_state_fields`.
+    """
+
+    kind: str = ""
+    _state_fields: tuple = ()
+
+    @property
+    def value(self) -> float:
+        """Current indicator value (NaN until warmed up)."""
+        return self._value
+
+    @property
+    def ready(self) -> bool:
+        """True once the indicator produces non-NaN values."""
+        return not _is_nan(self._value)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Return JSON-serializable state."""
+        state: Dict[str, Any] = {"kind": self.kind}
+        for name in self._state_fields:
+            v = getattr(self, name)
+            state[name] = list(v) if isinstance(v, deque) else v
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Indicator":
+        """Rebuild an indicator from to_state()."""
+        obj = cls.__new__(cls)
+        for name in cls._state_fields:
+            v = state[name]
+            setattr(obj, name, deque(v) if isinstance(v, list) else v)
+        return obj
+
+
+class SMA(Indicator):
+    """
+    Simple moving average over a fixed window.
+
+    Mirrors pandas roll_mean: Kahan-compensated add/remove sums and the same
+    result clamping, so values match rolling(window).mean() bit for bit.
+    """
+
+    kind = "sma"
+    _state_fields = (
+        "window", "_values", "_sum", "_comp_add", "_comp_remove",
+        "_neg_ct", "_same_ct", "_prev", "_value",
+    )
+
+    def __init__(self, window: int):
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self.window = window
+        self._values: deque = deque()
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._neg_ct = 0
+        self._same_ct = 0
+        self._prev: Optional[float] = None
+        self._value = NAN
+
+    def update(self, x: float) -> float:
+        """Push one observation and return the current mean."""
+        x = float(x)
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            y = -old - self._comp_remove
+            t = self._sum + y
+            self._comp_remove = t - self._sum - y
+            self._sum = t
+            if math.copysign(1.0, old) < 0:
+                self._neg_ct -= 1
+
+        self._values.append(x)
+        y = x - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct += 1
+        if self._prev is None or x == self._prev:
+            self._same_ct += 1
+        else:
+            self._same_ct = 1
+        self._prev = x
+
+        nobs = len(self._values)
+        if nobs < self.window:
+            self._value = NAN
+            return self._value
+        result = self._sum / nobs
+        if self._same_ct >= nobs:
+            result = self._prev
+        elif self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == nobs and result > 0:
+            result = 0.0
+        self._value = result
+        return result
+
+
+class EMA(Indicator):
+    """
+    Exponential moving average (span, adjust=False).
+
+    Mirrors pandas ewm(span=..., adjust=False).mean() bit for bit. Seeded with
+    the first observation, so it is never NaN after the first update.
+    """
+
+    kind = "ema"
+    _state_fields = ("span", "alpha", "_value")
+
+    def __init__(self, span: int):
+        if span <= 0:
+            raise ValueError(f"span must be positive, got {span}")
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self._value = NAN
+
+    def update(self, x: float) -> float:
+        """Push one observation and return the current EMA."""
+        x = float(x)
+        if _is_nan(self._value):
+            self._value = x
+        elif self._value != x:
+            old_wt = 1.0 - self.alpha
+            self._value = (old_wt * self._value + self.alpha * x) / (old_wt + self.alpha)
+        return self._value
+
+
+class RollingStd(Indicator):
+    """
+    Rolling standard deviation over a fixed window.
+
+    Welford add/remove updates with Kahan-compensated means, following pandas
+    roll_var; matches rolling(window).std(ddof=ddof) to floating-point
+    rounding.
+    """
+
+    kind = "rolling_std"
+    _state_fields = (
+        "window", "ddof", "_values", "_mean", "_ssqdm", "_comp_add",
+        "_comp_remove", "_same_ct", "_prev", "_value",
+    )
+
+    def __init__(self, window: int, ddof: int = 1):
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self.window = window
+        self.ddof = ddof
+        self._values: deque = deque()
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_ct = 0
+        self._prev: Optional[float] = None
+        self._value = NAN
+
+    def update(self, x: float) -> float:
+        """Push one observation and return the current std."""
+        x = float(x)
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            nobs = len(self._values)
+            if nobs:
+                prev_mean = self._mean - self._comp_remove
+                y = old - self._comp_remove
+                t = y - self._mean
+                self._comp_remove = t + self._mean - y
+                self._mean = self._mean - t / nobs
+                self._ssqdm = self._ssqdm - (old - prev_mean) * (old - self._mean)
+            else:
+                self._mean = 0.0
+                self._ssqdm = 0.0
+
+        self._values.append(x)
+        nobs = len(self._values)
+        if self._prev is None or x == self._prev:
+            self._same_ct += 1
+        else:
+            self._same_ct = 1
+        self._prev = x
+        prev_mean = self._mean - self._comp_add
+        y = x - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        self._mean = self._mean + t / nobs
+        self._ssqdm = self._ssqdm + (x - prev_mean) * (x - self._mean)
+
+        if nobs < self.window or nobs <= self.ddof:
+            self._value = NAN
+        elif nobs == 1 or self._same_ct >= nobs:
+            self._value = 0.0
+        else:
+            var = self._ssqdm / (nobs - self.ddof)
+            self._value = math.sqrt(var) if var > 0 else 0.0
+        return self._value
+
+
+class ATR(Indicator):
+    """
+    Average True Range with Wilder smoothing.
+
+    TR = max(high - low, |high - prev_close|, |low - prev_close|) (the first
+    bar uses high - low). ATR is the mean of the first `period` TRs, then
+    ATR = (ATR * (period - 1) + TR) / period.
+    """
+
+    kind = "atr"
+    _state_fields = ("period", "_prev_close", "_count", "_tr_sum", "_value")
+
+    def __init__(self, period: int = 14):
+        if period <= 0:
+            raise ValueError(f"period must be positive, got {period}")
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._count = 0
+        self._tr_sum = 0.0
+        self._value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """Push one bar and return the current ATR."""
+        high, low, close = float(high), float(low), float(close)
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._count += 1
+
+        if self._count < self.period:
+            self._tr_sum += tr
+        elif self._count == self.period:
+            self._tr_sum += tr
+            self._value = self._tr_sum / self.period
+        else:
+            self._value = (self._value * (self.period - 1) + tr) / self.period
+        return self._value
+
+
+class RSI(Indicator):
+    """
+    Relative Strength Index with Wilder smoothing.
+
+    Average gain/loss are the mean of the first `period` close-to-close
+    changes, then smoothed as avg = (avg * (period - 1) + x) / period.
+    RSI = 100 - 100 / (1 + avg_gain / avg_loss); 100 if avg_loss == 0
+    (50 if the series is flat).
+    """
+
+    kind = "rsi"
+    _state_fields = ("period", "_prev_close", "_count", "_avg_gain", "_avg_loss", "_value")
+
+    def __init__(self, period: int = 14):
+        if period <= 0:
+            raise ValueError(f"period must be positive, got {period}")
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._count = 0  # Number of changes seen
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._value = NAN
+
+    def update(self, close: float) -> float:
+        """Push one close and return the current RSI."""
+        close = float(close)
+        if self._prev_close is None:
+            self._prev_close = close
+            return self._value
+
+        change = close - self._prev_close
+        self._prev_close = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self._count += 1
+
+        if self._count <= self.period:
+            # Accumulate sums during warmup, average on the last one
+            self._avg_gain += gain
+            self._avg_loss += loss
+            if self._count < self.period:
+                return self._value
+            self._avg_gain /= self.period
+            self._avg_loss /= self.period
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        if self._avg_loss == 0.0:
+            self._value = 50.0 if self._avg_gain == 0.0 else 100.0
+        else:
+            rs = self._avg_gain / self._avg_loss
+            self._value = 100.0 - 100.0 / (1.0 + rs)
+        return self._value
+
+
+class Crossover(Indicator):
+    """
+    Detects crossings of a fast series over/under a slow series.
+
+    update(fast, slow) returns 'BUY' on a golden cross (prev fast <= slow and
+    now fast > slow), 'SELL' on a death cross (prev fast >= slow and now
+    fast < slow), None otherwise or if any of the four values is NaN.
+    Same rule as strategy_v0_7 / strategy_v0_8.
+    """
+
+    kind = "crossover"
+    _state_fields = ("_prev_fast", "_prev_slow", "_value")
+
+    def __init__(self):
+        self._prev_fast: Optional[float] = None
+        self._prev_slow: Optional[float] = None
+        self._value: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once a previous (fast, slow) pair is available."""
+        return self._prev_fast is not None
+
+    def update(self, fast: float, slow: float) -> Optional[str]:
+        """Push the current (fast, slow) pair and return the signal, if any."""
+        prev_fast, prev_slow = self._prev_fast, self._prev_slow
+        self._prev_fast, self._prev_slow = fast, slow
+
+        self._value = None
+        if prev_fast is None or any(_is_nan(v) for v in (prev_fast, prev_slow, fast, slow)):
+            return None
+        if prev_fast <= prev_slow and fast > slow:
+            self._value = "BUY"
+        elif prev_fast >= prev_slow and fast < slow:
+            self._value = "SELL"
+        return self._value
+
+
+def crossover_signals(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Crossover over whole arrays.
+
+    Returns an object array aligned with the inputs holding 'BUY', 'SELL' or
+    None per position; element i equals Crossover.update(fast[i], slow[i])
+    after feeding positions 0..i-1.
+    """
+    fast = np.asarray(fast, dtype=np.float64)
+    slow = np.asarray(slow, dtype=np.float64)
+    signals = np.full(len(fast), None, dtype=object)
+    if len(fast) < 2:
+        return signals
+
+    prev_fast, prev_slow = fast[:-1], slow[:-1]
+    curr_fast, curr_slow = fast[1:], slow[1:]
+    valid = ~(np.isnan(prev_fast) | np.isnan(prev_slow) | np.isnan(curr_fast) | np.isnan(curr_slow))
+    buy = valid & (prev_fast <= prev_slow) & (curr_fast > curr_slow)
+    sell = valid & ~buy & (prev_fast >= prev_slow) & (curr_fast < curr_slow)
+
+    tail = signals[1:]
+    tail[buy] = "BUY"
+    tail[sell] = "SELL"
+    return signals
+
+
+INDICATOR_TYPES: Dict[str, Type[Indicator]] = {
+    cls.kind: cls for cls in (SMA, EMA, RollingStd, ATR, RSI, Crossover)
+}
+
+
+def indicator_from_state(state: Dict[str, Any]) -> Indicator:
+    """
+    Rebuild any indicator from its to_state() dict.
+
+    Raises:
+        ValueError: If the state's kind is unknown
+    """
+    kind = state.get("kind")
+    if kind not in INDICATOR_TYPES:
+        supported = ", ".join(sorted(INDICATOR_TYPES))
+        raise ValueError(f"Unknown indicator kind '{kind}'. Supported: {supported}")
+    return INDICATOR_TYPES[kind].from_state(state)
@@ -0,0 +1,147 @@
+"""
+strategy_engine/precomputed.py
+
+Precompute (vectorized) strategy mode for offline runs.
+
+When the full OHLCV frame is already in memory (backtests, calibration), the
+crossover signals of v0_7/v0_8 can be computed once for every bar with
+vectorized pandas/NumPy instead of re-running the strategy on a growing
+slice per bar. LoopStepper.run() / run_bus_mode() call precompute() once and
+then only look up intents by bar index.
+
+Contract:
+    schedule = strategy.precompute(ohlcv_df, params)
+    intents = schedule.intents_at(bar_idx, ticker, asof_ts)
+
+Equivalence:
+    schedule.intents_at(i, ...) == slice_fn(ohlcv_df.iloc[:i+1], params, ticker, ts_i)
+    for every bar i (see tests/test_strategy_precompute.py). Frames whose
+    timestamps are not strictly increasing are evaluated bar by bar through
+    the slice function instead, so the guarantee holds for any input.
+
+Streaming sources (run_adapter_mode) have no full frame: there the strategy
+behaves as its slice function (it is callable with the StrategyFn signature).
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from contracts.event_messages import OrderIntent
+
+logger = logging.getLogger(__name__)
+
+ScheduleFn = Callable[[pd.DataFrame, Dict[str, Any]], np.ndarray]
+
+
+class IntentSchedule:
+    """
+    Per-bar signal sides for a whole OHLCV frame.
+
+    Attributes:
+        sides: Object ndarray, 'BUY'/'SELL'/None per bar position
+    """
+
+    def __init__(self, sides: np.ndarray):
+        self.sides = sides
+
+    def __len__(self) -> int:
+        return len(self.sides)
+
+    @property
+    def signal_count(self) -> int:
+        """Number of bars with a signal."""
+        return int(sum(side is not None for side in self.sides))
+
+    def intents_at(self, bar_idx: int, ticker: str, asof_ts: pd.Timestamp) -> List[OrderIntent]:
+        """
+        Build the intents for one bar (fresh objects; callers mutate them).
+
+        Args:
+            bar_idx: Bar position in the precomputed frame
+            ticker: Symbol for generated intents
+            asof_ts: Timestamp of the bar
+        """
+        side = self.sides[bar_idx]
+        if side is None:
+            return []
+        return [OrderIntent(
+            symbol=ticker,
+            side=side,
+            qty=1.0,  # Placeholder, sizing handled by risk manager
+            order_type="MARKET",
+            ts=asof_ts.isoformat(),
+        )]
+
+
+class PrecomputedStrategy:
+    """
+    Strategy that precomputes its full intent schedule up front.
+
+    Wraps a version's vectorized schedule function together with its slice
+    function (reference semantics and fallback).
+    """
+
+    def __init__(self, version: str, slice_fn: Callable, schedule_fn: ScheduleFn):
+        self.version = version
+        self._slice_fn = slice_fn
+        self._schedule_fn = schedule_fn
+
+    def precompute(
+        self,
+        ohlcv_df: pd.DataFrame,
+        params: Dict[str, Any],
+        ticker: str = "",
+    ) -> IntentSchedule:
+        """
+        Compute the signal of every bar of ohlcv_df.
+
+        Args:
+            ohlcv_df: Full OHLCV frame with 'timestamp' and 'close' columns
+            params: Strategy parameters
+            ticker: Symbol (only used by the per-bar fallback)
+
+        Returns:
+            IntentSchedule aligned with ohlcv_df row positions
+
+        Raises:
+            ValueError: If ohlcv_df has no 'timestamp' column
+        """
+        if ohlcv_df.empty:
+            return IntentSchedule(np.full(0, None, dtype=object))
+        if 'timestamp' not in ohlcv_df.columns:
+            raise ValueError("precompute mode requires a 'timestamp' column")
+
+        ts = ohlcv_df['timestamp']
+        if ts.is_monotonic_increasing and ts.is_unique:
+            return IntentSchedule(self._schedule_fn(ohlcv_df, params))
+
+        # Unsorted/duplicate timestamps: the slice path re-sorts and slices by
+        # timestamp, which a positional vectorized pass cannot reproduce.
+        logger.warning(
+            "Strategy %s precompute: timestamps not strictly increasing, "
+            "falling back to per-bar evaluation", self.version
+        )
+        sides = np.full(len(ohlcv_df), None, dtype=object)
+        for i in range(len(ohlcv_df)):
+            intents = self._slice_fn(ohlcv_df.iloc[:i + 1], params, ticker, ts.iloc[i])
+            if intents:
+                sides[i] = intents[0].side
+        return IntentSchedule(sides)
+
+    def required_lookback(self, params: Dict[str, Any]) -> Optional[int]:
+        """History needed when used as a slice function (adapter mode)."""
+        from strategy_engine.strategy_registry import get_strategy_lookback
+        return get_strategy_lookback(self._slice_fn, params)
+
+    def __call__(
+        self,
+        ohlcv_df: pd.DataFrame,
+        params: Dict[str, Any],
+        ticker: str,
+        asof_ts: pd.Timestamp,
+    ) -> List[OrderIntent]:
+        """StrategyFn-compatible entry point (delegates to the slice function)."""
+        return self._slice_fn(ohlcv_df, params, ticker, asof_ts)
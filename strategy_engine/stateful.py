@@ -0,0 +1,205 @@
+"""
+strategy_engine/stateful.py
+
+Stateful (streaming) strategy variants for O(1)-per-bar stepping.
+
+The slice-based strategies (v0_7, v0_8) receive the full history on every
+bar and recompute their indicators from scratch, so a run costs O(n^2).
+Stateful strategies instead receive ONE bar at a time and update a per-run
+StrategyState incrementally, built from strategy_engine.indicators.
+
+Contract:
+    state = strategy.init_state(params)
+    intents = strategy.on_bar(state, bar, params, ticker, asof_ts)
+
+Parity guarantee:
+    For the same (sorted) bar sequence, SMACrossoverStrategy and
+    EMACrossoverStrategy emit exactly the same intents as strategy_v0_7 and
+    strategy_v0_8 evaluated on the growing slice. SMA/EMA arithmetic mirrors
+    pandas rolling().mean() / ewm(adjust=False).mean() operation by operation,
+    so values are bit-identical (see tests/test_loop_stepper_streaming_parity.py).
+
+Registry:
+    get_strategy_fn(version, mode="stateful") returns instances of these classes.
+
+Backward compatibility:
+    Stateful strategies are also callable with the StrategyFn signature
+    (ohlcv_df, params, ticker, asof_ts). That path replays the slice through a
+    fresh state and is O(n) per call; it exists for tools that still pass slices.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping
+
+import pandas as pd
+
+from contracts.event_messages import OrderIntent
+from strategy_engine.indicators import (
+    EMA,
+    SMA,
+    Crossover,
+    Indicator,
+    indicator_from_state,
+)
+
+
+@dataclass
+class StrategyState:
+    """
+    Per-run incremental strategy state.
+
+    Attributes:
+        bar_count: Number of bars pushed so far
+        indicators: Streaming indicators keyed by name (e.g. 'fast', 'slow')
+    """
+    bar_count: int = 0
+    indicators: Dict[str, Indicator] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return JSON-serializable state (for checkpoints)."""
+        return {
+            "bar_count": self.bar_count,
+            "indicators": {name: ind.to_state() for name, ind in self.indicators.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StrategyState":
+        """Rebuild state from to_dict()."""
+        return cls(
+            bar_count=data["bar_count"],
+            indicators={
+                name: indicator_from_state(ind)
+                for name, ind in data["indicators"].items()
+            },
+        )
+
+
+class StatefulStrategy:
+    """
+    Base class for strategies that consume one bar at a time.
+
+    Subclasses implement init_state() and on_bar().
+    """
+
+    version: str = ""
+
+    def init_state(self, params: Dict[str, Any]) -> StrategyState:
+        """Create a fresh per-run state."""
+        raise NotImplementedError
+
+    def on_bar(
+        self,
+        state: StrategyState,
+        bar: Mapping[str, Any],
+        params: Dict[str, Any],
+        ticker: str,
+        asof_ts: pd.Timestamp,
+    ) -> List[OrderIntent]:
+        """
+        Push one bar into state and return intents for that bar.
+
+        Args:
+            state: Per-run state from init_state()
+            bar: Mapping with at least 'close' (OHLCV columns)
+            params: Strategy parameters (same keys as the slice-based version)
+            ticker: Symbol for generated intents
+            asof_ts: Timestamp of the bar (simulation time)
+        """
+        raise NotImplementedError
+
+    def __call__(
+        self,
+        ohlcv_df: pd.DataFrame,
+        params: Dict[str, Any],
+        ticker: str,
+        asof_ts: pd.Timestamp,
+    ) -> List[OrderIntent]:
+        """StrategyFn-compatible entry point (replays the slice, O(n))."""
+        if ohlcv_df.empty or 'close' not in ohlcv_df.columns:
+            return []
+
+        df = ohlcv_df
+        if 'timestamp' in df.columns:
+            df = df.set_index('timestamp')
+        df = df.sort_index().loc[:asof_ts]
+
+        state = self.init_state(params)
+        columns = list(df.columns)
+        intents: List[OrderIntent] = []
+        for ts, values in zip(df.index, df.itertuples(index=False, name=None)):
+            bar = dict(zip(columns, values))
+            intents = self.on_bar(state, bar, params, ticker, ts)
+        return intents
+
+    @staticmethod
+    def _make_intent(ticker: str, side: str, asof_ts: pd.Timestamp) -> OrderIntent:
+        return OrderIntent(
+            symbol=ticker,
+            side=side,
+            qty=1.0,  # Placeholder, sizing handled by risk manager
+            order_type="MARKET",
+            ts=asof_ts.isoformat(),
+        )
+
+
+class SMACrossoverStrategy(StatefulStrategy):
+    """Streaming equivalent of strategy_v0_7 (SMA crossover)."""
+
+    version = "v0_7"
+
+    def init_state(self, params: Dict[str, Any]) -> StrategyState:
+        fast_period = params.get('fast_period', 10)
+        slow_period = params.get('slow_period', 30)
+        return StrategyState(indicators={
+            "fast": SMA(fast_period),
+            "slow": SMA(slow_period),
+            "cross": Crossover(),
+        })
+
+    def on_bar(self, state, bar, params, ticker, asof_ts) -> List[OrderIntent]:
+        ind = state.indicators
+        fast = ind["fast"].update(bar['close'])
+        slow = ind["slow"].update(bar['close'])
+        side = ind["cross"].update(fast, slow)
+        state.bar_count += 1
+
+        # Same warmup as v0.7: need slow_period rows (and 2 valid points,
+        # which Crossover enforces)
+        if state.bar_count < params.get('slow_period', 30) or side is None:
+            return []
+        return [self._make_intent(ticker, side, asof_ts)]
+
+
+class EMACrossoverStrategy(StatefulStrategy):
+    """Streaming equivalent of strategy_v0_8 (EMA crossover)."""
+
+    version = "v0_8"
+
+    @staticmethod
+    def _periods(params: Dict[str, Any]) -> tuple:
+        fast_period = params.get('fast_period', 5)
+        slow_period = params.get('slow_period', 13)
+        if slow_period < fast_period:
+            slow_period, fast_period = fast_period, slow_period
+        return fast_period, slow_period
+
+    def init_state(self, params: Dict[str, Any]) -> StrategyState:
+        fast_period, slow_period = self._periods(params)
+        return StrategyState(indicators={
+            "fast": EMA(fast_period),
+            "slow": EMA(slow_period),
+            "cross": Crossover(),
+        })
+
+    def on_bar(self, state, bar, params, ticker, asof_ts) -> List[OrderIntent]:
+        ind = state.indicators
+        fast = ind["fast"].update(bar['close'])
+        slow = ind["slow"].update(bar['close'])
+        side = ind["cross"].update(fast, slow)
+        state.bar_count += 1
+
+        # Same warmup as v0.8: need slow_period rows and 2 points
+        _, slow_period = self._periods(params)
+        if state.bar_count < slow_period or side is None:
+            return []
+        return [self._make_intent(ticker, side, asof_ts)]
@@ -8,9 +8,19 @@ Usage:
     
     strategy_fn = get_strategy_fn("v0_7")  # Returns generate_order_intents function
     intents = strategy_fn(ohlcv_df, params, ticker, asof_ts)
+
+Modes:
+    slice     Module-level generate_order_intents; recomputes indicators over
+              the full slice on every call (reference implementation).
+    stateful  StatefulStrategy instance (strategy_engine.stateful); LoopStepper
+              feeds it one bar at a time, O(1) per bar. Same intents as slice.
+    precompute PrecomputedStrategy instance (strategy_engine.precomputed); for
+              in-memory frames LoopStepper computes all signals once with
+              vectorized pandas and looks them up per bar. Same intents as slice.
 """
 
-from typing import Callable, Dict, List, Any
+import importlib
+from typing import Callable, Dict, List, Any, Optional
 import pandas as pd
 from contracts.event_messages import OrderIntent
 
@@ -24,27 +34,72 @@ StrategyFn = Callable[
 STRATEGY_VERSIONS = ["v0_7", "v0_8"]
 DEFAULT_STRATEGY = "v0_7"
 
+# Execution modes (see module docstring)
+STRATEGY_MODES = ["slice", "stateful", "precompute"]
+DEFAULT_STRATEGY_MODE = "slice"
+
 
-def get_strategy_fn(version: str = DEFAULT_STRATEGY) -> StrategyFn:
+def get_strategy_fn(version: str = DEFAULT_STRATEGY, mode: str = DEFAULT_STRATEGY_MODE) -> StrategyFn:
     """
     Get strategy function by version string.
     
     Args:
         version: Strategy version (e.g., "v0_7", "v0_8")
+        mode: "slice" (default), "stateful" or "precompute"
         
     Returns:
         Strategy function with signature:
             (ohlcv_df, params, ticker, asof_ts) -> List[OrderIntent]
+        In stateful/precompute mode this is a StatefulStrategy /
+        PrecomputedStrategy instance, which is also callable with that signature.
             
     Raises:
-        ValueError: If version is not supported
+        ValueError: If version or mode is not supported
     """
+    if mode not in STRATEGY_MODES:
+        supported = ", ".join(STRATEGY_MODES)
+        raise ValueError(f"Unknown strategy mode '{mode}'. Supported: {supported}")
+    
     if version == "v0_7":
-        from strategy_engine.strategy_v0_7 import generate_order_intents
-        return generate_order_intents
+        if mode == "stateful":
+            from strategy_engine.stateful import SMACrossoverStrategy
+            return SMACrossoverStrategy()
+        from strategy_engine.strategy_v0_7 import generate_order_intents, generate_signal_schedule
     elif version == "v0_8":
-        from strategy_engine.strategy_v0_8 import generate_order_intents
-        return generate_order_intents
+        if mode == "stateful":
+            from strategy_engine.stateful import EMACrossoverStrategy
+            return EMACrossoverStrategy()
+        from strategy_engine.strategy_v0_8 import generate_order_intents, generate_signal_schedule
     else:
         supported = ", ".join(STRATEGY_VERSIONS)
         raise ValueError(f"Unknown strategy version '{version}'. Supported: {supported}")
+    
+    if mode == "precompute":
+        from strategy_engine.precomputed import PrecomputedStrategy
+        return PrecomputedStrategy(version, generate_order_intents, generate_signal_schedule)
+    return generate_order_intents
+
+
+def get_strategy_lookback(strategy_fn: StrategyFn, params: Dict[str, Any]) -> Optional[int]:
+    """
+    Get the declared history requirement (in bars) of a strategy.
+    
+    Registered versions declare it via their module's required_lookback(params);
+    custom strategy objects may expose a required_lookback(params) method.
+    
+    Args:
+        strategy_fn: Strategy callable (as returned by get_strategy_fn)
+        params: Strategy parameters
+        
+    Returns:
+        Number of bars the strategy needs, or None if undeclared
+    """
+    lookback_fn = getattr(strategy_fn, "required_lookback", None)
+    if lookback_fn is not None:
+        return lookback_fn(params)
+    
+    for version in STRATEGY_VERSIONS:
+        if strategy_fn is get_strategy_fn(version):
+            module = importlib.import_module(strategy_fn.__module__)
+            return module.required_lookback(params)
+    return None
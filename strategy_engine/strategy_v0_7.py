@@ -1,11 +1,51 @@
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional
 from contracts.event_messages import OrderIntent
+from strategy_engine.indicators import crossover_signals
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def required_lookback(params: Dict[str, Any]) -> int:
+    """
+    Bars of history generate_order_intents needs at each evaluation.
+
+    The crossover compares both SMAs at the current and previous bar, so the
+    longest window plus one bar is sufficient.
+    """
+    fast_period = params.get('fast_period', 10)
+    slow_period = params.get('slow_period', 30)
+    return max(fast_period, slow_period) + 1
+
+
+def generate_signal_schedule(ohlcv_df: pd.DataFrame, params: Dict[str, Any]) -> np.ndarray:
+    """
+    Vectorized signals for every bar of an in-memory OHLCV frame.
+
+    ohlcv_df must be sorted by timestamp with unique timestamps. Element i is
+    the side ('BUY'/'SELL') generate_order_intents would emit for the slice
+    ohlcv_df.iloc[:i+1] at that bar's timestamp, or None. Rolling means are
+    causal, so the full-series values at i equal those of the slice.
+
+    Returns:
+        Object ndarray of length len(ohlcv_df)
+    """
+    fast_period = params.get('fast_period', 10)
+    slow_period = params.get('slow_period', 30)
+
+    close = ohlcv_df['close']
+    fast_sma = close.rolling(window=fast_period).mean().to_numpy()
+    slow_sma = close.rolling(window=slow_period).mean().to_numpy()
+
+    signals = crossover_signals(fast_sma, slow_sma)
+    # Same warmup as generate_order_intents: slice needs slow_period rows
+    signals[:max(slow_period - 1, 0)] = None
+    return signals
+
+
 def generate_order_intents(
     ohlcv_df: pd.DataFrame,
     params: Dict[str, Any],
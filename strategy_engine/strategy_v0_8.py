@@ -17,13 +17,66 @@ Key differences from v0.7:
 - Slightly different default periods (fast=5, slow=13)
 """
 
+import math
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 from contracts.event_messages import OrderIntent
+from strategy_engine.indicators import crossover_signals
 import logging
 
 logger = logging.getLogger(__name__)
 
+# EMA has infinite memory. History older than the declared lookback carries
+# less than this fraction of the slow EMA's weight (see required_lookback).
+EMA_TRUNCATION_TOL = 1e-12
+
+
+def required_lookback(params: Dict[str, Any]) -> int:
+    """
+    Bars of history generate_order_intents needs at each evaluation.
+    
+    EMA(adjust=False) depends on the whole series, so this is the horizon after
+    which the truncated-window EMA differs from the full-history EMA by less
+    than EMA_TRUNCATION_TOL (relative weight of the dropped prefix).
+    """
+    fast_period = params.get('fast_period', 5)
+    slow_period = params.get('slow_period', 13)
+    slow_period = max(fast_period, slow_period)
+    
+    alpha = 2.0 / (slow_period + 1.0)
+    if alpha >= 1.0:
+        return slow_period + 1
+    horizon = math.ceil(math.log(EMA_TRUNCATION_TOL) / math.log(1.0 - alpha))
+    return max(slow_period, horizon) + 1
+
+
+def generate_signal_schedule(ohlcv_df: pd.DataFrame, params: Dict[str, Any]) -> np.ndarray:
+    """
+    Vectorized signals for every bar of an in-memory OHLCV frame.
+    
+    ohlcv_df must be sorted by timestamp with unique timestamps. Element i is
+    the side ('BUY'/'SELL') generate_order_intents would emit for the slice
+    ohlcv_df.iloc[:i+1] at that bar's timestamp, or None. EMA(adjust=False)
+    is a causal recurrence, so the full-series values at i equal the slice's.
+    
+    Returns:
+        Object ndarray of length len(ohlcv_df)
+    """
+    fast_period = params.get('fast_period', 5)
+    slow_period = params.get('slow_period', 13)
+    if slow_period < fast_period:
+        slow_period, fast_period = fast_period, slow_period
+    
+    close = ohlcv_df['close']
+    fast_ema = close.ewm(span=fast_period, adjust=False).mean().to_numpy()
+    slow_ema = close.ewm(span=slow_period, adjust=False).mean().to_numpy()
+    
+    signals = crossover_signals(fast_ema, slow_ema)
+    # Same warmup as generate_order_intents: slice needs slow_period rows
+    signals[:max(slow_period - 1, 0)] = None
+    return signals
+
 
 def generate_order_intents(
     ohlcv_df: pd.DataFrame,
@@ -0,0 +1,93 @@
+"""
+tests/test_benchmark_suite.py
+
+Tests for the benchmark suite (benchmarks/suite.py).
+
+Validates:
+- Quick run covers every benchmark in the checked-in baseline
+- compare flags rates more than max_regression_pct below baseline only
+- Missing/new benchmarks are listed without failing; missed KPIs (tx/day
+  counted in fills) and --quick vs full comparisons fail
+- CLI: run writes results JSON, compare exit code
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.suite import DEFAULT_BASELINE, compare_results, kpi_report, main, run_suite
+
+
+def results(**values):
+    return {"results": {name.replace("__", "."): {"value": v, "unit": "ops/s"} for name, v in values.items()}}
+
+
+def test_quick_run_matches_baseline_benchmarks():
+    current = run_suite(quick=True)
+    baseline = json.loads(DEFAULT_BASELINE.read_text())
+    assert set(current["results"]) == set(baseline["results"])
+    assert all(r["value"] > 0 for r in current["results"].values())
+    assert current["kpi"]["latency_per_bar_s"] > 0
+    bus_mode = current["results"]["loop_stepper.bus_mode"]
+    assert current["kpi"]["tx_per_day"] == pytest.approx(bus_mode["value"] * bus_mode["fills_per_bar"] * 86_400)
+
+
+def test_compare_threshold():
+    baseline = results(bus__single=1000.0, risk__assess=200.0)
+    report = compare_results(baseline, results(bus__single=850.0, risk__assess=260.0), max_regression_pct=20)
+    assert report["ok"]
+    rows = {r["name"]: r for r in report["rows"]}
+    assert rows["bus.single"]["change_pct"] == pytest.approx(-15.0)
+    assert rows["risk.assess"]["change_pct"] == pytest.approx(30.0)
+
+    report = compare_results(baseline, results(bus__single=790.0, risk__assess=200.0), max_regression_pct=20)
+    assert not report["ok"]
+    assert [r["name"] for r in report["rows"] if r["regressed"]] == ["bus.single"]
+
+
+def test_compare_missing_new_and_kpi():
+    report = compare_results(results(a=1.0, b=1.0), results(b=1.0, c=1.0))
+    assert report["ok"] and report["missing"] == ["a"] and report["new"] == ["c"]
+
+    slow = results(loop_stepper__bus_mode=0.5)  # 2 s per bar, 43k tx/day
+    slow["results"]["loop_stepper.bus_mode"]["fills_per_bar"] = 1.0
+    slow["kpi"] = kpi_report(slow["results"])
+    assert not slow["kpi"]["ok"]
+    assert not compare_results(slow, slow)["ok"]
+
+
+def test_kpi_counts_fills_not_bars():
+    fast = results(loop_stepper__bus_mode=10.0)  # 864k bars/day
+    fast["results"]["loop_stepper.bus_mode"]["fills_per_bar"] = 0.1
+    kpi = kpi_report(fast["results"])
+    assert kpi["tx_per_day"] == pytest.approx(86_400)
+    assert not kpi["ok"]
+
+
+def test_compare_quick_against_full_fails():
+    full = dict(results(risk__assess=100.0), quick=False)
+    quick = dict(results(risk__assess=100.0), quick=True)
+    report = compare_results(full, quick)
+    assert report["quick_mismatch"] and not report["ok"]
+    assert compare_results(quick, quick)["ok"]
+
+
+def test_unknown_group():
+    with pytest.raises(ValueError, match="Unknown benchmark groups"):
+        run_suite(only=["nope"])
+
+
+def test_cli_run_and_compare(tmp_path, capsys):
+    out = tmp_path / "results.json"
+    assert main(["run", "--quick", "--only", "risk", "--output", str(out)]) == 0
+    current = json.loads(out.read_text())
+    assert list(current["results"]) == ["risk.assess"] and current["kpi"] is None
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(dict(results(risk__assess=current["results"]["risk.assess"]["value"] * 10), quick=True)))
+    assert main(["compare", str(out), "--baseline", str(baseline)]) == 1
+    assert main(["compare", str(out), "--baseline", str(baseline), "--max-regression-pct", "95"]) == 0
+    assert "REGRESSION" in capsys.readouterr().out
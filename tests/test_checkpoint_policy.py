@@ -0,0 +1,242 @@
+"""
+tests/test_checkpoint_policy.py
+
+Tests for coalesced / asynchronous checkpointing (CheckpointPolicy,
+CheckpointWriter) and its use in run_bus_mode / run_adapter_mode.
+
+Validates:
+- Policy triggers: every N bars, every T seconds, always at close
+- Async writer: latest-wins single slot, errors surface on the caller
+- Loop runs save far fewer checkpoints yet end on the last processed bar,
+  including on a graceful stop, and never checkpoint bars not yet drained
+"""
+
+import threading
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus
+from engine.checkpoint import Checkpoint, CheckpointPolicy, CheckpointWriter
+from engine.loop_stepper import LoopStepper
+from engine.market_data.fixture_adapter import FixtureMarketDataAdapter
+
+
+PARAMS = {"fast_period": 3, "slow_period": 5}
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "ohlcv_fixture_3K1.csv"
+
+
+def make_ohlcv_df(n_bars: int = 200, seed: int = 3) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class StopAfter:
+    """Minimal StopController stand-in: requests stop after n checks."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.stop_reason = "test"
+
+    @property
+    def is_stop_requested(self) -> bool:
+        self.n -= 1
+        return self.n < 0
+
+
+class TestCheckpointPolicy:
+
+    def test_defaults_to_every_bar(self):
+        policy = CheckpointPolicy()
+        assert policy.is_due(bars=1, seconds=0.0)
+
+    def test_triggers(self):
+        policy = CheckpointPolicy(every_n_bars=10, every_seconds=5.0)
+        assert not policy.is_due(bars=9, seconds=4.9)
+        assert policy.is_due(bars=10, seconds=0.0)
+        assert policy.is_due(bars=1, seconds=5.0)
+        assert not CheckpointPolicy(every_n_bars=None).is_due(bars=10_000, seconds=1e9)
+
+    @pytest.mark.parametrize("kwargs", [{"every_n_bars": 0}, {"every_seconds": 0}])
+    def test_invalid_values_raise(self, kwargs):
+        with pytest.raises(ValueError):
+            CheckpointPolicy(**kwargs)
+
+
+class TestCheckpointWriter:
+
+    def test_every_n_bars_and_final_flush(self, tmp_path):
+        path = tmp_path / "ckpt.json"
+        writer = CheckpointWriter(path, CheckpointPolicy(every_n_bars=10))
+        ckpt = Checkpoint.create_new("run")
+        for i in range(25):
+            ckpt = ckpt.update(i)
+            writer.update(ckpt)
+            if i == 19:
+                assert Checkpoint.load(path).last_processed_idx == 19
+        assert writer.writes == 2
+        writer.close()
+        assert writer.writes == 3
+        assert Checkpoint.load(path).last_processed_idx == 24
+        writer.close()  # Idempotent
+        assert writer.writes == 3
+
+    def test_bars_argument_counts_towards_trigger(self, tmp_path):
+        writer = CheckpointWriter(tmp_path / "ckpt.json", CheckpointPolicy(every_n_bars=10))
+        ckpt = Checkpoint.create_new("run")
+        assert not writer.update(ckpt, bars=6)
+        assert writer.update(ckpt, bars=6)
+
+    def test_time_trigger(self, tmp_path):
+        clock = FakeClock()
+        writer = CheckpointWriter(
+            tmp_path / "ckpt.json", CheckpointPolicy(every_n_bars=None, every_seconds=2.0), clock=clock,
+        )
+        ckpt = Checkpoint.create_new("run")
+        assert not writer.update(ckpt.update(0))
+        clock.t = 1.9
+        assert not writer.update(ckpt.update(1))
+        clock.t = 2.0
+        assert writer.update(ckpt.update(2))
+        clock.t = 3.0
+        assert not writer.update(ckpt.update(3))
+        assert writer.writes == 1
+
+    def test_nothing_written_without_updates(self, tmp_path):
+        path = tmp_path / "ckpt.json"
+        CheckpointWriter(path, CheckpointPolicy(async_write=True)).close()
+        assert not path.exists()
+
+    def test_async_latest_wins(self, tmp_path, monkeypatch):
+        path = tmp_path / "ckpt.json"
+        release = threading.Event()
+        started = threading.Event()
+        original = Checkpoint.save_atomic
+
+        def slow_save(self, p):
+            started.set()
+            release.wait(5)
+            original(self, p)
+
+        monkeypatch.setattr(Checkpoint, "save_atomic", slow_save)
+        writer = CheckpointWriter(path, CheckpointPolicy(async_write=True))
+        ckpt = Checkpoint.create_new("run")
+        ckpt = ckpt.update(0)
+        writer.update(ckpt)
+        assert started.wait(5)  # Writer thread is blocked inside the first save
+        for i in range(1, 10):
+            ckpt = ckpt.update(i)
+            writer.update(ckpt)  # Never blocks the caller
+        release.set()
+        writer.close()
+
+        assert writer.saves == 10
+        assert writer.coalesced == 8
+        assert writer.writes == 2
+        assert Checkpoint.load(path).last_processed_idx == 9
+
+    def test_async_error_surfaces(self, tmp_path):
+        writer = CheckpointWriter(tmp_path / "missing" / "ckpt.json", CheckpointPolicy(async_write=True))
+        writer.update(Checkpoint.create_new("run").update(0))
+        with pytest.raises(RuntimeError, match="Checkpoint write"):
+            writer.flush()
+        with pytest.raises(RuntimeError):
+            writer.close()
+
+
+class TestLoopCheckpointPolicy:
+
+    @pytest.mark.parametrize("pipeline_batch", [None, 10])
+    def test_bus_mode_coalesced_async(self, tmp_path, pipeline_batch):
+        ckpt_path = tmp_path / "ckpt.json"
+        stepper = LoopStepper(strategy_params=PARAMS)
+        result = stepper.run_bus_mode(
+            make_ohlcv_df(), InMemoryBus(), warmup=10, max_steps=97,
+            pipeline_batch=pipeline_batch,
+            checkpoint=Checkpoint.create_new("bus"), checkpoint_path=ckpt_path,
+            checkpoint_policy=CheckpointPolicy(every_n_bars=25, async_write=True),
+        )
+        stepper.close()
+        ckpt = Checkpoint.load(ckpt_path)
+        assert ckpt.last_processed_idx == 96
+        assert ckpt.processed_count == 97
+        assert 1 <= result["checkpoint_writes"] <= 5
+
+    @pytest.mark.parametrize("pipeline_batch,expected_idx", [(None, None), (10, 9)])
+    def test_bus_mode_crash_before_drain(self, tmp_path, monkeypatch, pipeline_batch, expected_idx):
+        """A run killed between publish and drain never checkpoints undrained bars."""
+        import engine.loop_stepper as loop_stepper
+        
+        drain = loop_stepper.drain_bus_workers
+        drains = []
+        
+        def crashing_drain(*args, **kwargs):
+            drains.append(1)
+            if len(drains) > 1 or pipeline_batch is None:
+                raise RuntimeError("killed")
+            return drain(*args, **kwargs)
+        
+        monkeypatch.setattr(loop_stepper, "drain_bus_workers", crashing_drain)
+        ckpt_path = tmp_path / "ckpt.json"
+        stepper = LoopStepper(strategy_params=PARAMS)
+        with pytest.raises(RuntimeError, match="killed"):
+            stepper.run_bus_mode(
+                make_ohlcv_df(), InMemoryBus(), warmup=10, max_steps=50,
+                pipeline_batch=pipeline_batch,
+                checkpoint=Checkpoint.create_new("bus"), checkpoint_path=ckpt_path,
+            )
+        stepper.close()
+        if expected_idx is None:
+            assert not ckpt_path.exists()
+        else:
+            assert Checkpoint.load(ckpt_path).last_processed_idx == expected_idx
+    
+    def test_bus_mode_positions_unchanged(self, tmp_path):
+        positions = []
+        for name, policy in (("sync", None), ("async", CheckpointPolicy(every_n_bars=50, async_write=True))):
+            stepper = LoopStepper(state_db=tmp_path / f"{name}.db", strategy_params=PARAMS, seed=7)
+            stepper.run_bus_mode(
+                make_ohlcv_df(), InMemoryBus(), warmup=10, pipeline_batch=8,
+                checkpoint=Checkpoint.create_new(name), checkpoint_path=tmp_path / f"{name}.json",
+                checkpoint_policy=policy,
+            )
+            positions.append([(p["symbol"], p["qty"], p["avg_price"]) for p in stepper.get_positions()])
+            stepper.close()
+        assert positions[0] == positions[1]
+
+    def test_adapter_mode_graceful_stop_saves_latest(self, tmp_path):
+        ckpt_path = tmp_path / "ckpt.json"
+        stepper = LoopStepper(seed=42)
+        result = stepper.run_adapter_mode(
+            FixtureMarketDataAdapter(FIXTURE_PATH),
+            warmup=2,
+            checkpoint=Checkpoint.create_new("adapter"),
+            checkpoint_path=ckpt_path,
+            checkpoint_policy=CheckpointPolicy(every_n_bars=100, async_write=True),
+            stop_controller=StopAfter(6),  # 1 check up front, then 5 steps
+        )
+        stepper.close()
+        assert result["steps_processed"] == 5
+        assert result["checkpoint_writes"] == 1
+        assert Checkpoint.load(ckpt_path).last_processed_idx == 4
@@ -0,0 +1,176 @@
+"""
+tests/test_engine_snapshot.py
+
+Tests for engine-state snapshots (engine/snapshot.py) and snapshot resume in
+run_adapter_mode.
+
+Validates:
+- Snapshot round-trips through JSON; unknown versions are rejected
+- Resumed runs are byte-identical to uninterrupted runs (events, metrics,
+  positions) for window-based and stateful strategies, with and without an
+  ExchangeAdapter
+- Resume skips consumed events without replaying them into the strategy
+- Mismatched stepper config is rejected
+"""
+
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.checkpoint import Checkpoint, CheckpointPolicy
+from engine.exchange_adapter import PaperExchangeAdapter
+from engine.loop_stepper import LoopStepper
+from engine.market_data.fixture_adapter import FixtureMarketDataAdapter
+from engine.snapshot import EngineSnapshot, SNAPSHOT_VERSION
+from strategy_engine.strategy_registry import get_strategy_fn
+
+
+PARAMS = {"fast_period": 3, "slow_period": 5}
+WARMUP = 5
+
+
+def make_ohlcv_df(n_bars: int = 120, seed: int = 11) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+@pytest.fixture
+def fixture_csv(tmp_path) -> Path:
+    path = tmp_path / "ohlcv.csv"
+    make_ohlcv_df().to_csv(path, index=False)
+    return path
+
+
+def make_stepper(state_db: Path, mode: str) -> LoopStepper:
+    return LoopStepper(
+        state_db=state_db,
+        strategy_params=PARAMS,
+        strategy_fn=get_strategy_fn("v0_7", mode=mode),
+        seed=7,
+    )
+
+
+def run_segment(stepper, csv, max_steps, exchange, **kwargs):
+    return stepper.run_adapter_mode(
+        FixtureMarketDataAdapter(csv),
+        max_steps=max_steps,
+        warmup=WARMUP,
+        exchange_adapter=PaperExchangeAdapter() if exchange else None,
+        **kwargs,
+    )
+
+
+def dump(events) -> str:
+    return "\n".join(json.dumps(e, sort_keys=True) for e in events)
+
+
+class TestSnapshotFormat:
+
+    def test_round_trip(self, tmp_path):
+        stepper = LoopStepper(strategy_fn=get_strategy_fn("v0_7", mode="stateful"), strategy_params=PARAMS)
+        stepper._reset_strategy_state()
+        snap = stepper.snapshot(Checkpoint.create_new("r").update(0), consumed=6)
+        path = tmp_path / "snapshot.json"
+        snap.save_atomic(path)
+
+        loaded = EngineSnapshot.load(path)
+        assert json.dumps(loaded.to_dict()) == json.dumps(snap.to_dict())  # NaN-safe equality
+        assert loaded.version == SNAPSHOT_VERSION
+        assert not path.with_suffix(".json.tmp").exists()
+
+    def test_unknown_version_rejected(self, tmp_path):
+        stepper = LoopStepper()
+        data = stepper.snapshot(Checkpoint.create_new("r"), consumed=0).to_dict()
+        data["version"] = SNAPSHOT_VERSION + 1
+        with pytest.raises(ValueError, match="Unsupported snapshot version"):
+            EngineSnapshot.from_dict(data)
+
+
+class TestSnapshotResume:
+
+    @pytest.mark.parametrize("mode", ["slice", "stateful"])
+    @pytest.mark.parametrize("exchange", [False, True])
+    def test_resume_is_byte_identical(self, tmp_path, fixture_csv, mode, exchange):
+        total, first = 80, 33
+
+        stepper = make_stepper(tmp_path / "full.db", mode)
+        full = run_segment(stepper, fixture_csv, total, exchange)
+        full_positions = stepper.get_positions()
+        stepper.close()
+
+        ckpt_path, snap_path = tmp_path / "ckpt.json", tmp_path / "snapshot.json"
+        stepper = make_stepper(tmp_path / "resumed.db", mode)
+        part1 = run_segment(
+            stepper, fixture_csv, first, exchange,
+            checkpoint=Checkpoint.create_new("snap"), checkpoint_path=ckpt_path,
+            checkpoint_policy=CheckpointPolicy(every_n_bars=10), snapshot_path=snap_path,
+        )
+        stepper.close()
+
+        snapshot = EngineSnapshot.load(snap_path)
+        assert snapshot.checkpoint.last_processed_idx == first - 1
+        assert snapshot.consumed == WARMUP + first
+
+        # Fresh process: same config, state restored from the snapshot
+        stepper = make_stepper(tmp_path / "resumed.db", mode)
+        part2 = run_segment(
+            stepper, fixture_csv, total - first, exchange,
+            checkpoint_path=ckpt_path, snapshot=snapshot, snapshot_path=snap_path,
+        )
+        resumed_positions = stepper.get_positions()
+        stepper.close()
+
+        assert full["events"], "fixture must produce events"
+        assert dump(part1["events"] + part2["events"]) == dump(full["events"])
+        assert part2["metrics"] == full["metrics"]
+        assert resumed_positions == full_positions
+        assert Checkpoint.load(ckpt_path).last_processed_idx == total - 1
+        assert EngineSnapshot.load(snap_path).consumed == WARMUP + total
+
+    def test_resume_does_not_replay_history(self, tmp_path, fixture_csv, monkeypatch):
+        stepper = make_stepper(tmp_path / "a.db", "stateful")
+        run_segment(
+            stepper, fixture_csv, 50, False,
+            checkpoint=Checkpoint.create_new("r"), checkpoint_path=tmp_path / "ckpt.json",
+            snapshot_path=tmp_path / "snapshot.json",
+        )
+        stepper.close()
+
+        stepper = make_stepper(tmp_path / "a.db", "stateful")
+        pushed = []
+        original = stepper._push_bar
+        monkeypatch.setattr(stepper, "_push_bar", lambda bar, ts: pushed.append(bar) or original(bar, ts))
+        result = run_segment(stepper, fixture_csv, 5, False,
+                             snapshot=EngineSnapshot.load(tmp_path / "snapshot.json"))
+        stepper.close()
+        assert result["consumed"] == WARMUP + 55
+        assert len(pushed) == 5  # Only the new bars reach the strategy
+
+    def test_mismatched_strategy_rejected(self, tmp_path, fixture_csv):
+        stepper = make_stepper(tmp_path / "a.db", "stateful")
+        run_segment(
+            stepper, fixture_csv, 10, False,
+            checkpoint=Checkpoint.create_new("r"), checkpoint_path=tmp_path / "ckpt.json",
+            snapshot_path=tmp_path / "snapshot.json",
+        )
+        stepper.close()
+
+        stepper = make_stepper(tmp_path / "a.db", "slice")
+        with pytest.raises(ValueError, match="strategy kind"):
+            run_segment(stepper, fixture_csv, 5, False,
+                        snapshot=EngineSnapshot.load(tmp_path / "snapshot.json"))
+        stepper.close()
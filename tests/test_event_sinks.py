@@ -0,0 +1,236 @@
+"""
+tests/test_event_sinks.py
+
+Tests for the streaming event API (iter_events / iter_adapter_events) and
+pluggable event sinks.
+
+Validates:
+- iter_events() yields exactly run()["events"]
+- run(sink=...) / run_adapter_mode(sink=...) stream to the sink and keep only counts
+- Adapter-mode events are yielded after the step's checkpoint is saved;
+  an abandoned stream still saves it and closes the JSONL trace
+- run_live_3E adapter mode keeps only event counts
+- JsonlEventSink / ParquetEventSink roundtrip
+"""
+
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.loop_stepper import LoopStepper
+from engine.checkpoint import Checkpoint
+from engine.market_data.fixture_adapter import FixtureMarketDataAdapter
+from engine.event_sinks import (
+    EventSink,
+    ListSink,
+    CallbackSink,
+    JsonlEventSink,
+    ParquetEventSink,
+    open_event_sink,
+)
+from strategy_engine.strategy_registry import get_strategy_fn
+
+
+PARAMS = {"fast_period": 3, "slow_period": 5}
+
+
+def make_ohlcv_df(n_bars: int = 150, seed: int = 5) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+def counts_of(events):
+    counts = {}
+    for e in events:
+        counts[e["type"]] = counts.get(e["type"], 0) + 1
+    return dict(sorted(counts.items()))
+
+
+class TestRunStreaming:
+
+    @pytest.mark.parametrize("mode", ["slice", "stateful", "precompute"])
+    def test_iter_events_matches_run(self, mode):
+        df = make_ohlcv_df()
+        expected = LoopStepper(seed=42, strategy_fn=get_strategy_fn("v0_7", mode=mode),
+                               strategy_params=PARAMS).run(df, warmup=10)
+        stepper = LoopStepper(seed=42, strategy_fn=get_strategy_fn("v0_7", mode=mode),
+                              strategy_params=PARAMS)
+        streamed = list(stepper.iter_events(df, warmup=10))
+
+        assert streamed == expected["events"]
+        assert stepper._get_metrics() == expected["metrics"]
+        assert any(e["type"] == "OrderIntent" for e in streamed)
+
+    def test_run_with_sink_keeps_only_counts(self):
+        df = make_ohlcv_df()
+        expected = LoopStepper(seed=42, strategy_params=PARAMS).run(df, warmup=10)
+
+        sink = ListSink()
+        result = LoopStepper(seed=42, strategy_params=PARAMS).run(df, warmup=10, sink=sink)
+
+        assert "events" not in result
+        assert sink.events == expected["events"]
+        assert result["metrics"] == expected["metrics"]
+        assert result["event_counts"] == counts_of(expected["events"])
+
+    def test_not_enough_data(self):
+        stepper = LoopStepper()
+        assert list(stepper.iter_events(make_ohlcv_df(5), warmup=10)) == []
+        result = stepper.run(make_ohlcv_df(5), warmup=10, sink=ListSink())
+        assert result["event_counts"] == {}
+
+
+class TestAdapterStreaming:
+
+    def _csv(self, tmp_path):
+        csv_path = tmp_path / "ohlcv.csv"
+        make_ohlcv_df(120).to_csv(csv_path, index=False)
+        return csv_path
+
+    def test_sink_matches_event_list(self, tmp_path):
+        csv_path = self._csv(tmp_path)
+        expected = LoopStepper(seed=42, strategy_params=PARAMS).run_adapter_mode(
+            FixtureMarketDataAdapter(csv_path), warmup=10)
+
+        seen = []
+        result = LoopStepper(seed=42, strategy_params=PARAMS).run_adapter_mode(
+            FixtureMarketDataAdapter(csv_path), warmup=10, sink=CallbackSink(seen.append))
+
+        assert seen == expected["events"]
+        assert "events" not in result
+        assert result["consumed"] == expected["consumed"] == 120
+        assert result["steps_processed"] == expected["steps_processed"] == 110
+        assert result["event_counts"] == counts_of(expected["events"])
+
+    def test_generator_return_value_is_summary(self, tmp_path):
+        stream = LoopStepper(strategy_params=PARAMS).iter_adapter_events(
+            FixtureMarketDataAdapter(self._csv(tmp_path)), warmup=10, max_steps=20)
+        with pytest.raises(StopIteration) as stop:
+            while True:
+                next(stream)
+        assert stop.value.value["steps_processed"] == 20
+        assert "events" not in stop.value.value
+
+    def test_events_yielded_after_checkpoint_saved(self, tmp_path):
+        ckpt_path = tmp_path / "ckpt.json"
+        stepper = LoopStepper(seed=42, strategy_params=PARAMS)
+        stream = stepper.iter_adapter_events(
+            FixtureMarketDataAdapter(self._csv(tmp_path)), warmup=10,
+            checkpoint=Checkpoint.create_new("stream"), checkpoint_path=ckpt_path,
+        )
+        checked = 0
+        for event in stream:
+            if event["type"] == "OrderIntent":
+                assert Checkpoint.load(ckpt_path).processed_count == stepper._step_count
+                checked += 1
+        assert checked > 0
+
+    def test_abandoned_stream_closes_writers(self, tmp_path):
+        """Breaking out early still saves the latest checkpoint and closes the trace."""
+        import threading
+        from engine.checkpoint import CheckpointPolicy
+        
+        ckpt_path = tmp_path / "ckpt.json"
+        log_path = tmp_path / "events.ndjson"
+        stepper = LoopStepper(seed=42, strategy_params=PARAMS)
+        stream = stepper.iter_adapter_events(
+            FixtureMarketDataAdapter(self._csv(tmp_path)), warmup=10, log_jsonl_path=log_path,
+            checkpoint=Checkpoint.create_new("stream"), checkpoint_path=ckpt_path,
+            checkpoint_policy=CheckpointPolicy(every_n_bars=1000, async_write=True),
+        )
+        for event in stream:
+            if event["type"] == "OrderIntent":
+                break
+        stream.close()
+        
+        assert Checkpoint.load(ckpt_path).processed_count == stepper._step_count
+        assert not [t for t in threading.enumerate() if t.name.startswith(("jsonl-writer", "checkpoint-writer"))]
+        records = [json.loads(line) for line in log_path.read_text().splitlines()]
+        assert records
+        assert "AdapterModeDone" not in {r["event_type"] for r in records}
+    
+    def test_run_live_adapter_mode_keeps_no_event_list(self, tmp_path, monkeypatch):
+        """run_live_3E --data-mode adapter streams events to a sink, not into a list."""
+        import importlib.util
+        
+        spec = importlib.util.spec_from_file_location(
+            "run_live_3E", Path(__file__).parent.parent / "tools" / "run_live_3E.py")
+        run_live = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(run_live)
+        monkeypatch.setattr(run_live, "install_signal_handlers", lambda stop_controller: None)
+        
+        results = []
+        run_adapter_mode = LoopStepper.run_adapter_mode
+        
+        def spy(self, *args, **kwargs):
+            result = run_adapter_mode(self, *args, **kwargs)
+            results.append((kwargs.get("sink"), result))
+            return result
+        
+        monkeypatch.setattr(LoopStepper, "run_adapter_mode", spy)
+        outdir = tmp_path / "out"
+        monkeypatch.setattr(sys, "argv", [
+            "run_live_3E.py", "--data", "fixture", "--data-mode", "adapter",
+            "--fixture-path", str(self._csv(tmp_path)), "--outdir", str(outdir), "--max-steps", "50",
+        ])
+        assert run_live.main() == 0
+        
+        [(sink, result)] = results
+        assert isinstance(sink, EventSink) and not isinstance(sink, ListSink)
+        assert "events" not in result
+        assert result["event_counts"]
+    
+    def test_warmup_exhausted_keeps_legacy_shape(self, tmp_path):
+        csv_path = tmp_path / "short.csv"
+        make_ohlcv_df(5).to_csv(csv_path, index=False)
+        result = LoopStepper().run_adapter_mode(FixtureMarketDataAdapter(csv_path), warmup=10)
+        assert result["events"] == []
+        assert result["consumed"] == 5
+
+
+class TestFileSinks:
+
+    def test_protocol(self, tmp_path):
+        assert isinstance(ListSink(), EventSink)
+        assert isinstance(JsonlEventSink(tmp_path / "e.jsonl"), EventSink)
+
+    def test_jsonl_roundtrip(self, tmp_path):
+        df = make_ohlcv_df()
+        path = tmp_path / "events.jsonl"
+        sink = open_event_sink(path)
+        assert isinstance(sink, JsonlEventSink)
+        result = LoopStepper(seed=42, strategy_params=PARAMS).run(df, warmup=10, sink=sink)
+        sink.close()
+
+        expected = LoopStepper(seed=42, strategy_params=PARAMS).run(df, warmup=10)["events"]
+        lines = path.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == json.loads(json.dumps(expected))
+        assert len(lines) == sum(result["event_counts"].values())
+
+    def test_parquet_roundtrip(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        df = make_ohlcv_df()
+        path = tmp_path / "events.parquet"
+        sink = ParquetEventSink(path, batch_size=7)
+        LoopStepper(seed=42, strategy_params=PARAMS).run(df, warmup=10, sink=sink)
+        sink.close()
+
+        expected = LoopStepper(seed=42, strategy_params=PARAMS).run(df, warmup=10)["events"]
+        table = pq.read_table(path).to_pydict()
+        assert table["type"] == [e["type"] for e in expected]
+        assert [json.loads(p) for p in table["payload"]] == [e["payload"] for e in expected]
+        assert table["seq"] == list(range(len(expected)))
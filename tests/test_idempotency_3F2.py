@@ -142,3 +142,74 @@ class TestInMemoryIdempotencyStore:
         for i in range(100):
             result = store.mark_once(f"key_{i}")
             assert result is False
+
+
+class TestInMemoryExpiry:
+    """Tests for queue-based expiry."""
+    
+    def test_expired_keys_removed_on_mark(self):
+        """Each mark drops the keys that expired by then, oldest first."""
+        fake_time = [0.0]
+        store = InMemoryIdempotencyStore(ttl_s=10.0, now_fn=lambda: fake_time[0])
+        
+        for i in range(5):
+            fake_time[0] = float(i)
+            store.mark_once(f"key_{i}")
+        assert store.size() == 5
+        
+        fake_time[0] = 12.0  # key_0..key_2 expired
+        store.mark_once("new")
+        assert store.size() == 3
+        assert not store.mark_once("key_3")
+    
+    def test_remarked_key_survives_stale_entry(self):
+        """An expired key marked again is not removed by its old queue entry."""
+        fake_time = [0.0]
+        store = InMemoryIdempotencyStore(ttl_s=10.0, now_fn=lambda: fake_time[0])
+        store.mark_once("key1")
+        
+        fake_time[0] = 10.0
+        assert store.mark_once("key1") is True  # Expired, re-marked at t=10
+        fake_time[0] = 15.0
+        store.mark_once("other")  # Pops key1's t=0 entry
+        assert store.size() == 2
+        assert store.mark_once("key1") is False
+    
+    def test_mark_once_is_atomic_across_threads(self):
+        """A second thread cannot check a key while the first is still marking it."""
+        import threading
+        
+        in_mark = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def now_fn():
+            calls.append(1)
+            if len(calls) == 1:  # First mark_once stalls between its clock read and its write
+                in_mark.set()
+                release.wait(5)
+            return 0.0
+        
+        store = InMemoryIdempotencyStore(ttl_s=1e-3, now_fn=now_fn)
+        results = {}
+        first = threading.Thread(target=lambda: results.setdefault("first", store.mark_once("key")))
+        second = threading.Thread(target=lambda: results.setdefault("second", store.mark_once("key")))
+        first.start()
+        assert in_mark.wait(5)
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()  # Blocked on the store lock
+        release.set()
+        first.join(5)
+        second.join(5)
+        
+        assert results == {"first": True, "second": False}
+    
+    def test_benchmark_smoke(self):
+        """bench_idempotency_memory runs and keeps the store at live_keys."""
+        from benchmarks.bench_idempotency_memory import run_benchmark
+        
+        result = run_benchmark(n_keys=5000, live_keys=1000, windows=5, baseline_keys=2000)
+        assert result["queue"]["final_size"] == 1000
+        assert len(result["queue"]["windows"]) == 5
+        assert result["full_scan"]["final_size"] == 1000
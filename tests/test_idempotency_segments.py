@@ -0,0 +1,161 @@
+"""
+tests/test_idempotency_segments.py
+
+Tests for the segmented FileIdempotencyStore and its on-disk key segments
+(engine/idempotency_segment.py).
+
+Validates:
+- Segments: exact lookups (bloom false positives never become hits),
+  round trip of keys and timestamps
+- Active segment sealed at segment_max_keys, keys deduped across reopen
+- TTL: expired keys are new again, compact() deletes/rewrites segments
+- Flush cadence and legacy JSONL lines without "ts"
+- benchmarks/bench_idempotency.py smoke run
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.idempotency import FileIdempotencyStore
+from engine.idempotency_segment import KeySegment, key_hash, write_segment
+from benchmarks.bench_idempotency import run_benchmark
+
+
+class FakeClock:
+    def __init__(self, t: float = 1000.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def segment_files(path: Path):
+    return sorted(p.name for p in path.parent.glob(path.name + ".seg-*"))
+
+
+class TestKeySegment:
+
+    def test_round_trip_and_lookup(self, tmp_path):
+        entries = {f"key-{i}": float(i) for i in range(2000)}
+        write_segment(tmp_path / "s.seg", entries)
+        segment = KeySegment(tmp_path / "s.seg")
+        try:
+            assert len(segment) == 2000
+            assert (segment.min_ts, segment.max_ts) == (0.0, 1999.0)
+            assert dict(segment.entries()) == entries
+            for key in ("key-0", "key-777", "key-1999"):
+                assert segment.lookup(key, *key_hash(key)) == entries[key]
+            # Misses include bloom false positives; all must resolve to None
+            assert all(segment.lookup(k, *key_hash(k)) is None for k in (f"miss-{i}" for i in range(5000)))
+        finally:
+            segment.close()
+
+    def test_empty_segment(self, tmp_path):
+        write_segment(tmp_path / "s.seg", {})
+        segment = KeySegment(tmp_path / "s.seg")
+        assert len(segment) == 0 and segment.lookup("a", *key_hash("a")) is None
+        segment.close()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        (tmp_path / "s.seg").write_bytes(b"x" * 64)
+        with pytest.raises(ValueError, match="Not an idempotency segment"):
+            KeySegment(tmp_path / "s.seg")
+
+
+class TestSegmentedFileStore:
+
+    def test_seal_and_reopen(self, tmp_path):
+        path = tmp_path / "keys.jsonl"
+        store = FileIdempotencyStore(path, segment_max_keys=100)
+        assert all(store.mark_once(f"k{i}") for i in range(250))
+        assert segment_files(path) == ["keys.jsonl.seg-000001", "keys.jsonl.seg-000002"]
+        assert len(path.read_text().splitlines()) == 50  # Active segment only
+        assert not store.mark_once("k5") and not store.mark_once("k249")
+        store.close()
+
+        store = FileIdempotencyStore(path, segment_max_keys=100)
+        assert store.size() == 250
+        assert not any(store.mark_once(f"k{i}") for i in range(250))
+        assert store.contains("k120") and not store.contains("k250")
+        assert store.mark_once("k250")
+        store.close()
+
+    def test_ttl_expiry_and_compaction(self, tmp_path):
+        path = tmp_path / "keys.jsonl"
+        clock = FakeClock()
+        store = FileIdempotencyStore(path, ttl_s=60.0, segment_max_keys=10, now_fn=clock)
+        for i in range(10):  # Segment 1 at t=1000
+            store.mark_once(f"a{i}")
+        clock.t = 1030.0
+        for i in range(10):  # Segment 2 at t=1030
+            store.mark_once(f"b{i}")
+        assert store.size() == 20
+
+        clock.t = 1061.0  # Segment 1 expired, segment 2 live
+        assert not store.contains("a0") and store.contains("b0")
+        assert store.compact() == 10
+        assert segment_files(path) == ["keys.jsonl.seg-000002"]
+        assert store.mark_once("a0")  # Expired key is new again
+        store.close()
+
+    def test_compaction_rewrites_mostly_expired_segment(self, tmp_path):
+        path = tmp_path / "keys.jsonl"
+        clock = FakeClock()
+        store = FileIdempotencyStore(path, ttl_s=60.0, segment_max_keys=10, now_fn=clock)
+        for i in range(10):
+            clock.t = 1000.0 + 10 * i  # a0..a9 marked at 1000..1090
+            store.mark_once(f"a{i}")
+        assert store.compact(now=1075.0) == 0  # Only a0 expired at this point
+        assert store.compact(now=1125.0) == 7  # a7..a9 live (< half): rewrite
+        assert store.size() == 3
+        clock.t = 1125.0
+        assert store.contains("a9") and not store.contains("a6")
+        store.close()
+
+        store = FileIdempotencyStore(path, ttl_s=60.0, segment_max_keys=10, now_fn=clock)
+        assert store.size() == 3  # Rewritten segment persisted
+        store.close()
+
+    def test_flush_cadence(self, tmp_path):
+        path = tmp_path / "keys.jsonl"
+        store = FileIdempotencyStore(path, flush_every=3)
+        store.mark_once("a")
+        store.mark_once("b")
+        assert path.read_text() == ""  # Still buffered
+        store.mark_once("c")
+        assert [json.loads(line)["key"] for line in path.read_text().splitlines()] == ["a", "b", "c"]
+        store.mark_once("d")
+        store.flush()
+        assert len(path.read_text().splitlines()) == 4
+        store.close()
+
+    def test_legacy_lines_without_ts(self, tmp_path):
+        path = tmp_path / "keys.jsonl"
+        path.write_text('{"key": "old"}\nnot json\n')
+        clock = FakeClock()
+        store = FileIdempotencyStore(path, ttl_s=60.0, now_fn=clock)
+        assert not store.mark_once("old")  # Treated as marked at load time
+        clock.t += 60.0
+        assert store.mark_once("old")
+        store.close()
+
+    def test_invalid_args(self, tmp_path):
+        path = tmp_path / "keys.jsonl"
+        for kwargs, name in (
+            ({"ttl_s": 0}, "ttl_s"),
+            ({"segment_max_keys": 0}, "segment_max_keys"),
+            ({"flush_every": 0}, "flush_every"),
+            ({"fsync_every": 0}, "fsync_every"),
+        ):
+            with pytest.raises(ValueError, match=name):
+                FileIdempotencyStore(path, **kwargs)
+
+
+def test_benchmark_smoke(tmp_path):
+    result = run_benchmark(n_keys=3000, segment_max_keys=1000, lookups=200, db_dir=tmp_path)
+    assert result["keys"] == 3000 and result["segments"] == 3
+    assert result["hit"]["p50_us"] > 0 and result["miss"]["p50_us"] > 0
@@ -8,6 +8,7 @@ import os
 import sys
 import tempfile
 import threading
+import time
 import pytest
 from pathlib import Path
 
@@ -245,3 +246,91 @@ class TestSQLiteIdempotencyStoreEdgeCases:
         assert store.size() == 2
         
         store.close()
+
+
+class TestSQLiteIdempotencyStoreMarkMany:
+    """Tests for batched marks."""
+    
+    def test_mark_many_returns_new_keys(self, tmp_path):
+        """Only keys not seen before (including within the batch) are returned."""
+        store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db")
+        store.mark_once("a")
+        
+        assert store.mark_many(["a", "b", "c", "b"]) == {"b", "c"}
+        assert store.mark_many(["b", "c"]) == set()
+        assert store.mark_many([]) == set()
+        assert store.size() == 3
+        store.close()
+    
+    def test_mark_many_is_one_transaction(self, tmp_path):
+        """A failing batch leaves no keys behind."""
+        store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db")
+        
+        def keys():
+            yield "a"
+            raise RuntimeError("boom")
+        
+        with pytest.raises(RuntimeError):
+            store.mark_many(keys())
+        assert store.size() == 0
+        assert store.mark_once("a") is True
+        store.close()
+    
+    def test_unmark_many_releases_keys(self, tmp_path):
+        """Released keys are new again; unknown keys are ignored."""
+        store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db")
+        store.mark_many(["a", "b", "c"])
+        
+        assert store.unmark_many(["b", "c", "zz"]) == 2
+        assert store.unmark_many([]) == 0
+        assert store.contains("a")
+        assert store.mark_once("b") is True
+        store.close()
+
+
+class TestSQLiteIdempotencyStorePruning:
+    """Tests for TTL pruning."""
+    
+    def test_created_at_index(self, tmp_path):
+        store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db")
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM idempotency_keys WHERE created_at < 0"
+        ).fetchall()
+        assert "idx_idempotency_keys_created_at" in str(plan)
+        store.close()
+    
+    def test_prune_older_than(self, tmp_path):
+        clock = [1000.0]
+        store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db", now_fn=lambda: clock[0])
+        store.mark_many(["a", "b"])
+        clock[0] = 1100.0
+        store.mark_once("c")
+        
+        assert store.prune_older_than(1100.0) == 2
+        assert store.size() == 1
+        assert store.mark_once("a") is True  # Pruned keys are new again
+        assert store.mark_once("c") is False
+        store.close()
+    
+    def test_background_pruning(self, tmp_path):
+        clock = [1000.0]
+        store = SQLiteIdempotencyStore(
+            db_path=tmp_path / "idempotency.db", ttl_s=60.0, prune_interval_s=0.01,
+            now_fn=lambda: clock[0],
+        )
+        store.mark_many(["a", "b"])
+        clock[0] = 1061.0
+        deadline = time.monotonic() + 5.0
+        while store.size() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.size() == 0
+        store.close()
+        assert store._prune_thread is None
+    
+    def test_pruning_requires_ttl(self, tmp_path):
+        with pytest.raises(ValueError, match="ttl_s"):
+            SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db", ttl_s=0)
+        store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db")
+        with pytest.raises(ValueError, match="ttl_s"):
+            store.start_pruning()
+        store.close()
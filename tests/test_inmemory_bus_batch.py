@@ -0,0 +1,116 @@
+"""
+tests/test_inmemory_bus_batch.py
+
+Tests for the InMemoryBus batch API (publish_many / poll_batch) and the
+tuple-backed BusEnvelope.
+
+Validates:
+- publish_many == publish() per message (seq, order, envelopes)
+- poll_batch returns contiguous FIFO batches, full and partial drains
+- ThreadSafeBus batch API honours partitions
+- bench_bus micro-benchmark runs
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus, ThreadSafeBus, BusEnvelope
+from benchmarks.bench_bus import run_benchmark
+
+
+def messages(n, prefix="T"):
+    return [(f"{prefix}{i}", {"i": i}) for i in range(n)]
+
+
+class TestEnvelope:
+
+    def test_tuple_backed_and_immutable(self):
+        env = BusEnvelope(1, "t", "E", "T-1", {"k": 1})
+        assert isinstance(env, tuple)
+        assert env.seq == 1 and env.payload == {"k": 1}
+        with pytest.raises(AttributeError):
+            env.seq = 2  # type: ignore
+        assert BusEnvelope(seq=1, topic="t", event_type="E", trace_id="T-1", payload={"k": 1}) == env
+
+
+class TestPublishMany:
+
+    def test_matches_single_publish(self):
+        single, batched = InMemoryBus(), InMemoryBus()
+        single.publish("other", "X", "T", {})
+        batched.publish("other", "X", "T", {})
+
+        expected = [single.publish("t", "E", trace, payload) for trace, payload in messages(5)]
+        envelopes = batched.publish_many("t", "E", messages(5))
+
+        assert envelopes == expected
+        assert [e.seq for e in envelopes] == [2, 3, 4, 5, 6]
+        assert batched.poll("t", max_items=10) == single.poll("t", max_items=10)
+        assert batched.publish("t", "E", "next", {}).seq == 7
+
+    def test_empty_batch(self):
+        bus = InMemoryBus()
+        assert bus.publish_many("t", "E", []) == []
+        assert bus.size("t") == 0
+        assert bus.publish("t", "E", "T", {}).seq == 1
+
+    def test_accepts_generator(self):
+        bus = InMemoryBus()
+        bus.publish_many("t", "E", ((f"T{i}", {"i": i}) for i in range(3)))
+        assert [e.payload["i"] for e in bus.poll_batch("t", 10)] == [0, 1, 2]
+
+
+class TestPollBatch:
+
+    def test_partial_then_full_drain(self):
+        bus = InMemoryBus()
+        bus.publish_many("t", "E", messages(10))
+
+        first = bus.poll_batch("t", 4)
+        rest = bus.poll_batch("t", 100)
+        assert [e.seq for e in first] == [1, 2, 3, 4]
+        assert [e.seq for e in rest] == list(range(5, 11))
+        assert bus.poll_batch("t", 5) == []
+        assert bus.size("t") == 0
+
+    def test_unknown_topic_and_zero_items(self):
+        bus = InMemoryBus()
+        assert bus.poll_batch("missing", 10) == []
+        bus.publish("t", "E", "T", {})
+        assert bus.poll_batch("t", 0) == []
+        assert bus.size("t") == 1
+
+    def test_poll_is_poll_batch(self):
+        bus = InMemoryBus()
+        bus.publish_many("t", "E", messages(3))
+        assert [e.seq for e in bus.poll("t")] == [1]
+        assert [e.seq for e in bus.poll("t", max_items=5)] == [2, 3]
+
+
+class TestThreadSafeBatch:
+
+    def test_partitioned_publish_many(self):
+        bus = ThreadSafeBus(partitions={"t": 2})
+        envelopes = bus.publish_many("t", "E", messages(20))
+        assert [e.seq for e in envelopes] == list(range(1, 21))
+
+        polled = bus.partition_view(0).poll_batch("t", 100) + bus.partition_view(1).poll_batch("t", 100)
+        assert sorted(e.seq for e in polled) == list(range(1, 21))
+        for env in polled:
+            assert bus.partition_of("t", env.trace_id) in (0, 1)
+        assert bus.size("t") == 0
+
+    def test_poll_batch_across_partitions_respects_max(self):
+        bus = ThreadSafeBus(partitions={"t": 3})
+        bus.publish_many("t", "E", messages(9))
+        assert len(bus.poll_batch("t", 4)) == 4
+        assert bus.size("t") == 5
+
+
+def test_bench_bus_smoke():
+    result = run_benchmark(n_messages=2_000, batch=50, repeat=1)
+    assert result["single_eps"] > 0
+    assert result["batch_eps"] > 0
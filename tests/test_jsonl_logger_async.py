@@ -0,0 +1,135 @@
+"""
+tests/test_jsonl_logger_async.py
+
+Tests for the async mode of engine/structured_jsonl_logger.py.
+
+Validates:
+- Async output is byte-identical to the synchronous FileHandler
+- Lines keep emit order across batches, close() drains the queue
+- Overflow policies: block loses nothing, drop counts discarded lines
+- Replacing a logger's handler closes the previous one
+- benchmarks/bench_jsonl_logger.py smoke run
+"""
+
+import logging
+import threading
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.structured_jsonl_logger import (
+    AsyncJsonlHandler,
+    close_jsonl_logger,
+    get_jsonl_logger,
+    log_event,
+)
+from benchmarks.bench_jsonl_logger import run_benchmark
+
+
+def emit_events(logger: logging.Logger, n: int) -> None:
+    for i in range(n):
+        log_event(
+            logger, trace_id=f"t{i}", event_type="OrderIntentV1", step_id=i,
+            action="publish", topic="exec", extra={"qty": i, "side": "buy"},
+        )
+
+
+def test_async_output_matches_sync(tmp_path):
+    sync_logger = get_jsonl_logger(tmp_path / "sync.jsonl", name="test_sync")
+    emit_events(sync_logger, 500)
+    close_jsonl_logger(sync_logger)
+
+    async_logger = get_jsonl_logger(tmp_path / "async.jsonl", name="test_async", async_mode=True)
+    emit_events(async_logger, 500)
+    close_jsonl_logger(async_logger)
+
+    assert (tmp_path / "async.jsonl").read_bytes() == (tmp_path / "sync.jsonl").read_bytes()
+
+
+def test_order_across_batches_and_close_drains(tmp_path):
+    path = tmp_path / "events.jsonl"
+    handler = AsyncJsonlHandler(path, queue_size=8, batch_max_lines=3)
+    for i in range(1000):
+        handler.enqueue(str(i))
+    handler.close()
+    assert path.read_text().splitlines() == [str(i) for i in range(1000)]
+    handler.enqueue("after close")  # Ignored, no error
+    assert len(path.read_text().splitlines()) == 1000
+
+
+def test_flush_writes_queued_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    logger = get_jsonl_logger(path, name="test_flush", async_mode=True)
+    emit_events(logger, 10)
+    logger.handlers[0].flush()
+    assert len(path.read_text().splitlines()) == 10
+    close_jsonl_logger(logger)
+
+
+def test_plain_logging_calls_go_through_emit(tmp_path):
+    path = tmp_path / "events.jsonl"
+    logger = get_jsonl_logger(path, name="test_emit", async_mode=True)
+    logger.info('{"a":1}')
+    logger.debug('{"ignored":1}')
+    close_jsonl_logger(logger)
+    assert path.read_text() == '{"a":1}\n'
+
+
+def test_block_policy_waits_for_writer(tmp_path):
+    path = tmp_path / "events.jsonl"
+    handler = AsyncJsonlHandler(path, queue_size=1, overflow="block")
+    for i in range(200):
+        handler.enqueue(str(i))
+    handler.close()
+    assert handler.dropped == 0
+    assert len(path.read_text().splitlines()) == 200
+
+
+def test_drop_policy_counts_discarded_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    handler = AsyncJsonlHandler(path, queue_size=2, overflow="drop")
+    gate = threading.Event()
+    real_write = handler._file.write
+
+    def slow_write(data):
+        gate.wait(5)
+        return real_write(data)
+
+    handler._file.write = slow_write  # Writer stalls on its first batch
+    for i in range(50):
+        handler.enqueue(str(i))
+    gate.set()
+    handler.close()
+
+    written = path.read_text().splitlines()
+    assert handler.dropped > 0
+    assert len(written) + handler.dropped == 50
+    assert written == sorted(written, key=int)  # Survivors keep their order
+
+
+def test_replacing_handler_closes_previous(tmp_path):
+    logger = get_jsonl_logger(tmp_path / "a.jsonl", name="test_replace", async_mode=True)
+    first = logger.handlers[0]
+    emit_events(logger, 5)
+    logger = get_jsonl_logger(tmp_path / "b.jsonl", name="test_replace", async_mode=True)
+    assert first._thread is None and logger.handlers[0] is not first
+    assert len((tmp_path / "a.jsonl").read_text().splitlines()) == 5
+    close_jsonl_logger(logger)
+
+
+def test_invalid_args(tmp_path):
+    path = tmp_path / "events.jsonl"
+    for kwargs, name in (
+        ({"overflow": "spill"}, "overflow"),
+        ({"queue_size": 0}, "queue_size"),
+        ({"batch_max_lines": 0}, "batch_max_lines"),
+    ):
+        with pytest.raises(ValueError, match=name):
+            AsyncJsonlHandler(path, **kwargs)
+
+
+def test_benchmark_smoke():
+    result = run_benchmark(n_events=500, repeat=1)
+    assert {s["lines"] for s in result["scenarios"].values()} == {500}
@@ -0,0 +1,132 @@
+"""
+tests/test_latency_histogram.py
+
+Tests for LatencyHistogram (engine/latency_histogram.py) and its use in
+MetricsCollector.
+
+Validates:
+- Percentiles within the bucket width (<1%) of exact nearest-rank values
+  on skewed and multi-modal distributions
+- Exact results when a bucket holds one distinct value; empty safety
+- Bounded bucket count, merge == single histogram, to_dict round trip
+- MetricsCollector: merged collectors, stage events streamed to a sink
+"""
+
+import random
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.latency_histogram import LatencyHistogram
+from engine.metrics_collector import MetricsCollector
+
+
+PS = (0, 1, 25, 50, 90, 95, 99, 99.9, 100)
+
+
+def exact_percentile(samples, p):
+    """The nearest-rank calculation MetricsCollector used on full lists."""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, int(p / 100.0 * (len(ordered) - 1))))]
+
+
+def lognormal_samples(n, seed=1):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(-7.0, 1.2) for _ in range(n)]  # ~1 ms median, long tail
+
+
+def bimodal_samples(n, seed=2):
+    rng = random.Random(seed)
+    return [rng.gauss(0.0002, 0.00002) if rng.random() < 0.9 else rng.gauss(0.05, 0.01) for _ in range(n)]
+
+
+class TestAccuracy:
+
+    @pytest.mark.parametrize("make_samples", [lognormal_samples, bimodal_samples])
+    def test_matches_exact_percentiles(self, make_samples):
+        samples = make_samples(50_000)
+        hist = LatencyHistogram()
+        hist.record_many(samples)
+        for p, value in zip(PS, hist.percentiles(PS)):
+            exact = exact_percentile(samples, p)
+            # Bucket width bound (1/128) plus the 1 us resolution floor
+            assert abs(value - exact) <= exact / 128 + 1e-6, (p, value, exact)
+        assert hist.percentile(0) == min(samples) and hist.percentile(100) == max(samples)
+        assert hist.mean() == pytest.approx(sum(samples) / len(samples))
+
+    def test_identical_values_exact(self):
+        hist = LatencyHistogram()
+        hist.record_many([0.05] * 10 + [0.002] * 10)
+        assert hist.percentiles([25, 95]) == [0.002, 0.05]
+
+    def test_empty(self):
+        hist = LatencyHistogram()
+        assert hist.percentiles([50, 95]) == [None, None]
+        assert hist.mean() is None and len(hist) == 0
+
+
+class TestBoundedAndMergeable:
+
+    def test_bucket_count_bounded(self):
+        hist = LatencyHistogram()
+        rng = random.Random(3)
+        for _ in range(200_000):
+            hist.record(rng.uniform(0.0, 10.0))
+        # Range 1 us .. 10 s spans ~24 powers of two x 128 sub-buckets
+        assert hist.bucket_count < 24 * 128 and len(hist) == 200_000
+
+    def test_merge_equals_single_histogram(self):
+        samples = lognormal_samples(20_000)
+        whole = LatencyHistogram()
+        whole.record_many(samples)
+        parts = [LatencyHistogram() for _ in range(4)]
+        for i, value in enumerate(samples):
+            parts[i % 4].record(value)
+        merged = LatencyHistogram()
+        for part in parts:
+            merged.merge(part)
+        assert merged.bucket_count == whole.bucket_count
+        assert merged.percentiles(PS) == pytest.approx(whole.percentiles(PS), rel=1e-12)
+        assert merged.count == whole.count and merged.min == whole.min and merged.max == whole.max
+
+    def test_round_trip_and_config_mismatch(self):
+        hist = LatencyHistogram()
+        hist.record_many(bimodal_samples(1000))
+        restored = LatencyHistogram.from_dict(hist.to_dict())
+        assert restored.percentiles(PS) == hist.percentiles(PS)
+        with pytest.raises(ValueError, match="different configurations"):
+            hist.merge(LatencyHistogram(sub_bucket_bits=5))
+        with pytest.raises(ValueError, match="resolution"):
+            LatencyHistogram(resolution=0)
+
+
+class TestMetricsCollectorHistograms:
+
+    def record(self, collector, stage, dts):
+        for i, dt in enumerate(dts):
+            collector.record_stage(stage, i, f"t{i}", 0.0, dt)
+
+    def test_merged_workers_match_single_collector(self):
+        dts = lognormal_samples(4000)
+        single = MetricsCollector()
+        self.record(single, "exec", dts)
+        workers = [MetricsCollector(), MetricsCollector()]
+        self.record(workers[0], "exec", dts[:1500])
+        self.record(workers[1], "exec", dts[1500:])
+        workers[1].end("m", "REJECTED", reason="limit")
+        merged = MetricsCollector().merge(workers[0]).merge(workers[1])
+
+        summary = merged.snapshot_summary()
+        assert summary["stages_by_name"] == single.snapshot_summary()["stages_by_name"]
+        assert summary["stage_events_count"] == 4000
+        assert summary["rejects_by_reason"] == {"limit": 1}
+
+    def test_event_sink_streams_events(self):
+        seen = []
+        collector = MetricsCollector(event_sink=seen.append)
+        self.record(collector, "risk", [0.001, 0.002])
+        assert [e["dt"] for e in seen] == [0.001, 0.002]
+        assert collector.get_stage_events() == []
+        assert collector.snapshot_summary()["stage_events_count"] == 2
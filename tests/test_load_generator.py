@@ -0,0 +1,122 @@
+"""
+tests/test_load_generator.py
+
+Tests for the synthetic order-flow load generator (engine/load_generator.py)
+and tools/run_load_test.py.
+
+Validates:
+- Symbol mix parsing and LoadStage validation
+- Tracker: terminal records close traces (fill, risk/exec rejection),
+  earliest over-budget trace is reported
+- run_load: every intent completes, symbol mix reaches the position store,
+  latency budget taken from risk rules, SLO breach reported
+- CLI writes load_report.json, --fail-on-breach exit code
+"""
+
+import json
+import sqlite3
+import subprocess
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.load_generator import LoadStage, TraceLatencyTracker, parse_symbol_mix, run_load
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+
+
+class FakeClock:
+    def __init__(self, t: float = 0.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_parse_symbol_mix():
+    assert parse_symbol_mix("BTC/USDT:3, ETH/USDT:1") == {"BTC/USDT": 0.75, "ETH/USDT": 0.25}
+    assert parse_symbol_mix("A,B") == {"A": 0.5, "B": 0.5}
+    for bad in ("", "A:0", "A:-1"):
+        with pytest.raises(ValueError):
+            parse_symbol_mix(bad)
+
+
+def test_load_stage_validation():
+    assert LoadStage(rate=100, duration_s=2.5).n_intents == 250
+    with pytest.raises(ValueError, match="rate"):
+        LoadStage(rate=0, duration_s=1)
+    with pytest.raises(ValueError, match="duration_s"):
+        LoadStage(rate=1, duration_s=0)
+
+
+def test_tracker_outcomes_and_first_breach():
+    clock = FakeClock()
+    tracker = TraceLatencyTracker(n_stages=1, budget_s=1.0, now_fn=clock)
+    done = []
+    tracker.on_done = done.append
+    for i, due in enumerate((0.0, 0.5, 1.0, 1.5)):
+        tracker.start(f"t{i}", 0, due, f"e{i}")
+
+    clock.t = 0.2
+    tracker.observe({"trace_id": "t0", "event_type": "RiskDecisionV1", "action": "publish", "extra": {"allowed": True}})
+    assert tracker.in_flight == 4  # Allowed decision is not terminal
+    tracker.observe({"trace_id": "t0", "event_type": "PositionUpdated", "action": "persist"})
+    clock.t = 3.0
+    tracker.observe({"trace_id": "t3", "event_type": "ExecutionReportV1", "action": "publish",
+                     "extra": {"status": "REJECTED"}})
+    tracker.observe({"trace_id": "t1", "event_type": "RiskDecisionV1", "action": "publish",
+                     "extra": {"allowed": False}})
+    tracker.observe({"trace_id": "t1", "event_type": "PositionUpdated", "action": "persist"})  # Already closed
+
+    assert tracker.outcomes[0] == {"filled": 1, "risk_rejected": 1, "exec_rejected": 1}
+    assert done == ["e0", "e3", "e1"] and tracker.in_flight == 1
+    assert tracker.histograms[0].max == pytest.approx(2.5)
+    assert tracker.first_breach["trace_id"] == "t1"  # Earlier due than t3, though it completed later
+
+
+def test_run_load_completes_all_intents(tmp_path):
+    report = run_load(
+        [LoadStage(rate=200, duration_s=0.5), LoadStage(rate=400, duration_s=0.5)],
+        symbol_mix={"BTC/USDT": 0.5, "ETH/USDT": 0.5},
+        risk_rules={"latency_budget_seconds": 2.0},
+        exec_workers=2,
+        state_db=tmp_path / "state.db",
+    )
+    assert report["latency_budget_s"] == 2.0
+    assert report["published"] == 300 and report["incomplete"] == 0 and report["drained"]
+    assert [s["completed"] for s in report["stages"]] == [100, 200]
+    for stage in report["stages"]:
+        assert stage["filled"] == stage["completed"]
+        assert 0 < stage["p50_s"] <= stage["p95_s"] <= stage["p99_s"] <= stage["max_s"]
+        assert stage["sustained_tps"] > 0 and stage["within_budget"]
+    assert report["slo_breach"] is None and report["max_rate_within_budget"] == 400
+
+    with sqlite3.connect(tmp_path / "state.db") as conn:
+        symbols = {row[0] for row in conn.execute("SELECT symbol FROM positions")}
+    assert symbols == {"BTC/USDT", "ETH/USDT"}
+
+
+def test_run_load_reports_slo_breach():
+    report = run_load([LoadStage(rate=100, duration_s=0.2)], latency_budget_s=1e-9)
+    breach = report["slo_breach"]
+    assert breach["target_rate"] == 100 and breach["first_trace"] == "load-000000000"
+    assert report["max_rate_within_budget"] is None
+
+
+def test_cli(tmp_path):
+    def run(*extra):
+        return subprocess.run(
+            [sys.executable, str(PROJECT_ROOT / "tools" / "run_load_test.py"),
+             "--rates", "100", "--stage-seconds", "0.3", "--outdir", str(tmp_path), *extra],
+            capture_output=True, text=True, cwd=str(PROJECT_ROOT), timeout=120,
+        )
+
+    result = run("--fail-on-breach")
+    assert result.returncode == 0, result.stderr
+    report = json.loads((tmp_path / "load_report.json").read_text())
+    assert report["latency_budget_s"] == 1.0  # risk_rules.yaml latency_budget_seconds
+    assert report["stages"][0]["completed"] == 30
+
+    assert run("--latency-budget", "0.000000001", "--fail-on-breach").returncode == 1
@@ -0,0 +1,121 @@
+"""
+tests/test_loop_stepper_pipelined_bus.py
+
+Tests for pipelined run_bus_mode (pipeline_batch / max_pending_intents).
+
+Validates:
+- Pipelined runs end with the same positions and fill counts as two-phase runs
+- order_intent queue depth stays under the high-water mark
+- First fill happens before the producer reaches the end of the data
+- Checkpoint only advances past drained bars; bus fully drained at the end
+"""
+
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus
+from engine.loop_stepper import LoopStepper
+from engine.checkpoint import Checkpoint
+
+
+PARAMS = {"fast_period": 3, "slow_period": 5}
+
+
+def make_ohlcv_df(n_bars: int = 200, seed: int = 3) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+def run_bus(tmp_path, name, **kwargs):
+    stepper = LoopStepper(state_db=tmp_path / f"{name}.db", strategy_params=PARAMS, seed=42)
+    log_path = tmp_path / f"{name}.jsonl"
+    result = stepper.run_bus_mode(make_ohlcv_df(), InMemoryBus(), warmup=10,
+                                  max_drain_iterations=1000, log_jsonl_path=log_path, **kwargs)
+    positions = stepper.get_positions()
+    stepper.close()
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    return result, positions, records
+
+
+def strip_ts(positions):
+    return [(p["symbol"], p["qty"], p["avg_price"]) for p in positions]
+
+
+class TestPipelinedParity:
+
+    @pytest.mark.parametrize("kwargs", [
+        {"pipeline_batch": 1},
+        {"pipeline_batch": 7},
+        {"max_pending_intents": 1},
+        {"max_pending_intents": 3},
+    ])
+    def test_same_positions_as_two_phase(self, tmp_path, kwargs):
+        base, base_pos, _ = run_bus(tmp_path, "base")
+        result, positions, _ = run_bus(tmp_path, "piped", **kwargs)
+
+        assert base["published"] > 3
+        assert result["published"] == base["published"]
+        assert result["metrics"] == base["metrics"]
+        assert strip_ts(positions) == strip_ts(base_pos)
+        assert result["drains"] > 1
+        assert "drains" not in base
+
+    def test_high_water_mark_bounds_queue(self, tmp_path):
+        result, _, _ = run_bus(tmp_path, "hwm", max_pending_intents=2)
+        assert 1 <= result["peak_pending_intents"] <= 2
+
+    def test_first_fill_before_last_publish(self, tmp_path):
+        _, _, base_records = run_bus(tmp_path, "base")
+        _, _, records = run_bus(tmp_path, "piped", pipeline_batch=1)
+
+        def first_report_and_last_publish(recs):
+            types = [r["event_type"] for r in recs]
+            last_publish = max(i for i, t in enumerate(types) if t == "OrderIntentV1")
+            first_report = types.index("ExecutionReportV1")
+            return first_report, last_publish
+
+        base_report, base_publish = first_report_and_last_publish(base_records)
+        report, publish = first_report_and_last_publish(records)
+        assert base_report > base_publish
+        assert report < publish
+
+
+class TestPipelinedMechanics:
+
+    def test_bus_drained(self, tmp_path):
+        bus = InMemoryBus()
+        stepper = LoopStepper(strategy_params=PARAMS)
+        stepper.run_bus_mode(make_ohlcv_df(), bus, warmup=10, pipeline_batch=5)
+        for topic in ("order_intent", "risk_decision", "execution_report"):
+            assert bus.size(topic) == 0
+
+    def test_checkpoint_covers_drained_bars(self, tmp_path):
+        ckpt_path = tmp_path / "ckpt.json"
+        stepper = LoopStepper(strategy_params=PARAMS)
+        stepper.run_bus_mode(make_ohlcv_df(), InMemoryBus(), warmup=10, max_steps=47,
+                             pipeline_batch=10, checkpoint=Checkpoint.create_new("pipe"),
+                             checkpoint_path=ckpt_path)
+        ckpt = Checkpoint.load(ckpt_path)
+        # Last (partial) batch is drained and checkpointed at the end
+        assert ckpt.last_processed_idx == 46
+        assert ckpt.processed_count == 47
+
+    @pytest.mark.parametrize("kwargs", [{"pipeline_batch": 0}, {"max_pending_intents": 0}])
+    def test_invalid_values_raise(self, kwargs):
+        with pytest.raises(ValueError, match="must be >= 1"):
+            LoopStepper().run_bus_mode(make_ohlcv_df(), InMemoryBus(), **kwargs)
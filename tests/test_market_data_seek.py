@@ -0,0 +1,181 @@
+"""
+tests/test_market_data_seek.py
+
+Tests for the SeekableMarketDataAdapter extension (seek / seek_index).
+
+Validates:
+- Fixture adapter: binary-search seek by timestamp, seek_index clamping
+- CCXT adapter: seek(ts) costs one since-based fetch regardless of position
+- run_adapter_mode resume uses seek instead of polling history away, with
+  identical results
+"""
+
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.checkpoint import Checkpoint
+from engine.loop_stepper import LoopStepper
+from engine.market_data import (
+    CCXTConfig,
+    CCXTMarketDataAdapter,
+    FixtureMarketDataAdapter,
+    MockOHLCVClient,
+)
+from engine.snapshot import EngineSnapshot
+from strategy_engine.strategy_registry import get_strategy_fn
+
+
+HOUR_MS = 3_600_000
+START_TS = 1705276800000  # MockOHLCVClient default start
+PARAMS = {"fast_period": 3, "slow_period": 5}
+
+
+def make_ohlcv_df(n_bars: int = 60, seed: int = 5) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+@pytest.fixture
+def fixture_adapter(tmp_path) -> FixtureMarketDataAdapter:
+    path = tmp_path / "ohlcv.csv"
+    make_ohlcv_df().to_csv(path, index=False)
+    return FixtureMarketDataAdapter(path)
+
+
+class CountingClient(MockOHLCVClient):
+    """MockOHLCVClient recording every fetch's since."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fetches = []
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=None):
+        self.fetches.append(since)
+        return super().fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+
+def make_ccxt(n_bars: int = 200, limit: int = 20):
+    client = CountingClient(n_bars=n_bars)
+    adapter = CCXTMarketDataAdapter(client, CCXTConfig(limit=limit), allow_network=True)
+    return client, adapter
+
+
+class TestFixtureSeek:
+
+    def test_seek_ts(self, fixture_adapter):
+        first = fixture_adapter.peek_next_ts()
+        fixture_adapter.seek(first + 10 * HOUR_MS)
+        assert fixture_adapter.poll(max_items=1)[0].ts == first + 10 * HOUR_MS
+
+        fixture_adapter.seek(first + 10 * HOUR_MS + 1)  # Between bars: next bar
+        assert fixture_adapter.peek_next_ts() == first + 11 * HOUR_MS
+
+        fixture_adapter.seek(first - 1)  # Backwards, before the first bar
+        assert fixture_adapter.remaining() == len(fixture_adapter)
+
+        fixture_adapter.seek(first + 1000 * HOUR_MS)
+        assert fixture_adapter.is_exhausted()
+        assert fixture_adapter.poll() == []
+
+    def test_seek_index(self, fixture_adapter):
+        events = list(fixture_adapter.poll(max_items=100))
+        fixture_adapter.seek_index(17)
+        assert fixture_adapter.poll(max_items=2) == events[17:19]
+        fixture_adapter.seek_index(10_000)
+        assert fixture_adapter.is_exhausted()
+        with pytest.raises(ValueError, match="index"):
+            fixture_adapter.seek_index(-1)
+
+    def test_up_to_ts_still_enforced(self, fixture_adapter):
+        first = fixture_adapter.peek_next_ts()
+        fixture_adapter.seek(first + 5 * HOUR_MS)
+        batch = fixture_adapter.poll(max_items=10, up_to_ts=first + 6 * HOUR_MS)
+        assert [e.ts for e in batch] == [first + 5 * HOUR_MS, first + 6 * HOUR_MS]
+
+
+class TestCCXTSeek:
+
+    def test_seek_is_one_since_fetch(self):
+        client, adapter = make_ccxt()
+        target = START_TS + 150 * HOUR_MS
+        adapter.seek(target)
+        assert client.fetches == []  # Lazy: nothing fetched yet
+
+        events = adapter.poll(max_items=3)
+        assert [e.ts for e in events] == [target, target + HOUR_MS, target + 2 * HOUR_MS]
+        assert client.fetches == [target - 1]
+
+    def test_seek_backwards_after_consuming(self):
+        client, adapter = make_ccxt()
+        adapter.poll(max_items=20)
+        adapter.poll(max_items=20)
+        adapter.seek(START_TS)
+        assert adapter.poll(max_items=1)[0].ts == START_TS
+
+    def test_seek_index(self):
+        client, adapter = make_ccxt(n_bars=100, limit=20)
+        adapter.seek_index(45)
+        assert adapter.poll(max_items=1)[0].ts == START_TS + 45 * HOUR_MS
+        adapter.seek_index(500)
+        assert adapter.poll() == [] and adapter.is_exhausted()
+        with pytest.raises(ValueError, match="index"):
+            adapter.seek_index(-1)
+
+
+class TestResumeUsesSeek:
+
+    def test_snapshot_resume_with_ccxt_fetches_one_page(self, tmp_path):
+        def stepper():
+            return LoopStepper(strategy_params=PARAMS, strategy_fn=get_strategy_fn("v0_7", mode="stateful"))
+
+        _, adapter = make_ccxt()
+        full = stepper().run_adapter_mode(adapter, max_steps=150, warmup=5)
+
+        _, adapter = make_ccxt()
+        part1 = stepper().run_adapter_mode(
+            adapter, max_steps=120, warmup=5, checkpoint=Checkpoint.create_new("r"),
+            checkpoint_path=tmp_path / "ckpt.json", snapshot_path=tmp_path / "snapshot.json",
+        )
+        client, adapter = make_ccxt()
+        part2 = stepper().run_adapter_mode(
+            adapter, max_steps=30, warmup=5, snapshot=EngineSnapshot.load(tmp_path / "snapshot.json"),
+        )
+
+        assert client.fetches[0] == START_TS + 124 * HOUR_MS  # Seek past the last consumed bar
+        assert len(client.fetches) <= 3  # 30 bars with limit=20, not 155 bars of history
+        dump = lambda events: [json.dumps(e, sort_keys=True) for e in events]
+        assert dump(part1["events"] + part2["events"]) == dump(full["events"])
+
+    def test_checkpoint_resume_seeks_window_start(self, tmp_path, fixture_adapter, monkeypatch):
+        stepper = LoopStepper(strategy_params=PARAMS, seed=3)
+        stepper.run_adapter_mode(fixture_adapter, max_steps=40, warmup=5)
+        window = stepper._ohlcv_buffer.capacity
+        assert window is not None and window < 45
+
+        seeks = []
+        fixture_adapter.reset()
+        original = fixture_adapter.seek_index
+        monkeypatch.setattr(fixture_adapter, "seek_index", lambda i: seeks.append(i) or original(i))
+        resumed = LoopStepper(strategy_params=PARAMS, seed=3)
+        result = resumed.run_adapter_mode(fixture_adapter, max_steps=5, warmup=5, start_idx=40)
+
+        assert seeks == [45 - window]
+        assert result["consumed"] == 50
+        # Window rebuilt from the seek point matches the uninterrupted window
+        assert resumed._ohlcv_buffer.timestamps().tolist()[:-5] == \
+            stepper._ohlcv_buffer.timestamps().tolist()[5:]
@@ -162,7 +162,7 @@ class TestMetricsCollectorPercentiles:
         
         # Add 100 latencies manually
         for i in range(100):
-            collector._latencies.append(float(i + 1))  # 1ms to 100ms equiv
+            collector._latencies.record(float(i + 1))  # 1ms to 100ms equiv
         
         summary = collector.snapshot_summary()
         
@@ -0,0 +1,132 @@
+"""
+tests/test_metrics_writer_buffered.py
+
+Tests for MetricsWriter buffering, background flush and compressed
+rotation (engine/metrics_collector.py).
+
+Validates:
+- Size-based flush at buffer_bytes, explicit flush(), buffer_bytes=0
+- Time-based flush from the background thread
+- gzip of rotated parts, rotate_keep with compressed parts, dashboard tail
+- Rotation state kept in memory (no directory scan after open)
+- benchmarks/bench_metrics.py smoke run
+"""
+
+import gzip
+import json
+import time
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.metrics_collector import MetricsWriter
+from tools.render_metrics_dashboard_3H import tail_ndjson_files
+from benchmarks.bench_metrics import run_benchmark
+
+
+def read_lines(path: Path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def all_events(run_dir: Path):
+    """Events from rotated parts (plain or gzipped) and the active file, in order."""
+    parts = {}
+    for p in run_dir.glob("metrics.ndjson.*"):
+        suffix = p.name[len("metrics.ndjson."):].replace(".gz", "")
+        parts[int(suffix)] = p
+    events = []
+    for n in sorted(parts):
+        opener = gzip.open if parts[n].suffix == ".gz" else open
+        with opener(parts[n], "rt") as f:
+            events.extend(json.loads(line) for line in f)
+    events.extend(json.loads(line) for line in read_lines(run_dir / "metrics.ndjson"))
+    return events
+
+
+class TestBuffering:
+
+    def test_size_based_and_explicit_flush(self, tmp_path):
+        writer = MetricsWriter(run_dir=tmp_path, buffer_bytes=100, flush_interval_s=None)
+        writer.append_event({"i": 0})
+        assert read_lines(tmp_path / "metrics.ndjson") == []  # Buffered
+        for i in range(1, 20):
+            writer.append_event({"i": i})
+        flushed = len(read_lines(tmp_path / "metrics.ndjson"))
+        assert 0 < flushed < 20  # Size-based flushes happened
+        writer.flush()
+        assert len(read_lines(tmp_path / "metrics.ndjson")) == 20
+        writer.close()
+
+    def test_unbuffered_writes_every_event(self, tmp_path):
+        writer = MetricsWriter(run_dir=tmp_path, buffer_bytes=0, flush_interval_s=None)
+        writer.append_event({"i": 0})
+        assert len(read_lines(tmp_path / "metrics.ndjson")) == 1
+        writer.close()
+
+    def test_background_flush(self, tmp_path):
+        writer = MetricsWriter(run_dir=tmp_path, flush_interval_s=0.02)
+        writer.append_event({"i": 0})
+        deadline = time.monotonic() + 5.0
+        while not read_lines(tmp_path / "metrics.ndjson") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(read_lines(tmp_path / "metrics.ndjson")) == 1
+        writer.close()
+        assert writer._flush_thread is None
+
+    def test_invalid_args(self, tmp_path):
+        with pytest.raises(ValueError, match="buffer_bytes"):
+            MetricsWriter(run_dir=tmp_path, buffer_bytes=-1)
+        with pytest.raises(ValueError, match="flush_interval_s"):
+            MetricsWriter(run_dir=tmp_path, flush_interval_s=0)
+
+
+class TestCompressedRotation:
+
+    def test_rotated_parts_gzipped_in_order(self, tmp_path):
+        writer = MetricsWriter(run_dir=tmp_path, rotate_max_lines=3, rotate_compress=True)
+        for i in range(10):
+            writer.append_event({"seq": i})
+        writer.close()
+
+        assert sorted(p.name for p in tmp_path.glob("metrics.ndjson.*")) == [
+            "metrics.ndjson.1.gz", "metrics.ndjson.2.gz", "metrics.ndjson.3.gz",
+        ]
+        assert [e["seq"] for e in all_events(tmp_path)] == list(range(10))
+        assert [e["seq"] for e in tail_ndjson_files(tmp_path)] == list(range(10))
+
+    def test_keep_with_compression(self, tmp_path):
+        (tmp_path / "metrics.ndjson.1.gz").write_bytes(gzip.compress(b'{"old": 1}\n'))
+        writer = MetricsWriter(
+            run_dir=tmp_path, rotate_max_lines=2, rotate_keep=2, rotate_compress=True,
+            flush_interval_s=None,
+        )
+        for i in range(8):
+            writer.append_event({"seq": i})
+        writer.close()
+        # Pre-existing .1 counted; 4 new parts .2-.5, the 2 newest remain
+        assert sorted(p.name for p in tmp_path.glob("metrics.ndjson.*")) == [
+            "metrics.ndjson.4.gz", "metrics.ndjson.5.gz",
+        ]
+
+    def test_no_directory_scan_after_open(self, tmp_path, monkeypatch):
+        (tmp_path / "metrics.ndjson.1").write_text("old\n")
+        writer = MetricsWriter(run_dir=tmp_path, rotate_max_lines=2)
+
+        def no_glob(self, pattern):
+            raise AssertionError("rotation must not glob the run dir")
+
+        monkeypatch.setattr(Path, "glob", no_glob)
+        for i in range(10):
+            writer.append_event({"seq": i})
+        writer.close()
+        monkeypatch.undo()
+        assert (tmp_path / "metrics.ndjson.6").exists()  # .2 .. .6 after the existing .1
+        assert writer.rotation_count == 5
+
+
+def test_benchmark_smoke():
+    result = run_benchmark(n_events=2000, repeat=1, rotate_lines=500)
+    assert set(result["scenarios"]) == {"off", "unbuffered", "buffered", "buffered_gzip_rotation"}
+    assert all(s["events_per_sec"] > 0 for s in result["scenarios"].values())
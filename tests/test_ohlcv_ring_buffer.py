@@ -0,0 +1,179 @@
+"""
+tests/test_ohlcv_ring_buffer.py
+
+Tests for OHLCVRingBuffer and its use in LoopStepper.run_adapter_mode.
+
+Validates:
+- FIFO eviction and chronological order across wrap-around
+- Views are zero-copy and contiguous
+- to_frame() matches the legacy pd.DataFrame(rows) layout
+- Unbounded mode keeps full history
+- snapshot()/from_snapshot() roundtrip (JSON-serializable)
+- Adapter mode sizes the window from the strategy's declared lookback
+"""
+
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.loop_stepper import LoopStepper
+from engine.market_data.fixture_adapter import FixtureMarketDataAdapter
+from engine.market_data.ohlcv_ring_buffer import OHLCVRingBuffer
+from strategy_engine.strategy_registry import get_strategy_fn, get_strategy_lookback
+
+
+HOUR_MS = 3_600_000
+
+
+def fill(buf: OHLCVRingBuffer, n: int) -> None:
+    for i in range(n):
+        buf.append(i * HOUR_MS, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, float(i))
+
+
+class TestOHLCVRingBuffer:
+
+    def test_invalid_capacity_raises(self):
+        with pytest.raises(ValueError, match="capacity must be positive"):
+            OHLCVRingBuffer(0)
+
+    def test_partial_fill_order(self):
+        buf = OHLCVRingBuffer(5)
+        fill(buf, 3)
+        assert len(buf) == 3
+        assert buf.timestamps().tolist() == [0, HOUR_MS, 2 * HOUR_MS]
+        assert buf.column("close").tolist() == [100.5, 101.5, 102.5]
+
+    def test_eviction_keeps_most_recent_in_order(self):
+        buf = OHLCVRingBuffer(4)
+        fill(buf, 11)
+        assert len(buf) == 4
+        assert buf.total_appended == 11
+        assert buf.timestamps().tolist() == [i * HOUR_MS for i in range(7, 11)]
+        assert buf.column("volume").tolist() == [7.0, 8.0, 9.0, 10.0]
+        assert buf.last()["close"] == 110.5
+
+    def test_views_are_zero_copy_and_contiguous(self):
+        buf = OHLCVRingBuffer(4)
+        fill(buf, 6)
+        closes = buf.column("close")
+        assert closes.flags["C_CONTIGUOUS"]
+        assert np.shares_memory(closes, buf._values)
+
+        df = buf.to_frame()
+        assert np.shares_memory(df["close"].to_numpy(), buf._values)
+
+    def test_to_frame_matches_legacy_rows_frame(self):
+        buf = OHLCVRingBuffer(3)
+        rows = []
+        for i in range(5):
+            bar = {
+                "timestamp": pd.Timestamp(i * HOUR_MS, unit="ms", tz="UTC"),
+                "open": 1.0 + i, "high": 2.0 + i, "low": 0.5 + i,
+                "close": 1.5 + i, "volume": 10.0 * i,
+            }
+            rows.append(bar)
+            buf.append(i * HOUR_MS, bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"])
+
+        expected = pd.DataFrame(rows[-3:]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(buf.to_frame(), expected)
+
+    def test_unbounded_mode_keeps_full_history(self):
+        buf = OHLCVRingBuffer(None)
+        fill(buf, 200)
+        assert len(buf) == 200
+        assert buf.timestamps()[0] == 0
+        assert buf.column("open").tolist() == [100.0 + i for i in range(200)]
+
+    def test_snapshot_roundtrip_json(self):
+        buf = OHLCVRingBuffer(5)
+        fill(buf, 8)
+        snap = json.loads(json.dumps(buf.snapshot()))
+        restored = OHLCVRingBuffer.from_snapshot(snap)
+
+        assert restored.total_appended == 8
+        pd.testing.assert_frame_equal(restored.to_frame(), buf.to_frame())
+
+        # Restored buffer keeps evicting correctly
+        buf.append(9 * HOUR_MS, 1, 2, 0.5, 1.5, 3)
+        restored.append(9 * HOUR_MS, 1, 2, 0.5, 1.5, 3)
+        pd.testing.assert_frame_equal(restored.to_frame(), buf.to_frame())
+
+
+class TestStrategyLookback:
+
+    def test_registered_versions_declare_lookback(self):
+        params = {"fast_period": 3, "slow_period": 5}
+        assert get_strategy_lookback(get_strategy_fn("v0_7"), params) == 6
+        # EMA horizon is much longer than the slow period
+        assert get_strategy_lookback(get_strategy_fn("v0_8"), params) > 5
+
+    def test_undeclared_strategy_returns_none(self):
+        assert get_strategy_lookback(lambda *args: [], {}) is None
+
+
+class _RecordingStrategy:
+    """Custom strategy declaring a lookback and recording slice lengths."""
+
+    def __init__(self, lookback: int):
+        self.lookback = lookback
+        self.slice_lengths = []
+
+    def required_lookback(self, params):
+        return self.lookback
+
+    def __call__(self, ohlcv_df, params, ticker, asof_ts):
+        self.slice_lengths.append(len(ohlcv_df))
+        assert ohlcv_df["timestamp"].iloc[-1] == asof_ts
+        return []
+
+
+class TestAdapterModeWindow:
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        rng = np.random.default_rng(3)
+        n = 150
+        closes = 100.0 + np.cumsum(rng.standard_normal(n))
+        df = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=n, freq="1h", tz="UTC"),
+            "open": closes, "high": closes + 1.0, "low": closes - 1.0,
+            "close": closes, "volume": 1000.0,
+        })
+        path = tmp_path / "ohlcv.csv"
+        df.to_csv(path, index=False)
+        return path
+
+    def test_window_bounded_by_declared_lookback(self, csv_path):
+        strategy = _RecordingStrategy(lookback=7)
+        stepper = LoopStepper(seed=42, strategy_fn=strategy)
+        stepper.run_adapter_mode(FixtureMarketDataAdapter(csv_path), warmup=10)
+
+        assert len(strategy.slice_lengths) == 140
+        assert max(strategy.slice_lengths) == 7
+
+    def test_explicit_window_overrides_lookback(self, csv_path):
+        strategy = _RecordingStrategy(lookback=7)
+        stepper = LoopStepper(seed=42, strategy_fn=strategy, ohlcv_window=20)
+        stepper.run_adapter_mode(FixtureMarketDataAdapter(csv_path), warmup=10)
+        assert max(strategy.slice_lengths) == 20
+
+    @pytest.mark.parametrize("version,params", [
+        ("v0_7", {"fast_period": 3, "slow_period": 5}),
+        ("v0_8", {"fast_period": 5, "slow_period": 13}),
+    ])
+    def test_bounded_window_same_events_as_full_history(self, csv_path, version, params):
+        results = []
+        for window in (None, 10_000):
+            stepper = LoopStepper(
+                seed=42, strategy_fn=get_strategy_fn(version),
+                strategy_params=params, ohlcv_window=window,
+            )
+            results.append(stepper.run_adapter_mode(FixtureMarketDataAdapter(csv_path), warmup=10))
+
+        assert results[0]["events"] == results[1]["events"]
+        assert any(e["type"] == "OrderIntent" for e in results[0]["events"])
@@ -0,0 +1,201 @@
+"""
+tests/test_position_cache.py
+
+Tests for the write-behind PositionCache (state/position_cache.py).
+
+Validates:
+- Same position arithmetic as PositionStoreSQLite.apply_fill
+- Reads come from memory; SQLite only sees dirty symbols on flush
+- Size-based and periodic flush, flush before every checkpoint save
+- Existing positions are loaded on construction
+- LoopStepper: positions persisted at checkpoints, opt-in portfolio-aware risk
+"""
+
+import sqlite3
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.checkpoint import Checkpoint, CheckpointPolicy, CheckpointWriter
+from engine.loop_stepper import LoopStepper
+from state import PositionCache, PositionStoreSQLite
+
+
+PARAMS = {"fast_period": 3, "slow_period": 5}
+
+FILLS = [
+    ("BTC/USDT", "BUY", 1.0, 100.0),
+    ("ETH/USDT", "SELL", 2.0, 10.0),
+    ("BTC/USDT", "BUY", 3.0, 120.0),
+    ("ETH/USDT", "BUY", 5.0, 12.0),
+    ("BTC/USDT", "SELL", 4.0, 90.0),  # Close
+]
+
+
+def make_ohlcv_df(n_bars: int = 200, seed: int = 3) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+def db_positions(db_path: Path):
+    """Rows as seen by an independent connection."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT symbol, qty, avg_price FROM positions ORDER BY symbol").fetchall()
+    finally:
+        conn.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class TestPositionCache:
+
+    def test_matches_store(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "ref.db") as ref:
+            expected = [ref.apply_fill(*fill) for fill in FILLS]
+            with PositionCache(PositionStoreSQLite(tmp_path / "cache.db")) as cache:
+                results = [cache.apply_fill(*fill) for fill in FILLS]
+                assert [(r["qty"], r["avg_price"]) for r in results] == \
+                    [(e["qty"], e["avg_price"]) for e in expected]
+                assert cache.list_positions() == [
+                    {k: p[k] for k in ("symbol", "qty", "avg_price")} for p in ref.list_positions()
+                ]
+                assert cache.get_position("BTC/USDT") is None
+
+    def test_write_behind_and_size_flush(self, tmp_path):
+        db = tmp_path / "state.db"
+        cache = PositionCache(PositionStoreSQLite(db), flush_every_fills=4)
+        cache.apply_fills(FILLS[:3])
+        assert cache.get_position("BTC/USDT")["qty"] == 4.0
+        assert db_positions(db) == []  # Not flushed yet
+        assert cache.dirty_count == 2
+
+        cache.apply_fill(*FILLS[3])  # 4th fill: size-based flush
+        assert cache.dirty_count == 0 and cache.flushes == 1
+        assert [row[0] for row in db_positions(db)] == ["BTC/USDT", "ETH/USDT"]
+
+        cache.apply_fill(*FILLS[4])  # Close is written as a delete on flush
+        cache.close()
+        assert [row[0] for row in db_positions(db)] == ["ETH/USDT"]
+
+    def test_periodic_flush(self, tmp_path):
+        db = tmp_path / "state.db"
+        clock = FakeClock()
+        cache = PositionCache(
+            PositionStoreSQLite(db), flush_every_fills=None, flush_every_seconds=5.0, clock=clock,
+        )
+        cache.apply_fill(*FILLS[0])
+        assert db_positions(db) == []
+        clock.t = 5.0
+        cache.apply_fill(*FILLS[1])
+        assert len(db_positions(db)) == 2
+        cache.close()
+
+    def test_loads_existing_positions(self, tmp_path):
+        db = tmp_path / "state.db"
+        with PositionStoreSQLite(db) as store:
+            store.apply_fill("BTC/USDT", "BUY", 2.0, 100.0)
+        with PositionCache(PositionStoreSQLite(db)) as cache:
+            assert cache.apply_fill("BTC/USDT", "BUY", 2.0, 200.0)["avg_price"] == 150.0
+
+    def test_invalid_batch_applies_nothing(self, tmp_path):
+        with PositionCache(PositionStoreSQLite(tmp_path / "state.db")) as cache:
+            with pytest.raises(ValueError, match="side"):
+                cache.apply_fills([FILLS[0], ("ETH/USDT", "HOLD", 1.0, 10.0)])
+            assert cache.list_positions() == []
+
+    def test_weights(self, tmp_path):
+        with PositionCache(PositionStoreSQLite(tmp_path / "state.db")) as cache:
+            cache.apply_fills(FILLS[:2])
+            assert cache.weights(1000.0, {"BTC/USDT": 150.0}) == {"BTC/USDT": 0.15, "ETH/USDT": 0.02}
+            with pytest.raises(ValueError, match="nav"):
+                cache.weights(0.0)
+
+    def test_invalid_thresholds(self, tmp_path):
+        store = PositionStoreSQLite(tmp_path / "state.db")
+        with pytest.raises(ValueError, match="flush_every_fills"):
+            PositionCache(store, flush_every_fills=0)
+        with pytest.raises(ValueError, match="flush_every_seconds"):
+            PositionCache(store, flush_every_seconds=0)
+        store.close()
+
+
+class TestCheckpointFlush:
+
+    def test_before_save_runs_before_each_save(self, tmp_path):
+        db = tmp_path / "state.db"
+        cache = PositionCache(PositionStoreSQLite(db), flush_every_fills=None)
+        seen = []
+
+        def before_save():
+            cache.flush()
+            seen.append(len(db_positions(db)))
+
+        writer = CheckpointWriter(
+            tmp_path / "ckpt.json", CheckpointPolicy(every_n_bars=2), before_save=before_save,
+        )
+        checkpoint = Checkpoint.create_new("r")
+        for idx, fill in enumerate(FILLS[:4]):
+            cache.apply_fill(*fill)
+            checkpoint = checkpoint.update(idx)
+            writer.update(checkpoint)
+        writer.close()
+        cache.close()
+        assert seen == [2, 2]
+
+    def test_adapter_mode_positions_persisted_at_checkpoint(self, tmp_path):
+        from engine.market_data.fixture_adapter import FixtureMarketDataAdapter
+
+        csv_path = tmp_path / "ohlcv.csv"
+        make_ohlcv_df().to_csv(csv_path, index=False)
+        db = tmp_path / "state.db"
+
+        stepper = LoopStepper(strategy_params=PARAMS, state_db=db, position_flush_every=None)
+        stepper.run_adapter_mode(
+            FixtureMarketDataAdapter(csv_path), max_steps=100, warmup=5,
+            checkpoint=Checkpoint.create_new("r"), checkpoint_path=tmp_path / "ckpt.json",
+        )
+        # Final checkpoint save flushed the cache; the store is not closed yet
+        assert db_positions(db) == [
+            (p["symbol"], p["qty"], p["avg_price"]) for p in stepper.get_positions()
+        ]
+        assert db_positions(db) != []
+        stepper.close()
+
+
+class TestPositionAwareRisk:
+
+    def test_weights_reach_risk_manager(self, tmp_path):
+        rules = {"position_limits": {"max_single_asset_pct": 0.005}}
+        results = {}
+        for aware in (False, True):
+            stepper = LoopStepper(
+                strategy_params=PARAMS, risk_rules=rules,
+                state_db=tmp_path / f"state_{aware}.db", position_aware_risk=aware,
+            )
+            results[aware] = stepper.run(make_ohlcv_df(), warmup=5)["metrics"]
+            stepper.close()
+
+        assert results[False]["rejected"] == 0
+        # Once a position is open its weight (~1%) exceeds the 0.5% limit
+        assert results[True]["rejected"] > 0
+        assert results[True]["fills"] < results[False]["fills"]
@@ -0,0 +1,145 @@
+"""
+tests/test_position_ledger.py
+
+Tests for the append-only fill ledger and position snapshots of
+PositionStoreSQLite.
+
+Validates:
+- Every fill (apply_fill, apply_fills, PositionCache flush) lands in the
+  ledger with a contiguous, monotonic sequence
+- Periodic snapshots are taken when the ledger crosses snapshot_every
+- rebuild_positions(as_of_seq) matches the live positions at that offset,
+  from the nearest snapshot or from an empty ledger, including databases
+  that held positions before the ledger existed
+"""
+
+import random
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from state import PositionCache, PositionStoreSQLite
+
+
+SYMBOLS = ("BTC/USDT", "ETH/USDT", "SOL/USDT")
+
+
+def make_fills(n: int, seed: int = 7):
+    """Random buys/sells with frequent closes and crosses."""
+    rng = random.Random(seed)
+    return [
+        (rng.choice(SYMBOLS), rng.choice(("BUY", "SELL")), float(rng.randint(1, 3)), float(rng.randint(90, 110)))
+        for _ in range(n)
+    ]
+
+
+def strip(positions):
+    return [(p["symbol"], p["qty"], p["avg_price"]) for p in positions]
+
+
+class TestLedger:
+
+    def test_fills_appended_in_order(self, tmp_path):
+        fills = make_fills(10)
+        with PositionStoreSQLite(tmp_path / "state.db") as store:
+            store.apply_fill(*fills[0])
+            store.apply_fills(fills[1:])
+            ledger = store.list_fills()
+            assert [f["seq"] for f in ledger] == list(range(1, 11))
+            assert [(f["symbol"], f["side"], f["qty"], f["price"]) for f in ledger] == fills
+            assert store.ledger_seq() == 10
+            assert [f["seq"] for f in store.list_fills(after_seq=3, until_seq=5)] == [4, 5]
+
+    def test_invalid_batch_not_recorded(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "state.db") as store:
+            with pytest.raises(ValueError):
+                store.apply_fills([make_fills(1)[0], ("BTC/USDT", "BUY", -1.0, 100.0)])
+            assert store.ledger_seq() == 0
+
+    def test_cache_flush_records_fills(self, tmp_path):
+        fills = make_fills(25)
+        store = PositionStoreSQLite(tmp_path / "state.db")
+        cache = PositionCache(store, flush_every_fills=10)
+        for fill in fills:
+            cache.apply_fill(*fill)
+        assert store.ledger_seq() == 20  # Two size-based flushes so far
+        cache.flush()
+        assert store.ledger_seq() == 25
+        assert strip(store.rebuild_positions()) == strip(cache.list_positions())
+        cache.close()
+
+
+class TestSnapshotsAndRebuild:
+
+    def test_periodic_snapshots(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "state.db", snapshot_every=100) as store:
+            fills = make_fills(350)
+            for start in range(0, 350, 30):
+                store.apply_fills(fills[start:start + 30])
+            conn = store._get_connection()
+            seqs = [row[0] for row in conn.execute("SELECT seq FROM position_snapshots ORDER BY seq")]
+            # One snapshot per crossed boundary, at the end of the crossing batch
+            assert seqs == [120, 210, 300]
+
+    def test_rebuild_matches_history(self, tmp_path):
+        fills = make_fills(500)
+        history = {0: []}
+        with PositionStoreSQLite(tmp_path / "state.db", snapshot_every=64) as store:
+            for seq, fill in enumerate(fills, start=1):
+                store.apply_fill(*fill)
+                history[seq] = strip(store.list_positions())
+
+            for as_of in (0, 1, 63, 64, 65, 200, 499, 500):
+                assert strip(store.rebuild_positions(as_of)) == history[as_of], as_of
+            assert strip(store.rebuild_positions()) == history[500]
+
+    def test_rebuild_without_snapshots(self, tmp_path):
+        fills = make_fills(50)
+        with PositionStoreSQLite(tmp_path / "state.db", snapshot_every=None) as store:
+            store.apply_fills(fills[:20])
+            expected = strip(store.list_positions())
+            store.apply_fills(fills[20:])
+            assert strip(store.rebuild_positions(20)) == expected
+
+    def test_explicit_snapshot(self, tmp_path):
+        fills = make_fills(30)
+        with PositionStoreSQLite(tmp_path / "state.db", snapshot_every=None) as store:
+            store.apply_fills(fills)
+            assert store.snapshot_positions() == 30
+            conn = store._get_connection()
+            conn.execute("DELETE FROM fills")  # Rebuild at the snapshot needs no ledger
+            conn.commit()
+            assert strip(store.rebuild_positions(30)) == strip(store.list_positions())
+
+    def test_upgraded_db_snapshots_existing_positions(self, tmp_path):
+        """A pre-ledger state.db rebuilds from its live positions, then replays new fills."""
+        import sqlite3
+        
+        db_path = tmp_path / "state.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE positions (symbol TEXT PRIMARY KEY, qty REAL NOT NULL,"
+            " avg_price REAL, updated_at TEXT NOT NULL, meta_json TEXT)"
+        )
+        conn.execute("INSERT INTO positions VALUES ('BTC/USDT', 2.0, 100.0, '2024-01-01', NULL)")
+        conn.commit()
+        conn.close()
+        
+        with PositionStoreSQLite(db_path) as store:
+            assert strip(store.rebuild_positions()) == [("BTC/USDT", 2.0, 100.0)]
+            store.apply_fill("BTC/USDT", "BUY", 2.0, 110.0)
+            store.apply_fill("ETH/USDT", "BUY", 1.0, 50.0)
+            assert strip(store.rebuild_positions()) == strip(store.list_positions())
+            assert strip(store.rebuild_positions(0)) == [("BTC/USDT", 2.0, 100.0)]
+        with PositionStoreSQLite(db_path) as store:
+            # Reopened with a non-empty ledger: the seq-0 snapshot is left alone
+            assert strip(store.rebuild_positions(0)) == [("BTC/USDT", 2.0, 100.0)]
+    
+    def test_invalid_args(self, tmp_path):
+        with pytest.raises(ValueError, match="snapshot_every"):
+            PositionStoreSQLite(tmp_path / "state.db", snapshot_every=0)
+        with PositionStoreSQLite(tmp_path / "state.db") as store:
+            with pytest.raises(ValueError, match="as_of_seq"):
+                store.rebuild_positions(-1)
@@ -0,0 +1,172 @@
+"""
+tests/test_position_store_batch.py
+
+Tests for the group-commit fill API of PositionStoreSQLite.
+
+Validates:
+- apply_fills() matches sequential apply_fill() (adds, reductions, crosses,
+  closes, reopens, several symbols)
+- A batch is atomic: an invalid fill applies nothing
+- Connections run in WAL mode with synchronous=NORMAL by default
+- PositionStoreWorker applies each polled batch with one apply_fills() call
+  and logs the same position_changed values as per-fill application
+- benchmarks/bench_position_store.py smoke run
+"""
+
+import json
+import sqlite3
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus
+from contracts.events_v1 import ExecutionReportV1
+from engine.bus_workers import PositionStoreWorker, TOPIC_EXECUTION_REPORT
+from engine.structured_jsonl_logger import get_jsonl_logger, close_jsonl_logger
+from state.position_store_sqlite import PositionStoreSQLite
+from benchmarks.bench_position_store import run_benchmark
+
+
+FILLS = [
+    ("BTC/USDT", "BUY", 1.0, 100.0),
+    ("ETH/USDT", "SELL", 2.0, 10.0),    # Open short
+    ("BTC/USDT", "BUY", 3.0, 120.0),    # Increase: weighted avg
+    ("BTC/USDT", "sell", 1.5, 130.0),   # Reduce: keep avg
+    ("ETH/USDT", "BUY", 5.0, 12.0),     # Cross: avg = fill price
+    ("BTC/USDT", "SELL", 2.5, 90.0),    # Close
+    ("BTC/USDT", "SELL", 1.0, 95.0),    # Reopen short
+    (" SOL/USDT ", "BUY", 4.0, 20.0),
+]
+
+
+def positions(store: PositionStoreSQLite):
+    return [(p["symbol"], p["qty"], p["avg_price"]) for p in store.list_positions()]
+
+
+class TestApplyFills:
+
+    def test_matches_sequential_apply_fill(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "seq.db") as seq, \
+             PositionStoreSQLite(tmp_path / "batch.db") as batch:
+            expected = [seq.apply_fill(*fill) for fill in FILLS]
+            results = batch.apply_fills(FILLS)
+
+            assert positions(batch) == positions(seq)
+            assert len(results) == len(FILLS)
+            for got, want in zip(results, expected):
+                assert got["symbol"] == want["symbol"]
+                assert got["qty"] == want["qty"]
+                assert got["avg_price"] == want["avg_price"]
+                assert got["closed"] == want.get("closed", False)
+
+    def test_batches_compose(self, tmp_path):
+        """Splitting the fills across batches gives the same end state."""
+        with PositionStoreSQLite(tmp_path / "one.db") as one, \
+             PositionStoreSQLite(tmp_path / "many.db") as many:
+            one.apply_fills(FILLS)
+            many.apply_fills(FILLS[:3])
+            many.apply_fills(FILLS[3:6])
+            many.apply_fills(FILLS[6:])
+            assert positions(many) == positions(one)
+
+    def test_empty_batch(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "state.db") as store:
+            assert store.apply_fills([]) == []
+            assert store.list_positions() == []
+
+    def test_invalid_fill_applies_nothing(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "state.db") as store:
+            store.apply_fill("BTC/USDT", "BUY", 1.0, 100.0)
+            with pytest.raises(ValueError, match="qty must be positive"):
+                store.apply_fills([("BTC/USDT", "BUY", 1.0, 100.0), ("ETH/USDT", "BUY", 0.0, 10.0)])
+            assert positions(store) == [("BTC/USDT", 1.0, 100.0)]
+
+
+class TestPragmas:
+
+    def test_wal_and_synchronous_normal_by_default(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "state.db") as store:
+            conn = store._get_connection()
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_sqlite_defaults_when_disabled(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "state.db", journal_mode=None, synchronous=None) as store:
+            conn = store._get_connection()
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+
+    def test_committed_fills_visible_to_other_connections(self, tmp_path):
+        with PositionStoreSQLite(tmp_path / "state.db") as store:
+            store.apply_fills(FILLS[:3])
+            other = sqlite3.connect(str(tmp_path / "state.db"))
+            try:
+                assert other.execute("SELECT qty FROM positions WHERE symbol = 'BTC/USDT'").fetchone()[0] == 4.0
+            finally:
+                other.close()
+
+
+class SpyStore(PositionStoreSQLite):
+    """PositionStoreSQLite recording apply_fills() batch sizes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+
+    def apply_fills(self, fills):
+        fills = list(fills)
+        self.batches.append(len(fills))
+        return super().apply_fills(fills)
+
+
+def publish_reports(bus: InMemoryBus) -> None:
+    for i, (symbol, side, qty, price) in enumerate(FILLS):
+        status = "REJECTED" if i == 3 else "FILLED"
+        report = ExecutionReportV1(
+            ref_order_event_id=f"o{i}", status=status, filled_qty=qty, avg_price=price,
+            event_id=f"r{i}", ts="2024-01-01T00:00:00+00:00", trace_id=f"t{i}",
+            extra={"symbol": symbol.strip(), "side": side.upper()},
+        )
+        bus.publish(TOPIC_EXECUTION_REPORT, "ExecutionReportV1", report.trace_id, report.to_dict())
+
+
+class TestPositionStoreWorker:
+
+    def test_one_transaction_per_poll_and_same_log(self, tmp_path):
+        store = SpyStore(tmp_path / "state.db")
+        store.ensure_schema()
+        log_path = tmp_path / "events.jsonl"
+        jsonl_logger = get_jsonl_logger(log_path, name="test_position_store_batch")
+        worker = PositionStoreWorker(store, jsonl_logger=jsonl_logger)
+
+        bus = InMemoryBus()
+        publish_reports(bus)
+        assert worker.step(bus, max_items=5) == 5
+        assert worker.step(bus, max_items=5) == 3
+        close_jsonl_logger(jsonl_logger)
+
+        assert store.batches == [4, 3]  # The REJECTED report is skipped
+
+        reference = PositionStoreSQLite(tmp_path / "ref.db")
+        reference.ensure_schema()
+        expected = [reference.apply_fill(*fill) for i, fill in enumerate(FILLS) if i != 3]
+        assert positions(store) == positions(reference)
+
+        changed = [
+            json.loads(line) for line in log_path.read_text().splitlines()
+            if json.loads(line)["event_type"] == "position_changed"
+        ]
+        assert [e["step_id"] for e in changed] == list(range(len(expected)))
+        assert [(e["extra"]["qty"], e["extra"]["avg_px"]) for e in changed] == \
+            [(p["qty"], p["avg_price"]) for p in expected]
+        store.close()
+        reference.close()
+
+
+def test_benchmark_smoke(tmp_path):
+    result = run_benchmark(n_fills=200, batch=50, repeat=1, db_dir=tmp_path)
+    assert result["fills"] == 200
+    assert result["single_fps"] > 0 and result["batch_fps"] > 0
+    assert result["speedup"] > 1.0
@@ -17,7 +17,7 @@ from bus import InMemoryBus
 from contracts.events_v1 import OrderIntentV1, RiskDecisionV1, ExecutionReportV1
 from engine.bus_workers import ExecWorker, TOPIC_RISK_DECISION, TOPIC_EXECUTION_REPORT
 from engine.retry_policy import RetryPolicy
-from engine.idempotency import InMemoryIdempotencyStore
+from engine.idempotency import InMemoryIdempotencyStore, SQLiteIdempotencyStore
 from engine.exchange_adapter import ExecutionContext
 
 
@@ -272,6 +272,76 @@ class TestIdempotencyPrevention:
         assert flaky.call_count == 2  # Both submitted
         assert len(flaky.submitted_reports) == 2
 
+    def test_batch_deduped_with_one_mark_many(self, tmp_path):
+        """A drained batch is deduped in one mark_many call (SQLite store)."""
+        bus = InMemoryBus()
+        flaky = FlakyAdapter(fail_count=0)
+        intent_cache = {oid: make_test_intent(oid) for oid in ("order-a", "order-b")}
+        
+        idem_store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db")
+        idem_store.mark_once("exec:order-b")  # Already executed before a restart
+        calls = []
+        mark_many = idem_store.mark_many
+        idem_store.mark_many = lambda keys: calls.append(list(keys)) or mark_many(keys)
+        
+        worker = ExecWorker(
+            exchange_adapter=flaky,
+            intent_cache=intent_cache,
+            idempotency_store=idem_store,
+        )
+        for oid in ("order-a", "order-b", "order-a"):
+            bus.publish(
+                topic=TOPIC_RISK_DECISION,
+                event_type="RiskDecisionV1",
+                trace_id=f"trace-{oid}",
+                payload=make_test_decision(oid, f"decision-{oid}"),
+            )
+        
+        assert worker.step(bus, max_items=10) == 3
+        assert calls == [["exec:order-a", "exec:order-b", "exec:order-a"]]
+        assert flaky.call_count == 1  # order-a once; order-b was already marked
+        assert len(bus.poll(TOPIC_EXECUTION_REPORT, max_items=10)) == 1
+        idem_store.close()
+
+    def test_mid_batch_failure_releases_unsubmitted_keys(self, tmp_path):
+        """A submit error mid-batch leaves the later orders replayable."""
+        bus = InMemoryBus()
+        failing = FlakyAdapter(fail_count=1, fail_with=RuntimeError)
+        oids = ("ev0", "ev1", "ev2")
+        intent_cache = {oid: make_test_intent(oid) for oid in oids}
+        idem_store = SQLiteIdempotencyStore(db_path=tmp_path / "idempotency.db")
+        for oid in oids:
+            bus.publish(
+                topic=TOPIC_RISK_DECISION,
+                event_type="RiskDecisionV1",
+                trace_id=f"trace-{oid}",
+                payload=make_test_decision(oid, f"decision-{oid}"),
+            )
+        
+        worker = ExecWorker(exchange_adapter=failing, intent_cache=intent_cache, idempotency_store=idem_store)
+        with pytest.raises(RuntimeError):
+            worker.step(bus, max_items=10)
+        
+        assert failing.call_count == 1
+        assert idem_store.contains("exec:ev0")  # Attempted: stays marked
+        assert not idem_store.contains("exec:ev1")
+        assert not idem_store.contains("exec:ev2")
+        
+        # Replay after restart: the unsubmitted orders still execute
+        replay_bus = InMemoryBus()
+        for oid in oids:
+            replay_bus.publish(
+                topic=TOPIC_RISK_DECISION,
+                event_type="RiskDecisionV1",
+                trace_id=f"trace-{oid}",
+                payload=make_test_decision(oid, f"decision-{oid}"),
+            )
+        adapter = FlakyAdapter(fail_count=0)
+        worker = ExecWorker(exchange_adapter=adapter, intent_cache=intent_cache, idempotency_store=idem_store)
+        assert worker.step(replay_bus, max_items=10) == 3
+        assert [r.ref_order_event_id for r in adapter.submitted_reports] == ["ev1", "ev2"]
+        idem_store.close()
+
 
 class TestNoRealSleep:
     """Tests verifying no real sleeps in test mode."""
@@ -0,0 +1,125 @@
+"""
+tests/test_run_metrics_aggregator.py
+
+Tests for online run metrics (RunMetricsAggregator) fed by the JSONL trace.
+
+Validates:
+- Aggregator matches collect_metrics_from_jsonl on the same events
+- LoopStepper event_observer sees every trace record (bus mode)
+- Concurrent observe() calls lose no counts
+- run_live_3E --verify-run-metrics passes
+- benchmarks/bench_run_metrics.py smoke run
+"""
+
+import json
+import subprocess
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus
+from engine.loop_stepper import LoopStepper
+from engine.run_metrics_3D5 import RunMetricsAggregator, collect_metrics_from_jsonl
+from engine.structured_jsonl_logger import close_jsonl_logger, get_jsonl_logger, log_event
+from engine.time_provider import SimulatedTimeProvider
+from benchmarks.bench_run_metrics import run_benchmark
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+
+
+def make_ohlcv_df(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """Deterministic random-walk OHLCV."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.normal(0, 2, n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": rng.integers(1000, 10000, n_bars),
+    })
+
+
+def test_matches_reparse_of_logged_events(tmp_path):
+    path = tmp_path / "events.jsonl"
+    aggregator = RunMetricsAggregator()
+    logger = get_jsonl_logger(path, name="test_run_metrics", observer=aggregator.observe)
+    events = [
+        ("t1", "OrderIntentV1", 1, "publish", {"symbol": "BTC"}),
+        ("t1", "RiskDecisionV1", 2, "publish", {"allowed": True}),
+        ("t1", "ExecutionReportV1", 3, "publish", {"status": "PARTIALLY_FILLED"}),
+        ("t1", "PositionUpdated", 4, "persist", {"symbol": "BTC"}),
+        ("t2", "OrderIntentV1", 5, "publish", None),
+        ("t2", "RiskDecisionV1", 6, "publish", {"allowed": False}),
+        ("t3", "ExecutionReportV1", 7, "publish", {"status": "REJECTED"}),
+        ("SYSTEM", "BusModeDone", 10, "complete", {"drain_iterations": 4}),
+    ]
+    for trace_id, event_type, step_id, action, extra in events:
+        log_event(logger, trace_id=trace_id, event_type=event_type, step_id=step_id, action=action, extra=extra)
+    close_jsonl_logger(logger)
+
+    online = aggregator.summary()
+    assert online == collect_metrics_from_jsonl(path)
+    assert online["num_fills"] == 1 and online["num_risk_rejected"] == 1
+    assert online["unique_trace_ids"] == 3 and online["drain_iterations"] == 4
+    assert list(online) == list(collect_metrics_from_jsonl(tmp_path / "missing.jsonl"))  # CSV column order
+
+
+def test_bus_mode_observer_matches_trace(tmp_path):
+    trace_path = tmp_path / "events.ndjson"
+    aggregator = RunMetricsAggregator()
+    stepper = LoopStepper(state_db=tmp_path / "state.db", seed=42, time_provider=SimulatedTimeProvider(seed=42))
+    stepper.run_bus_mode(
+        make_ohlcv_df(120), InMemoryBus(), max_steps=100, warmup=10,
+        log_jsonl_path=trace_path, event_observer=aggregator.observe,
+    )
+    stepper.close()
+
+    online = aggregator.summary()
+    assert online["num_order_intents"] > 0
+    assert online == collect_metrics_from_jsonl(trace_path)
+
+
+def test_concurrent_observe():
+    aggregator = RunMetricsAggregator()
+
+    def work(worker: int) -> None:
+        for i in range(2000):
+            aggregator.observe({
+                "trace_id": f"w{worker}-{i}", "event_type": "ExecutionReportV1",
+                "step_id": i, "action": "publish", "extra": {"status": "FILLED"},
+            })
+
+    threads = [threading.Thread(target=work, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    summary = aggregator.summary()
+    assert summary["num_execution_reports"] == summary["num_fills"] == 8000
+    assert summary["unique_trace_ids"] == 8000 and summary["max_step_id"] == 1999
+
+
+def test_run_live_3E_verify_run_metrics(tmp_path):
+    outdir = tmp_path / "run"
+    result = subprocess.run(
+        [sys.executable, str(PROJECT_ROOT / "tools" / "run_live_3E.py"),
+         "--outdir", str(outdir), "--seed", "42", "--max-steps", "60",
+         "--clock", "simulated", "--exchange", "paper", "--verify-run-metrics"],
+        capture_output=True, text=True, cwd=str(PROJECT_ROOT), timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Run metrics verified" in result.stdout
+    metrics = json.loads((outdir / "run_metrics.json").read_text())
+    assert metrics == collect_metrics_from_jsonl(outdir / "events.ndjson")
+
+
+def test_benchmark_smoke():
+    result = run_benchmark(n_events=2000)
+    assert result["match"] and result["events"] == 2000
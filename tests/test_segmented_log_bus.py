@@ -0,0 +1,198 @@
+"""
+tests/test_segmented_log_bus.py
+
+Tests for SegmentedLogBus (persistent segmented log bus).
+
+Validates:
+- BusBase behaviour: FIFO per topic, global seq, size
+- Persistence: messages and seq survive reopen; torn tail records are dropped
+- Consumer groups: committed offsets, auto-commit (at-least-once), seek, views
+- Segment rolling, retention and replay across segments
+- run_bus_mode over the log bus matches InMemoryBus
+"""
+
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import BusBase, InMemoryBus, SegmentedLogBus
+from engine.loop_stepper import LoopStepper
+
+
+def publish_n(bus, n, topic="t", start=0):
+    return [bus.publish(topic, "E", f"T{i}", {"i": i}) for i in range(start, start + n)]
+
+
+def items(envelopes):
+    return [e.payload["i"] for e in envelopes]
+
+
+class TestBusBehaviour:
+
+    def test_implements_protocol_and_fifo(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path)
+        assert isinstance(bus, BusBase)
+        published = publish_n(bus, 5)
+        bus.publish("other", "X", "T", {"i": -1})
+
+        assert bus.size("t") == 5
+        polled = bus.poll("t", max_items=3) + bus.poll("t", max_items=10)
+        assert polled == published
+        assert [e.seq for e in polled] == [1, 2, 3, 4, 5]
+        assert bus.size("t") == 0
+        assert bus.poll("t") == []
+        assert bus.poll("missing", max_items=5) == []
+        assert bus.size("missing") == 0
+        bus.close()
+
+    def test_publish_many_matches_publish(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path)
+        envelopes = bus.publish_many("t", "E", [(f"T{i}", {"i": i}) for i in range(4)])
+        assert [e.seq for e in envelopes] == [1, 2, 3, 4]
+        assert bus.poll_batch("t", 10) == envelopes
+        bus.close()
+
+    def test_invalid_topic_name(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid topic"):
+            SegmentedLogBus(tmp_path).publish("../x", "E", "T", {})
+
+
+class TestPersistence:
+
+    def test_reopen_resumes_offsets_and_seq(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path)
+        publish_n(bus, 10)
+        assert items(bus.poll("t", max_items=4)) == [0, 1, 2, 3]
+        bus.close()  # Commits position 4
+
+        bus = SegmentedLogBus(tmp_path)
+        assert bus.committed("t") == 4
+        assert bus.size("t") == 6
+        assert items(bus.poll("t", max_items=100)) == [4, 5, 6, 7, 8, 9]
+        assert bus.publish("t", "E", "T", {"i": 10}).seq == 11
+        bus.close()
+
+    def test_crash_redelivers_uncommitted_batch(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path)
+        publish_n(bus, 10)
+        bus.poll("t", max_items=4)
+        bus.poll("t", max_items=3)  # Commits the first batch; this one is in flight
+        del bus  # Crash: no close()
+
+        bus = SegmentedLogBus(tmp_path)
+        assert items(bus.poll("t", max_items=100)) == [4, 5, 6, 7, 8, 9]
+        bus.close()
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path)
+        publish_n(bus, 3)
+        bus.close()
+        segment = next((tmp_path / "t").glob("*.log"))
+        with open(segment, "ab") as f:
+            f.write(b"\x20\x00\x00\x00garbage")
+
+        bus = SegmentedLogBus(tmp_path)
+        assert bus.end_offset("t") == 3
+        assert bus.publish("t", "E", "T", {"i": 3}).seq == 4
+        assert items(bus.replay("t")) == [0, 1, 2, 3]
+        bus.close()
+
+
+class TestConsumerGroups:
+
+    def test_groups_are_independent(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path)
+        publish_n(bus, 6)
+        audit = bus.consumer("audit")
+
+        assert items(bus.poll("t", max_items=6)) == list(range(6))
+        assert audit.size("t") == 6
+        assert items(audit.poll("t", max_items=2)) == [0, 1]
+        bus.close()
+
+        offsets = json.loads((tmp_path / "_offsets" / "audit.json").read_text())
+        assert offsets == {"t": 2}
+        assert SegmentedLogBus(tmp_path).committed("t") == 6
+
+    def test_seek_and_manual_commit(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path, auto_commit=False)
+        publish_n(bus, 5)
+        bus.poll("t", max_items=5)
+        bus.seek("t", 2)
+        assert items(bus.poll("t", max_items=2)) == [2, 3]
+        bus.commit("t")
+        bus.close()
+        assert SegmentedLogBus(tmp_path).position("t") == 4
+
+    def test_no_auto_commit_without_commit(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path, auto_commit=False)
+        publish_n(bus, 3)
+        bus.poll("t", max_items=3)
+        bus.close()
+        assert SegmentedLogBus(tmp_path).size("t") == 3
+
+
+class TestSegments:
+
+    def test_rolling_and_replay_across_segments(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path, segment_bytes=200)
+        publish_n(bus, 50)
+        segments = sorted((tmp_path / "t").glob("*.log"))
+        assert len(segments) > 3
+        assert items(bus.replay("t")) == list(range(50))
+        assert items(bus.replay("t", from_offset=17, to_offset=23)) == list(range(17, 23))
+        assert items(bus.poll("t", max_items=50)) == list(range(50))
+        bus.close()
+
+        reopened = SegmentedLogBus(tmp_path, segment_bytes=200)
+        assert items(reopened.replay("t", batch_size=7)) == list(range(50))
+        assert reopened.publish("t", "E", "T", {"i": 50}).seq == 51
+        reopened.close()
+
+    def test_retention_drops_oldest_segments(self, tmp_path):
+        bus = SegmentedLogBus(tmp_path, segment_bytes=200, retention_segments=2)
+        publish_n(bus, 50)
+        assert len(list((tmp_path / "t").glob("*.log"))) == 2
+        start = bus.start_offset("t")
+        assert 0 < start < 50
+        # A consumer behind the log start continues from it
+        assert items(bus.poll("t", max_items=100)) == list(range(start, 50))
+        bus.close()
+
+    def test_invalid_settings(self, tmp_path):
+        with pytest.raises(ValueError, match="segment_bytes"):
+            SegmentedLogBus(tmp_path, segment_bytes=0)
+        with pytest.raises(ValueError, match="retention_segments"):
+            SegmentedLogBus(tmp_path, retention_segments=0)
+
+
+def test_run_bus_mode_matches_inmemory(tmp_path):
+    rng = np.random.default_rng(3)
+    closes = 100.0 + np.cumsum(rng.standard_normal(150))
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=150, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+    params = {"fast_period": 3, "slow_period": 5}
+
+    results = []
+    for name, bus in (("mem", InMemoryBus()), ("log", SegmentedLogBus(tmp_path / "bus"))):
+        stepper = LoopStepper(state_db=tmp_path / f"{name}.db", strategy_params=params, seed=42)
+        result = stepper.run_bus_mode(df, bus, warmup=10, max_drain_iterations=1000)
+        results.append((result, [(p["symbol"], p["qty"], p["avg_price"]) for p in stepper.get_positions()]))
+        stepper.close()
+    bus.close()  # Commits the workers' last batches
+
+    assert results[1] == results[0]
+    log_bus = SegmentedLogBus(tmp_path / "bus")
+    assert log_bus.end_offset("order_intent") == results[0][0]["published"] > 0
+    assert all(log_bus.size(t) == 0 for t in log_bus.topics())
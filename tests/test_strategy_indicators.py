@@ -0,0 +1,249 @@
+"""
+tests/test_strategy_indicators.py
+
+Tests for streaming indicators (strategy_engine/indicators.py) and the
+stateful strategy registry mode.
+
+Validates:
+- SMA / EMA match pandas rolling/ewm bit for bit
+- RollingStd matches pandas rolling std
+- ATR / RSI match a straightforward Wilder reference implementation
+- Crossover signals and NaN handling
+- to_state()/indicator_from_state() roundtrip continues identically
+- get_strategy_fn(version, mode="stateful") returns streaming strategies
+"""
+
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategy_engine.indicators import (
+    SMA,
+    EMA,
+    RollingStd,
+    ATR,
+    RSI,
+    Crossover,
+    indicator_from_state,
+)
+from strategy_engine.stateful import (
+    StatefulStrategy,
+    StrategyState,
+    SMACrossoverStrategy,
+    EMACrossoverStrategy,
+)
+from strategy_engine.strategy_registry import (
+    get_strategy_fn,
+    STRATEGY_MODES,
+    DEFAULT_STRATEGY_MODE,
+)
+
+
+def make_ohlcv_df(n_bars: int = 500, seed: int = 7) -> pd.DataFrame:
+    """Random-walk OHLCV with a flat stretch (exercises tie handling)."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    closes[60:75] = closes[60]
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + rng.uniform(0.1, 2.0, n_bars),
+        "low": closes - rng.uniform(0.1, 2.0, n_bars),
+        "close": closes,
+        "volume": rng.integers(100, 1000, n_bars),
+    })
+
+
+def wilder_atr(df: pd.DataFrame, period: int) -> np.ndarray:
+    high, low, close = df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy()
+    prev_close = np.roll(close, 1)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[0] = high[0] - low[0]
+    out = np.full(len(df), np.nan)
+    out[period - 1] = tr[:period].mean()
+    for i in range(period, len(df)):
+        out[i] = (out[i - 1] * (period - 1) + tr[i]) / period
+    return out
+
+
+def wilder_rsi(closes: np.ndarray, period: int) -> np.ndarray:
+    change = np.diff(closes)
+    gains, losses = np.clip(change, 0, None), np.clip(-change, 0, None)
+    out = np.full(len(closes), np.nan)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    for i in range(period, len(closes)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        out[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+class TestIndicatorsMatchReference:
+    """Streaming values match pandas / reference implementations."""
+
+    @pytest.mark.parametrize("window", [1, 3, 5, 30])
+    def test_sma_matches_pandas_bitwise(self, window):
+        closes = make_ohlcv_df()["close"]
+        ind = SMA(window)
+        streamed = np.array([ind.update(x) for x in closes])
+        expected = closes.rolling(window=window).mean().to_numpy()
+        assert np.array_equal(streamed, expected, equal_nan=True)
+
+    @pytest.mark.parametrize("span", [3, 5, 13])
+    def test_ema_matches_pandas_bitwise(self, span):
+        closes = make_ohlcv_df()["close"]
+        ind = EMA(span)
+        streamed = np.array([ind.update(x) for x in closes])
+        expected = closes.ewm(span=span, adjust=False).mean().to_numpy()
+        assert np.array_equal(streamed, expected)
+
+    @pytest.mark.parametrize("window", [2, 5, 20])
+    def test_rolling_std_matches_pandas(self, window):
+        closes = make_ohlcv_df()["close"]
+        ind = RollingStd(window)
+        streamed = np.array([ind.update(x) for x in closes])
+        expected = closes.rolling(window=window).std().to_numpy()
+        assert np.array_equal(np.isnan(streamed), np.isnan(expected))
+        np.testing.assert_allclose(streamed, expected, rtol=1e-9, atol=1e-6)
+
+    def test_rolling_std_flat_window_is_zero(self):
+        ind = RollingStd(4)
+        for _ in range(10):
+            value = ind.update(101.3)
+        assert value == 0.0
+
+    @pytest.mark.parametrize("period", [3, 14])
+    def test_atr_matches_wilder_reference(self, period):
+        df = make_ohlcv_df()
+        ind = ATR(period)
+        streamed = np.array([
+            ind.update(h, l, c) for h, l, c in zip(df["high"], df["low"], df["close"])
+        ])
+        np.testing.assert_allclose(streamed, wilder_atr(df, period), rtol=1e-12)
+
+    @pytest.mark.parametrize("period", [3, 14])
+    def test_rsi_matches_wilder_reference(self, period):
+        closes = make_ohlcv_df()["close"].to_numpy()
+        ind = RSI(period)
+        streamed = np.array([ind.update(x) for x in closes])
+        np.testing.assert_allclose(streamed, wilder_rsi(closes, period), rtol=1e-12)
+        assert np.nanmin(streamed) >= 0.0 and np.nanmax(streamed) <= 100.0
+
+    def test_rsi_flat_series_is_neutral(self):
+        ind = RSI(3)
+        for _ in range(6):
+            value = ind.update(50.0)
+        assert value == 50.0
+
+    def test_invalid_window_raises(self):
+        for cls in (SMA, EMA, RollingStd, ATR, RSI):
+            with pytest.raises(ValueError, match="must be positive"):
+                cls(0)
+
+
+class TestCrossover:
+
+    def test_golden_and_death_cross(self):
+        cross = Crossover()
+        assert cross.update(1.0, 2.0) is None  # No previous point
+        assert cross.update(2.0, 2.0) is None  # Touch, no cross
+        assert cross.update(3.0, 2.0) == "BUY"
+        assert cross.update(3.0, 2.5) is None
+        assert cross.update(1.0, 2.5) == "SELL"
+        assert cross.value == "SELL"
+
+    def test_nan_blocks_signal(self):
+        cross = Crossover()
+        cross.update(float("nan"), 2.0)
+        assert cross.update(3.0, 2.0) is None
+        assert cross.update(1.0, 2.0) == "SELL"
+
+
+class TestIndicatorState:
+    """Serialized state resumes exactly where it left off."""
+
+    @pytest.mark.parametrize("factory", [
+        lambda: SMA(7),
+        lambda: EMA(9),
+        lambda: RollingStd(6),
+        lambda: RSI(5),
+    ])
+    def test_close_indicators_roundtrip(self, factory):
+        closes = make_ohlcv_df(200)["close"].tolist()
+        full, head = factory(), factory()
+        expected = [full.update(x) for x in closes]
+        for x in closes[:120]:
+            head.update(x)
+
+        restored = indicator_from_state(json.loads(json.dumps(head.to_state())))
+        assert type(restored) is type(head)
+        resumed = [restored.update(x) for x in closes[120:]]
+        assert np.array_equal(resumed, expected[120:], equal_nan=True)
+
+    def test_atr_roundtrip(self):
+        df = make_ohlcv_df(100)
+        bars = list(zip(df["high"], df["low"], df["close"]))
+        full, head = ATR(14), ATR(14)
+        expected = [full.update(*b) for b in bars]
+        for b in bars[:50]:
+            head.update(*b)
+        restored = indicator_from_state(json.loads(json.dumps(head.to_state())))
+        assert [restored.update(*b) for b in bars[50:]] == expected[50:]
+
+    def test_unknown_kind_raises(self):
+        with pytest.raises(ValueError, match="Unknown indicator kind"):
+            indicator_from_state({"kind": "macd"})
+
+    @pytest.mark.parametrize("strategy_cls,params", [
+        (SMACrossoverStrategy, {"fast_period": 3, "slow_period": 5}),
+        (EMACrossoverStrategy, {"fast_period": 5, "slow_period": 13}),
+    ])
+    def test_strategy_state_roundtrip(self, strategy_cls, params):
+        df = make_ohlcv_df(300)
+        strategy = strategy_cls()
+        bars = df.to_dict("records")
+
+        full = strategy.init_state(params)
+        expected = [
+            [i.side for i in strategy.on_bar(full, b, params, "BTC-USD", b["timestamp"])]
+            for b in bars
+        ]
+
+        head = strategy.init_state(params)
+        for b in bars[:150]:
+            strategy.on_bar(head, b, params, "BTC-USD", b["timestamp"])
+        restored = StrategyState.from_dict(json.loads(json.dumps(head.to_dict())))
+        resumed = [
+            [i.side for i in strategy.on_bar(restored, b, params, "BTC-USD", b["timestamp"])]
+            for b in bars[150:]
+        ]
+        assert restored.bar_count == full.bar_count
+        assert resumed == expected[150:]
+        assert any(expected[150:])
+
+
+class TestStatefulRegistryMode:
+
+    def test_modes(self):
+        assert "slice" in STRATEGY_MODES and "stateful" in STRATEGY_MODES
+        assert DEFAULT_STRATEGY_MODE == "slice"
+
+    def test_stateful_mode_returns_streaming_strategies(self):
+        sma = get_strategy_fn("v0_7", mode="stateful")
+        ema = get_strategy_fn("v0_8", mode="stateful")
+        assert isinstance(sma, SMACrossoverStrategy)
+        assert isinstance(ema, EMACrossoverStrategy)
+        assert isinstance(sma, StatefulStrategy)
+
+    def test_slice_mode_unchanged(self):
+        assert get_strategy_fn("v0_7", mode="slice") is get_strategy_fn("v0_7")
+
+    def test_unknown_mode_raises(self):
+        with pytest.raises(ValueError, match="Unknown strategy mode"):
+            get_strategy_fn("v0_7", mode="vectorized")
@@ -0,0 +1,148 @@
+"""
+tests/test_strategy_precompute.py
+
+Equivalence tests for the precompute (vectorized) strategy mode.
+
+Validates:
+- generate_signal_schedule matches generate_order_intents on every slice
+- LoopStepper.run() / run_bus_mode() emit identical events and JSONL traces
+- Unsorted/duplicate timestamps fall back to per-bar evaluation
+- run_adapter_mode() treats a precomputed strategy as its slice function
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus
+from engine.loop_stepper import LoopStepper
+from engine.market_data.fixture_adapter import FixtureMarketDataAdapter
+from strategy_engine.indicators import Crossover, crossover_signals
+from strategy_engine.precomputed import PrecomputedStrategy
+from strategy_engine.strategy_registry import get_strategy_fn
+
+
+CASES = [
+    ("v0_7", {"fast_period": 3, "slow_period": 5}),
+    ("v0_7", {}),
+    ("v0_8", {"fast_period": 5, "slow_period": 13}),
+    ("v0_8", {"fast_period": 8, "slow_period": 3}),
+]
+
+
+def make_ohlcv_df(n_bars: int = 300, seed: int = 11) -> pd.DataFrame:
+    """Random-walk OHLCV with a flat stretch (exercises tie handling)."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    closes[60:75] = closes[60]
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": rng.integers(100, 1000, n_bars),
+    })
+
+
+def per_bar_sides(slice_fn, df, params):
+    sides = []
+    for i in range(len(df)):
+        intents = slice_fn(df.iloc[:i + 1], params, "BTC-USD", df["timestamp"].iloc[i])
+        sides.append(intents[0].side if intents else None)
+    return sides
+
+
+def test_crossover_signals_matches_streaming_crossover():
+    rng = np.random.default_rng(0)
+    fast = rng.standard_normal(200).round(1)
+    slow = rng.standard_normal(200).round(1)
+    fast[:5] = np.nan
+    cross = Crossover()
+    expected = [cross.update(f, s) for f, s in zip(fast, slow)]
+    assert crossover_signals(fast, slow).tolist() == expected
+
+
+@pytest.mark.parametrize("version,params", CASES)
+class TestPrecomputeEquivalence:
+    """Precomputed schedule == per-bar slice evaluation."""
+
+    def test_schedule_matches_per_bar_slices(self, version, params):
+        df = make_ohlcv_df(200)
+        strategy = get_strategy_fn(version, mode="precompute")
+        assert isinstance(strategy, PrecomputedStrategy)
+
+        schedule = strategy.precompute(df, params, "BTC-USD")
+        expected = per_bar_sides(get_strategy_fn(version), df, params)
+        assert list(schedule.sides) == expected
+        assert schedule.signal_count > 0
+
+    def test_run_events_identical(self, version, params):
+        df = make_ohlcv_df()
+        results = []
+        for mode in ("slice", "precompute"):
+            stepper = LoopStepper(seed=42, strategy_fn=get_strategy_fn(version, mode=mode),
+                                  strategy_params=params)
+            results.append(stepper.run(df, warmup=10))
+
+        assert results[1]["events"] == results[0]["events"]
+        assert results[1]["metrics"] == results[0]["metrics"]
+        assert any(e["type"] == "OrderIntent" for e in results[0]["events"])
+
+    def test_bus_mode_trace_identical(self, version, params, tmp_path):
+        df = make_ohlcv_df()
+        results = {}
+        for mode in ("slice", "precompute"):
+            log_path = tmp_path / f"{mode}.jsonl"
+            stepper = LoopStepper(
+                state_db=tmp_path / f"{mode}.db",
+                seed=42,
+                strategy_fn=get_strategy_fn(version, mode=mode),
+                strategy_params=params,
+            )
+            result = stepper.run_bus_mode(
+                df, InMemoryBus(), warmup=10, start_idx=20,
+                max_drain_iterations=1000, log_jsonl_path=log_path,
+            )
+            results[mode] = (result, log_path.read_bytes())
+            stepper.close()
+
+        assert results["precompute"] == results["slice"]
+
+
+class TestPrecomputeFallbacks:
+
+    def test_unsorted_timestamps_fall_back_to_per_bar(self):
+        df = make_ohlcv_df(80)
+        shuffled = df.sample(frac=1.0, random_state=3).reset_index(drop=True)
+        params = {"fast_period": 3, "slow_period": 5}
+        strategy = get_strategy_fn("v0_7", mode="precompute")
+
+        schedule = strategy.precompute(shuffled, params, "BTC-USD")
+        assert list(schedule.sides) == per_bar_sides(get_strategy_fn("v0_7"), shuffled, params)
+
+    def test_missing_timestamp_column_raises(self):
+        df = make_ohlcv_df(100).drop(columns=["timestamp"])
+        with pytest.raises(ValueError, match="timestamp"):
+            get_strategy_fn("v0_7", mode="precompute").precompute(df, {})
+
+    def test_empty_frame(self):
+        schedule = get_strategy_fn("v0_8", mode="precompute").precompute(pd.DataFrame(), {})
+        assert len(schedule) == 0
+
+    def test_adapter_mode_uses_slice_semantics(self, tmp_path):
+        csv_path = tmp_path / "ohlcv.csv"
+        make_ohlcv_df(120).to_csv(csv_path, index=False)
+        params = {"fast_period": 3, "slow_period": 5}
+
+        results = []
+        for mode in ("slice", "precompute"):
+            stepper = LoopStepper(seed=42, strategy_fn=get_strategy_fn("v0_7", mode=mode),
+                                  strategy_params=params)
+            results.append(stepper.run_adapter_mode(FixtureMarketDataAdapter(csv_path), warmup=10))
+
+        assert results[1]["events"] == results[0]["events"]
@@ -0,0 +1,157 @@
+"""
+tests/test_universe_stepper.py
+
+Tests for UniverseLoopStepper (multi-symbol bus mode).
+
+Validates:
+- Each symbol ends with the same position as a dedicated LoopStepper run
+- Slice / stateful / precompute strategy modes agree
+- One shared position store, bus fully drained after the run
+- Symbols filter, ragged panels, resume from start_idx, panel validation
+"""
+
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus
+from engine.loop_stepper import LoopStepper
+from engine.universe_stepper import UniverseLoopStepper, panel_from_frames
+from strategy_engine.strategy_registry import get_strategy_fn
+
+
+SYMBOLS = ["BTC-USD", "ETH-USD", "SOL-USD"]
+PARAMS = {"fast_period": 3, "slow_period": 5}
+
+
+def make_ohlcv_df(n_bars: int = 120, seed: int = 1) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+def make_frames(n_bars: int = 120):
+    return {sym: make_ohlcv_df(n_bars, seed=i + 1) for i, sym in enumerate(SYMBOLS)}
+
+
+def positions_by_symbol(positions):
+    return {p["symbol"]: (p["qty"], round(p["avg_price"], 9)) for p in positions}
+
+
+class TestUniverseMatchesSingleSymbol:
+
+    def test_positions_match_per_symbol_loop_steppers(self, tmp_path):
+        frames = make_frames()
+
+        expected = {}
+        for sym, df in frames.items():
+            stepper = LoopStepper(state_db=tmp_path / f"{sym}.db", ticker=sym,
+                                  strategy_params=PARAMS, seed=42)
+            stepper.run_bus_mode(df, InMemoryBus(), warmup=10, max_drain_iterations=1000)
+            expected.update(positions_by_symbol(stepper.get_positions()))
+            stepper.close()
+
+        universe = UniverseLoopStepper(state_db=tmp_path / "universe.db",
+                                       strategy_params=PARAMS, seed=42)
+        result = universe.run_bus_mode(panel_from_frames(frames), InMemoryBus(), warmup=10)
+        actual = positions_by_symbol(universe.get_positions())
+        universe.close()
+
+        assert len(expected) >= 2
+        assert actual == expected
+        assert result["bars"] == 110
+        assert result["symbols"] == 3
+        assert result["metrics"]["symbol_bars"] == 330
+
+    @pytest.mark.parametrize("version", ["v0_7", "v0_8"])
+    def test_strategy_modes_agree(self, version, tmp_path):
+        panel = panel_from_frames(make_frames())
+        results = {}
+        for mode in ("slice", "stateful", "precompute"):
+            stepper = UniverseLoopStepper(
+                state_db=tmp_path / f"{mode}.db",
+                strategy_fn=get_strategy_fn(version, mode=mode),
+                strategy_params=PARAMS,
+                seed=42,
+            )
+            log_path = tmp_path / f"{mode}.jsonl"
+            result = stepper.run_bus_mode(panel, InMemoryBus(), warmup=10, log_jsonl_path=log_path)
+            results[mode] = (result, log_path.read_bytes(), positions_by_symbol(stepper.get_positions()))
+            stepper.close()
+
+        assert results["stateful"] == results["slice"]
+        assert results["precompute"] == results["slice"]
+        assert results["slice"][0]["published"] > 0
+
+
+class TestUniverseMechanics:
+
+    def test_bus_drained_and_single_store(self, tmp_path):
+        bus = InMemoryBus()
+        stepper = UniverseLoopStepper(state_db=tmp_path / "u.db", strategy_params=PARAMS)
+        result = stepper.run_bus_mode(panel_from_frames(make_frames()), bus, warmup=10)
+
+        assert result["published"] > 0
+        for topic in ("order_intent", "risk_decision", "execution_report"):
+            assert bus.size(topic) == 0
+        assert {p["symbol"] for p in stepper.get_positions()} <= set(SYMBOLS)
+        assert len(stepper.get_positions()) >= 2
+        assert sorted(p.name for p in tmp_path.glob("*.db")) == ["u.db"]
+        stepper.close()
+
+    def test_symbols_filter(self, tmp_path):
+        stepper = UniverseLoopStepper(state_db=tmp_path / "u.db", symbols=["ETH-USD"],
+                                      strategy_params=PARAMS)
+        result = stepper.run_bus_mode(panel_from_frames(make_frames()), InMemoryBus(), warmup=10)
+        assert result["symbols"] == 1
+        assert {p["symbol"] for p in stepper.get_positions()} <= {"ETH-USD"}
+        stepper.close()
+
+    def test_ragged_panel(self, tmp_path):
+        frames = make_frames()
+        frames["SOL-USD"] = frames["SOL-USD"].iloc[40:].reset_index(drop=True)
+        stepper = UniverseLoopStepper(strategy_params=PARAMS)
+        result = stepper.run_bus_mode(panel_from_frames(frames), InMemoryBus(), warmup=10)
+        assert result["bars"] == 110
+        assert result["metrics"]["symbol_bars"] == 110 + 110 + 80
+
+    @pytest.mark.parametrize("mode", ["slice", "stateful"])
+    def test_resume_matches_uninterrupted_tail(self, mode, tmp_path):
+        panel = panel_from_frames(make_frames())
+
+        def published(start_idx):
+            stepper = UniverseLoopStepper(strategy_fn=get_strategy_fn("v0_7", mode=mode),
+                                          strategy_params=PARAMS, seed=7)
+            log_path = tmp_path / f"{mode}_{start_idx}.jsonl"
+            stepper.run_bus_mode(panel, InMemoryBus(), warmup=10, start_idx=start_idx,
+                                 log_jsonl_path=log_path)
+            records = [json.loads(line) for line in log_path.read_text().splitlines()]
+            return [(r["step_id"], r["extra"]["symbol"]) for r in records if r["event_type"] == "OrderIntentV1"]
+
+        full, resumed = published(0), published(50)
+        # Step ids restart at 1 on resume; signals must be the same
+        assert resumed
+        assert resumed == [(step - 50, sym) for step, sym in full if step > 50]
+
+    def test_missing_columns_raise(self):
+        stepper = UniverseLoopStepper()
+        with pytest.raises(ValueError, match="symbol"):
+            stepper.run_bus_mode(make_ohlcv_df(), InMemoryBus())
+
+    def test_not_enough_bars(self):
+        stepper = UniverseLoopStepper()
+        result = stepper.run_bus_mode(panel_from_frames(make_frames(5)), InMemoryBus(), warmup=10)
+        assert result["published"] == 0
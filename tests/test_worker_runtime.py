@@ -0,0 +1,311 @@
+"""
+tests/test_worker_runtime.py
+
+Tests for ThreadSafeBus and the threaded WorkerRuntime.
+
+Validates:
+- Concurrent publishers get unique, FIFO-ordered seq numbers
+- Trace partitions: one trace always lands in one partition (per-trace seq order)
+- Runtime drains every stage, stops gracefully (stop() / StopController)
+- Worker failures surface to the caller
+- run_bus_mode(exec_workers=N) matches the single-threaded fills and positions
+"""
+
+import time
+import threading
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bus import InMemoryBus, ThreadSafeBus
+from engine.loop_stepper import LoopStepper
+from engine.worker_runtime import WorkerRuntime
+from engine.exchange_adapter import SimulatedRealtimeAdapter
+
+
+PARAMS = {"fast_period": 3, "slow_period": 5}
+
+
+def make_ohlcv_df(n_bars: int = 200, seed: int = 3) -> pd.DataFrame:
+    """Random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    closes = 100.0 + np.cumsum(rng.standard_normal(n_bars))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="1h", tz="UTC"),
+        "open": closes - 0.5,
+        "high": closes + 1.0,
+        "low": closes - 1.0,
+        "close": closes,
+        "volume": 1000.0,
+    })
+
+
+class StopFlag:
+    """Minimal StopController stand-in."""
+
+    def __init__(self):
+        self.is_stop_requested = False
+        self.stop_reason = None
+
+
+class Forwarder:
+    """Moves envelopes from one topic to another, recording what it saw."""
+
+    def __init__(self, src, dst=None, delay_s=0.0):
+        self.src, self.dst, self.delay_s = src, dst, delay_s
+        self.seen = []
+
+    def step(self, bus, max_items=10):
+        envelopes = bus.poll(self.src, max_items=max_items)
+        for env in envelopes:
+            if self.delay_s:
+                time.sleep(self.delay_s)
+            self.seen.append((env.trace_id, env.seq))
+            if self.dst:
+                bus.publish(self.dst, env.event_type, env.trace_id, env.payload)
+        return len(envelopes)
+
+
+class Exploder:
+    def step(self, bus, max_items=10):
+        if bus.poll("in", max_items=1):
+            raise ValueError("boom")
+        return 0
+
+
+class TestThreadSafeBus:
+
+    def test_concurrent_publish_unique_ordered_seq(self):
+        bus = ThreadSafeBus()
+
+        def produce(k):
+            for i in range(500):
+                bus.publish("t", "E", f"T{k}", {"i": i})
+
+        threads = [threading.Thread(target=produce, args=(k,)) for k in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        envelopes = bus.poll("t", max_items=10_000)
+        seqs = [e.seq for e in envelopes]
+        assert seqs == sorted(seqs) == list(range(1, 2001))
+        for k in range(4):
+            assert [e.payload["i"] for e in envelopes if e.trace_id == f"T{k}"] == list(range(500))
+
+    def test_partitions_route_by_trace(self):
+        bus = ThreadSafeBus(partitions={"t": 3})
+        for i in range(60):
+            bus.publish("t", "E", f"T{i % 7}", {"i": i})
+        assert bus.size("t") == 60
+
+        owners = {}
+        for k in range(3):
+            for env in bus.partition_view(k).poll("t", max_items=100):
+                assert owners.setdefault(env.trace_id, k) == k
+                assert env.topic == "t"
+        assert bus.size("t") == 0
+        assert len(set(owners.values())) > 1
+
+    def test_wait_until_below(self):
+        bus = ThreadSafeBus()
+        bus.publish("t", "E", "T", {})
+        assert not bus.wait_until_below("t", 1, timeout=0.01)
+        threading.Timer(0.02, lambda: bus.poll("t")).start()
+        assert bus.wait_until_below("t", 1, timeout=2.0)
+
+    def test_invalid_partition_count(self):
+        with pytest.raises(ValueError, match="must be >= 1"):
+            ThreadSafeBus(partitions={"t": 0})
+
+
+class TestWorkerRuntime:
+
+    def test_pipeline_drains_and_keeps_trace_order(self):
+        bus = ThreadSafeBus(partitions={"mid": 3})
+        first = Forwarder("in", "mid")
+        middles = [Forwarder("mid", "out", delay_s=0.0005) for _ in range(3)]
+        last = Forwarder("out")
+        runtime = WorkerRuntime(bus)
+        runtime.add_worker("first", first, "in")
+        for k, w in enumerate(middles):
+            runtime.add_worker(f"mid-{k}", w, "mid", partition=k)
+        runtime.add_worker("last", last, "out")
+        runtime.start()
+
+        for i in range(300):
+            bus.publish("in", "E", f"T{i % 11}", {"i": i})
+        assert runtime.drain(timeout=10)
+        runtime.stop()
+
+        assert not runtime.running
+        assert len(last.seen) == 300
+        for w in middles:
+            per_trace = {}
+            for trace, seq in w.seen:
+                per_trace.setdefault(trace, []).append(seq)
+            assert all(s == sorted(s) for s in per_trace.values())
+        stats = runtime.stats()
+        assert sum(stats[f"mid-{k}"]["processed"] for k in range(3)) == 300
+        assert stats["first"]["items_per_second"] > 0
+        assert stats["mid-0"]["mean_latency_ms"] > 0
+
+    def test_stop_controller_graceful_stop(self):
+        bus = ThreadSafeBus()
+        stop = StopFlag()
+        sink = Forwarder("mid")
+        runtime = WorkerRuntime(bus, stop_controller=stop, idle_wait_s=0.01)
+        runtime.add_worker("first", Forwarder("in", "mid"), "in")
+        runtime.add_worker("sink", sink, "mid")
+        for i in range(50):
+            bus.publish("in", "E", "T", {"i": i})
+        runtime.start()
+        stop.is_stop_requested = True
+
+        deadline = time.time() + 5
+        while runtime.running and time.time() < deadline:
+            time.sleep(0.01)
+        assert not runtime.running
+        assert len(sink.seen) == 50
+
+    def test_worker_error_surfaces(self):
+        bus = ThreadSafeBus()
+        runtime = WorkerRuntime(bus)
+        runtime.add_worker("x", Exploder(), "in")
+        runtime.start()
+        bus.publish("in", "E", "T", {})
+        with pytest.raises(RuntimeError, match="boom"):
+            runtime.drain(timeout=5)
+        with pytest.raises(RuntimeError):
+            runtime.stop()
+        assert runtime.stats()["x"]["error"] == "ValueError: boom"
+
+    def test_requires_threadsafe_bus(self):
+        with pytest.raises(TypeError, match="ThreadSafeBus"):
+            WorkerRuntime(InMemoryBus())
+
+
+class TestThreadedBusMode:
+
+    def run(self, tmp_path, name, bus, **kwargs):
+        stepper = LoopStepper(state_db=tmp_path / f"{name}.db", strategy_params=PARAMS, seed=42)
+        result = stepper.run_bus_mode(make_ohlcv_df(), bus, warmup=10, max_drain_iterations=1000, **kwargs)
+        positions = [(p["symbol"], p["qty"], p["avg_price"]) for p in stepper.get_positions()]
+        stepper.close()
+        return result, positions
+
+    def test_single_exec_worker_matches_sequential(self, tmp_path):
+        base, base_pos = self.run(tmp_path, "base", InMemoryBus())
+        bus = ThreadSafeBus()
+        result, positions = self.run(tmp_path, "threaded", bus, exec_workers=1, max_pending_intents=2)
+
+        assert result["metrics"] == base["metrics"]
+        assert result["published"] == base["published"] > 3
+        assert positions == base_pos
+        assert set(result["workers"]) == {"risk", "exec-0", "position"}
+        assert result["workers"]["risk"]["processed"] == base["published"]
+        for topic in ("order_intent", "risk_decision", "execution_report"):
+            assert bus.size(topic) == 0
+
+    def test_parallel_exec_workers_with_latency(self, tmp_path):
+        def adapter():
+            return SimulatedRealtimeAdapter(
+                base_latency_ms=2, max_latency_ms=3, failure_rate_1_in_n=2**40,
+                sleep_fn=lambda ms: time.sleep(ms / 1000.0),
+            )
+
+        base, _ = self.run(tmp_path, "base", InMemoryBus(), exchange_adapter=adapter())
+        result, positions = self.run(
+            tmp_path, "threaded", ThreadSafeBus(partitions={"risk_decision": 4}),
+            exec_workers=4, exchange_adapter=adapter(),
+        )
+
+        assert result["metrics"]["fills"] == base["metrics"]["fills"]
+        exec_stats = [result["workers"][f"exec-{k}"] for k in range(4)]
+        assert sum(s["processed"] for s in exec_stats) == base["published"]
+        assert sum(1 for s in exec_stats if s["processed"]) > 1
+        assert sum(qty for _, qty, _ in positions) == pytest.approx(
+            sum(qty for _, qty, _ in self.run(tmp_path, "base2", InMemoryBus())[1])
+        )
+
+    def test_parallel_exec_workers_share_memory_idempotency_store(self, tmp_path):
+        """N exec threads can share an InMemoryIdempotencyStore that expires keys constantly."""
+        from engine.idempotency import InMemoryIdempotencyStore
+        
+        base, base_pos = self.run(tmp_path, "base", InMemoryBus())
+        store = InMemoryIdempotencyStore(ttl_s=1e-9)  # Every mark expires the previous ones
+        result, positions = self.run(
+            tmp_path, "threaded", ThreadSafeBus(partitions={"risk_decision": 4}),
+            exec_workers=4, idempotency_store=store,
+        )
+        
+        assert all(stats["error"] is None for stats in result["workers"].values())
+        assert result["metrics"]["fills"] == base["metrics"]["fills"]
+        assert sum(qty for _, qty, _ in positions) == pytest.approx(sum(qty for _, qty, _ in base_pos))
+    
+    def test_checkpoint_after_workers_drained(self, tmp_path, monkeypatch):
+        """The threaded checkpoint is saved only once every stage is empty."""
+        from engine.checkpoint import Checkpoint
+        
+        bus = ThreadSafeBus()
+        queued_at_save = []
+        save_atomic = Checkpoint.save_atomic
+        
+        def recording_save(self, path):
+            queued_at_save.append(sum(bus.size(t) for t in ("order_intent", "risk_decision", "execution_report")))
+            save_atomic(self, path)
+        
+        monkeypatch.setattr(Checkpoint, "save_atomic", recording_save)
+        ckpt_path = tmp_path / "ckpt.json"
+        self.run(
+            tmp_path, "threaded", bus, exec_workers=1, max_steps=50,
+            checkpoint=Checkpoint.create_new("threaded"), checkpoint_path=ckpt_path,
+        )
+        
+        assert queued_at_save == [0]
+        assert Checkpoint.load(ckpt_path).last_processed_idx == 49
+    
+    def test_producer_error_stops_threads(self, tmp_path):
+        """An exception in the bar loop stops the workers and the async log writer."""
+        from engine.checkpoint import Checkpoint
+        
+        class FailingBus(ThreadSafeBus):
+            def __init__(self):
+                super().__init__()
+                self.intents = 0
+            
+            def publish(self, topic, *args, **kwargs):
+                if topic == "order_intent":
+                    self.intents += 1
+                    if self.intents > 2:
+                        raise RuntimeError("publish failed")
+                return super().publish(topic, *args, **kwargs)
+        
+        ckpt_path = tmp_path / "ckpt.json"
+        stepper = LoopStepper(state_db=tmp_path / "state.db", strategy_params=PARAMS, seed=42)
+        with pytest.raises(RuntimeError, match="publish failed"):
+            stepper.run_bus_mode(
+                make_ohlcv_df(), FailingBus(), warmup=10, exec_workers=1,
+                log_jsonl_path=tmp_path / "events.ndjson",
+                checkpoint=Checkpoint.create_new("threaded"), checkpoint_path=ckpt_path,
+            )
+        stepper.close()
+        
+        names = [t.name for t in threading.enumerate()]
+        assert not [n for n in names if n.startswith(("worker-", "jsonl-writer"))]
+        assert not ckpt_path.exists()
+    
+    def test_invalid_configurations(self, tmp_path):
+        stepper = LoopStepper(strategy_params=PARAMS)
+        df = make_ohlcv_df()
+        with pytest.raises(TypeError, match="ThreadSafeBus"):
+            stepper.run_bus_mode(df, InMemoryBus(), exec_workers=1)
+        with pytest.raises(ValueError, match="partitions"):
+            stepper.run_bus_mode(df, ThreadSafeBus(), exec_workers=2)
+        with pytest.raises(ValueError, match="pipeline_batch"):
+            stepper.run_bus_mode(df, ThreadSafeBus(), exec_workers=1, pipeline_batch=5)
@@ -16,6 +16,7 @@ Part of ticket AG-3H-3-1, extended in AG-3I-4-1.
 """
 
 import argparse
+import gzip
 import json
 from datetime import datetime, timezone
 from pathlib import Path
@@ -37,16 +38,21 @@ def tail_ndjson_files(run_dir: Path, max_lines: int = 100) -> List[Dict[str, Any
     """
     Tail NDJSON files in order: metrics.ndjson.N (oldest) -> metrics.ndjson (newest).
     
+    Rotated files may be gzipped (metrics.ndjson.N.gz).
+    
     Returns at most max_lines events from the end.
     """
     events: List[Dict[str, Any]] = []
     
     # Find all metrics.ndjson files
     main_file = run_dir / "metrics.ndjson"
-    rotated_files = sorted(
-        run_dir.glob("metrics.ndjson.[0-9]*"),
-        key=lambda p: int(p.suffix.lstrip("."))
-    )
+    rotated = {}
+    for p in run_dir.glob("metrics.ndjson.[0-9]*"):
+        suffix = p.name[len("metrics.ndjson."):]
+        suffix = suffix[:-3] if suffix.endswith(".gz") else suffix
+        if suffix.isdigit():
+            rotated[int(suffix)] = p
+    rotated_files = [rotated[n] for n in sorted(rotated)]
     
     # Read in chronological order: rotated first (oldest), then main (newest)
     all_files = list(rotated_files) + ([main_file] if main_file.exists() else [])
@@ -55,7 +61,8 @@ def tail_ndjson_files(run_dir: Path, max_lines: int = 100) -> List[Dict[str, Any
         if not f.exists():
             continue
         try:
-            with open(f, "r", encoding="utf-8") as fp:
+            opener = gzip.open if f.suffix == ".gz" else open
+            with opener(f, "rt", encoding="utf-8") as fp:
                 for line in fp:
                     line = line.strip()
                     if line:
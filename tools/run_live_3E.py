@@ -30,13 +30,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pandas as pd
 import numpy as np
 
-from bus import InMemoryBus
+from bus import InMemoryBus, ThreadSafeBus
 from engine.loop_stepper import LoopStepper
-from engine.run_metrics_3D5 import collect_metrics_from_jsonl
+from engine.run_metrics_3D5 import RunMetricsAggregator, collect_metrics_from_jsonl
 from engine.time_provider import SimulatedTimeProvider, RealTimeProvider
 from engine.exchange_adapter import PaperExchangeAdapter, StubNetworkExchangeAdapter, SimulatedRealtimeAdapter
 from engine.runtime_config import RuntimeConfig
-from engine.checkpoint import Checkpoint
+from engine.checkpoint import Checkpoint, CheckpointPolicy
+from engine.event_sinks import NullSink
+from engine.snapshot import EngineSnapshot
 from engine.idempotency import (
     FileIdempotencyStore,
     InMemoryIdempotencyStore,
@@ -45,7 +47,13 @@ from engine.idempotency import (
 )
 from engine.metrics_collector import MetricsCollector, MetricsWriter, NoOpMetricsCollector
 from risk_rules_loader import load_risk_rules
-from strategy_engine.strategy_registry import get_strategy_fn, STRATEGY_VERSIONS, DEFAULT_STRATEGY
+from strategy_engine.strategy_registry import (
+    get_strategy_fn,
+    STRATEGY_VERSIONS,
+    DEFAULT_STRATEGY,
+    STRATEGY_MODES,
+    DEFAULT_STRATEGY_MODE,
+)
 
 # Configure basic logging
 logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
@@ -124,6 +132,7 @@ def build_metrics(
     rotate_max_mb: Optional[int] = None,
     rotate_max_lines: Optional[int] = None,
     rotate_keep: Optional[int] = None,
+    rotate_compress: bool = False,
 ) -> tuple:
     """
     Build metrics collector and writer based on configuration.
@@ -135,6 +144,7 @@ def build_metrics(
         rotate_max_mb: Optional max MB before rotation
         rotate_max_lines: Optional max lines before rotation
         rotate_keep: Optional keep only N rotated files (AG-3I-3-1)
+        rotate_compress: gzip rotated files
         
     Returns:
         Tuple of (MetricsCollector or NoOpMetricsCollector, MetricsWriter)
@@ -149,12 +159,17 @@ def build_metrics(
         import time
         clock_fn = time.monotonic
     
-    collector = MetricsCollector(clock_fn=clock_fn)
     writer = MetricsWriter(
         run_dir=run_dir,
         rotate_max_mb=rotate_max_mb,
         rotate_max_lines=rotate_max_lines,
         rotate_keep=rotate_keep,
+        rotate_compress=rotate_compress,
+    )
+    # Stage events stream to metrics.ndjson as they happen (bounded memory)
+    collector = MetricsCollector(
+        clock_fn=clock_fn,
+        event_sink=writer.append_event if writer.enabled else None,
     )
     return collector, writer
 
@@ -253,6 +268,56 @@ def main():
         default=DEFAULT_STRATEGY,
         help=f"Strategy version to use (default: {DEFAULT_STRATEGY})"
     )
+    parser.add_argument(
+        "--strategy-mode",
+        choices=STRATEGY_MODES,
+        default=DEFAULT_STRATEGY_MODE,
+        help="slice: recompute indicators over full history each bar; "
+             "stateful: streaming indicators, O(1) per bar; "
+             "precompute: vectorized signals for the whole frame up front "
+             "(same intents in all modes)"
+    )
+    
+    parser.add_argument(
+        "--pipeline-batch",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Dataframe mode: drain bus workers after every N bars instead of once at the end"
+    )
+    parser.add_argument(
+        "--max-pending-intents",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Dataframe mode: order_intent queue high-water mark; producer drains when reached"
+    )
+    parser.add_argument(
+        "--exec-workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Dataframe mode: run bus workers on threads with N exec workers (default: single thread)"
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Save the run checkpoint every N bars (default: 1; the latest is always saved on exit)"
+    )
+    parser.add_argument(
+        "--checkpoint-seconds",
+        type=float,
+        default=None,
+        metavar="T",
+        help="Also save the run checkpoint when T seconds have passed since the last save"
+    )
+    parser.add_argument(
+        "--async-checkpoint",
+        action="store_true",
+        help="Write checkpoints on a background thread (latest wins)"
+    )
     
     # AG-3K-1-1 + AG-3K-2-1: Data source selection
     parser.add_argument(
@@ -342,6 +407,19 @@ def main():
         default=None,
         help="Keep only N most recent rotated files (default: keep all)"
     )
+    parser.add_argument(
+        "--metrics-rotate-compress",
+        action="store_true",
+        default=False,
+        help="gzip rotated metrics files (metrics.ndjson.N.gz)"
+    )
+    
+    parser.add_argument(
+        "--verify-run-metrics",
+        action="store_true",
+        default=False,
+        help="Re-parse events.ndjson after the run and fail if it disagrees with run_metrics.json"
+    )
     
     # AG-3L-1-1: Data mode selection (adapter vs dataframe bridge)
     parser.add_argument(
@@ -403,6 +481,13 @@ def main():
         "seed": args.seed,
         "latency_steps": args.latency_steps if args.exchange == "stub" else 0,
         "strategy": args.strategy,  # AG-3J-1-1
+        "strategy_mode": args.strategy_mode,
+        "pipeline_batch": args.pipeline_batch,
+        "max_pending_intents": args.max_pending_intents,
+        "exec_workers": args.exec_workers,
+        "checkpoint_every": args.checkpoint_every,
+        "checkpoint_seconds": args.checkpoint_seconds,
+        "async_checkpoint": args.async_checkpoint,
         "data_source": args.data,  # AG-3K-1-1
         "fixture_path": args.fixture_path if args.data == "fixture" else None,  # AG-3K-1-1
         "max_steps": args.max_steps,
@@ -422,6 +507,7 @@ def main():
     # 3F.4: Setup run directory and crash recovery
     run_dir: Optional[Path] = None
     checkpoint: Optional[Checkpoint] = None
+    snapshot: Optional[EngineSnapshot] = None
     idem_store: Optional[IdempotencyStore] = None
     start_idx = 0
     
@@ -433,7 +519,13 @@ def main():
             sys.exit(1)
         checkpoint = Checkpoint.load(checkpoint_path)
         start_idx = checkpoint.last_processed_idx + 1
-        print(f"Resuming from run_id={checkpoint.run_id}, start_idx={start_idx}")
+        snapshot_path = run_dir / "snapshot.json"
+        if args.data_mode == "adapter" and snapshot_path.exists():
+            # Engine-state snapshot: resume without replaying history
+            snapshot = EngineSnapshot.load(snapshot_path)
+            start_idx = snapshot.checkpoint.last_processed_idx + 1
+        print(f"Resuming from run_id={checkpoint.run_id}, start_idx={start_idx}"
+              + (" (snapshot)" if snapshot else ""))
         idem_store = build_idempotency_store(run_dir, args.idempotency_backend)
     elif args.run_dir:
         run_dir = Path(args.run_dir)
@@ -450,11 +542,14 @@ def main():
         sys.exit(0)
         
     # 3. Initialize LoopStepper
-    bus = InMemoryBus()
+    if args.exec_workers:
+        bus = ThreadSafeBus(partitions={"risk_decision": args.exec_workers})
+    else:
+        bus = InMemoryBus()
     
     # AG-3J-1-1: Get strategy function based on CLI flag
-    strategy_fn = get_strategy_fn(args.strategy)
-    print(f"  Strategy: {args.strategy}")
+    strategy_fn = get_strategy_fn(args.strategy, mode=args.strategy_mode)
+    print(f"  Strategy: {args.strategy} ({args.strategy_mode})")
     
     stepper = LoopStepper(
         state_db=db_path,
@@ -547,6 +642,7 @@ def main():
         rotate_max_mb=args.metrics_rotate_max_mb,
         rotate_max_lines=args.metrics_rotate_max_lines,
         rotate_keep=args.metrics_rotate_keep,
+        rotate_compress=args.metrics_rotate_compress,
     )
     if args.enable_metrics and run_dir:
         print(f"  Metrics enabled: {run_dir}/metrics_*.json")
@@ -564,10 +660,19 @@ def main():
     
     # Determine checkpoint_path for saving during loop
     ckpt_path = run_dir / "checkpoint.json" if run_dir else None
+    ckpt_policy = CheckpointPolicy(
+        every_n_bars=args.checkpoint_every,
+        every_seconds=args.checkpoint_seconds,
+        async_write=args.async_checkpoint,
+    )
     
     # Start metrics tracking for the run
     metrics_collector.start("run_main")
     
+    # run_metrics.json / results.csv are aggregated from the trace as it is
+    # logged (no re-parse of events.ndjson at shutdown)
+    run_metrics = RunMetricsAggregator()
+    
     # AG-H1-2-1: Exit code tracking (0=success/controlled shutdown, nonzero=error)
     exit_code = 0
     
@@ -583,8 +688,13 @@ def main():
                 exchange_adapter=exchange_adapter,  # AG-3M-1-1: End-to-end via ExchangeAdapter
                 checkpoint=checkpoint,              # AG-3M-2-1: Checkpoint for resume
                 checkpoint_path=ckpt_path,          # AG-3M-2-1: Path to save checkpoint
+                checkpoint_policy=ckpt_policy,
                 start_idx=start_idx,                # AG-3M-2-1: Resume from this index
                 stop_controller=stop_controller,    # AG-3O-2-1: Graceful shutdown
+                snapshot=snapshot,
+                snapshot_path=run_dir / "snapshot.json" if run_dir else None,
+                event_observer=run_metrics.observe,
+                sink=NullSink(),  # Events are in the JSONL trace; keep only counts
             )
         else:
             # Default: use run_bus_mode() with DataFrame
@@ -598,9 +708,14 @@ def main():
                 idempotency_store=idem_store,
                 checkpoint=checkpoint,
                 checkpoint_path=ckpt_path,
+                checkpoint_policy=ckpt_policy,
                 start_idx=start_idx,
                 metrics_collector=metrics_collector,  # 3H.1: granular observability
                 stop_controller=stop_controller,      # AG-3O-2-1: Graceful shutdown
+                pipeline_batch=args.pipeline_batch,
+                max_pending_intents=args.max_pending_intents,
+                exec_workers=args.exec_workers,
+                event_observer=run_metrics.observe,
             )
         # End metrics with success
         metrics_collector.end("run_main", status="FILLED")
@@ -622,7 +737,8 @@ def main():
         # Close idempotency store if used
         if idem_store:
             idem_store.close()
-        # 3H.1: Write stage events to NDJSON before summary
+        # 3H.1: Write stage events to NDJSON before summary (build_metrics
+        # streams them via event_sink, so only events kept in memory remain)
         if metrics_writer.enabled:
             for event in metrics_collector.get_stage_events():
                 metrics_writer.append_event(event)
@@ -633,7 +749,15 @@ def main():
     
     # 4. Collect Metrics
     if trace_path.exists():
-        metrics = collect_metrics_from_jsonl(trace_path)
+        metrics = run_metrics.summary()
+        if args.verify_run_metrics:
+            reparsed = collect_metrics_from_jsonl(trace_path)
+            if reparsed != metrics:
+                mismatched = sorted(k for k in reparsed if reparsed[k] != metrics.get(k))
+                logger.error(f"Run metrics differ from events.ndjson re-parse: {mismatched}")
+                exit_code = 1
+            else:
+                print("Run metrics verified against events.ndjson")
         
         # Write metrics json
         with open(metrics_path, "w", encoding="utf-8") as f:
@@ -650,7 +774,7 @@ def main():
             "pnl": metrics.get("pnl_realized", 0.0), # Assuming metrics has specific fields or we dump all
         }
         # Dump flattened metrics to CSV as 'results.csv'
-        # The collect_metrics_from_jsonl returns a dict. We'll flatten it.
+        # RunMetricsAggregator.summary() returns a flat dict.
         
         # Also, user requested "results.csv headers esperados (los que ya use el repo)".
         # Existing runner (calibration) outputs a row per run.
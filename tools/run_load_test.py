@@ -0,0 +1,127 @@
+"""
+tools/run_load_test.py
+
+Synthetic order-flow load test with a latency SLO report.
+
+Drives OrderIntentV1 at each target rate (a back-to-back ramp) through the
+bus workers (engine/load_generator.py) and writes load_report.json with
+per-stage p50/p95/p99/max end-to-end latency, sustained throughput and the
+point where latency exceeded latency_budget_seconds from the risk rules.
+
+Usage:
+  python tools/run_load_test.py --rates 100,500,1000,2000 --stage-seconds 10 --outdir report/load
+  python tools/run_load_test.py --rates 50 --stage-seconds 60 --symbols "BTC/USDT:0.7,ETH/USDT:0.3" --fail-on-breach
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engine.load_generator import DEFAULT_SYMBOL_MIX, LoadStage, parse_symbol_mix, run_load
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+logger = logging.getLogger("run_load_test")
+
+PROJECT_ROOT = Path(__file__).parent.parent
+KPI_TX_PER_DAY = 100_000
+
+
+def _fmt_ms(seconds) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable summary of a load report."""
+    print(f"Latency budget: {report['latency_budget_s']}s")
+    print(f"{'rate/s':>9} {'done':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'tps':>9}  SLO")
+    for st in report["stages"]:
+        print(
+            f"{st['target_rate']:>9g} {st['completed']:>8} {_fmt_ms(st['p50_s']):>9} {_fmt_ms(st['p95_s']):>9}"
+            f" {_fmt_ms(st['p99_s']):>9} {_fmt_ms(st['max_s']):>9} {st['sustained_tps']:>9.1f}"
+            f"  {'ok' if st['within_budget'] else 'BREACH'}"
+        )
+    breach = report["slo_breach"]
+    if breach is None:
+        print("No SLO breach")
+    else:
+        print(f"SLO breached at {breach['target_rate']:g}/s (stage p99 {_fmt_ms(breach['stage_p99_s'])} ms)")
+        if "first_trace" in breach:
+            print(
+                f"  first trace over budget: {breach['first_trace']} due at +{breach['first_trace_at_s']:.2f}s,"
+                f" latency {breach['first_trace_latency_s']:.3f}s"
+            )
+    if report["tx_per_day_at_max_rate"] is not None:
+        verdict = "ok" if report["tx_per_day_at_max_rate"] >= KPI_TX_PER_DAY else "below target"
+        print(
+            f"Max rate within budget: {report['max_rate_within_budget']:g}/s"
+            f" = {report['tx_per_day_at_max_rate']:,.0f} tx/day ({verdict}, target {KPI_TX_PER_DAY:,})"
+        )
+    if report["incomplete"]:
+        print(f"WARNING: {report['incomplete']} traces did not complete")
+
+
+def parse_rates(spec: str) -> List[float]:
+    return [float(r) for r in spec.split(",") if r.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Order-flow load test with latency SLO report")
+    parser.add_argument("--rates", type=parse_rates, default=[100.0, 500.0, 1000.0], help="Comma-separated intents/sec per stage")
+    parser.add_argument("--stage-seconds", type=float, default=10.0, help="Duration of each stage")
+    parser.add_argument(
+        "--symbols", type=parse_symbol_mix, default=DEFAULT_SYMBOL_MIX,
+        help='Symbol mix "SYM:weight,..." (default: BTC/USDT:0.5,ETH/USDT:0.3,SOL/USDT:0.2)',
+    )
+    parser.add_argument("--risk-rules", type=Path, default=PROJECT_ROOT / "risk_rules.yaml", help="Risk rules YAML")
+    parser.add_argument("--latency-budget", type=float, default=None, help="Override latency_budget_seconds")
+    parser.add_argument("--exec-workers", type=int, default=1, help="ExecWorker threads")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for symbol/side/qty draws")
+    parser.add_argument("--outdir", type=Path, default=None, help="Write load_report.json (and state.db) here")
+    parser.add_argument("--trace", action="store_true", help="Also write the JSONL trace to outdir/events.ndjson")
+    parser.add_argument("--fail-on-breach", action="store_true", help="Exit 1 if any stage breaches the SLO")
+    args = parser.parse_args()
+
+    if args.trace and not args.outdir:
+        parser.error("--trace requires --outdir")
+    try:
+        stages = [LoadStage(rate, args.stage_seconds) for rate in args.rates]
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.outdir:
+        args.outdir.mkdir(parents=True, exist_ok=True)
+        for name in ("state.db", "events.ndjson"):
+            if (args.outdir / name).exists():
+                (args.outdir / name).unlink()
+
+    report = run_load(
+        stages,
+        symbol_mix=args.symbols,
+        risk_rules=args.risk_rules,
+        latency_budget_s=args.latency_budget,
+        exec_workers=args.exec_workers,
+        seed=args.seed,
+        state_db=args.outdir / "state.db" if args.outdir else None,
+        trace_path=args.outdir / "events.ndjson" if args.trace else None,
+    )
+    report["symbol_mix"] = args.symbols
+
+    print_report(report)
+    if args.outdir:
+        with open(args.outdir / "load_report.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, sort_keys=True, indent=2)
+        print(f"Report written to {args.outdir / 'load_report.json'}")
+
+    if args.fail_on_breach and report["slo_breach"] is not None:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())